@@ -1,11 +1,21 @@
 # generated by datamodel-codegen:
 #   filename:  schema.deref.yaml
-#   timestamp: 2025-08-26T13:26:52+00:00
+#   timestamp: 2026-10-17T01:07:57+00:00
 
 from __future__ import annotations
 from enum import Enum
 from typing import Any, Literal, Optional, Union
-from pydantic import AnyUrl, BaseModel, ConfigDict, Field, RootModel, confloat, conint, constr
+from pydantic import (
+    AnyUrl,
+    BaseModel,
+    ConfigDict,
+    Field,
+    PositiveFloat,
+    RootModel,
+    confloat,
+    conint,
+    constr,
+)
 
 
 class Version(Enum):
@@ -396,13 +406,6 @@ class Extractor(BaseModel):
     ]
 
 
-class Type2(Enum):
-    OllamaEmbedder = "OllamaEmbedder"
-    OpenAIEmbedder = "OpenAIEmbedder"
-    HuggingFaceEmbedder = "HuggingFaceEmbedder"
-    SentenceTransformerEmbedder = "SentenceTransformerEmbedder"
-
-
 class Model(Enum):
     nomic_embed_text = "nomic-embed-text"
     mxbai_embed_large = "mxbai-embed-large"
@@ -417,24 +420,70 @@ class Config17(BaseModel):
     dimension: Optional[conint(ge=128, le=4096)] = Field(768, description="Embedding dimension")
     batch_size: Optional[conint(ge=1, le=128)] = Field(16, description="Batch processing size")
     timeout: Optional[conint(ge=10)] = Field(60, description="Request timeout (seconds)")
+    max_concurrency: Optional[conint(ge=1, le=32)] = Field(
+        4, description="Batches in flight at once"
+    )
+    max_retries: Optional[conint(ge=0, le=10)] = Field(
+        3, description="Retries for timeouts, dropped connections and 429/5xx responses"
+    )
+    retry_backoff: Optional[confloat(ge=0.0)] = Field(
+        0.5, description="Initial retry delay in seconds (doubles per attempt)"
+    )
     auto_pull: Optional[bool] = Field(True, description="Auto-pull missing models")
 
 
-class Model1(Enum):
-    text_embedding_3_small = "text-embedding-3-small"
-    text_embedding_3_large = "text-embedding-3-large"
-    text_embedding_ada_002 = "text-embedding-ada-002"
+class Embedder(BaseModel):
+    type: Literal["OllamaEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config17 = Field(..., title="Ollama Embedder Configuration")
 
 
 class Config18(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    api_key: str = Field(..., description="OpenAI API key")
-    model: Optional[Model1] = Field("text-embedding-3-small", description="OpenAI model")
-    dimension: Optional[conint(ge=256, le=3072)] = Field(None, description="Override dimension")
-    batch_size: Optional[conint(ge=1, le=2048)] = Field(100, description="Batch size")
-    max_retries: Optional[conint(ge=0, le=10)] = Field(3, description="Max retry attempts")
+    api_key: Optional[str] = Field(
+        None, description="API key (defaults to $OPENAI_API_KEY; local servers may need none)"
+    )
+    base_url: Optional[str] = Field(
+        "https://api.openai.com/v1", description="API root; point at any OpenAI-compatible server"
+    )
+    model: Optional[str] = Field(
+        "text-embedding-3-small",
+        description="Embedding model (text-embedding-3-small, text-embedding-3-large, or the server's model)",
+    )
+    dimensions: Optional[conint(ge=1, le=3072)] = Field(
+        None, description="Shorten vectors to this many dimensions (text-embedding-3 models)"
+    )
+    batch_size: Optional[conint(ge=1, le=2048)] = Field(
+        512, description="Maximum inputs per request"
+    )
+    max_tokens_per_request: Optional[conint(ge=1, le=300000)] = Field(
+        100000, description="Inputs are packed into requests up to this many tokens"
+    )
+    max_input_tokens: Optional[conint(ge=1)] = Field(
+        8191, description="Longer inputs are truncated to this many tokens"
+    )
+    max_concurrency: Optional[conint(ge=1, le=64)] = Field(
+        4, description="Requests in flight at once"
+    )
+    requests_per_minute: Optional[conint(ge=1)] = Field(
+        3000, description="Client-side request rate limit (null for none)"
+    )
+    tokens_per_minute: Optional[conint(ge=1)] = Field(
+        1000000, description="Client-side token rate limit (null for none)"
+    )
+    timeout: Optional[conint(ge=1)] = Field(60, description="Request timeout (seconds)")
+    max_retries: Optional[conint(ge=0, le=10)] = Field(
+        3, description="Retries for 429/5xx responses and dropped connections"
+    )
+    retry_backoff: Optional[confloat(ge=0.0)] = Field(
+        1.0, description="Base delay (seconds) for jittered exponential backoff"
+    )
+
+
+class Embedder1(BaseModel):
+    type: Literal["OpenAIEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config18 = Field(..., title="OpenAI Embedder Configuration")
 
 
 class Device(Enum):
@@ -444,55 +493,137 @@ class Device(Enum):
     auto = "auto"
 
 
+class PoolingStrategy(Enum):
+    mean = "mean"
+    max = "max"
+    cls = "cls"
+
+
 class Config19(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
     model_name: Optional[str] = Field(
-        "sentence-transformers/all-MiniLM-L6-v2", description="HuggingFace model ID"
+        "sentence-transformers/all-MiniLM-L6-v2", description="HuggingFace model ID or local path"
     )
     device: Optional[Device] = Field("auto", description="Computation device")
-    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Batch size")
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per forward pass")
     normalize_embeddings: Optional[bool] = Field(True, description="L2 normalize embeddings")
+    pooling_strategy: Optional[PoolingStrategy] = Field(
+        "mean", description="How token states are pooled into one vector"
+    )
+    max_length: Optional[conint(ge=1, le=8192)] = Field(
+        512, description="Maximum tokens per text (longer texts are truncated)"
+    )
     show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
     cache_folder: Optional[str] = Field(None, description="Model cache directory")
 
 
-class Device1(Enum):
-    cpu = "cpu"
-    cuda = "cuda"
-    mps = "mps"
-
-
-class PoolingStrategy(Enum):
-    mean = "mean"
-    max = "max"
-    cls = "cls"
+class Embedder2(BaseModel):
+    type: Literal["HuggingFaceEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config19 = Field(..., title="HuggingFace Embedder Configuration")
 
 
 class Config20(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    model_name: Optional[str] = Field("all-MiniLM-L6-v2", description="Model name")
-    device: Optional[Device1] = Field("cpu", description="Computation device")
-    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Batch size")
+    model_name: Optional[str] = Field(
+        "all-MiniLM-L6-v2", description="sentence-transformers model name or local path"
+    )
+    device: Optional[Device] = Field("cpu", description="Computation device")
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per forward pass")
     normalize_embeddings: Optional[bool] = Field(True, description="Normalize embeddings")
     pooling_strategy: Optional[PoolingStrategy] = Field(
-        "mean", description="Token pooling strategy"
+        "mean", description="Token pooling strategy (defaults to the model's own pooling)"
     )
+    max_seq_length: Optional[conint(ge=1)] = Field(
+        None, description="Maximum tokens per text (defaults to the model's limit)"
+    )
+    show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
+    cache_folder: Optional[str] = Field(None, description="Model cache directory")
 
 
-class Embedder(BaseModel):
-    type: Type2
-    config: Union[Config17, Config18, Config19, Config20]
+class Embedder3(BaseModel):
+    type: Literal["SentenceTransformerEmbedder"] = Field(
+        ..., description="Embedder type identifier"
+    )
+    config: Config20 = Field(..., title="Sentence Transformer Configuration")
 
 
-class Type3(Enum):
-    ChromaStore = "ChromaStore"
-    FAISSStore = "FAISSStore"
-    PineconeStore = "PineconeStore"
-    QdrantStore = "QdrantStore"
+class Config21(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    model_name: Optional[str] = Field(
+        "sentence-transformers/all-MiniLM-L6-v2",
+        description="HuggingFace model ID or local path to export",
+    )
+    onnx_path: Optional[str] = Field(
+        None, description="Existing fp32 ONNX model to run instead of exporting one"
+    )
+    export_dir: Optional[str] = Field(
+        "./data/onnx_models", description="Where exported (and quantized) models are kept"
+    )
+    quantize: Optional[bool] = Field(False, description="Run the dynamic int8-quantized model")
+    intra_op_num_threads: Optional[conint(ge=0)] = Field(
+        0, description="Threads per operator (0 lets onnxruntime use one per physical core)"
+    )
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per inference call")
+    normalize_embeddings: Optional[bool] = Field(True, description="L2 normalize embeddings")
+    pooling_strategy: Optional[PoolingStrategy] = Field(
+        "mean", description="How token states are pooled into one vector"
+    )
+    max_length: Optional[conint(ge=1, le=8192)] = Field(
+        512, description="Maximum tokens per text (longer texts are truncated)"
+    )
+    show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
+    cache_folder: Optional[str] = Field(
+        None, description="Model cache directory used when exporting"
+    )
+
+
+class Embedder4(BaseModel):
+    type: Literal["OnnxEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config21 = Field(..., title="ONNX Embedder Configuration")
+
+
+class EmbedderType(Enum):
+    OllamaEmbedder = "OllamaEmbedder"
+    OpenAIEmbedder = "OpenAIEmbedder"
+    HuggingFaceEmbedder = "HuggingFaceEmbedder"
+    SentenceTransformerEmbedder = "SentenceTransformerEmbedder"
+    OnnxEmbedder = "OnnxEmbedder"
+
+
+class Config22(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    embedder_type: Optional[EmbedderType] = Field(
+        "OllamaEmbedder", description="Embedder that computes cache misses"
+    )
+    embedder_config: Optional[dict[str, Any]] = Field(
+        {}, description="Configuration passed to the wrapped embedder"
+    )
+    cache_path: Optional[str] = Field(
+        "./data/embedding_cache.sqlite", description="SQLite file holding the cached vectors"
+    )
+    max_entries: Optional[conint(ge=1)] = Field(
+        None, description="Evict least recently used vectors beyond this many entries"
+    )
+    max_size_mb: Optional[PositiveFloat] = Field(
+        None,
+        description="Evict least recently used vectors beyond this many megabytes of vector data",
+    )
+    namespace: Optional[str] = Field(
+        None, description='Cache key prefix (defaults to "<embedder_type>:<model>")'
+    )
+
+
+class Embedder5(BaseModel):
+    type: Literal["CachedEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config22 = Field(..., title="Cached Embedder Configuration")
 
 
 class DistanceFunction(Enum):
@@ -501,7 +632,7 @@ class DistanceFunction(Enum):
     ip = "ip"
 
 
-class Config21(BaseModel):
+class Config23(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -515,6 +646,17 @@ class Config21(BaseModel):
     port: Optional[conint(ge=1, le=65535)] = Field(8000, description="Server port")
     distance_function: Optional[DistanceFunction] = Field("cosine", description="Distance metric")
     embedding_function: Optional[str] = Field(None, description="Built-in embedding function")
+    batch_size: Optional[conint(ge=1)] = Field(
+        1000, description="Maximum documents per add/upsert/get call"
+    )
+    persistent_deduplication: Optional[bool] = Field(
+        True, description="Keep the deduplication hash index in a SQLite file in persist_directory"
+    )
+
+
+class VectorStore(BaseModel):
+    type: Literal["ChromaStore"] = Field(..., description="Vector store type identifier")
+    config: Config23 = Field(..., title="Chroma Store Configuration")
 
 
 class IndexType(Enum):
@@ -530,25 +672,111 @@ class Metric(Enum):
     Cosine = "Cosine"
 
 
-class Config22(BaseModel):
+class Quantization(Enum):
+    none = "none"
+    float16 = "float16"
+    int8 = "int8"
+    pq = "pq"
+
+
+class Config24(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of the index and sidecar files)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/faiss_db", description="Directory holding the index and metadata sidecar"
+    )
     dimension: conint(ge=1, le=4096) = Field(..., description="Vector dimension")
     index_type: Optional[IndexType] = Field("Flat", description="Index type")
     metric: Optional[Metric] = Field("L2", description="Distance metric")
     nlist: Optional[conint(ge=1)] = Field(100, description="Number of clusters (IVF)")
     nprobe: Optional[conint(ge=1)] = Field(10, description="Clusters to search (IVF)")
+    hnsw_m: Optional[conint(ge=2)] = Field(32, description="Graph neighbours per node (HNSW)")
+    ef_search: Optional[conint(ge=1)] = Field(
+        64, description="Search-time candidate list size (HNSW)"
+    )
+    quantization: Optional[Quantization] = Field(
+        "none", description="Store float16, int8 or PQ codes in the index (Flat, IVF, HNSW)"
+    )
+    pq_m: Optional[conint(ge=1)] = Field(
+        8, description="PQ sub-quantizers, reduced to a divisor of the dimension"
+    )
+    pq_nbits: Optional[conint(ge=1, le=16)] = Field(8, description="Bits per PQ sub-quantizer code")
+    rescore: Optional[bool] = Field(
+        True, description="Re-score quantized candidates exactly from the on-disk vectors file"
+    )
+    rescore_factor: Optional[conint(ge=1)] = Field(
+        4, description="Quantized candidates re-scored per requested result"
+    )
     use_gpu: Optional[bool] = Field(False, description="Enable GPU acceleration")
 
 
+class VectorStore1(BaseModel):
+    type: Literal["FAISSStore"] = Field(..., description="Vector store type identifier")
+    config: Config24 = Field(..., title="FAISS Store Configuration")
+
+
+class DistanceMetric(Enum):
+    cosine = "cosine"
+    ip = "ip"
+    l2 = "l2"
+
+
+class Dtype(Enum):
+    float32 = "float32"
+    float16 = "float16"
+
+
+class Config25(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of the matrix and sidecar files)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/numpy_db",
+        description="Directory holding the .npy matrix and columnar metadata sidecar",
+    )
+    distance_metric: Optional[DistanceMetric] = Field("cosine", description="Distance metric")
+    dtype: Optional[Dtype] = Field(
+        "float32", description="Storage precision of the embedding matrix"
+    )
+    block_size: Optional[conint(ge=1)] = Field(
+        65536, description="Rows upcast to float32 at a time when scoring a float16 matrix"
+    )
+    quantization: Optional[Quantization] = Field(
+        "none", description="Scan int8 or PQ codes held in memory (float16 sets dtype)"
+    )
+    pq_m: Optional[conint(ge=1)] = Field(
+        8, description="PQ sub-quantizers, reduced to a divisor of the dimension"
+    )
+    rescore: Optional[bool] = Field(
+        True, description="Re-score quantized candidates exactly from the memory-mapped matrix"
+    )
+    rescore_factor: Optional[conint(ge=1)] = Field(
+        4, description="Quantized candidates re-scored per requested result"
+    )
+    enable_deduplication: Optional[bool] = Field(
+        True, description="Skip documents whose ID is already stored (replace them when false)"
+    )
+
+
+class VectorStore2(BaseModel):
+    type: Literal["NumpyStore"] = Field(..., description="Vector store type identifier")
+    config: Config25 = Field(..., title="NumPy Store Configuration")
+
+
 class Metric1(Enum):
     euclidean = "euclidean"
     cosine = "cosine"
     dotproduct = "dotproduct"
 
 
-class Config23(BaseModel):
+class Config26(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -561,16 +789,30 @@ class Config23(BaseModel):
     replicas: Optional[conint(ge=1, le=20)] = Field(1, description="Number of replicas")
 
 
+class VectorStore3(BaseModel):
+    type: Literal["PineconeStore"] = Field(..., description="Vector store type identifier")
+    config: Config26 = Field(..., title="Pinecone Store Configuration")
+
+
 class Distance(Enum):
     Cosine = "Cosine"
     Euclid = "Euclid"
     Dot = "Dot"
 
 
-class Config24(BaseModel):
+class Quantization2(Enum):
+    none = "none"
+    scalar = "scalar"
+
+
+class Config27(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    path: Optional[str] = Field(
+        "./data/qdrant_db", description="Local storage path (embedded mode, no server)"
+    )
+    url: Optional[str] = Field(None, description="Qdrant server URL (server mode)")
     host: Optional[str] = Field("localhost", description="Server host")
     port: Optional[conint(ge=1, le=65535)] = Field(6333, description="Server port")
     grpc_port: Optional[conint(ge=1, le=65535)] = Field(6334, description="gRPC port")
@@ -581,26 +823,83 @@ class Config24(BaseModel):
     vector_size: conint(ge=1, le=65536) = Field(..., description="Vector dimension")
     distance: Optional[Distance] = Field("Cosine", description="Distance metric")
     on_disk: Optional[bool] = Field(False, description="Store vectors on disk")
+    hnsw_m: Optional[conint(ge=2)] = Field(
+        16, description="HNSW graph neighbours per node (server mode)"
+    )
+    hnsw_ef_construct: Optional[conint(ge=4)] = Field(
+        100, description="HNSW build-time candidate list size (server mode)"
+    )
+    hnsw_ef: Optional[conint(ge=1)] = Field(
+        128, description="HNSW search-time candidate list size (server mode)"
+    )
+    quantization: Optional[Quantization2] = Field(
+        "none", description="Scalar (int8) quantization to cut RAM (server mode)"
+    )
+    batch_size: Optional[conint(ge=1)] = Field(256, description="Points per upsert batch")
+    parallel: Optional[conint(ge=1)] = Field(1, description="Parallel upload workers")
+    enable_deduplication: Optional[bool] = Field(
+        True, description="Skip documents whose ID is already stored"
+    )
 
 
-class VectorStore(BaseModel):
-    type: Type3
-    config: Union[Config21, Config22, Config23, Config24]
+class VectorStore4(BaseModel):
+    type: Literal["QdrantStore"] = Field(..., description="Vector store type identifier")
+    config: Config27 = Field(..., title="Qdrant Store Configuration")
 
 
-class DistanceMetric(Enum):
+class ShardType(Enum):
+    ChromaStore = "ChromaStore"
+    FAISSStore = "FAISSStore"
+    NumpyStore = "NumpyStore"
+    QdrantStore = "QdrantStore"
+
+
+class Config28(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of each shard's collection)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/sharded_db",
+        description="Directory holding the shard manifest and, by default, the shards",
+    )
+    shard_type: Optional[ShardType] = Field(
+        "ChromaStore", description="Store type used for every shard"
+    )
+    shard_config: Optional[dict[str, Any]] = Field(
+        {}, description="Configuration passed to each shard (persist_directory is set per shard)"
+    )
+    num_shards: Optional[conint(ge=1)] = Field(
+        4, description="Number of shards; fixed once the collection is created"
+    )
+    shard_directories: Optional[list[str]] = Field(
+        [], description="Directories (e.g. one per disk) assigned to shards round-robin"
+    )
+    max_workers: Optional[conint(ge=1)] = Field(
+        None, description="Threads used to query shards concurrently (defaults to num_shards)"
+    )
+
+
+class VectorStore5(BaseModel):
+    type: Literal["ShardedStore"] = Field(..., description="Vector store type identifier")
+    config: Config28 = Field(..., title="Sharded Store Configuration")
+
+
+class DistanceMetric1(Enum):
     cosine = "cosine"
     euclidean = "euclidean"
     manhattan = "manhattan"
     dot = "dot"
 
 
-class Config25(BaseModel):
+class Config29(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
     top_k: Optional[conint(ge=1, le=1000)] = Field(10, description="Number of results")
-    distance_metric: Optional[DistanceMetric] = Field("cosine", description="Distance metric")
+    distance_metric: Optional[DistanceMetric1] = Field("cosine", description="Distance metric")
     score_threshold: Optional[confloat(ge=0.0, le=1.0)] = Field(
         None, description="Minimum similarity score"
     )
@@ -610,7 +909,7 @@ class RetrievalStrategy(BaseModel):
     type: Literal["BasicSimilarityStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config25 = Field(..., title="Basic Similarity Configuration")
+    config: Config29 = Field(..., title="Basic Similarity Configuration")
 
 
 class FilterMode(Enum):
@@ -618,7 +917,7 @@ class FilterMode(Enum):
     post = "post"
 
 
-class Config26(BaseModel):
+class Config30(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -636,7 +935,7 @@ class RetrievalStrategy1(BaseModel):
     type: Literal["MetadataFilteredStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config26 = Field(..., title="Metadata Filtered Configuration")
+    config: Config30 = Field(..., title="Metadata Filtered Configuration")
 
 
 class AggregationMethod(Enum):
@@ -646,7 +945,7 @@ class AggregationMethod(Enum):
     reciprocal_rank = "reciprocal_rank"
 
 
-class Config27(BaseModel):
+class Config31(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -664,7 +963,7 @@ class RetrievalStrategy2(BaseModel):
     type: Literal["MultiQueryStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config27 = Field(..., title="Multi Query Configuration")
+    config: Config31 = Field(..., title="Multi Query Configuration")
 
 
 class RerankFactors(BaseModel):
@@ -677,7 +976,7 @@ class RerankFactors(BaseModel):
     metadata_weight: Optional[confloat(ge=0.0, le=1.0)] = 0.1
 
 
-class Config28(BaseModel):
+class Config32(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -689,10 +988,10 @@ class Config28(BaseModel):
 
 class RetrievalStrategy3(BaseModel):
     type: Literal["RerankedStrategy"] = Field(..., description="Retrieval strategy type identifier")
-    config: Config28 = Field(..., title="Reranked Configuration")
+    config: Config32 = Field(..., title="Reranked Configuration")
 
 
-class Type4(Enum):
+class Type2(Enum):
     BasicSimilarityStrategy = "BasicSimilarityStrategy"
     MetadataFilteredStrategy = "MetadataFilteredStrategy"
     MultiQueryStrategy = "MultiQueryStrategy"
@@ -703,7 +1002,7 @@ class Strategy1(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    type: Type4
+    type: Type2
     weight: Optional[confloat(ge=0.0, le=1.0)] = 1.0
     config: Optional[dict[str, Any]] = None
 
@@ -714,7 +1013,7 @@ class CombinationMethod(Enum):
     score_fusion = "score_fusion"
 
 
-class Config29(BaseModel):
+class Config33(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -731,7 +1030,7 @@ class RetrievalStrategy4(BaseModel):
     type: Literal["HybridUniversalStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config29 = Field(..., title="Hybrid Universal Configuration")
+    config: Config33 = Field(..., title="Hybrid Universal Configuration")
 
 
 class Components(BaseModel):
@@ -740,8 +1039,12 @@ class Components(BaseModel):
     )
     parser: Parser = Field(..., description="Parser configuration", title="Parser Configuration")
     extractors: Optional[list[Extractor]] = Field(None, max_length=10)
-    embedder: Embedder = Field(..., title="Embedder Configuration")
-    vector_store: VectorStore = Field(..., title="Vector Store Configuration")
+    embedder: Union[Embedder, Embedder1, Embedder2, Embedder3, Embedder4, Embedder5] = Field(
+        ..., title="Embedder Configuration"
+    )
+    vector_store: Union[
+        VectorStore, VectorStore1, VectorStore2, VectorStore3, VectorStore4, VectorStore5
+    ] = Field(..., title="Vector Store Configuration")
     retrieval_strategy: Union[
         RetrievalStrategy,
         RetrievalStrategy1,
@@ -772,7 +1075,7 @@ class Strategy(BaseModel):
     components: Components = Field(..., title="Strategy Components")
 
 
-class Type5(Enum):
+class Type3(Enum):
     CSVParser = "CSVParser"
     PDFParser = "PDFParser"
     MarkdownParser = "MarkdownParser"
@@ -782,7 +1085,7 @@ class Type5(Enum):
     PlainTextParser = "PlainTextParser"
 
 
-class Config30(BaseModel):
+class Config34(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -799,7 +1102,7 @@ class Config30(BaseModel):
     delimiter: Optional[constr(max_length=1)] = Field(",", description="CSV delimiter character")
 
 
-class Config31(BaseModel):
+class Config35(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -820,7 +1123,7 @@ class Config31(BaseModel):
     ocr_enabled: Optional[bool] = Field(False, description="Enable OCR for scanned documents")
 
 
-class Config32(BaseModel):
+class Config36(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -835,7 +1138,7 @@ class Config32(BaseModel):
     )
 
 
-class Config33(BaseModel):
+class Config37(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -848,7 +1151,7 @@ class Config33(BaseModel):
     text_only: Optional[bool] = Field(False, description="Extract only text")
 
 
-class Config34(BaseModel):
+class Config38(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -860,7 +1163,7 @@ class Config34(BaseModel):
     preserve_formatting: Optional[bool] = Field(False, description="Preserve text formatting")
 
 
-class Config35(BaseModel):
+class Config39(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -872,7 +1175,7 @@ class Config35(BaseModel):
     header_row: Optional[conint(ge=0)] = Field(0, description="Header row index")
 
 
-class Config36(BaseModel):
+class Config40(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -913,11 +1216,11 @@ class Parser1(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    type: Type5
-    config: Union[Config30, Config31, Config32, Config33, Config34, Config35, Config36]
+    type: Type3
+    config: Union[Config34, Config35, Config36, Config37, Config38, Config39, Config40]
 
 
-class Type6(Enum):
+class Type4(Enum):
     KeywordExtractor = "KeywordExtractor"
     EntityExtractor = "EntityExtractor"
     DateTimeExtractor = "DateTimeExtractor"
@@ -937,7 +1240,7 @@ class Algorithm2(Enum):
     textrank = "textrank"
 
 
-class Config37(BaseModel):
+class Config41(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -948,7 +1251,7 @@ class Config37(BaseModel):
     language: Optional[str] = Field("english", description="Language for stop words")
 
 
-class Config38(BaseModel):
+class Config42(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -965,7 +1268,7 @@ class Config38(BaseModel):
     )
 
 
-class Config39(BaseModel):
+class Config43(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -980,7 +1283,7 @@ class Config39(BaseModel):
     )
 
 
-class Config40(BaseModel):
+class Config44(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -990,7 +1293,7 @@ class Config40(BaseModel):
     min_heading_length: Optional[conint(ge=1)] = Field(3, description="Minimum heading length")
 
 
-class Config41(BaseModel):
+class Config45(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1001,7 +1304,7 @@ class Config41(BaseModel):
     resolve_redirects: Optional[bool] = Field(False, description="Resolve URL redirects")
 
 
-class Config42(BaseModel):
+class Config46(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1012,7 +1315,7 @@ class Config42(BaseModel):
     normalize_paths: Optional[bool] = Field(True, description="Normalize path formats")
 
 
-class Config43(BaseModel):
+class Config47(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1024,7 +1327,7 @@ class Config43(BaseModel):
     return_positions: Optional[bool] = Field(False, description="Return match positions")
 
 
-class Config44(BaseModel):
+class Config48(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1042,7 +1345,7 @@ class Algorithm3(Enum):
     lexrank = "lexrank"
 
 
-class Config45(BaseModel):
+class Config49(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1054,7 +1357,7 @@ class Config45(BaseModel):
     include_statistics: Optional[bool] = Field(True, description="Include text statistics")
 
 
-class Config46(BaseModel):
+class Config50(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1068,115 +1371,216 @@ class Extractor1(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    type: Type6 = Field(..., description="Extractor type identifier")
+    type: Type4 = Field(..., description="Extractor type identifier")
     config: Union[
-        Config37,
-        Config38,
-        Config39,
-        Config40,
         Config41,
         Config42,
         Config43,
         Config44,
         Config45,
         Config46,
+        Config47,
+        Config48,
+        Config49,
+        Config50,
     ]
 
 
-class Type7(Enum):
-    OllamaEmbedder = "OllamaEmbedder"
-    OpenAIEmbedder = "OpenAIEmbedder"
-    HuggingFaceEmbedder = "HuggingFaceEmbedder"
-    SentenceTransformerEmbedder = "SentenceTransformerEmbedder"
-
-
-class Model2(Enum):
-    nomic_embed_text = "nomic-embed-text"
-    mxbai_embed_large = "mxbai-embed-large"
-
-
-class Config47(BaseModel):
+class Config51(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    model: Optional[Model2] = Field("nomic-embed-text", description="Ollama model name")
+    model: Optional[Model] = Field("nomic-embed-text", description="Ollama model name")
     base_url: Optional[AnyUrl] = Field("http://localhost:11434", description="Ollama API endpoint")
     dimension: Optional[conint(ge=128, le=4096)] = Field(768, description="Embedding dimension")
     batch_size: Optional[conint(ge=1, le=128)] = Field(16, description="Batch processing size")
     timeout: Optional[conint(ge=10)] = Field(60, description="Request timeout (seconds)")
+    max_concurrency: Optional[conint(ge=1, le=32)] = Field(
+        4, description="Batches in flight at once"
+    )
+    max_retries: Optional[conint(ge=0, le=10)] = Field(
+        3, description="Retries for timeouts, dropped connections and 429/5xx responses"
+    )
+    retry_backoff: Optional[confloat(ge=0.0)] = Field(
+        0.5, description="Initial retry delay in seconds (doubles per attempt)"
+    )
     auto_pull: Optional[bool] = Field(True, description="Auto-pull missing models")
 
 
-class Model3(Enum):
-    text_embedding_3_small = "text-embedding-3-small"
-    text_embedding_3_large = "text-embedding-3-large"
-    text_embedding_ada_002 = "text-embedding-ada-002"
+class Embedder6(BaseModel):
+    type: Literal["OllamaEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config51 = Field(..., title="Ollama Embedder Configuration")
 
 
-class Config48(BaseModel):
+class Config52(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    api_key: str = Field(..., description="OpenAI API key")
-    model: Optional[Model3] = Field("text-embedding-3-small", description="OpenAI model")
-    dimension: Optional[conint(ge=256, le=3072)] = Field(None, description="Override dimension")
-    batch_size: Optional[conint(ge=1, le=2048)] = Field(100, description="Batch size")
-    max_retries: Optional[conint(ge=0, le=10)] = Field(3, description="Max retry attempts")
+    api_key: Optional[str] = Field(
+        None, description="API key (defaults to $OPENAI_API_KEY; local servers may need none)"
+    )
+    base_url: Optional[str] = Field(
+        "https://api.openai.com/v1", description="API root; point at any OpenAI-compatible server"
+    )
+    model: Optional[str] = Field(
+        "text-embedding-3-small",
+        description="Embedding model (text-embedding-3-small, text-embedding-3-large, or the server's model)",
+    )
+    dimensions: Optional[conint(ge=1, le=3072)] = Field(
+        None, description="Shorten vectors to this many dimensions (text-embedding-3 models)"
+    )
+    batch_size: Optional[conint(ge=1, le=2048)] = Field(
+        512, description="Maximum inputs per request"
+    )
+    max_tokens_per_request: Optional[conint(ge=1, le=300000)] = Field(
+        100000, description="Inputs are packed into requests up to this many tokens"
+    )
+    max_input_tokens: Optional[conint(ge=1)] = Field(
+        8191, description="Longer inputs are truncated to this many tokens"
+    )
+    max_concurrency: Optional[conint(ge=1, le=64)] = Field(
+        4, description="Requests in flight at once"
+    )
+    requests_per_minute: Optional[conint(ge=1)] = Field(
+        3000, description="Client-side request rate limit (null for none)"
+    )
+    tokens_per_minute: Optional[conint(ge=1)] = Field(
+        1000000, description="Client-side token rate limit (null for none)"
+    )
+    timeout: Optional[conint(ge=1)] = Field(60, description="Request timeout (seconds)")
+    max_retries: Optional[conint(ge=0, le=10)] = Field(
+        3, description="Retries for 429/5xx responses and dropped connections"
+    )
+    retry_backoff: Optional[confloat(ge=0.0)] = Field(
+        1.0, description="Base delay (seconds) for jittered exponential backoff"
+    )
 
 
-class Device2(Enum):
-    cpu = "cpu"
-    cuda = "cuda"
-    mps = "mps"
-    auto = "auto"
+class Embedder7(BaseModel):
+    type: Literal["OpenAIEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config52 = Field(..., title="OpenAI Embedder Configuration")
 
 
-class Config49(BaseModel):
+class Config53(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
     model_name: Optional[str] = Field(
-        "sentence-transformers/all-MiniLM-L6-v2", description="HuggingFace model ID"
+        "sentence-transformers/all-MiniLM-L6-v2", description="HuggingFace model ID or local path"
     )
-    device: Optional[Device2] = Field("auto", description="Computation device")
-    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Batch size")
+    device: Optional[Device] = Field("auto", description="Computation device")
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per forward pass")
     normalize_embeddings: Optional[bool] = Field(True, description="L2 normalize embeddings")
+    pooling_strategy: Optional[PoolingStrategy] = Field(
+        "mean", description="How token states are pooled into one vector"
+    )
+    max_length: Optional[conint(ge=1, le=8192)] = Field(
+        512, description="Maximum tokens per text (longer texts are truncated)"
+    )
     show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
     cache_folder: Optional[str] = Field(None, description="Model cache directory")
 
 
-class Device3(Enum):
-    cpu = "cpu"
-    cuda = "cuda"
-    mps = "mps"
+class Embedder8(BaseModel):
+    type: Literal["HuggingFaceEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config53 = Field(..., title="HuggingFace Embedder Configuration")
 
 
-class Config50(BaseModel):
+class Config54(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    model_name: Optional[str] = Field("all-MiniLM-L6-v2", description="Model name")
-    device: Optional[Device3] = Field("cpu", description="Computation device")
-    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Batch size")
+    model_name: Optional[str] = Field(
+        "all-MiniLM-L6-v2", description="sentence-transformers model name or local path"
+    )
+    device: Optional[Device] = Field("cpu", description="Computation device")
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per forward pass")
     normalize_embeddings: Optional[bool] = Field(True, description="Normalize embeddings")
     pooling_strategy: Optional[PoolingStrategy] = Field(
-        "mean", description="Token pooling strategy"
+        "mean", description="Token pooling strategy (defaults to the model's own pooling)"
     )
+    max_seq_length: Optional[conint(ge=1)] = Field(
+        None, description="Maximum tokens per text (defaults to the model's limit)"
+    )
+    show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
+    cache_folder: Optional[str] = Field(None, description="Model cache directory")
 
 
-class Embedder1(BaseModel):
-    type: Type7
-    config: Union[Config47, Config48, Config49, Config50]
+class Embedder9(BaseModel):
+    type: Literal["SentenceTransformerEmbedder"] = Field(
+        ..., description="Embedder type identifier"
+    )
+    config: Config54 = Field(..., title="Sentence Transformer Configuration")
 
 
-class Type8(Enum):
-    ChromaStore = "ChromaStore"
-    FAISSStore = "FAISSStore"
-    PineconeStore = "PineconeStore"
-    QdrantStore = "QdrantStore"
+class Config55(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    model_name: Optional[str] = Field(
+        "sentence-transformers/all-MiniLM-L6-v2",
+        description="HuggingFace model ID or local path to export",
+    )
+    onnx_path: Optional[str] = Field(
+        None, description="Existing fp32 ONNX model to run instead of exporting one"
+    )
+    export_dir: Optional[str] = Field(
+        "./data/onnx_models", description="Where exported (and quantized) models are kept"
+    )
+    quantize: Optional[bool] = Field(False, description="Run the dynamic int8-quantized model")
+    intra_op_num_threads: Optional[conint(ge=0)] = Field(
+        0, description="Threads per operator (0 lets onnxruntime use one per physical core)"
+    )
+    batch_size: Optional[conint(ge=1, le=256)] = Field(32, description="Texts per inference call")
+    normalize_embeddings: Optional[bool] = Field(True, description="L2 normalize embeddings")
+    pooling_strategy: Optional[PoolingStrategy] = Field(
+        "mean", description="How token states are pooled into one vector"
+    )
+    max_length: Optional[conint(ge=1, le=8192)] = Field(
+        512, description="Maximum tokens per text (longer texts are truncated)"
+    )
+    show_progress_bar: Optional[bool] = Field(False, description="Show progress bar")
+    cache_folder: Optional[str] = Field(
+        None, description="Model cache directory used when exporting"
+    )
 
 
-class Config51(BaseModel):
+class Embedder10(BaseModel):
+    type: Literal["OnnxEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config55 = Field(..., title="ONNX Embedder Configuration")
+
+
+class Config56(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    embedder_type: Optional[EmbedderType] = Field(
+        "OllamaEmbedder", description="Embedder that computes cache misses"
+    )
+    embedder_config: Optional[dict[str, Any]] = Field(
+        {}, description="Configuration passed to the wrapped embedder"
+    )
+    cache_path: Optional[str] = Field(
+        "./data/embedding_cache.sqlite", description="SQLite file holding the cached vectors"
+    )
+    max_entries: Optional[conint(ge=1)] = Field(
+        None, description="Evict least recently used vectors beyond this many entries"
+    )
+    max_size_mb: Optional[PositiveFloat] = Field(
+        None,
+        description="Evict least recently used vectors beyond this many megabytes of vector data",
+    )
+    namespace: Optional[str] = Field(
+        None, description='Cache key prefix (defaults to "<embedder_type>:<model>")'
+    )
+
+
+class Embedder11(BaseModel):
+    type: Literal["CachedEmbedder"] = Field(..., description="Embedder type identifier")
+    config: Config56 = Field(..., title="Cached Embedder Configuration")
+
+
+class Config57(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1190,6 +1594,17 @@ class Config51(BaseModel):
     port: Optional[conint(ge=1, le=65535)] = Field(8000, description="Server port")
     distance_function: Optional[DistanceFunction] = Field("cosine", description="Distance metric")
     embedding_function: Optional[str] = Field(None, description="Built-in embedding function")
+    batch_size: Optional[conint(ge=1)] = Field(
+        1000, description="Maximum documents per add/upsert/get call"
+    )
+    persistent_deduplication: Optional[bool] = Field(
+        True, description="Keep the deduplication hash index in a SQLite file in persist_directory"
+    )
+
+
+class VectorStore6(BaseModel):
+    type: Literal["ChromaStore"] = Field(..., description="Vector store type identifier")
+    config: Config57 = Field(..., title="Chroma Store Configuration")
 
 
 class Metric2(Enum):
@@ -1198,25 +1613,106 @@ class Metric2(Enum):
     Cosine = "Cosine"
 
 
-class Config52(BaseModel):
+class Quantization3(Enum):
+    none = "none"
+    float16 = "float16"
+    int8 = "int8"
+    pq = "pq"
+
+
+class Config58(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of the index and sidecar files)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/faiss_db", description="Directory holding the index and metadata sidecar"
+    )
     dimension: conint(ge=1, le=4096) = Field(..., description="Vector dimension")
     index_type: Optional[IndexType] = Field("Flat", description="Index type")
     metric: Optional[Metric2] = Field("L2", description="Distance metric")
     nlist: Optional[conint(ge=1)] = Field(100, description="Number of clusters (IVF)")
     nprobe: Optional[conint(ge=1)] = Field(10, description="Clusters to search (IVF)")
+    hnsw_m: Optional[conint(ge=2)] = Field(32, description="Graph neighbours per node (HNSW)")
+    ef_search: Optional[conint(ge=1)] = Field(
+        64, description="Search-time candidate list size (HNSW)"
+    )
+    quantization: Optional[Quantization3] = Field(
+        "none", description="Store float16, int8 or PQ codes in the index (Flat, IVF, HNSW)"
+    )
+    pq_m: Optional[conint(ge=1)] = Field(
+        8, description="PQ sub-quantizers, reduced to a divisor of the dimension"
+    )
+    pq_nbits: Optional[conint(ge=1, le=16)] = Field(8, description="Bits per PQ sub-quantizer code")
+    rescore: Optional[bool] = Field(
+        True, description="Re-score quantized candidates exactly from the on-disk vectors file"
+    )
+    rescore_factor: Optional[conint(ge=1)] = Field(
+        4, description="Quantized candidates re-scored per requested result"
+    )
     use_gpu: Optional[bool] = Field(False, description="Enable GPU acceleration")
 
 
+class VectorStore7(BaseModel):
+    type: Literal["FAISSStore"] = Field(..., description="Vector store type identifier")
+    config: Config58 = Field(..., title="FAISS Store Configuration")
+
+
+class DistanceMetric2(Enum):
+    cosine = "cosine"
+    ip = "ip"
+    l2 = "l2"
+
+
+class Config59(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of the matrix and sidecar files)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/numpy_db",
+        description="Directory holding the .npy matrix and columnar metadata sidecar",
+    )
+    distance_metric: Optional[DistanceMetric2] = Field("cosine", description="Distance metric")
+    dtype: Optional[Dtype] = Field(
+        "float32", description="Storage precision of the embedding matrix"
+    )
+    block_size: Optional[conint(ge=1)] = Field(
+        65536, description="Rows upcast to float32 at a time when scoring a float16 matrix"
+    )
+    quantization: Optional[Quantization3] = Field(
+        "none", description="Scan int8 or PQ codes held in memory (float16 sets dtype)"
+    )
+    pq_m: Optional[conint(ge=1)] = Field(
+        8, description="PQ sub-quantizers, reduced to a divisor of the dimension"
+    )
+    rescore: Optional[bool] = Field(
+        True, description="Re-score quantized candidates exactly from the memory-mapped matrix"
+    )
+    rescore_factor: Optional[conint(ge=1)] = Field(
+        4, description="Quantized candidates re-scored per requested result"
+    )
+    enable_deduplication: Optional[bool] = Field(
+        True, description="Skip documents whose ID is already stored (replace them when false)"
+    )
+
+
+class VectorStore8(BaseModel):
+    type: Literal["NumpyStore"] = Field(..., description="Vector store type identifier")
+    config: Config59 = Field(..., title="NumPy Store Configuration")
+
+
 class Metric3(Enum):
     euclidean = "euclidean"
     cosine = "cosine"
     dotproduct = "dotproduct"
 
 
-class Config53(BaseModel):
+class Config60(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1229,10 +1725,24 @@ class Config53(BaseModel):
     replicas: Optional[conint(ge=1, le=20)] = Field(1, description="Number of replicas")
 
 
-class Config54(BaseModel):
+class VectorStore9(BaseModel):
+    type: Literal["PineconeStore"] = Field(..., description="Vector store type identifier")
+    config: Config60 = Field(..., title="Pinecone Store Configuration")
+
+
+class Quantization5(Enum):
+    none = "none"
+    scalar = "scalar"
+
+
+class Config61(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    path: Optional[str] = Field(
+        "./data/qdrant_db", description="Local storage path (embedded mode, no server)"
+    )
+    url: Optional[str] = Field(None, description="Qdrant server URL (server mode)")
     host: Optional[str] = Field("localhost", description="Server host")
     port: Optional[conint(ge=1, le=65535)] = Field(6333, description="Server port")
     grpc_port: Optional[conint(ge=1, le=65535)] = Field(6334, description="gRPC port")
@@ -1243,19 +1753,76 @@ class Config54(BaseModel):
     vector_size: conint(ge=1, le=65536) = Field(..., description="Vector dimension")
     distance: Optional[Distance] = Field("Cosine", description="Distance metric")
     on_disk: Optional[bool] = Field(False, description="Store vectors on disk")
+    hnsw_m: Optional[conint(ge=2)] = Field(
+        16, description="HNSW graph neighbours per node (server mode)"
+    )
+    hnsw_ef_construct: Optional[conint(ge=4)] = Field(
+        100, description="HNSW build-time candidate list size (server mode)"
+    )
+    hnsw_ef: Optional[conint(ge=1)] = Field(
+        128, description="HNSW search-time candidate list size (server mode)"
+    )
+    quantization: Optional[Quantization5] = Field(
+        "none", description="Scalar (int8) quantization to cut RAM (server mode)"
+    )
+    batch_size: Optional[conint(ge=1)] = Field(256, description="Points per upsert batch")
+    parallel: Optional[conint(ge=1)] = Field(1, description="Parallel upload workers")
+    enable_deduplication: Optional[bool] = Field(
+        True, description="Skip documents whose ID is already stored"
+    )
 
 
-class VectorStore1(BaseModel):
-    type: Type8
-    config: Union[Config51, Config52, Config53, Config54]
+class VectorStore10(BaseModel):
+    type: Literal["QdrantStore"] = Field(..., description="Vector store type identifier")
+    config: Config61 = Field(..., title="Qdrant Store Configuration")
 
 
-class Config55(BaseModel):
+class Config62(BaseModel):
+    model_config = ConfigDict(
+        extra="forbid",
+    )
+    collection_name: Optional[constr(pattern=r"^[a-zA-Z0-9_-]+$")] = Field(
+        "documents", description="Collection name (prefix of each shard's collection)"
+    )
+    persist_directory: Optional[str] = Field(
+        "./data/sharded_db",
+        description="Directory holding the shard manifest and, by default, the shards",
+    )
+    shard_type: Optional[ShardType] = Field(
+        "ChromaStore", description="Store type used for every shard"
+    )
+    shard_config: Optional[dict[str, Any]] = Field(
+        {}, description="Configuration passed to each shard (persist_directory is set per shard)"
+    )
+    num_shards: Optional[conint(ge=1)] = Field(
+        4, description="Number of shards; fixed once the collection is created"
+    )
+    shard_directories: Optional[list[str]] = Field(
+        [], description="Directories (e.g. one per disk) assigned to shards round-robin"
+    )
+    max_workers: Optional[conint(ge=1)] = Field(
+        None, description="Threads used to query shards concurrently (defaults to num_shards)"
+    )
+
+
+class VectorStore11(BaseModel):
+    type: Literal["ShardedStore"] = Field(..., description="Vector store type identifier")
+    config: Config62 = Field(..., title="Sharded Store Configuration")
+
+
+class DistanceMetric3(Enum):
+    cosine = "cosine"
+    euclidean = "euclidean"
+    manhattan = "manhattan"
+    dot = "dot"
+
+
+class Config63(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
     top_k: Optional[conint(ge=1, le=1000)] = Field(10, description="Number of results")
-    distance_metric: Optional[DistanceMetric] = Field("cosine", description="Distance metric")
+    distance_metric: Optional[DistanceMetric3] = Field("cosine", description="Distance metric")
     score_threshold: Optional[confloat(ge=0.0, le=1.0)] = Field(
         None, description="Minimum similarity score"
     )
@@ -1265,10 +1832,10 @@ class RetrievalStrategy5(BaseModel):
     type: Literal["BasicSimilarityStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config55 = Field(..., title="Basic Similarity Configuration")
+    config: Config63 = Field(..., title="Basic Similarity Configuration")
 
 
-class Config56(BaseModel):
+class Config64(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1286,10 +1853,10 @@ class RetrievalStrategy6(BaseModel):
     type: Literal["MetadataFilteredStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config56 = Field(..., title="Metadata Filtered Configuration")
+    config: Config64 = Field(..., title="Metadata Filtered Configuration")
 
 
-class Config57(BaseModel):
+class Config65(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1307,10 +1874,10 @@ class RetrievalStrategy7(BaseModel):
     type: Literal["MultiQueryStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config57 = Field(..., title="Multi Query Configuration")
+    config: Config65 = Field(..., title="Multi Query Configuration")
 
 
-class Config58(BaseModel):
+class Config66(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1322,10 +1889,10 @@ class Config58(BaseModel):
 
 class RetrievalStrategy8(BaseModel):
     type: Literal["RerankedStrategy"] = Field(..., description="Retrieval strategy type identifier")
-    config: Config58 = Field(..., title="Reranked Configuration")
+    config: Config66 = Field(..., title="Reranked Configuration")
 
 
-class Type9(Enum):
+class Type5(Enum):
     BasicSimilarityStrategy = "BasicSimilarityStrategy"
     MetadataFilteredStrategy = "MetadataFilteredStrategy"
     MultiQueryStrategy = "MultiQueryStrategy"
@@ -1336,12 +1903,12 @@ class Strategy2(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
-    type: Type9
+    type: Type5
     weight: Optional[confloat(ge=0.0, le=1.0)] = 1.0
     config: Optional[dict[str, Any]] = None
 
 
-class Config59(BaseModel):
+class Config67(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
@@ -1358,7 +1925,7 @@ class RetrievalStrategy9(BaseModel):
     type: Literal["HybridUniversalStrategy"] = Field(
         ..., description="Retrieval strategy type identifier"
     )
-    config: Config59 = Field(..., title="Hybrid Universal Configuration")
+    config: Config67 = Field(..., title="Hybrid Universal Configuration")
 
 
 class Components1(BaseModel):
@@ -1367,8 +1934,12 @@ class Components1(BaseModel):
     )
     parser: Parser1 = Field(..., description="Parser configuration", title="Parser Configuration")
     extractors: Optional[list[Extractor1]] = Field(None, max_length=10)
-    embedder: Embedder1 = Field(..., title="Embedder Configuration")
-    vector_store: VectorStore1 = Field(..., title="Vector Store Configuration")
+    embedder: Union[Embedder6, Embedder7, Embedder8, Embedder9, Embedder10, Embedder11] = Field(
+        ..., title="Embedder Configuration"
+    )
+    vector_store: Union[
+        VectorStore6, VectorStore7, VectorStore8, VectorStore9, VectorStore10, VectorStore11
+    ] = Field(..., title="Vector Store Configuration")
     retrieval_strategy: Union[
         RetrievalStrategy5,
         RetrievalStrategy6,
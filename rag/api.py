@@ -1,17 +1,27 @@
 """Internal API for RAG system search functionality."""
 
 import json
+import logging
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass, asdict
 
 from core.base import Document
+from core.embedding_batcher import get_embedding_batcher
 from core.factories import (
     create_embedder_from_config,
     create_vector_store_from_config,
     create_retrieval_strategy_from_config,
 )
+from utils.embedding_registry import (
+    EmbeddingProbeError,
+    configure_embedding_registry,
+    validate_embedder_for_store,
+)
 from utils.path_resolver import PathResolver, resolve_paths_in_config
+from utils.query_cache import get_query_cache
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -77,10 +87,21 @@ class SearchAPI:
     def _initialize_components(self) -> None:
         """Initialize embedder, vector store, and retrieval strategy from config."""
         try:
+            configure_embedding_registry(self.config.get("embedding_registry"), PathResolver(self.base_dir).base_dir)
             self.embedder = create_embedder_from_config(self.config.get("embedder", {}))
+            # Shared with the CLI search command; None when disabled in config
+            self.query_cache = get_query_cache(self.config.get("query_cache"))
+            # Concurrent searches can share micro-batches through one batcher
+            batcher_config = self.config.get("embedding_batcher") or {}
+            self.query_embedder = (
+                get_embedding_batcher(self.embedder, batcher_config)
+                if batcher_config.get("enabled", False)
+                else self.embedder
+            )
             self.vector_store = create_vector_store_from_config(
                 self.config.get("vector_store", {})
             )
+            self._validate_dimensions()
 
             # Initialize retrieval strategy (with fallback to basic strategy)
             retrieval_config = self.config.get("retrieval_strategy")
@@ -102,6 +123,17 @@ class SearchAPI:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize components: {e}")
 
+    def _validate_dimensions(self) -> None:
+        """Fail at startup, not on the first search, if the store can't take the embedder's vectors.
+
+        An embedder that can't be reached yet is only logged; searches will
+        report it when they need it.
+        """
+        try:
+            validate_embedder_for_store(self.embedder, self.vector_store)
+        except EmbeddingProbeError as e:
+            logger.warning(f"Skipping dimension check: {e}")
+
     def search(
         self,
         query: str,
@@ -130,8 +162,8 @@ class SearchAPI:
             >>> for result in results:
             ...     print(f"Score: {result.score:.3f} - {result.content[:100]}...")
         """
-        # Embed the query
-        query_embedding = self.embedder.embed([query])[0]
+        # Embed the query (repeats are served from the query cache)
+        query_embedding = self._embed_queries([query])[0]
 
         # Use retrieval strategy to get results
         retrieval_result = self.retrieval_strategy.retrieve(
@@ -139,9 +171,72 @@ class SearchAPI:
             vector_store=self.vector_store,
             top_k=top_k,
             metadata_filter=metadata_filter,
+            query_text=query,
+            **kwargs,
+        )
+
+        return self._to_results(retrieval_result, min_score, return_raw_documents)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        min_score: Optional[float] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        return_raw_documents: bool = False,
+        **kwargs,
+    ) -> List[Union[List[SearchResult], List[Document]]]:
+        """Search several queries with one embedding call and batched retrieval.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of results to return per query (default: 5)
+            min_score: Minimum similarity score filter (optional)
+            metadata_filter: Filter results by metadata fields (optional)
+            return_raw_documents: Return Document objects instead of SearchResult (default: False)
+            **kwargs: Additional arguments passed to the retrieval strategy
+
+        Returns:
+            One result list per query, in the same order as ``queries``
+
+        Example:
+            >>> api = SearchAPI()
+            >>> for results in api.search_batch(["password reset", "billing"], top_k=3):
+            ...     print(len(results))
+        """
+        if not queries:
+            return []
+
+        # Embed every uncached query in one call
+        query_embeddings = self._embed_queries(list(queries))
+
+        retrieval_results = self.retrieval_strategy.retrieve_batch(
+            query_embeddings,
+            self.vector_store,
+            top_k=top_k,
+            metadata_filter=metadata_filter,
+            query_texts=list(queries),
             **kwargs,
         )
 
+        return [
+            self._to_results(result, min_score, return_raw_documents)
+            for result in retrieval_results
+        ]
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed queries through the query cache and batcher when they are enabled."""
+        if self.query_cache is None:
+            return self.query_embedder.embed(queries)
+        return self.query_cache.embed_many(self.query_embedder, queries)
+
+    def _to_results(
+        self,
+        retrieval_result,
+        min_score: Optional[float],
+        return_raw_documents: bool,
+    ) -> Union[List[SearchResult], List[Document]]:
+        """Apply min_score and convert a RetrievalResult to the requested output type."""
         documents = retrieval_result.documents
 
         # Apply min_score filter if specified
@@ -198,7 +293,8 @@ class SearchAPI:
         """Get information about the vector store collection.
 
         Returns:
-            Dictionary with collection information including retrieval strategy info
+            Dictionary with collection information including retrieval strategy
+            info and query embedding cache statistics
         """
         info = self.vector_store.get_collection_info()
         info["retrieval_strategy"] = {
@@ -206,6 +302,11 @@ class SearchAPI:
             "type": type(self.retrieval_strategy).__name__,
             "config": getattr(self.retrieval_strategy, "config", {}),
         }
+        info["query_cache"] = (
+            self.query_cache.get_stats() if self.query_cache is not None else {"enabled": False}
+        )
+        if self.query_embedder is not self.embedder:
+            info["embedding_batcher"] = self.query_embedder.get_stats()
         return info
 
     def search_with_context(
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure the BM25 lexical index: ingest rate in batches, on-disk size against
+the raw text, reload time, and query latency (target: p95 under 5 ms).
+
+Chunk text is drawn from a Zipf-distributed synthetic vocabulary, so common
+and rare terms behave roughly like natural language.
+
+Usage:
+    python benchmarks/bench_bm25.py --docs 100000 --words 120
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from common import latency_summary, print_table, time_call
+
+from utils.bm25_index import BM25Index
+
+
+def make_texts(count, words, vocabulary, seed=0):
+    """Chunks of ``words`` Zipf-distributed terms, plus one identifier each."""
+    rng = np.random.default_rng(seed)
+    terms = np.array([f"term{i}" for i in range(vocabulary)])
+    ranks = np.minimum(rng.zipf(1.2, size=(count, words)), vocabulary) - 1
+    return [f"{' '.join(terms[row])} part-{i}" for i, row in enumerate(ranks)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 index benchmark")
+    parser.add_argument("--docs", type=int, default=50000, help="Number of chunks")
+    parser.add_argument("--words", type=int, default=120, help="Words per chunk")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="Distinct terms")
+    parser.add_argument("--batch", type=int, default=500, help="Chunks per ingest batch")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=20, help="Results per query")
+    args = parser.parse_args()
+
+    texts = make_texts(args.docs, args.words, args.vocabulary)
+    rng = np.random.default_rng(1)
+    # Mixes of common and rare terms, and exact identifiers
+    queries = [
+        " ".join(f"term{i}" for i in np.minimum(rng.zipf(1.2, size=3), args.vocabulary) - 1)
+        if q % 2 else f"part-{rng.integers(args.docs)} term{rng.integers(100)}"
+        for q in range(args.queries)
+    ]
+    workdir = Path(tempfile.mkdtemp(prefix="bm25_"))
+
+    try:
+        path = workdir / "bench.bm25"
+        index = BM25Index(path)
+        start = time.perf_counter()
+        for i in range(0, args.docs, args.batch):
+            index.add((f"doc_{j}", texts[j]) for j in range(i, min(i + args.batch, args.docs)))
+        ingest_seconds = time.perf_counter() - start
+        appended_bytes = path.stat().st_size
+        index.compact()
+        compact_bytes = path.stat().st_size
+
+        start = time.perf_counter()
+        reloaded = BM25Index(path)
+        load_seconds = time.perf_counter() - start
+
+        raw_bytes = sum(len(text.encode("utf-8")) for text in texts)
+        stats = reloaded.get_stats()
+        print(f"\n{args.docs} chunks x {args.words} words, {stats['terms']} terms, {stats['postings']} postings\n")
+        print_table([{
+            "docs_per_s": args.docs / ingest_seconds,
+            "raw_mb": raw_bytes / 1e6,
+            "appended_mb": appended_bytes / 1e6,
+            "compacted_mb": compact_bytes / 1e6,
+            "bytes_per_posting": compact_bytes / stats["postings"],
+            "load_s": load_seconds,
+        }])
+
+        rows = []
+        for label, selected in (("mixed", queries), ("terms", queries[1::2]), ("identifier", queries[::2])):
+            samples = [time_call(reloaded.search, query, args.top_k) for query in selected]
+            row = {"queries": label, "count": len(selected)}
+            row.update(latency_summary(samples))
+            rows.append(row)
+        print()
+        print_table(rows)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
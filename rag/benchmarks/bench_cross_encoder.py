@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Time CrossEncoderRerankStrategy on CPU: a cold rerank of N candidates per
+query, the same queries again with every pair served from the score cache,
+and a batch of queries scored in one model pass.
+
+"per_pair_ms" is the cold latency divided by the candidates scored.
+
+Usage:
+    python benchmarks/bench_cross_encoder.py --model cross-encoder/ms-marco-MiniLM-L-6-v2 --candidates 10 20 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import latency_summary, print_table, time_call
+
+from components.retrievers.base import CandidatePool
+from components.retrievers.cross_encoder_rerank.cross_encoder_rerank import CrossEncoderRerankStrategy
+from core.base import Document
+
+WORDS = (
+    "the system stores document chunks with their embeddings so that retrieval can rank "
+    "passages by similarity to a query while metadata filters narrow results by source "
+    "date author and type before reranking selects the final context for the answer"
+).split()
+
+
+def make_pool(count, seed=0):
+    """Chunks of 40-200 words with descending dense scores."""
+    rng = np.random.default_rng(seed)
+    return [
+        Document(content=" ".join(rng.choice(WORDS, size=rng.integers(40, 200))), id=f"doc_{i}",
+                 metadata={"similarity_score": 1.0 - i / (2 * count)})
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-encoder rerank benchmark")
+    parser.add_argument("--model", default="cross-encoder/ms-marco-MiniLM-L-6-v2", help="Cross-encoder model")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 50], help="Candidates reranked")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per configuration")
+    parser.add_argument("--batch-size", type=int, default=32, help="Pairs per model call")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    queries = [" ".join(rng.choice(WORDS, size=6)) + f" {q}" for q in range(args.queries)]
+    embedding = [0.0]
+
+    rows = []
+    for candidates in args.candidates:
+        pool = CandidatePool(make_pool(candidates))
+        strategy = CrossEncoderRerankStrategy(config={
+            "model_name": args.model, "candidates": candidates, "batch_size": args.batch_size,
+        })
+        strategy.retrieve(embedding, pool, args.top_k, query_text="warm up")
+
+        cold = [time_call(strategy.retrieve, embedding, pool, args.top_k, query_text=q) for q in queries]
+        cached = [time_call(strategy.retrieve, embedding, pool, args.top_k, query_text=q) for q in queries]
+        strategy.score_cache.clear()
+        start = time.perf_counter()
+        strategy.retrieve_batch([embedding] * len(queries), pool, args.top_k, query_texts=queries)
+        batch_seconds = time.perf_counter() - start
+
+        for label, samples in (("cold", cold), ("cached", cached)):
+            row = {"candidates": candidates, "run": label}
+            row.update(latency_summary(samples))
+            row["per_pair_ms"] = row["mean_ms"] / candidates if label == "cold" else ""
+            rows.append(row)
+        rows.append({"candidates": candidates, "run": "batch", "mean_ms": batch_seconds * 1000 / len(queries),
+                     "p50_ms": "", "p95_ms": "", "per_pair_ms": ""})
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Load generator for EmbeddingBatcher: concurrent chat clients each embed one
+query at a time, optionally alongside ingest clients embedding 32-text
+batches, against a stub embedder that models a model server: each call costs
+--call-ms plus --text-ms per text, and at most --server-slots calls run at
+once (one local model or Ollama with OLLAMA_NUM_PARALLEL=1 by default).
+
+"direct" calls the embedder from every client; "batched" routes the same
+load through one EmbeddingBatcher. The "idle" rows time single queries with
+nothing else running, i.e. the latency cost of --max-wait-ms.
+
+Usage:
+    python benchmarks/bench_embedding_batcher.py --clients 32 --seconds 5
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from common import latency_summary, print_table
+
+from core.embedding_batcher import EmbeddingBatcher
+
+
+class StubServerEmbedder:
+    """Sleeps like a model server; ``slots`` calls may run concurrently."""
+
+    model = "stub"
+    batch_size = 64
+
+    def __init__(self, call_ms, text_ms, slots, dim=384):
+        self.call_seconds = call_ms / 1000.0
+        self.text_seconds = text_ms / 1000.0
+        self.slots = threading.Semaphore(slots)
+        self.dim = dim
+
+    def embed_array(self, texts):
+        with self.slots:
+            time.sleep(self.call_seconds + self.text_seconds * len(texts))
+        return np.zeros((len(texts), self.dim), dtype=np.float32)
+
+
+def run_load(embed, clients, ingest_clients, seconds):
+    """Run chat (1 text) and ingest (32 texts) clients for ``seconds``; return per-kind latencies."""
+    stop = time.perf_counter() + seconds
+    latencies = {"chat": [], "ingest": []}
+    texts = {"chat": 0, "ingest": 0}
+    lock = threading.Lock()
+
+    def client(kind):
+        batch = ["what is the refund policy"] if kind == "chat" else ["ingested chunk text"] * 32
+        own = []
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            embed(batch)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies[kind].extend(own)
+            texts[kind] += len(own) * len(batch)
+
+    kinds = ["chat"] * clients + ["ingest"] * ingest_clients
+    started = time.perf_counter()
+    with ThreadPoolExecutor(len(kinds)) as pool:
+        list(pool.map(client, kinds))
+    elapsed = time.perf_counter() - started
+    return latencies, texts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EmbeddingBatcher load benchmark")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent chat clients (1 query each)")
+    parser.add_argument("--ingest-clients", type=int, default=2, help="Concurrent ingest clients (32 texts each)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Load duration per mode")
+    parser.add_argument("--call-ms", type=float, default=8.0, help="Fixed cost per embedder call")
+    parser.add_argument("--text-ms", type=float, default=0.2, help="Cost per embedded text")
+    parser.add_argument("--server-slots", type=int, default=1, help="Embedder calls the server runs at once")
+    parser.add_argument("--max-batch-size", type=int, default=64, help="EmbeddingBatcher.max_batch_size")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="EmbeddingBatcher.max_wait_ms")
+    args = parser.parse_args()
+
+    embedder = StubServerEmbedder(args.call_ms, args.text_ms, args.server_slots)
+    batcher = EmbeddingBatcher(
+        embedder, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+        max_concurrent_batches=args.server_slots,
+    )
+
+    rows = []
+    for mode, embed in (("direct", embedder.embed_array), ("batched", batcher.embed_array)):
+        idle = [time_once(embed) for _ in range(20)]
+        rows.append({"mode": mode, "load": "idle query", "texts_per_sec": "",
+                     **latency_summary(idle)})
+        latencies, texts, elapsed = run_load(embed, args.clients, args.ingest_clients, args.seconds)
+        for kind in ("chat", "ingest"):
+            if latencies[kind]:
+                rows.append({"mode": mode, "load": f"{kind} under load",
+                             "texts_per_sec": texts[kind] / elapsed, **latency_summary(latencies[kind])})
+        rows.append({"mode": mode, "load": "total", "texts_per_sec": sum(texts.values()) / elapsed,
+                     "mean_ms": "", "p50_ms": "", "p95_ms": ""})
+
+    stats = batcher.get_stats()
+    batcher.close()
+
+    print(f"\n{args.clients} chat + {args.ingest_clients} ingest clients, {args.seconds:.0f}s per mode, "
+          f"embedder call {args.call_ms}ms + {args.text_ms}ms/text, {args.server_slots} server slot(s)\n")
+    print_table(rows)
+    print(f"\nbatched: {stats['batches']} batches, mean batch size {stats['mean_batch_size']:.1f}")
+
+
+def time_once(embed):
+    start = time.perf_counter()
+    embed(["single idle query"])
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
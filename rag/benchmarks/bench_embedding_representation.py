@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compare the two ways embeddings can travel from an embedder to a store:
+
+- "list":  embed() output, one Python list of floats per document (what
+           embedders returned before embed_array)
+- "array": embed_array() output, one float32 (batch, dim) array per batch with
+           each Document holding a row view into it
+
+"bytes_per_chunk" is the memory the documents' embeddings hold (measured with
+tracemalloc, so it includes the per-float objects of the list form).
+"to_docs_ms" is turning the embedder's (batch, dim) output into per-document
+embeddings; "to_store_ms" is the store gathering them back into a matrix, as
+NumpyStore/FaissStore do; "add_ms" is a full NumpyStore.add_documents.
+
+Usage:
+    python benchmarks/bench_embedding_representation.py --docs 20000 --dim 768
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import print_table
+
+from core.base import Document
+from components.stores.numpy_store.numpy_store import NumpyStore
+
+
+def attach(documents, batches, as_lists):
+    """Give each document its vector from the embedder's output batches."""
+    position = 0
+    for batch in batches:
+        rows = batch.tolist() if as_lists else batch
+        for row in rows:
+            documents[position].embeddings = row
+            position += 1
+
+
+def measure(count, dim, batch_size, as_lists):
+    rng = np.random.default_rng(0)
+    batches = [
+        rng.standard_normal((min(batch_size, count - start), dim)).astype(np.float32)
+        for start in range(0, count, batch_size)
+    ]
+
+    # Memory pass: fresh output arrays count towards what the documents hold
+    documents = [Document(content=f"chunk {i}", id=f"doc_{i}") for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    attach(documents, batches if as_lists else [batch.copy() for batch in batches], as_lists)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    # Timing pass, without tracemalloc's overhead
+    documents = [Document(content=f"chunk {i}", id=f"doc_{i}") for i in range(count)]
+    start = time.perf_counter()
+    attach(documents, batches, as_lists)
+    to_docs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    np.asarray([doc.embeddings for doc in documents], dtype=np.float32)
+    to_store = time.perf_counter() - start
+
+    directory = tempfile.mkdtemp(prefix="bench_repr_")
+    try:
+        store = NumpyStore("bench", {"persist_directory": directory, "enable_deduplication": False})
+        start = time.perf_counter()
+        store.add_documents(documents)
+        add = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return {"bytes_per_chunk": held / count, "to_docs_ms": to_docs * 1000,
+            "to_store_ms": to_store * 1000, "add_ms": add * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List vs NumPy embedding representation benchmark")
+    parser.add_argument("--docs", type=int, default=20000, help="Documents to embed")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    parser.add_argument("--batch-size", type=int, default=64, help="Rows per embedder batch")
+    args = parser.parse_args()
+
+    lists = measure(args.docs, args.dim, args.batch_size, as_lists=True)
+    arrays = measure(args.docs, args.dim, args.batch_size, as_lists=False)
+    rows = [dict(representation="list", **lists), dict(representation="array", **arrays)]
+    rows.append({"representation": "list / array",
+                 **{key: f"{lists[key] / arrays[key]:.1f}x" for key in lists}})
+
+    print(f"\n{args.docs} documents, dim={args.dim}, batch_size={args.batch_size}\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
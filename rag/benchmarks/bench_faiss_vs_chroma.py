@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare ingest throughput and query latency of FaissStore and ChromaStore
+on the same synthetic corpus.
+
+Usage:
+    python benchmarks/bench_faiss_vs_chroma.py --docs 20000 --dim 384 --queries 200
+"""
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+from common import latency_summary, make_corpus, make_queries, print_table, time_call
+
+from components.stores.chroma_store.chroma_store import ChromaStore
+from components.stores.faiss_store.faiss_store import FaissStore
+
+
+def bench_store(label, store, documents, queries, top_k):
+    """Ingest the corpus into a store and time single-query searches."""
+    ingest_seconds = time_call(store.add_documents, documents)
+
+    # Warm up so lazy index setup is not counted
+    store.search(query_embedding=queries[0], top_k=top_k)
+    samples = [
+        time_call(store.search, query_embedding=query, top_k=top_k)
+        for query in queries
+    ]
+
+    row = {"store": label, "ingest_s": ingest_seconds,
+           "docs_per_s": len(documents) / ingest_seconds}
+    row.update(latency_summary(samples))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAISS vs Chroma store benchmark")
+    parser.add_argument("--docs", type=int, default=10000, help="Corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--index-types", default="Flat,IVF,HNSW",
+                        help="Comma separated FAISS index types")
+    args = parser.parse_args()
+
+    documents = make_corpus(args.docs, args.dim)
+    queries = make_queries(args.queries, args.dim)
+    workdir = Path(tempfile.mkdtemp(prefix="faiss_vs_chroma_"))
+
+    rows = []
+    try:
+        chroma = ChromaStore("bench_chroma", {
+            "collection_name": "bench",
+            "persist_directory": str(workdir / "chroma"),
+            "enable_deduplication": False,
+        })
+        rows.append(bench_store("chroma", chroma, documents, queries, args.top_k))
+
+        for index_type in args.index_types.split(","):
+            faiss_store = FaissStore(f"bench_faiss_{index_type}", {
+                "collection_name": f"bench_{index_type.lower()}",
+                "persist_directory": str(workdir / "faiss"),
+                "dimension": args.dim,
+                "index_type": index_type,
+                "metric": "Cosine",
+                "nlist": max(int(args.docs ** 0.5), 1),
+                "nprobe": 16,
+                "enable_deduplication": False,
+            })
+            rows.append(bench_store(f"faiss-{index_type}", faiss_store,
+                                    documents, queries, args.top_k))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{args.docs} docs, dim={args.dim}, {args.queries} queries, top_k={args.top_k}\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
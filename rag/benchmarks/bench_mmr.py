@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Measure HybridUniversalStrategy's MMR stage on a corpus with near-duplicate
+chunks (each topic stored --copies times with a little noise, like
+overlapping chunks of the same passage).
+
+"distinct" is the number of different topics among the top_k results;
+"max_cosine" is the mean over queries of the highest cosine between two
+returned chunks. Without MMR the top_k is mostly copies of the best topic.
+
+Usage:
+    python benchmarks/bench_mmr.py --topics 5000 --copies 4 --top-k 5
+"""
+
+import argparse
+import shutil
+import tempfile
+
+import numpy as np
+
+from common import latency_summary, make_queries, print_table, time_call
+
+from components.retrievers.hybrid_universal.hybrid_universal import HybridUniversalStrategy
+from components.stores.numpy_store.numpy_store import NumpyStore
+from core.base import Document
+
+
+def make_documents(topics, copies, dim, noise, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    documents = []
+    for t in range(topics):
+        for c in range(copies):
+            vector = centers[t] + noise * rng.standard_normal(dim).astype(np.float32)
+            documents.append(Document(content=f"topic {t} copy {c}", id=f"t{t}_c{c}",
+                                      metadata={"topic": t}, embeddings=vector.tolist()))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MMR diversification benchmark")
+    parser.add_argument("--topics", type=int, default=5000, help="Distinct topics")
+    parser.add_argument("--copies", type=int, default=4, help="Near-duplicate chunks per topic")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--noise", type=float, default=0.02, help="Per-copy noise")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--lambdas", type=float, nargs="+", default=[0.7, 0.5], help="mmr_lambda values")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="mmr_")
+    try:
+        store = NumpyStore(config={"persist_directory": workdir})
+        documents = make_documents(args.topics, args.copies, args.dim, args.noise)
+        store.add_documents(documents)
+        vectors_by_id = {doc.id: doc.embeddings for doc in documents}
+        queries = make_queries(args.queries, args.dim)
+        strategies = [{"type": "basic", "weight": 0.6}, {"type": "reranked", "weight": 0.4}]
+
+        rows = []
+        for mmr_lambda in [None] + args.lambdas:
+            hybrid = HybridUniversalStrategy(config={"strategies": strategies, "mmr_lambda": mmr_lambda})
+            samples, distinct, max_cosine = [], [], []
+            for query in queries:
+                samples.append(time_call(hybrid.retrieve, query, store, args.top_k))
+                result = hybrid.retrieve(query, store, args.top_k)
+                distinct.append(len({doc.metadata["topic"] for doc in result.documents}))
+                vectors = np.asarray([vectors_by_id[doc.id] for doc in result.documents], dtype=np.float32)
+                vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+                similarity = vectors @ vectors.T
+                np.fill_diagonal(similarity, -1.0)
+                max_cosine.append(float(similarity.max()))
+            row = {"mmr_lambda": "off" if mmr_lambda is None else mmr_lambda}
+            row.update(latency_summary(samples))
+            row.update({"distinct": float(np.mean(distinct)), "max_cosine": float(np.mean(max_cosine))})
+            rows.append(row)
+        print(f"\n{args.topics} topics x {args.copies} copies, top_k={args.top_k}\n")
+        print_table(rows)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare OllamaEmbedder throughput (documents/second) on the legacy
+one-text-per-request /api/embeddings path against batched /api/embed
+requests at several concurrency limits.
+
+A local stub server stands in for Ollama. Each request costs a fixed
+``--request-ms`` (HTTP + model dispatch) plus ``--text-ms`` per input
+text. This models the overhead batching removes, not real model speed, so
+run against a real server to get absolute numbers:
+
+    python benchmarks/bench_ollama_embed.py --base-url http://localhost:11434
+
+Usage:
+    python benchmarks/bench_ollama_embed.py --docs 2000 --batch-size 32
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import print_table
+
+from components.embedders.ollama_embedder.ollama_embedder import OllamaEmbedder
+
+
+def make_stub_server(dim: int, request_ms: float, text_ms: float) -> ThreadingHTTPServer:
+    """Start a threaded server answering /api/embed and /api/embeddings."""
+    vector = [0.01] * dim
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like Ollama
+        disable_nagle_algorithm = True  # else delayed ACKs add ~40ms per request
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path == "/api/embed":
+                count = len(payload["input"])
+                body = {"embeddings": [vector] * count}
+            elif self.path == "/api/embeddings":
+                count = 1
+                body = {"embedding": vector}
+            else:
+                self.send_error(404)
+                return
+
+            time.sleep((request_ms + text_ms * count) / 1000)
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(label, embed, texts):
+    start = time.perf_counter()
+    embeddings = embed(texts)
+    elapsed = time.perf_counter() - start
+    assert len(embeddings) == len(texts)
+    return {"path": label, "seconds": elapsed, "docs_per_sec": len(texts) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--request-ms", type=float, default=2.0, help="Stub cost per request")
+    parser.add_argument("--text-ms", type=float, default=0.2, help="Stub cost per text")
+    parser.add_argument("--base-url", help="Benchmark a real Ollama server instead of the stub")
+    parser.add_argument("--model", default="nomic-embed-text")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = make_stub_server(args.dim, args.request_ms, args.text_ms)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    texts = [f"Synthetic benchmark chunk {i} about embedding throughput" for i in range(args.docs)]
+    config = {"model": args.model, "base_url": base_url, "batch_size": args.batch_size}
+
+    rows = []
+    legacy = OllamaEmbedder("bench_legacy", {**config, "max_concurrency": 1})
+    rows.append(run("legacy /api/embeddings", legacy._embed_batch_legacy, texts))
+
+    for concurrency in args.concurrency:
+        embedder = OllamaEmbedder("bench_batch", {**config, "max_concurrency": concurrency})
+        rows.append(run(f"/api/embed x{concurrency}", embedder.embed, texts))
+
+    baseline = rows[0]["docs_per_sec"]
+    for row in rows:
+        row["speedup"] = row["docs_per_sec"] / baseline
+
+    print(f"\n{args.docs} docs, batch_size={args.batch_size}, {'stub' if server else base_url}\n")
+    print_table(rows)
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare CPU embedding throughput of the PyTorch model (HuggingFaceEmbedder)
+with its ONNX Runtime export (OnnxEmbedder), fp32 and dynamic int8, at a few
+intra-op thread counts.
+
+"speedup" is relative to PyTorch fp32 with torch's default thread count.
+"mean_cosine"/"min_cosine" compare each text's vector with the PyTorch one;
+"drift" is 1 - mean_cosine. The first run exports (and quantizes) the model
+into --export-dir; later runs reuse it.
+
+Usage:
+    python benchmarks/bench_onnx_embedder.py --model sentence-transformers/all-MiniLM-L6-v2 --docs 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import print_table
+
+from components.embedders.huggingface_embedder.huggingface_embedder import HuggingFaceEmbedder
+from components.embedders.onnx_embedder.onnx_embedder import OnnxEmbedder
+
+WORDS = (
+    "the system stores document chunks with their embeddings so that retrieval can rank "
+    "passages by similarity to a query while metadata filters narrow results by source "
+    "date author and type before reranking selects the final context for the answer"
+).split()
+
+
+def make_texts(count, seed=0):
+    """Sentences of 8-120 words, so batches see realistic length variation."""
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=rng.integers(8, 120))) for _ in range(count)]
+
+
+def timed_encode(embedder, texts, repeats):
+    """Best-of-``repeats`` seconds to encode ``texts`` (after a warm-up batch)."""
+    embedder.encode(texts[:embedder.batch_size])
+    best, vectors = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        vectors = embedder.encode(texts)
+        best = min(best, time.perf_counter() - start)
+    return best, vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyTorch vs ONNX Runtime embedding benchmark")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2", help="Model to export")
+    parser.add_argument("--docs", type=int, default=1000, help="Texts to embed")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per inference call")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0, 1, 4], help="intra_op_num_threads values")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes per configuration (best is reported)")
+    parser.add_argument("--export-dir", default="./data/onnx_models", help="Where exported models are kept")
+    args = parser.parse_args()
+
+    texts = make_texts(args.docs)
+    common = {"model_name": args.model, "batch_size": args.batch_size}
+
+    reference = HuggingFaceEmbedder("bench_torch", dict(common, device="cpu"))
+    reference_seconds, expected = timed_encode(reference, texts, args.repeats)
+    rows = [{"config": "torch fp32", "docs_per_sec": args.docs / reference_seconds, "speedup": 1.0,
+             "mean_cosine": "1.00000", "min_cosine": "1.00000", "drift": "0"}]
+
+    for quantize in (False, True):
+        for threads in args.threads:
+            embedder = OnnxEmbedder("bench_onnx", dict(
+                common, export_dir=args.export_dir, quantize=quantize, intra_op_num_threads=threads,
+            ))
+            seconds, actual = timed_encode(embedder, texts, args.repeats)
+            cosine = (expected * actual).sum(axis=1)  # both normalized
+            rows.append({
+                "config": f"onnx {'int8' if quantize else 'fp32'} threads={threads or 'auto'}",
+                "docs_per_sec": args.docs / seconds,
+                "speedup": reference_seconds / seconds,
+                # Drift is far below print_table's two decimals
+                "mean_cosine": f"{cosine.mean():.5f}",
+                "min_cosine": f"{cosine.min():.5f}",
+                "drift": f"{1.0 - cosine.mean():.1e}",
+            })
+
+    print(f"\n{args.model}: {args.docs} texts, batch_size={args.batch_size}, best of {args.repeats}\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
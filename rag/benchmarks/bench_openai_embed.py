@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compare OpenAIEmbedder throughput (documents/second) with one request in
+flight against token-packed concurrent requests, on a corpus of mixed-length
+chunks.
+
+A local stub OpenAI-compatible server stands in for the API. Each request
+costs a fixed ``--request-ms`` plus ``--token-us`` per input token (words, a
+rough stand-in for tokens). This models latency, not a real model, so run
+against a real server for absolute numbers:
+
+    python benchmarks/bench_openai_embed.py --base-url http://localhost:8000/v1 --model <model>
+
+Usage:
+    python benchmarks/bench_openai_embed.py --docs 5000
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from common import print_table
+
+from components.embedders.openai_embedder.openai_embedder import OpenAIEmbedder
+
+
+def make_stub_server(dim: int, request_ms: float, token_us: float) -> ThreadingHTTPServer:
+    """Start a threaded server answering POST /v1/embeddings."""
+    vector = [0.01] * dim
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # else delayed ACKs add ~40ms per request
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if self.path != "/v1/embeddings":
+                self.send_error(404)
+                return
+            inputs = payload["input"]
+            tokens = sum(len(text.split()) for text in inputs)
+            time.sleep(request_ms / 1000 + tokens * token_us / 1e6)
+
+            data = json.dumps({
+                "data": [{"index": i, "embedding": vector} for i in range(len(inputs))],
+                "usage": {"prompt_tokens": tokens},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_texts(count, seed=0):
+    """Chunks of 20-400 words."""
+    rng = np.random.default_rng(seed)
+    return [" ".join(["token"] * int(n)) for n in rng.integers(20, 400, size=count)]
+
+
+def run(label, embedder, texts):
+    start = time.perf_counter()
+    embeddings = embedder.embed(texts)
+    elapsed = time.perf_counter() - start
+    assert len(embeddings) == len(texts)
+    return {"config": label, "requests": embedder.usage["requests"], "seconds": elapsed,
+            "docs_per_sec": len(texts) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--request-ms", type=float, default=20.0, help="Stub cost per request")
+    parser.add_argument("--token-us", type=float, default=5.0, help="Stub cost per token (microseconds)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--max-tokens", type=int, default=20000, help="max_tokens_per_request")
+    parser.add_argument("--base-url", help="Benchmark a real server instead of the stub")
+    parser.add_argument("--model", default="text-embedding-3-small")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = make_stub_server(args.dim, args.request_ms, args.token_us)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    texts = make_texts(args.docs)
+    config = {"base_url": base_url, "model": args.model, "requests_per_minute": None, "tokens_per_minute": None}
+
+    rows = [run("100 items/request x1", OpenAIEmbedder("bench", {
+        **config, "batch_size": 100, "max_tokens_per_request": 300000, "max_concurrency": 1,
+    }), texts)]
+    for concurrency in args.concurrency:
+        rows.append(run(f"{args.max_tokens} tokens/request x{concurrency}", OpenAIEmbedder("bench", {
+            **config, "batch_size": 2048, "max_tokens_per_request": args.max_tokens, "max_concurrency": concurrency,
+        }), texts))
+
+    baseline = rows[0]["docs_per_sec"]
+    for row in rows:
+        row["speedup"] = row["docs_per_sec"] / baseline
+
+    print(f"\n{args.docs} docs, {'stub' if server else base_url}\n")
+    print_table(rows)
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
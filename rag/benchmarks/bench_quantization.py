@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Report vector memory, recall@k and query latency for each quantization mode
+of NumpyStore and FaissStore, with and without exact re-scoring.
+
+"memory_mb" is what search scans: the in-memory codes for NumpyStore and the
+serialized index for FaissStore. "disk_mb" adds the full-precision copy used
+for re-scoring. Recall is measured against exact cosine top-k. Uniform random
+vectors are the hardest case for PQ; real embeddings usually do better.
+
+Usage:
+    python benchmarks/bench_quantization.py --docs 50000 --dim 384 --queries 200
+"""
+
+import argparse
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from common import latency_summary, make_corpus, make_queries, print_table, time_call
+
+from components.stores.faiss_store.faiss_store import FaissStore
+from components.stores.numpy_store.numpy_store import NumpyStore
+
+
+def exact_top_k(documents, queries, top_k):
+    """Ground-truth ID sets by brute-force cosine similarity."""
+    vectors = np.asarray([doc.embeddings for doc in documents], dtype=np.float32)
+    scores = np.asarray(queries, dtype=np.float32) @ vectors.T
+    order = np.argsort(-scores, axis=1)[:, :top_k]
+    return [{documents[i].id for i in row} for row in order]
+
+
+def file_mb(*paths):
+    return sum(p.stat().st_size for p in paths if p.exists()) / 2 ** 20
+
+
+def bench(label, store, documents, queries, expected, top_k):
+    """Ingest, then time single-query searches and compute recall."""
+    store.add_documents(documents)
+    store.search(query_embedding=queries[0], top_k=top_k)
+
+    samples, recalls = [], []
+    for query, truth in zip(queries, expected):
+        holder = {}
+
+        def call():
+            holder["results"] = store.search(query_embedding=query, top_k=top_k)
+
+        samples.append(time_call(call))
+        recalls.append(len({doc.id for doc in holder["results"]} & truth) / top_k)
+
+    if isinstance(store, NumpyStore):
+        info = store.get_collection_info()
+        memory = info["code_bytes"] / 2 ** 20 if info["code_bytes"] else file_mb(store.matrix_path)
+        disk = file_mb(store.matrix_path, store.quant_path)
+    else:
+        memory = file_mb(store.index_path)
+        disk = file_mb(store.index_path, store.vectors_path)
+
+    row = {"config": label, "memory_mb": memory, "disk_mb": disk,
+           "recall": float(np.mean(recalls))}
+    row.update(latency_summary(samples))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantization memory/recall benchmark")
+    parser.add_argument("--docs", type=int, default=20000, help="Corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--pq-m", type=int, default=48, help="PQ sub-quantizers")
+    parser.add_argument("--rescore-factor", type=int, default=4, help="Candidates re-scored per result")
+    args = parser.parse_args()
+
+    documents = make_corpus(args.docs, args.dim)
+    queries = make_queries(args.queries, args.dim)
+    expected = exact_top_k(documents, queries, args.top_k)
+    workdir = Path(tempfile.mkdtemp(prefix="quantization_"))
+
+    modes = [("none", False), ("float16", False), ("int8", False), ("int8", True),
+             ("pq", False), ("pq", True)]
+    rows = []
+    try:
+        for quantization, rescore in modes:
+            suffix = f"{quantization}{'+rescore' if rescore else ''}"
+            common = {
+                "quantization": quantization,
+                "rescore": rescore,
+                "rescore_factor": args.rescore_factor,
+                "pq_m": args.pq_m,
+                "enable_deduplication": False,
+            }
+            name = suffix.replace("+", "_")
+            rows.append(bench(f"numpy {suffix}", NumpyStore("bench_numpy", dict(
+                common, persist_directory=str(workdir / "numpy"), collection_name=name,
+                distance_metric="cosine",
+            )), documents, queries, expected, args.top_k))
+            for index_type in ("Flat", "HNSW"):
+                rows.append(bench(f"faiss {index_type} {suffix}", FaissStore("bench_faiss", dict(
+                    common, persist_directory=str(workdir / "faiss"),
+                    collection_name=f"{index_type}_{name}", index_type=index_type, metric="Cosine",
+                )), documents, queries, expected, args.top_k))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\n{args.docs} docs, dim={args.dim}, top_k={args.top_k}, "
+          f"pq_m={args.pq_m}, rescore_factor={args.rescore_factor}\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
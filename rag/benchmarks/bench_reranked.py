@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Time RerankedStrategy's scoring of initial_k candidates (recency, length and
+metadata boosts plus the final sort), from 20 to 1000 candidates.
+
+"epoch" candidates carry the timestamp_epoch stores add at ingest; "legacy"
+candidates only have the ISO timestamp, as chunks stored before it did.
+
+Usage:
+    python benchmarks/bench_reranked.py --repeats 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from common import latency_summary, print_table, time_call
+
+from components.retrievers.reranked.reranked import RerankedStrategy
+from core.base import Document
+
+PRIORITIES = ["low", "medium", "High", "critical", None]
+TYPES = ["faq", "Guide", "policy", "note", None]
+
+
+def make_candidates(count, with_epochs, seed=0):
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    candidates = []
+    for i in range(count):
+        epoch = now - float(rng.uniform(0, 200)) * 86400
+        metadata = {
+            "similarity_score": float(rng.uniform(0.5, 1.0)),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch)),
+            "priority": PRIORITIES[i % len(PRIORITIES)],
+            "type": TYPES[i % len(TYPES)],
+            "verified": bool(i % 3 == 0),
+            "view_count": int(rng.integers(0, 10000)),
+        }
+        if with_epochs:
+            metadata["timestamp_epoch"] = epoch
+        candidates.append(Document(content="x" * int(rng.integers(50, 2000)), id=f"c{i}", metadata=metadata))
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RerankedStrategy scoring benchmark")
+    parser.add_argument("--repeats", type=int, default=1000, help="Timed scorings per row")
+    args = parser.parse_args()
+
+    strategy = RerankedStrategy()
+    rows = []
+    for initial_k in (20, 50, 100, 200, 500, 1000):
+        for label, with_epochs in (("epoch", True), ("legacy", False)):
+            candidates = make_candidates(initial_k, with_epochs)
+            base = np.array([doc.metadata["similarity_score"] for doc in candidates])
+
+            def score():
+                np.argsort(-strategy._rerank_scores(candidates, base), kind="stable")
+
+            score()
+            samples = [time_call(score) for _ in range(args.repeats)]
+            summary = latency_summary(samples)
+            rows.append({
+                "initial_k": initial_k,
+                "timestamps": label,
+                "p50_us": summary["p50_ms"] * 1000,
+                "p95_us": summary["p95_ms"] * 1000,
+                "us_per_candidate": summary["p50_ms"] * 1000 / initial_k,
+            })
+
+    print(f"\nRerankedStrategy scoring, default factors, {args.repeats} repeats\n")
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
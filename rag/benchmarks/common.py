@@ -0,0 +1,83 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Make the rag package importable when running `python benchmarks/<script>.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.base import Document  # noqa: E402
+
+
+def make_corpus(count: int, dim: int, seed: int = 0, sources: int = 50) -> List[Document]:
+    """Build a synthetic corpus of unit-norm random embeddings."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    documents = []
+    for i in range(count):
+        source = f"/bench/file{i % sources}.txt"
+        documents.append(Document(
+            id=f"bench_{i}",
+            content=f"Synthetic benchmark chunk {i}",
+            source=source,
+            metadata={
+                "document_hash": f"hash{i % sources}",
+                "file_path": source,
+                "bucket": i % 100,
+                "category": "even" if i % 2 == 0 else "odd",
+            },
+            embeddings=vectors[i].tolist(),
+        ))
+    return documents
+
+
+def make_queries(count: int, dim: int, seed: int = 1) -> List[List[float]]:
+    """Build random unit-norm query vectors."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.tolist()
+
+
+def time_call(fn: Callable, *args, **kwargs) -> float:
+    """Return the wall-clock seconds taken by a single call."""
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Summarise latency samples (seconds) as milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": p95 * 1000,
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    """Print a list of dicts as an aligned table."""
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    cells = [[_format(row.get(h)) for h in headers] for row in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  ".join(c.ljust(w) for c, w in zip(row, widths)))
+
+
+def _format(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
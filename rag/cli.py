@@ -28,6 +28,8 @@ from core.factories import (
 # Import for retrieval strategies is handled via core.factories
 from utils.progress import LlamaProgressTracker, create_enhanced_progress_bar
 from utils.path_resolver import PathResolver, resolve_paths_in_config
+from utils.embedding_registry import configure_embedding_registry
+from utils.query_cache import get_query_cache
 from core.document_manager import DocumentManager, DeletionStrategy, UpdateStrategy
 from core.extractor_integration import ExtractorIntegrator, apply_extractors_from_cli_args
 from components.extractors import registry
@@ -392,7 +394,9 @@ def create_pipeline_from_config(
 
     # Create pipeline
     if enhanced:
-        pipeline = EnhancedPipeline("🦙 Enhanced RAG Pipeline")
+        pipeline = EnhancedPipeline(
+            "🦙 Enhanced RAG Pipeline", embedding_batcher=config.get("embedding_batcher")
+        )
     else:
         pipeline = Pipeline("RAG Pipeline")
 
@@ -432,6 +436,7 @@ def ingest_command(args):
             strategy_overrides=getattr(args, 'strategy_overrides', None),
             base_dir=args.base_dir if hasattr(args, "base_dir") else None
         )
+        configure_embedding_registry(config.get("embedding_registry"), resolver.base_dir)
         
         # Show config type
         if hasattr(args, 'strategy') and args.strategy:
@@ -490,7 +495,7 @@ def ingest_command(args):
                     doc_name = Path(doc.source).name if doc.source else f"Document {i}"
                     print(f"  📄 {doc_name}: ", end="")
                     # Show mini embedding visualization
-                    if doc.embeddings:
+                    if doc.embeddings is not None and len(doc.embeddings):
                         viz = "["
                         for j in range(min(20, len(doc.embeddings))):
                             val = doc.embeddings[j]
@@ -574,7 +579,7 @@ def ingest_command(args):
                     for key, value in list(doc.metadata.items())[:3]:
                         if not key.startswith('_'):
                             print(f"     • {key}: {str(value)[:50]}")
-                if doc.embeddings:
+                if doc.embeddings is not None and len(doc.embeddings):
                     print(f"     • Embeddings: {len(doc.embeddings)} dimensions")
             
             if len(result.documents) > 3:
@@ -613,6 +618,7 @@ def search_command(args):
         strategy_overrides=getattr(args, 'strategy_overrides', None),
         base_dir=base_dir
     )
+    configure_embedding_registry(config.get("embedding_registry"), PathResolver(base_dir).base_dir)
     
     # Show config type
     if hasattr(args, 'strategy') and args.strategy:
@@ -650,7 +656,12 @@ def search_command(args):
     try:
         # Convert query to embedding first
         print("🧠 Converting your query into llama-friendly embeddings...")
-        query_embedding = embedder.embed([args.query])[0]
+        # Same query embedding cache as SearchAPI
+        query_cache = get_query_cache(config.get("query_cache"))
+        if query_cache is not None:
+            query_embedding = query_cache.embed(embedder, args.query)
+        else:
+            query_embedding = embedder.embed([args.query])[0]
         tracker.print_success("Query embedded successfully!")
         
         # Use retrieval strategy if available, otherwise direct store search
@@ -659,7 +670,8 @@ def search_command(args):
             retrieval_result = retrieval_strategy.retrieve(
                 query_embedding=query_embedding,
                 vector_store=store,
-                top_k=args.top_k
+                top_k=args.top_k,
+                query_text=args.query
             )
             # Convert RetrievalResult to list of documents with scores
             results = []
@@ -1438,6 +1450,8 @@ def manage_command(args):
         handle_cleanup_command(args, doc_manager, tracker)
     elif args.manage_command == "hash":
         handle_hash_command(args, doc_manager, tracker)
+    elif args.manage_command == "compact":
+        handle_compact_command(args, doc_manager, tracker)
     else:
         tracker.print_error("Unknown management command")
         sys.exit(1)
@@ -1632,6 +1646,49 @@ def handle_hash_command(args, doc_manager: DocumentManager, tracker: LlamaProgre
         tracker.print_error(f"Hash operation failed: {e}")
 
 
+def handle_compact_command(args, doc_manager: DocumentManager, tracker: LlamaProgressTracker):
+    """Handle compaction of soft-deleted documents."""
+    tracker.print_header("🗜️  Store Compaction 🗜️")
+
+    if args.dry_run:
+        tracker.print_info("🔍 DRY RUN MODE - Nothing will be removed")
+
+    try:
+        results = doc_manager.deletion_manager.compact(
+            max_chunks=args.max_chunks,
+            min_deleted_ratio=args.min_deleted_ratio,
+            dry_run=args.dry_run
+        )
+
+        for error in results.get("errors", []):
+            tracker.print_error(f"❌ {error}")
+        if results.get("errors"):
+            return
+
+        if results.get("skipped"):
+            tracker.print_info(
+                f"ℹ️  Nothing to compact ({results['remaining_deleted']:,} soft-deleted chunks, "
+                f"threshold {args.min_deleted_ratio:.0%})"
+            )
+            return
+
+        verb = "Would purge" if args.dry_run else "Purged"
+        tracker.print_success(f"✅ {verb} {results['deleted_count']:,} soft-deleted chunks")
+        if not args.dry_run:
+            reclaimed_mb = results["bytes_reclaimed"] / (1024 * 1024)
+            tracker.print_success(
+                f"💾 Reclaimed {results['bytes_reclaimed']:,} bytes ({reclaimed_mb:.1f} MB), "
+                f"{results['bytes_after']:,} bytes on disk"
+            )
+        if results.get("remaining_deleted"):
+            tracker.print_info(
+                f"⏭️  {results['remaining_deleted']:,} soft-deleted chunks remain; run again to continue"
+            )
+
+    except Exception as e:
+        tracker.print_error(f"Compaction failed: {e}")
+
+
 def extractor_command(args):
     """Handle extractor commands."""
     setup_logging(args.log_level)
@@ -2059,7 +2116,8 @@ def main():
         epilog="Examples:\n"
                "  python cli.py manage delete --older-than 30 --dry-run\n"
                "  python cli.py manage stats --detailed\n"
-               "  python cli.py manage cleanup --duplicates"
+               "  python cli.py manage cleanup --duplicates\n"
+               "  python cli.py manage compact --max-chunks 10000"
     )
     manage_parser.add_argument(
         "--strategy", dest="rag_strategy", help="Use a predefined RAG strategy for configuration"
@@ -2120,6 +2178,17 @@ def main():
     hash_parser.add_argument("--rehash", action="store_true",
                             help="Regenerate all document hashes")
 
+    # Compact commands
+    compact_parser = manage_subparsers.add_parser(
+        "compact", help="Purge soft-deleted chunks and rebuild the index without them"
+    )
+    compact_parser.add_argument("--max-chunks", type=int, metavar="N",
+                               help="Purge at most N chunks per run (incremental compaction)")
+    compact_parser.add_argument("--min-deleted-ratio", type=float, default=0.0, metavar="RATIO",
+                               help="Only compact when at least this fraction of chunks is soft-deleted")
+    compact_parser.add_argument("--dry-run", action="store_true",
+                               help="Report what would be purged without changing the store")
+
     # Extractor commands
     extractor_parser = subparsers.add_parser(
         "extractors", 
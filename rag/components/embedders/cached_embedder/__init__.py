@@ -0,0 +1,12 @@
+"""CachedEmbedder Component
+
+Component for cached embedder.
+"""
+
+from .cached_embedder import CachedEmbedder
+
+__all__ = ['CachedEmbedder']
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "embedder"
+COMPONENT_NAME = "cached_embedder"
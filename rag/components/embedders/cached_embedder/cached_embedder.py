@@ -0,0 +1,265 @@
+"""Content-addressed embedding cache.
+
+Wraps any embedder registered in ``EmbedderFactory`` and keeps every vector it
+produces in a SQLite file keyed by ``(model, chunk_hash)``. ``chunk_hash`` is
+the SHA-256 of the stripped text, the same value ``generate_chunk_metadata``
+stores on each chunk, so re-ingesting an edited directory only sends the
+changed chunks to the wrapped embedder.
+
+Vectors are stored as float32 blobs. When the cache grows past ``max_entries``
+or ``max_size_mb`` the least recently used rows are evicted down to 90% of the
+limit. Zero vectors (what the HTTP embedders return on failure) are never
+cached.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from core.base import Embedder, Document, ProcessingResult
+from utils.hash_utils import hash_content
+from utils.query_cache import vector_settings_key
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+_SQL_CHUNK = 500
+# Eviction frees down to this fraction of the limit so it runs rarely
+_EVICT_TO = 0.9
+
+
+class CachedEmbedder(Embedder):
+    """Persistent (model, chunk_hash) -> vector cache in front of another embedder."""
+
+    def __init__(self, name: str = "CachedEmbedder", config: Optional[Dict[str, Any]] = None):
+        super().__init__(name, config)
+        config = config or {}
+        self.embedder_type = config.get("embedder_type", "OllamaEmbedder")
+        self.embedder_config = dict(config.get("embedder_config") or {})
+        self.cache_path = config.get("cache_path", "./data/embedding_cache.sqlite")
+        self.max_entries = config.get("max_entries")
+        max_size_mb = config.get("max_size_mb")
+        self.max_bytes = int(max_size_mb * 2 ** 20) if max_size_mb else None
+
+        self.embedder = self._create_embedder()
+        self.model_key = config.get("namespace") or self._default_model_key()
+        self.batch_size = getattr(self.embedder, "batch_size", 32)
+
+        self.cache_stats: Dict[str, int] = {"cache_hits": 0, "cache_misses": 0}
+        self.last_embed_stats: Dict[str, int] = {"cache_hits": 0, "cache_misses": 0}
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._entries, self._bytes = self._totals()
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def _create_embedder(self) -> Embedder:
+        # Imported here: the factory module imports this one
+        from core.factories import EmbedderFactory
+
+        if self.embedder_type == "CachedEmbedder":
+            raise ValueError("CachedEmbedder cannot wrap itself")
+        return EmbedderFactory.create(self.embedder_type, self.embedder_config)
+
+    def _default_model_key(self) -> str:
+        model = getattr(self.embedder, "model", None) or getattr(self.embedder, "model_name", None)
+        return f"{self.embedder_type}:{model or 'default'}{vector_settings_key(self.embedder)}"
+
+    def _connect(self) -> sqlite3.Connection:
+        path = Path(self.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                chunk_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, chunk_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        conn.commit()
+        return conn
+
+    def _totals(self):
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        return entries, size
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Return cached vectors where available and embed only the misses."""
+        if not texts:
+            self.last_embed_stats = {"cache_hits": 0, "cache_misses": 0}
+            return []
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Cached and freshly embedded vectors as one float32 (len(texts), dimension) array."""
+        if not texts:
+            self.last_embed_stats = {"cache_hits": 0, "cache_misses": 0}
+            return np.empty((0, 0), dtype=np.float32)
+
+        chunk_hashes = [hash_content(text or "") for text in texts]
+        cached = self._lookup(set(chunk_hashes))
+
+        # Each distinct missing chunk is embedded once, even if repeated in the batch
+        missing: Dict[str, str] = {}
+        for text, chunk_hash in zip(texts, chunk_hashes):
+            if chunk_hash not in cached and chunk_hash not in missing:
+                missing[chunk_hash] = text
+
+        if missing:
+            vectors = self.embedder.embed_array(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors))
+            self._store(fresh)
+            cached.update(fresh)
+
+        hits = sum(1 for chunk_hash in chunk_hashes if chunk_hash not in missing)
+        self.last_embed_stats = {"cache_hits": hits, "cache_misses": len(chunk_hashes) - hits}
+        for key, value in self.last_embed_stats.items():
+            self.cache_stats[key] += value
+
+        return np.stack([cached[chunk_hash] for chunk_hash in chunk_hashes])
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string through the cache."""
+        return self.embed([text])[0]
+
+    def process(self, documents: List[Document]) -> ProcessingResult:
+        """Add embeddings to documents and report cache hits/misses."""
+        result = super().process(documents)
+        result.metrics.update(self.last_embed_stats)
+        return result
+
+    # ------------------------------------------------------------------
+    # Cache storage
+    # ------------------------------------------------------------------
+
+    def _lookup(self, chunk_hashes) -> Dict[str, np.ndarray]:
+        """Fetch cached vectors and mark them as recently used."""
+        keys = list(chunk_hashes)
+        found: Dict[str, np.ndarray] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQL_CHUNK):
+                chunk = keys[start:start + _SQL_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT chunk_hash, vector FROM embeddings WHERE model = ? AND chunk_hash IN ({placeholders})",
+                    [self.model_key, *chunk],
+                ).fetchall()
+                for chunk_hash, blob in rows:
+                    found[chunk_hash] = np.frombuffer(blob, dtype=np.float32)
+                if rows:
+                    hit_keys = [row[0] for row in rows]
+                    self._conn.execute(
+                        f"UPDATE embeddings SET last_used = ? WHERE model = ? "
+                        f"AND chunk_hash IN ({','.join('?' * len(hit_keys))})",
+                        [now, self.model_key, *hit_keys],
+                    )
+            self._conn.commit()
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]) -> None:
+        now = time.time()
+        rows = []
+        for chunk_hash, vector in vectors.items():
+            array = np.asarray(vector, dtype=np.float32)
+            if not array.size or not np.any(array):
+                continue  # failed embeddings come back as zeros; retry them next time
+            rows.append((self.model_key, chunk_hash, array.tobytes(), now))
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, chunk_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            # Recount: REPLACE overwrites rows that were already counted
+            self._entries, self._bytes = self._totals()
+            if self._over_limit(self._entries, self._bytes):
+                self._evict()
+
+    def _over_limit(self, entries: int, size: int, fraction: float = 1.0) -> bool:
+        return bool(
+            (self.max_entries and entries > self.max_entries * fraction)
+            or (self.max_bytes and size > self.max_bytes * fraction)
+        )
+
+    def _evict(self) -> None:
+        """Delete least recently used rows until under 90% of the limits (lock held)."""
+        entries, size = self._totals()
+        victims = []
+        cursor = self._conn.execute(
+            "SELECT model, chunk_hash, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        )
+        for model, chunk_hash, length in cursor:
+            if not self._over_limit(entries, size, _EVICT_TO):
+                break
+            victims.append((model, chunk_hash))
+            entries -= 1
+            size -= length
+        cursor.close()
+
+        self._conn.executemany("DELETE FROM embeddings WHERE model = ? AND chunk_hash = ?", victims)
+        self._conn.commit()
+        self._entries, self._bytes = entries, size
+        logger.info(f"Evicted {len(victims)} cached embeddings from {self.cache_path}")
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """Return cache size, limits and hit/miss counters."""
+        with self._lock:
+            entries, size = self._totals()
+        return {
+            "cache_path": str(self.cache_path),
+            "model_key": self.model_key,
+            "entries": entries,
+            "size_bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            **self.cache_stats,
+        }
+
+    def clear(self) -> None:
+        """Drop every cached vector for this model."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings WHERE model = ?", (self.model_key,))
+            self._conn.commit()
+            self._entries, self._bytes = self._totals()
+
+    # ------------------------------------------------------------------
+    # Delegation
+    # ------------------------------------------------------------------
+
+    def validate_config(self) -> bool:
+        """Validate the wrapped embedder."""
+        return self.embedder.validate_config()
+
+    def get_embedding_dimension(self) -> int:
+        """Dimension of the wrapped embedder's vectors."""
+        return self.embedder.get_embedding_dimension()
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get embedder description."""
+        return "Persistent content-addressed embedding cache in front of any other embedder."
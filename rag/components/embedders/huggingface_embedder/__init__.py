@@ -1,11 +1,11 @@
-"""HuggingfaceEmbedder Component
+"""HuggingFaceEmbedder Component
 
 Component for huggingface embedder.
 """
 
-from .huggingface_embedder import HuggingfaceEmbedder
+from .huggingface_embedder import HuggingFaceEmbedder
 
-__all__ = ['HuggingfaceEmbedder']
+__all__ = ['HuggingFaceEmbedder']
 
 # Component metadata (read from schema.json at runtime)
 COMPONENT_TYPE = "embedder"
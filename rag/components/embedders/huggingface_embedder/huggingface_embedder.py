@@ -1,85 +1,133 @@
-"""HuggingFace Embedder Component - Coming Soon
+"""HuggingFace transformers embedder.
 
-This embedder will provide integration with HuggingFace transformers library
-for generating document embeddings using various pre-trained models.
+Runs any ``AutoModel`` encoder in-process and pools its last hidden state
+(mean, max or CLS) into one vector per text. The tokenizer and model are
+loaded on first use and shared by every embedder in the process with the same
+model and device. Texts are encoded in length-sorted batches under
+``torch.inference_mode``.
 
-Planned Features:
-- Support for popular embedding models (sentence-transformers, etc.)
-- Batch processing with configurable batch sizes
-- GPU acceleration support
-- Model caching and optimization
-- Custom tokenization options
-
-Status: Implementation in progress
+torch and transformers are imported on first use (importing them takes
+seconds), but must be installed for this module to import.
 """
 
-from typing import List, Dict, Any, Optional
-from core.base import Embedder, Document
+import importlib.util
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from core.base import Embedder
+from utils.local_inference import encode_batched, load_model_once, resolve_device
+
+if importlib.util.find_spec("torch") is None or importlib.util.find_spec("transformers") is None:
+    raise ImportError("HuggingFaceEmbedder requires torch and transformers")
+
+logger = logging.getLogger(__name__)
+
+POOLING_STRATEGIES = ("mean", "max", "cls")
 
 
 class HuggingFaceEmbedder(Embedder):
-    """HuggingFace-based embedder for generating document embeddings.
-    
-    This component will integrate with the HuggingFace transformers ecosystem
-    to provide high-quality embeddings using state-of-the-art models.
-    
-    Status: Coming Soon
-    """
-    
-    def __init__(self, name: str = "HuggingFaceEmbedder", config: Dict[str, Any] = None):
+    """Local CPU/GPU embedder backed by HuggingFace transformers."""
+
+    def __init__(self, name: str = "HuggingFaceEmbedder", config: Optional[Dict[str, Any]] = None):
+        # Ensure name is always a string
+        if not isinstance(name, str):
+            name = "HuggingFaceEmbedder"
         super().__init__(name, config)
-        
-        # Configuration will include:
-        # - model_name: HuggingFace model identifier
-        # - device: CPU/GPU device selection
-        # - max_length: Maximum sequence length
-        # - batch_size: Processing batch size
-        # - trust_remote_code: Whether to trust remote code
-        
-        # Placeholder for future implementation
-        raise NotImplementedError(
-            "HuggingFaceEmbedder is not yet implemented. "
-            "Coming soon in a future release! "
-            "For now, please use OllamaEmbedder or OpenAIEmbedder."
+        config = config or {}
+        self.model_name = config.get("model_name", "sentence-transformers/all-MiniLM-L6-v2")
+        self.device = resolve_device(config.get("device", "auto"))
+        self.batch_size = max(config.get("batch_size", 32), 1)
+        self.normalize_embeddings = config.get("normalize_embeddings", True)
+        self.pooling_strategy = config.get("pooling_strategy", "mean")
+        self.max_length = config.get("max_length", 512)
+        self.show_progress_bar = config.get("show_progress_bar", False)
+        self.cache_folder = config.get("cache_folder")
+
+        if self.pooling_strategy not in POOLING_STRATEGIES:
+            raise ValueError(
+                f"Unknown pooling_strategy {self.pooling_strategy!r}; expected one of {POOLING_STRATEGIES}"
+            )
+
+    def load_model(self) -> Tuple[Any, Any]:
+        """The shared (tokenizer, model) pair, loaded on first call."""
+        key = ("transformers", self.model_name, self.device, self.cache_folder)
+        return load_model_once(key, self._load_model)
+
+    def _load_model(self) -> Tuple[Any, Any]:
+        from transformers import AutoModel, AutoTokenizer
+
+        logger.info(f"Loading transformers model {self.model_name} on {self.device}")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=self.cache_folder)
+        model = AutoModel.from_pretrained(self.model_name, cache_dir=self.cache_folder).to(self.device)
+        model.eval()
+        return tokenizer, model
+
+    def _pool(self, hidden, attention_mask):
+        """Pool token states (batch, tokens, hidden) into (batch, hidden)."""
+        import torch
+
+        if self.pooling_strategy == "cls":
+            return hidden[:, 0]
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        if self.pooling_strategy == "max":
+            return hidden.masked_fill(mask == 0, torch.finfo(hidden.dtype).min).max(dim=1).values
+        return (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` into a float32 array of shape (len(texts), dimension)."""
+        import torch
+
+        tokenizer, model = self.load_model()
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        def encode_batch(batch: List[str]) -> "torch.Tensor":
+            features = tokenizer(
+                batch, padding=True, truncation=True, max_length=self.max_length, return_tensors="pt"
+            ).to(self.device)
+            hidden = model(**features).last_hidden_state
+            vectors = self._pool(hidden, features["attention_mask"])
+            if self.normalize_embeddings:
+                vectors = torch.nn.functional.normalize(vectors, p=2, dim=1)
+            return vectors
+
+        return encode_batched(
+            texts, self.batch_size, self.get_embedding_dimension(), encode_batch,
+            show_progress=self.show_progress_bar,
         )
-    
-    def embed_documents(self, documents: List[Document]) -> List[Document]:
-        """Generate embeddings for a batch of documents.
-        
-        This will use HuggingFace transformers to generate high-quality
-        embeddings from the document content.
-        
-        Args:
-            documents: List of documents to embed
-            
-        Returns:
-            Documents with embeddings added
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("HuggingFaceEmbedder coming soon!")
-    
-    def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for a single query string.
-        
-        Args:
-            query: Query string to embed
-            
-        Returns:
-            Query embedding vector
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("HuggingFaceEmbedder coming soon!")
-
-
-# Future implementation notes:
-# 1. Will use sentence-transformers library for easy model loading
-# 2. Support for popular models like:
-#    - all-MiniLM-L6-v2 (lightweight, fast)
-#    - all-mpnet-base-v2 (balanced performance)
-#    - multi-qa-MiniLM-L6-cos-v1 (optimized for Q&A)
-# 3. Automatic model caching and GPU utilization
-# 4. Integration with RAG strategies for optimal performance
\ No newline at end of file
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for texts."""
+        if not texts:
+            return []
+        return self.encode(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one float32 array of shape (len(texts), dimension)."""
+        return self.encode(texts)
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string."""
+        return self.encode([text])[0].tolist()
+
+    def get_embedding_dimension(self) -> int:
+        """Get the dimension of embeddings produced by this model."""
+        _, model = self.load_model()
+        return model.config.hidden_size
+
+    def validate_config(self) -> bool:
+        """Check that the model can be loaded."""
+        try:
+            self.load_model()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load transformers model {self.model_name}: {e}")
+            return False
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get embedder description."""
+        return "Local HuggingFace transformers embedder with configurable pooling."
@@ -3,9 +3,16 @@
 import requests
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+from requests.adapters import HTTPAdapter
+
 from core.base import Embedder
+from utils.embedding_registry import known_dimension, probe_embedding_profile
+from utils.http import RETRY_STATUS_CODES, connection_refused
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +31,17 @@ class OllamaEmbedder(Embedder):
         self.base_url = self.api_base  # Alias for compatibility
         self.batch_size = max(config.get("batch_size", 32), 1)  # Ensure positive batch size
         self.timeout = config.get("timeout", 60)
+        self.max_concurrency = max(config.get("max_concurrency", 4), 1)
+        self.max_retries = max(config.get("max_retries", 3), 0)
+        self.retry_backoff = config.get("retry_backoff", 0.5)
+
+        # One pooled session so batches in flight reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Cleared when the server predates the batch /api/embed endpoint
+        self._batch_endpoint = True
 
     def validate_config(self) -> bool:
         """Validate configuration and check Ollama availability."""
@@ -59,24 +77,69 @@ class OllamaEmbedder(Embedder):
             return False
 
     def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts using Ollama."""
+        """Generate embeddings for texts using Ollama.
+
+        Texts are sent in batches of ``batch_size``; up to ``max_concurrency``
+        batches are in flight at once. Order is preserved. Texts that fail
+        get zero vectors.
+        """
+        vectors = self._embed_all(texts)
+        if any(vector is None for vector in vectors):
+            zeros = [0.0] * self._fallback_dimension()
+            vectors = [list(zeros) if vector is None else vector for vector in vectors]
+        return vectors
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one float32 (len(texts), dimension) array; failed rows stay zero."""
+        vectors = self._embed_all(texts)
+        dimension = next(
+            (len(vector) for vector in vectors if vector is not None), None
+        ) or self._fallback_dimension()
+        array = np.zeros((len(vectors), dimension), dtype=np.float32)
+        for row, vector in zip(array, vectors):
+            if vector is not None and len(vector) == dimension:
+                row[:] = vector
+        return array
+
+    def _embed_all(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed all texts in concurrent batches; None for each text that failed."""
         if not texts:
             return []
 
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        if len(batches) == 1 or self.max_concurrency == 1:
+            batch_results = [self._embed_batch(batch) for batch in batches]
+        else:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-embed") as executor:
+                batch_results = list(executor.map(self._embed_batch, batches))
+
         embeddings = []
-        
-        # Process in batches
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i:i + self.batch_size]
-            batch_embeddings = self._embed_batch(batch)
+        for batch_embeddings in batch_results:
             embeddings.extend(batch_embeddings)
-        
         return embeddings
 
-    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Embed a batch of texts."""
+    def _embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed a batch of texts with one /api/embed request."""
+        if self._batch_endpoint:
+            try:
+                embeddings = self._call_embed_api(texts)
+                if embeddings is not None:
+                    if len(embeddings) == len(texts):
+                        return embeddings
+                    logger.warning(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} texts")
+                    return [None] * len(texts)
+            except Exception as e:
+                logger.error(f"Error generating embeddings: {e}")
+                return [None] * len(texts)
+
+        return self._embed_batch_legacy(texts)
+
+    def _embed_batch_legacy(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Embed a batch one text at a time via the legacy /api/embeddings endpoint."""
         embeddings = []
-        
+
         for text in texts:
             try:
                 result = self._call_ollama_api(text)
@@ -85,16 +148,34 @@ class OllamaEmbedder(Embedder):
                     embeddings.append(embedding)
                 else:
                     logger.warning(f"No embedding returned for text: {text[:50]}...")
-                    embeddings.append([0.0] * self.get_embedding_dimension())
+                    embeddings.append(None)
             except Exception as e:
                 logger.error(f"Error generating embedding: {e}")
-                embeddings.append([0.0] * self.get_embedding_dimension())
-        
+                embeddings.append(None)
+
         return embeddings
 
     def get_embedding_dimension(self) -> int:
-        """Get the dimension of embeddings produced by this model."""
-        # Default dimensions for common models (avoid test embedding during tests)
+        """Get the dimension of embeddings produced by this model.
+
+        Read from the embedding registry, probing the server on first use;
+        a guess from the model name if the server can't be reached.
+        """
+        dimension = known_dimension(self)
+        if dimension is None:
+            try:
+                dimension = probe_embedding_profile(self).dimension
+            except Exception as e:
+                logger.debug(f"Could not probe {self.model} for its dimension: {e}")
+                dimension = self._guess_dimension()
+        return dimension
+
+    def _fallback_dimension(self) -> int:
+        """Size for zero-vector fallbacks, without calling the server."""
+        return known_dimension(self) or self._guess_dimension()
+
+    def _guess_dimension(self) -> int:
+        """Dimension of common models, by name."""
         dimension_map = {
             "nomic-embed-text": 768,
             "all-minilm": 384,
@@ -107,33 +188,64 @@ class OllamaEmbedder(Embedder):
         
         return 768  # Default
     
+    def _post(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST to the Ollama API, retrying dropped connections and busy responses.
+
+        Waits ``retry_backoff * 2**attempt`` seconds between attempts. A refused
+        connection (nothing listening) is raised immediately.
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                error = f"Ollama API error {response.status_code}: {response.text}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if connection_refused(e):
+                    raise
+                error = str(e)
+
+            if attempt < self.max_retries:
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.debug(f"Retrying {path} in {delay:.2f}s ({error})")
+                time.sleep(delay)
+
+        raise Exception(f"{error} (after {self.max_retries + 1} attempts)")
+
+    def _call_embed_api(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Call the batch /api/embed endpoint; None if the server lacks it."""
+        response = self._post("/api/embed", {"model": self.model, "input": texts})
+
+        if response.status_code == 404 and "model" not in response.text.lower():
+            # Ollama < 0.3.4 only has /api/embeddings
+            logger.info("Ollama /api/embed not available, falling back to /api/embeddings")
+            self._batch_endpoint = False
+            return None
+        if response.status_code == 200:
+            return response.json().get("embeddings", [])
+        raise Exception(f"Ollama API error {response.status_code}: {response.text}")
+
     def _call_ollama_api(self, text: str) -> Dict[str, Any]:
         """Call Ollama API for a single text."""
-        response = requests.post(
-            f"{self.base_url}/api/embeddings",
-            json={
-                "model": self.model,
-                "prompt": text
-            },
-            timeout=self.timeout
-        )
-        
+        response = self._post("/api/embeddings", {"model": self.model, "prompt": text})
+
         if response.status_code == 200:
             return response.json()
         else:
             raise Exception(f"Ollama API error {response.status_code}: {response.text}")
-    
+
     def embed_text(self, text: str) -> List[float]:
         """Embed a single text string."""
         if not text or not text.strip():
-            return [0.0] * self.get_embedding_dimension()
+            return [0.0] * self._fallback_dimension()
         
         try:
             result = self._call_ollama_api(text)
-            return result.get("embedding", [0.0] * self.get_embedding_dimension())
+            return result.get("embedding", [0.0] * self._fallback_dimension())
         except Exception as e:
             logger.error(f"Error embedding text: {e}")
-            return [0.0] * self.get_embedding_dimension()
+            return [0.0] * self._fallback_dimension()
     
     def _check_model_availability(self) -> bool:
         """Check if the model is available."""
@@ -142,4 +254,4 @@ class OllamaEmbedder(Embedder):
     @classmethod
     def get_description(cls) -> str:
         """Get embedder description."""
-        return "Ollama-based embedder for local text embedding generation using various models."
\ No newline at end of file
+        return "Ollama-based embedder for local text embedding generation using various models."
@@ -0,0 +1,12 @@
+"""OnnxEmbedder Component
+
+Component for onnx embedder.
+"""
+
+from .onnx_embedder import OnnxEmbedder
+
+__all__ = ['OnnxEmbedder']
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "embedder"
+COMPONENT_NAME = "onnx_embedder"
@@ -0,0 +1,297 @@
+"""ONNX Runtime embedder.
+
+Runs a transformers encoder (any model ``HuggingFaceEmbedder`` can load, e.g.
+a sentence-transformers checkpoint) through onnxruntime on the CPU. The model
+is exported to ONNX once with ``torch.onnx`` and kept under ``export_dir``;
+after that only onnxruntime and the tokenizer are needed, so ingest nodes can
+run without torch. Pooling and normalization happen in NumPy.
+
+With ``quantize: true`` the exported graph is additionally converted with
+onnxruntime's dynamic int8 quantization (int8 weights, activations quantized
+per batch at runtime), which is smaller and usually faster again on CPUs with
+VNNI/AVX-512. ``measure_against_reference`` reports the speedup and cosine
+drift relative to the fp32 PyTorch model.
+
+onnxruntime and transformers must be installed for this module to import.
+Exporting also needs torch and onnxscript; quantizing needs onnx.
+"""
+
+import importlib.util
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from core.base import Embedder
+from utils.local_inference import load_model_once, scatter_batches
+
+if importlib.util.find_spec("onnxruntime") is None or importlib.util.find_spec("transformers") is None:
+    raise ImportError("OnnxEmbedder requires onnxruntime and transformers")
+
+logger = logging.getLogger(__name__)
+
+POOLING_STRATEGIES = ("mean", "max", "cls")
+ONNX_OPSET = 18
+
+
+def _model_slug(model_name: str) -> str:
+    """Directory name for a model ID or local path."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "--", model_name.strip("/\\")) or "model"
+
+
+class OnnxEmbedder(Embedder):
+    """CPU embedder running an exported (optionally int8-quantized) ONNX graph."""
+
+    def __init__(self, name: str = "OnnxEmbedder", config: Optional[Dict[str, Any]] = None):
+        # Ensure name is always a string
+        if not isinstance(name, str):
+            name = "OnnxEmbedder"
+        super().__init__(name, config)
+        config = config or {}
+        self.model_name = config.get("model_name", "sentence-transformers/all-MiniLM-L6-v2")
+        self.onnx_path = config.get("onnx_path")
+        self.export_dir = config.get("export_dir", "./data/onnx_models")
+        self.quantize = config.get("quantize", False)
+        # 0 lets onnxruntime pick (one thread per physical core)
+        self.intra_op_num_threads = config.get("intra_op_num_threads", 0)
+        self.batch_size = max(config.get("batch_size", 32), 1)
+        self.normalize_embeddings = config.get("normalize_embeddings", True)
+        self.pooling_strategy = config.get("pooling_strategy", "mean")
+        self.max_length = config.get("max_length", 512)
+        self.show_progress_bar = config.get("show_progress_bar", False)
+        self.cache_folder = config.get("cache_folder")
+
+        if self.pooling_strategy not in POOLING_STRATEGIES:
+            raise ValueError(
+                f"Unknown pooling_strategy {self.pooling_strategy!r}; expected one of {POOLING_STRATEGIES}"
+            )
+
+        if self.onnx_path:
+            self.fp32_path = Path(self.onnx_path)
+        else:
+            self.fp32_path = Path(self.export_dir) / _model_slug(self.model_name) / "model.onnx"
+        self.int8_path = self.fp32_path.with_name(f"{self.fp32_path.stem}_int8.onnx")
+        self._dimension: Optional[int] = None
+
+    @property
+    def model_path(self) -> Path:
+        """The ONNX file this embedder runs."""
+        return self.int8_path if self.quantize else self.fp32_path
+
+    # ------------------------------------------------------------------
+    # Export and loading
+    # ------------------------------------------------------------------
+
+    def load_model(self) -> Tuple[Any, Any]:
+        """The shared (tokenizer, InferenceSession) pair, exported and loaded on first call."""
+        key = ("onnxruntime", str(self.model_path.resolve()), self.intra_op_num_threads)
+        return load_model_once(key, self._load_model)
+
+    def _load_model(self) -> Tuple[Any, Any]:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        if not self.fp32_path.exists():
+            self.export_onnx()
+        if self.quantize and not self.int8_path.exists():
+            self.quantize_onnx()
+
+        # The export directory holds a copy of the tokenizer so nothing is downloaded at runtime
+        model_dir = self.fp32_path.parent
+        tokenizer_source = str(model_dir) if (model_dir / "tokenizer_config.json").exists() else self.model_name
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_source, cache_dir=self.cache_folder)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        logger.info(f"Loading ONNX model {self.model_path} ({self.intra_op_num_threads or 'auto'} threads)")
+        session = ort.InferenceSession(str(self.model_path), options, providers=["CPUExecutionProvider"])
+        return tokenizer, session
+
+    def export_onnx(self) -> Path:
+        """Export ``model_name`` to ``fp32_path`` (batch and sequence axes dynamic)."""
+        if importlib.util.find_spec("torch") is None or importlib.util.find_spec("onnxscript") is None:
+            raise ImportError(
+                f"Exporting {self.model_name} to ONNX requires torch and onnxscript; "
+                f"install them or point onnx_path at an exported model"
+            )
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        logger.info(f"Exporting {self.model_name} to {self.fp32_path}")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=self.cache_folder)
+        model = AutoModel.from_pretrained(self.model_name, cache_dir=self.cache_folder)
+        model.eval()
+
+        sample = tokenizer(["an example input", "a"], padding=True, return_tensors="pt")
+        input_names = list(sample.keys())
+
+        class LastHiddenState(torch.nn.Module):
+            """Positional-input wrapper so the graph inputs follow the tokenizer's outputs."""
+
+            def __init__(self, encoder):
+                super().__init__()
+                self.encoder = encoder
+
+            def forward(self, *inputs):
+                return self.encoder(**dict(zip(input_names, inputs))).last_hidden_state
+
+        batch, sequence = torch.export.Dim("batch"), torch.export.Dim("sequence")
+        program = torch.onnx.export(
+            LastHiddenState(model),
+            tuple(sample[name] for name in input_names),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_shapes=(tuple({0: batch, 1: sequence} for _ in input_names),),
+            opset_version=ONNX_OPSET,
+            dynamo=True,
+            verbose=False,
+        )
+
+        # Write next to the target and rename, so a crash never leaves a half-written model
+        self.fp32_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.fp32_path.with_name(f"{self.fp32_path.name}.partial")
+        program.save(str(partial))
+        os.replace(partial, self.fp32_path)
+        tokenizer.save_pretrained(str(self.fp32_path.parent))
+        return self.fp32_path
+
+    def quantize_onnx(self) -> Path:
+        """Write the dynamic int8 version of the fp32 graph to ``int8_path``."""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {self.fp32_path} to int8")
+        partial = self.int8_path.with_name(f"{self.int8_path.stem}.partial.onnx")
+        quantize_dynamic(str(self.fp32_path), str(partial), weight_type=QuantType.QInt8)
+        os.replace(partial, self.int8_path)
+        return self.int8_path
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def _pool(self, hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Pool token states (batch, tokens, hidden) into (batch, hidden)."""
+        if self.pooling_strategy == "cls":
+            return hidden[:, 0]
+        mask = attention_mask[..., None].astype(hidden.dtype)
+        if self.pooling_strategy == "max":
+            return np.where(mask > 0, hidden, np.finfo(hidden.dtype).min).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` into a float32 array of shape (len(texts), dimension)."""
+        tokenizer, session = self.load_model()
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+        input_names = [node.name for node in session.get_inputs()]
+
+        def encode_batch(batch: List[str]) -> np.ndarray:
+            features = tokenizer(
+                batch, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+            )
+            feeds = {name: features[name].astype(np.int64) for name in input_names}
+            hidden = session.run(None, feeds)[0]
+            vectors = self._pool(hidden, features["attention_mask"])
+            if self.normalize_embeddings:
+                vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+            return vectors
+
+        return scatter_batches(
+            texts, self.batch_size, self.get_embedding_dimension(), encode_batch,
+            show_progress=self.show_progress_bar,
+        )
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for texts."""
+        if not texts:
+            return []
+        return self.encode(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one float32 array of shape (len(texts), dimension)."""
+        return self.encode(texts)
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string."""
+        return self.encode([text])[0].tolist()
+
+    def get_embedding_dimension(self) -> int:
+        """Get the dimension of embeddings produced by this model."""
+        if self._dimension is None:
+            tokenizer, session = self.load_model()
+            dimension = session.get_outputs()[0].shape[-1]
+            if not isinstance(dimension, int):
+                # Symbolic output axis: run an empty input to find out
+                features = tokenizer([""], return_tensors="np")
+                feeds = {node.name: features[node.name].astype(np.int64) for node in session.get_inputs()}
+                dimension = session.run(None, feeds)[0].shape[-1]
+            self._dimension = int(dimension)
+        return self._dimension
+
+    def measure_against_reference(self, texts: List[str], repeats: int = 3) -> Dict[str, float]:
+        """Compare speed and output with the fp32 PyTorch model on ``texts``.
+
+        Both models are warmed up first; throughput is the best of ``repeats``
+        passes over ``texts``. ``cosine_drift`` is 1 - mean cosine similarity
+        between the two models' vectors for the same text.
+        """
+        from components.embedders.huggingface_embedder.huggingface_embedder import HuggingFaceEmbedder
+
+        reference = HuggingFaceEmbedder(f"{self.name}_reference", {
+            "model_name": self.model_name,
+            "device": "cpu",
+            "batch_size": self.batch_size,
+            "normalize_embeddings": self.normalize_embeddings,
+            "pooling_strategy": self.pooling_strategy,
+            "max_length": self.max_length,
+            "cache_folder": self.cache_folder,
+        })
+
+        def best_time(encode) -> Tuple[float, np.ndarray]:
+            encode(texts[:self.batch_size])
+            best, vectors = float("inf"), None
+            for _ in range(max(repeats, 1)):
+                start = time.perf_counter()
+                vectors = encode(texts)
+                best = min(best, time.perf_counter() - start)
+            return best, vectors
+
+        reference_seconds, expected = best_time(reference.encode)
+        onnx_seconds, actual = best_time(self.encode)
+
+        norms = np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+        cosine = (expected * actual).sum(axis=1) / np.clip(norms, 1e-12, None)
+        report = {
+            "texts": len(texts),
+            "reference_docs_per_sec": len(texts) / reference_seconds,
+            "onnx_docs_per_sec": len(texts) / onnx_seconds,
+            "speedup": reference_seconds / onnx_seconds,
+            "mean_cosine": float(cosine.mean()),
+            "min_cosine": float(cosine.min()),
+            "cosine_drift": float(1.0 - cosine.mean()),
+        }
+        logger.info(
+            f"{self.model_path.name}: {report['speedup']:.2f}x vs PyTorch fp32, "
+            f"cosine drift {report['cosine_drift']:.2e} (min cosine {report['min_cosine']:.4f})"
+        )
+        return report
+
+    def validate_config(self) -> bool:
+        """Check that the ONNX model can be exported (if needed) and loaded."""
+        try:
+            self.load_model()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model for {self.model_name}: {e}")
+            return False
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get embedder description."""
+        return "CPU embedder running an exported, optionally int8-quantized, ONNX model."
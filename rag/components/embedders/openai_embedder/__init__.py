@@ -1,11 +1,11 @@
-"""OpenaiEmbedder Component
+"""OpenAIEmbedder Component
 
 Component for openai embedder.
 """
 
-from .openai_embedder import OpenaiEmbedder
+from .openai_embedder import OpenAIEmbedder, OpenAIRequestError
 
-__all__ = ['OpenaiEmbedder']
+__all__ = ['OpenAIEmbedder', 'OpenAIRequestError']
 
 # Component metadata (read from schema.json at runtime)
 COMPONENT_TYPE = "embedder"
@@ -1,86 +1,323 @@
-"""OpenAI Embedder Component - Coming Soon
+"""OpenAI embedder.
 
-This embedder will provide integration with OpenAI's text embedding API
-for generating high-quality document embeddings using models like text-embedding-3.
+Calls the ``/embeddings`` endpoint of the OpenAI API or of any
+OpenAI-compatible server (vLLM, llama.cpp, LocalAI, LM Studio, ...) set with
+``base_url``.
 
-Planned Features:
-- Support for OpenAI embedding models (text-embedding-3-small, text-embedding-3-large)
-- Batch processing with rate limiting
-- Automatic retry logic with exponential backoff
-- Cost optimization through batch requests
-- Configurable dimensions and model selection
-
-Status: Implementation in progress
+Inputs are packed into requests by token count rather than item count, using
+the same tiktoken encoding choice as ``OpenAICompatibleAPI.count_tokens``
+(``len(text) // 4`` when tiktoken or its encoding files are unavailable).
+Requests run concurrently, each waiting on a shared requests-per-minute /
+tokens-per-minute limiter, and 429/5xx responses are retried with jittered
+exponential backoff (honouring ``Retry-After``). A request that still fails
+after its retries yields zero vectors, like the other HTTP embedders; one the
+API rejects outright (a 4xx other than 429, such as a bad key, an unknown
+model or bad input) raises ``OpenAIRequestError`` instead.
 """
 
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
-from core.base import Embedder, Document
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 
-class OpenAIEmbedder(Embedder):
-    """OpenAI API-based embedder for generating document embeddings.
-    
-    This component will integrate with OpenAI's embedding API to provide
-    state-of-the-art embeddings using their latest models.
-    
-    Status: Coming Soon
+from core.base import Embedder
+from utils.embedding_registry import known_dimension, probe_embedding_profile
+from utils.http import RETRY_STATUS_CODES, connection_refused
+
+logger = logging.getLogger(__name__)
+
+# Native output sizes; other models are measured from the first response
+MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+# Longest delay a Retry-After header may impose
+MAX_RETRY_AFTER = 60.0
+
+
+class OpenAIRequestError(Exception):
+    """An /embeddings request that failed; ``retryable`` if it failed only after retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding_for_model(model: str):
+    """tiktoken encoding for ``model`` (as in ``OpenAICompatibleAPI.count_tokens``), or None."""
+    try:
+        import tiktoken
+
+        if "gpt-4" in model:
+            return tiktoken.encoding_for_model("gpt-4")
+        if "gpt-3.5" in model:
+            return tiktoken.encoding_for_model("gpt-3.5-turbo")
+        # Default to cl100k_base encoding for other models (all OpenAI embedding models)
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable for {model}, estimating tokens as len(text) // 4: {e}")
+        return None
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute token buckets shared by worker threads.
+
+    Each bucket holds up to one minute of budget and refills continuously.
+    ``acquire`` blocks until both buckets can pay for the request. A request
+    larger than a whole bucket waits for a full bucket rather than forever.
     """
-    
-    def __init__(self, name: str = "OpenAIEmbedder", config: Dict[str, Any] = None):
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.limits = {
+            name: float(limit)
+            for name, limit in (("requests", requests_per_minute), ("tokens", tokens_per_minute))
+            if limit
+        }
+        self._available = dict(self.limits)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a request of ``tokens`` may be sent; returns the seconds waited."""
+        cost = {"requests": 1.0, "tokens": float(tokens)}
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed, self._updated = now - self._updated, now
+                for name, limit in self.limits.items():
+                    self._available[name] = min(limit, self._available[name] + elapsed * limit / 60.0)
+
+                delay = 0.0
+                for name, limit in self.limits.items():
+                    shortfall = min(cost[name], limit) - self._available[name]
+                    if shortfall > 0:
+                        delay = max(delay, shortfall * 60.0 / limit)
+                if delay == 0.0:
+                    for name, limit in self.limits.items():
+                        self._available[name] -= min(cost[name], limit)
+                    return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class OpenAIEmbedder(Embedder):
+    """Embedder for the OpenAI (or an OpenAI-compatible) embeddings API."""
+
+    def __init__(self, name: str = "OpenAIEmbedder", config: Optional[Dict[str, Any]] = None):
+        # Ensure name is always a string
+        if not isinstance(name, str):
+            name = "OpenAIEmbedder"
         super().__init__(name, config)
-        
-        # Configuration will include:
-        # - api_key: OpenAI API key
-        # - model: Model name (text-embedding-3-small, text-embedding-3-large)
-        # - dimensions: Optional dimension reduction
-        # - batch_size: API batch size
-        # - max_retries: Maximum retry attempts
-        # - timeout: Request timeout
-        
-        # Placeholder for future implementation
-        raise NotImplementedError(
-            "OpenAIEmbedder is not yet implemented. "
-            "Coming soon in a future release! "
-            "For now, please use OllamaEmbedder."
+        config = config or {}
+        self.api_key = config.get("api_key") or os.environ.get("OPENAI_API_KEY")
+        self.base_url = config.get("base_url", "https://api.openai.com/v1").rstrip("/")
+        self.model = config.get("model", "text-embedding-3-small")
+        # "dimension" is the name older configs used
+        self.dimensions = config.get("dimensions", config.get("dimension"))
+        self.batch_size = max(config.get("batch_size", 512), 1)
+        self.max_tokens_per_request = max(config.get("max_tokens_per_request", 100000), 1)
+        self.max_input_tokens = max(config.get("max_input_tokens", 8191), 1)
+        self.max_concurrency = max(config.get("max_concurrency", 4), 1)
+        self.timeout = config.get("timeout", 60)
+        self.max_retries = max(config.get("max_retries", 3), 0)
+        self.retry_backoff = config.get("retry_backoff", 1.0)
+        self.limiter = RateLimiter(
+            config.get("requests_per_minute", 3000), config.get("tokens_per_minute", 1000000)
         )
-    
-    def embed_documents(self, documents: List[Document]) -> List[Document]:
-        """Generate embeddings for a batch of documents using OpenAI API.
-        
-        This will use OpenAI's text-embedding API to generate high-quality
-        embeddings with proper rate limiting and error handling.
-        
-        Args:
-            documents: List of documents to embed
-            
-        Returns:
-            Documents with embeddings added
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("OpenAIEmbedder coming soon!")
-    
-    def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for a single query string.
-        
-        Args:
-            query: Query string to embed
-            
-        Returns:
-            Query embedding vector
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("OpenAIEmbedder coming soon!")
-
-
-# Future implementation notes:
-# 1. Will use openai Python client library
-# 2. Support for models:
-#    - text-embedding-3-small (1536 dimensions, cost-effective)
-#    - text-embedding-3-large (3072 dimensions, highest quality)
-# 3. Intelligent batching for API efficiency
-# 4. Rate limiting and retry logic for production use
-# 5. Cost tracking and optimization features
\ No newline at end of file
+
+        self._dimension: Optional[int] = (
+            self.dimensions or MODEL_DIMENSIONS.get(self.model) or known_dimension(self)
+        )
+        self.usage: Dict[str, int] = {"requests": 0, "prompt_tokens": 0, "retries": 0}
+        self._usage_lock = threading.Lock()
+
+        # One pooled session so requests in flight reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        if self.api_key:
+            self.session.headers["Authorization"] = f"Bearer {self.api_key}"
+
+    # ------------------------------------------------------------------
+    # Tokens and packing
+    # ------------------------------------------------------------------
+
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens ``text`` costs."""
+        encoding = _encoding_for_model(self.model)
+        if encoding is None:
+            return max(len(text) // 4, 1)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _truncate(self, text: str) -> str:
+        """Cut ``text`` down to ``max_input_tokens`` (the API rejects longer inputs)."""
+        encoding = _encoding_for_model(self.model)
+        if encoding is None:
+            return text[:self.max_input_tokens * 4]
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:self.max_input_tokens])
+
+    def _pack(self, token_counts: List[int]) -> List[List[int]]:
+        """Group input indices, in order, into requests within the token and item limits."""
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for index, tokens in enumerate(token_counts):
+            if current and (
+                current_tokens + tokens > self.max_tokens_per_request or len(current) >= self.batch_size
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(index)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for texts, in token-packed concurrent requests."""
+        if not texts:
+            return []
+
+        # The API rejects empty strings
+        inputs = [text or " " for text in texts]
+        token_counts = []
+        for i, text in enumerate(inputs):
+            tokens = self.count_tokens(text)
+            if tokens > self.max_input_tokens:
+                inputs[i] = self._truncate(text)
+                tokens = self.max_input_tokens
+            token_counts.append(tokens)
+
+        batches = [
+            ([inputs[i] for i in batch], sum(token_counts[i] for i in batch))
+            for batch in self._pack(token_counts)
+        ]
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self._embed_request(batch, tokens) for batch, tokens in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                results = list(executor.map(lambda batch: self._embed_request(*batch), batches))
+
+        return [vector for vectors in results for vector in vectors]
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string."""
+        return self.embed([text])[0]
+
+    def _embed_request(self, texts: List[str], tokens: int) -> List[List[float]]:
+        """One /embeddings call; zero vectors if retries run out (once the dimension is known)."""
+        try:
+            self.limiter.acquire(tokens)
+            vectors = self._call_embeddings_api(texts)
+            if len(vectors) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(vectors)}")
+            return vectors
+        except OpenAIRequestError as e:
+            if not e.retryable or self._dimension is None:
+                raise
+            logger.error(f"OpenAI embedding request of {len(texts)} texts failed: {e}")
+            return [[0.0] * self._dimension for _ in texts]
+
+    def _call_embeddings_api(self, texts: List[str]) -> List[List[float]]:
+        payload: Dict[str, Any] = {"model": self.model, "input": texts}
+        if self.dimensions:
+            payload["dimensions"] = self.dimensions
+        body = self._post("/embeddings", payload).json()
+
+        with self._usage_lock:
+            self.usage["requests"] += 1
+            self.usage["prompt_tokens"] += (body.get("usage") or {}).get("prompt_tokens", 0)
+
+        data = sorted(body["data"], key=lambda item: item.get("index", 0))
+        vectors = [item["embedding"] for item in data]
+        if self.dimensions and vectors and len(vectors[0]) > self.dimensions:
+            vectors = self._shorten(vectors)
+        if vectors and self._dimension is None:
+            self._dimension = len(vectors[0])
+        return vectors
+
+    def _shorten(self, vectors: List[List[float]]) -> List[List[float]]:
+        """Truncate and re-normalize, for servers that ignore ``dimensions``."""
+        array = np.asarray(vectors, dtype=np.float32)[:, :self.dimensions]
+        array /= np.clip(np.linalg.norm(array, axis=1, keepdims=True), 1e-12, None)
+        return array.tolist()
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> requests.Response:
+        """POST with jittered exponential backoff on 429/5xx and dropped connections."""
+        url = f"{self.base_url}{path}"
+        error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+                if response.status_code == 200:
+                    return response
+                error = f"OpenAI API error {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRY_STATUS_CODES:
+                    # Rejected outright (bad key, unknown model, bad input): retrying won't help
+                    raise OpenAIRequestError(error, status_code=response.status_code)
+                retry_after = _retry_after(response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if connection_refused(e):
+                    raise
+                error = str(e)
+
+            if attempt < self.max_retries:
+                delay = self.retry_backoff * (2 ** attempt)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                # Jitter so concurrent requests rate-limited together don't retry together
+                delay *= random.uniform(0.5, 1.5)
+                with self._usage_lock:
+                    self.usage["retries"] += 1
+                logger.debug(f"Retrying {path} in {delay:.2f}s ({error})")
+                time.sleep(delay)
+
+        raise OpenAIRequestError(f"{error} (after {attempt + 1} attempts)", retryable=True)
+
+    def get_embedding_dimension(self) -> int:
+        """Get the dimension of embeddings produced by this model."""
+        if self._dimension is None:
+            # Unknown model on a compatible server: probe it once and remember it
+            self._dimension = probe_embedding_profile(self).dimension
+        return self._dimension
+
+    def validate_config(self) -> bool:
+        """Check that the endpoint answers an embedding request."""
+        try:
+            self._call_embeddings_api(["validation"])
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to validate OpenAI embedder config: {e}")
+            return False
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get embedder description."""
+        return "OpenAI (or OpenAI-compatible) API embedder with token-aware batching and rate limiting."
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped at MAX_RETRY_AFTER."""
+    try:
+        return min(float(response.headers["Retry-After"]), MAX_RETRY_AFTER)
+    except (KeyError, ValueError):
+        return None
@@ -1,88 +1,139 @@
-"""Sentence Transformer Embedder Component - Coming Soon
+"""Sentence Transformer embedder.
 
-This embedder will provide direct integration with the sentence-transformers library
-for generating document embeddings using pre-trained transformer models.
+Runs a sentence-transformers model in-process, so ingest needs no embedding
+server. The model is loaded on first use and shared by every embedder in the
+process with the same model, device and pooling. Texts are encoded in
+length-sorted batches under ``torch.inference_mode``.
 
-Planned Features:
-- Support for 100+ pre-trained sentence transformer models
-- Local inference (no API calls required)
-- GPU acceleration with automatic device detection
-- Model caching and optimization
-- Custom fine-tuning support
-
-Status: Implementation in progress
+torch and sentence-transformers are imported on first use (importing them
+takes seconds), but must be installed for this module to import.
 """
 
+import importlib.util
+import logging
 from typing import List, Dict, Any, Optional
-from core.base import Embedder, Document
+
+import numpy as np
+
+from core.base import Embedder
+from utils.local_inference import encode_batched, load_model_once, resolve_device
+
+if importlib.util.find_spec("torch") is None or importlib.util.find_spec("sentence_transformers") is None:
+    raise ImportError("SentenceTransformerEmbedder requires torch and sentence-transformers")
+
+logger = logging.getLogger(__name__)
+
+POOLING_STRATEGIES = ("mean", "max", "cls")
 
 
 class SentenceTransformerEmbedder(Embedder):
-    """Sentence Transformers-based embedder for generating document embeddings.
-    
-    This component will integrate with the sentence-transformers library
-    to provide local, high-quality embeddings without API dependencies.
-    
-    Status: Coming Soon
-    """
-    
-    def __init__(self, name: str = "SentenceTransformerEmbedder", config: Dict[str, Any] = None):
+    """Local CPU/GPU embedder backed by the sentence-transformers library."""
+
+    def __init__(self, name: str = "SentenceTransformerEmbedder", config: Optional[Dict[str, Any]] = None):
+        # Ensure name is always a string
+        if not isinstance(name, str):
+            name = "SentenceTransformerEmbedder"
         super().__init__(name, config)
-        
-        # Configuration will include:
-        # - model_name: Sentence transformer model name
-        # - device: CPU/GPU device selection
-        # - normalize_embeddings: Whether to L2 normalize
-        # - batch_size: Processing batch size
-        # - show_progress_bar: Display progress during encoding
-        # - convert_to_tensor: Return tensors instead of numpy
-        
-        # Placeholder for future implementation
-        raise NotImplementedError(
-            "SentenceTransformerEmbedder is not yet implemented. "
-            "Coming soon in a future release! "
-            "For now, please use OllamaEmbedder."
+        config = config or {}
+        self.model_name = config.get("model_name", "all-MiniLM-L6-v2")
+        self.device = resolve_device(config.get("device", "cpu"))
+        self.batch_size = max(config.get("batch_size", 32), 1)
+        self.normalize_embeddings = config.get("normalize_embeddings", True)
+        # None keeps the pooling the model was trained with
+        self.pooling_strategy = config.get("pooling_strategy")
+        self.cache_folder = config.get("cache_folder")
+        self.max_seq_length = config.get("max_seq_length")
+        self.show_progress_bar = config.get("show_progress_bar", False)
+
+        if self.pooling_strategy is not None and self.pooling_strategy not in POOLING_STRATEGIES:
+            raise ValueError(
+                f"Unknown pooling_strategy {self.pooling_strategy!r}; expected one of {POOLING_STRATEGIES}"
+            )
+
+    def load_model(self):
+        """The shared model instance, loaded on first call."""
+        key = (
+            "sentence-transformers", self.model_name, self.device, self.cache_folder,
+            self.pooling_strategy, self.max_seq_length,
         )
-    
-    def embed_documents(self, documents: List[Document]) -> List[Document]:
-        """Generate embeddings for a batch of documents using sentence transformers.
-        
-        This will use the sentence-transformers library to generate embeddings
-        locally without any API calls.
-        
-        Args:
-            documents: List of documents to embed
-            
-        Returns:
-            Documents with embeddings added
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("SentenceTransformerEmbedder coming soon!")
-    
-    def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for a single query string.
-        
-        Args:
-            query: Query string to embed
-            
-        Returns:
-            Query embedding vector
-            
-        Raises:
-            NotImplementedError: This embedder is not yet implemented
-        """
-        raise NotImplementedError("SentenceTransformerEmbedder coming soon!")
-
-
-# Future implementation notes:
-# 1. Will use sentence-transformers library directly
-# 2. Support for popular models:
-#    - all-MiniLM-L6-v2 (384 dims, fast)
-#    - all-mpnet-base-v2 (768 dims, balanced)
-#    - multi-qa-MiniLM-L6-cos-v1 (384 dims, Q&A optimized)
-#    - paraphrase-multilingual-MiniLM-L12-v2 (multi-language)
-# 3. Automatic GPU detection and utilization
-# 4. Model downloading and caching
-# 5. Support for custom fine-tuned models
\ No newline at end of file
+        return load_model_once(key, self._load_model)
+
+    def _load_model(self):
+        from sentence_transformers import SentenceTransformer
+
+        try:  # sentence-transformers >= 6
+            from sentence_transformers.sentence_transformer.modules import Pooling
+        except ImportError:
+            from sentence_transformers.models import Pooling
+
+        logger.info(f"Loading sentence-transformers model {self.model_name} on {self.device}")
+        model = SentenceTransformer(self.model_name, device=self.device, cache_folder=self.cache_folder)
+        model.eval()
+        if self.max_seq_length:
+            model.max_seq_length = self.max_seq_length
+        if self.pooling_strategy is not None:
+            for index, module in enumerate(model):
+                if isinstance(module, Pooling):
+                    dimension = getattr(module, "embedding_dimension", None) or module.word_embedding_dimension
+                    model[index] = Pooling(dimension, pooling_mode=self.pooling_strategy)
+        return model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` into a float32 array of shape (len(texts), dimension)."""
+        import torch
+
+        model = self.load_model()
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        def encode_batch(batch: List[str]) -> "torch.Tensor":
+            features = model.tokenize(batch)
+            features = {
+                key: value.to(self.device) if isinstance(value, torch.Tensor) else value
+                for key, value in features.items()
+            }
+            vectors = model(features)["sentence_embedding"]
+            if self.normalize_embeddings:
+                vectors = torch.nn.functional.normalize(vectors, p=2, dim=1)
+            return vectors
+
+        return encode_batched(
+            texts, self.batch_size, self.get_embedding_dimension(), encode_batch,
+            show_progress=self.show_progress_bar,
+        )
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for texts."""
+        if not texts:
+            return []
+        return self.encode(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one float32 array of shape (len(texts), dimension)."""
+        return self.encode(texts)
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string."""
+        return self.encode([text])[0].tolist()
+
+    def get_embedding_dimension(self) -> int:
+        """Get the dimension of embeddings produced by this model."""
+        model = self.load_model()
+        # Renamed in sentence-transformers 6
+        getter = getattr(model, "get_embedding_dimension", None) or model.get_sentence_embedding_dimension
+        return getter()
+
+    def validate_config(self) -> bool:
+        """Check that the model can be loaded."""
+        try:
+            self.load_model()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load sentence-transformers model {self.model_name}: {e}")
+            return False
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get embedder description."""
+        return "Local sentence-transformers embedder with batched in-process inference."
@@ -2,7 +2,7 @@
 
 import re
 from collections import Counter, defaultdict
-from typing import Dict, Any, List, Optional
+from typing import Collection, Dict, Any, List, Optional
 import logging
 import math
 
@@ -11,6 +11,21 @@ from core.base import Document
 
 logger = logging.getLogger(__name__)
 
+# Stop words dropped by the TF-IDF extractor and the BM25 index
+BASIC_STOP_WORDS = (
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+    'to', 'was', 'will', 'with'
+)
+
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+
+def tokenize(text: str, stop_words: Collection[str] = (), min_length: int = 3) -> List[str]:
+    """Lowercase ``text``, split it on punctuation and whitespace, and drop stop words and short tokens."""
+    words = _NON_WORD_PATTERN.sub(' ', text.lower()).split()
+    return [word for word in words if word not in stop_words and len(word) >= min_length]
+
 
 class RAKEExtractor(BaseExtractor):
     """
@@ -227,12 +242,7 @@ class YAKEExtractor(BaseExtractor):
     
     def _tokenize_text(self, text: str) -> List[str]:
         """Tokenize text into words."""
-        # Simple tokenization
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
-        words = text.split()
-        
-        # Filter out stop words and short words
-        return [word for word in words if word not in self.stop_words and len(word) > 2]
+        return tokenize(text, self.stop_words)
     
     def _calculate_word_features(self, words: List[str]) -> Dict[str, Dict[str, float]]:
         """Calculate features for each word."""
@@ -353,11 +363,7 @@ class TFIDFExtractor(BaseExtractor):
     
     def _get_default_stop_words(self) -> List[str]:
         """Get default English stop words."""
-        return [
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'will', 'with'
-        ]
+        return list(BASIC_STOP_WORDS)
     
     def extract(self, documents: List[Document]) -> List[Document]:
         """Extract keywords using TF-IDF."""
@@ -415,8 +421,7 @@ class TFIDFExtractor(BaseExtractor):
     
     def _extract_terms(self, text: str) -> List[str]:
         """Extract terms (n-grams) from text."""
-        words = text.split()
-        words = [word for word in words if word not in self.stop_words and len(word) > 2]
+        words = tokenize(text, self.stop_words)
         
         terms = []
         
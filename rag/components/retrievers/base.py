@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
-from core.base import Document, Component
+from core.base import Document, Component, VectorStore
 
 
 @dataclass
@@ -53,6 +53,57 @@ class RetrievalStrategy(Component, ABC):
         """
         pass
     
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int = 5,
+        **kwargs
+    ) -> List[RetrievalResult]:
+        """Retrieve documents for several queries, one result per query.
+        
+        Strategies that can share index calls across queries override this;
+        the default calls retrieve() once per query.
+        """
+        return [
+            self.retrieve(query_embedding, vector_store, top_k, **kwargs)
+            for query_embedding in query_embeddings
+        ]
+    
+    @staticmethod
+    def _search_batch(
+        vector_store,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Document]]:
+        """Search several embeddings through VectorStore.search_batch when available.
+        
+        Duck-typed stores that don't derive from VectorStore are searched one
+        query at a time. ``include_embeddings`` asks the store to attach each
+        candidate's stored vector; it is only passed on when set.
+        """
+        extra = {"include_embeddings": True} if include_embeddings else {}
+        if isinstance(vector_store, VectorStore):
+            return vector_store.search_batch(query_embeddings, top_k=top_k, where=where, **extra)
+        if where:
+            extra["where"] = where
+        return [
+            vector_store.search(query_embedding=query_embedding, top_k=top_k, **extra)
+            for query_embedding in query_embeddings
+        ]
+    
+    def candidate_pool_size(self, top_k: int, vector_store, **kwargs) -> Optional[int]:
+        """How many nearest neighbours of the query ``retrieve`` reads, if that is all it reads.
+        
+        Strategies that only post-process one plain ``search`` of the query
+        embedding return its ``top_k`` so a hybrid strategy can serve them
+        from a shared CandidatePool. None (the default) means the strategy
+        needs its own store calls.
+        """
+        return None
+    
     @abstractmethod
     def supports_vector_store(self, vector_store_type: str) -> bool:
         """Check if this strategy supports the given vector store type.
@@ -66,6 +117,25 @@ class RetrievalStrategy(Component, ABC):
         pass
 
 
+class CandidatePool:
+    """Store-like view of one query's prefetched nearest neighbours.
+    
+    ``search`` serves the first ``top_k`` candidates as copies, so strategies
+    sharing a pool can annotate metadata without seeing each other's changes.
+    """
+    
+    def __init__(self, documents: List[Document]):
+        self.documents = documents
+    
+    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None,
+               **kwargs) -> List[Document]:
+        return [
+            Document(content=doc.content, metadata=dict(doc.metadata or {}), id=doc.id,
+                     source=doc.source, embeddings=doc.embeddings)
+            for doc in self.documents[:top_k]
+        ]
+
+
 class HybridRetrievalStrategy(RetrievalStrategy):
     """Base class for hybrid retrieval strategies that combine multiple approaches."""
     
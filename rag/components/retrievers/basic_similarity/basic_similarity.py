@@ -56,66 +56,104 @@ class BasicSimilarityStrategy(RetrievalStrategy):
                 query_embedding=query_embedding,
                 top_k=effective_top_k
             )
-            
-            # Extract scores from metadata if available
-            scores = []
-            filtered_docs = []
-            
-            for doc in documents:
-                # Try to get similarity score directly first (for tests and some implementations)
-                similarity_score = None
-                if doc.metadata:
-                    similarity_score = doc.metadata.get('similarity_score')
-                
-                # If no direct similarity score, convert from distance
-                if similarity_score is None:
-                    distance = doc.metadata.get('_score', float('inf')) if doc.metadata else float('inf')
-                    
-                    # Convert distance to similarity score (ChromaDB returns distances, lower is better)
-                    import math
-                    scale_factor = 100.0
-                    similarity_score = math.exp(-distance / scale_factor)
-                    
-                    # Update metadata with both distance and similarity score
-                    if doc.metadata:
-                        doc.metadata['_similarity_score'] = similarity_score
-                        doc.metadata['_distance'] = distance
-                
-                # Apply similarity threshold
-                if similarity_score >= self.similarity_threshold:
-                    scores.append(similarity_score)
-                    
-                    # Clean up metadata if requested
-                    if not self.include_metadata and doc.metadata:
-                        # Remove internal scoring metadata but keep original metadata
-                        cleaned_metadata = {k: v for k, v in doc.metadata.items() 
-                                          if not k.startswith('_')}
-                        doc.metadata = cleaned_metadata
-                    
-                    filtered_docs.append(doc)
-            
-            # Create result
-            result = RetrievalResult(
-                documents=filtered_docs,
-                scores=scores,
-                strategy_metadata={
-                    "strategy": "BasicSimilarityStrategy",
-                    "version": "1.0.0",
-                    "query_embedding_dim": len(query_embedding),
-                    "similarity_threshold": self.similarity_threshold,
-                    "requested_k": top_k,
-                    "returned_count": len(filtered_docs)
-                }
-            )
+            result = self._build_result(documents, query_embedding, top_k)
             
         except Exception as e:
             logger.error(f"Error in basic similarity retrieval: {e}")
             # Let the exception bubble up for basic strategies
             raise
         
-        logger.debug(f"Retrieved {len(filtered_docs)} documents using basic similarity")
+        logger.debug(f"Retrieved {len(result.documents)} documents using basic similarity")
         return result
     
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int = 5,
+        **kwargs
+    ) -> List[RetrievalResult]:
+        """
+        Retrieve documents for several queries with one batched store search.
+        
+        Args:
+            query_embeddings: The embedded query vectors
+            vector_store: The vector store to search in
+            top_k: Maximum number of documents to return per query
+            **kwargs: Additional parameters
+            
+        Returns:
+            One RetrievalResult per query, in order
+        """
+        effective_top_k = min(top_k, self.max_results)
+        
+        try:
+            batches = self._search_batch(vector_store, query_embeddings, effective_top_k)
+        except Exception as e:
+            logger.error(f"Error in basic similarity retrieval: {e}")
+            raise
+        
+        return [
+            self._build_result(documents, query_embedding, top_k)
+            for query_embedding, documents in zip(query_embeddings, batches)
+        ]
+    
+    def candidate_pool_size(self, top_k: int, vector_store, **kwargs) -> Optional[int]:
+        """One plain search of ``min(top_k, max_results)`` neighbours."""
+        return min(top_k, self.max_results)
+    
+    def _build_result(self, documents: List[Document], query_embedding: List[float], top_k: int) -> RetrievalResult:
+        """Score, threshold and package the documents returned by the store."""
+        # Extract scores from metadata if available
+        scores = []
+        filtered_docs = []
+        
+        for doc in documents:
+            # Try to get similarity score directly first (for tests and some implementations)
+            similarity_score = None
+            if doc.metadata:
+                similarity_score = doc.metadata.get('similarity_score')
+            
+            # If no direct similarity score, convert from distance
+            if similarity_score is None:
+                distance = doc.metadata.get('_score', float('inf')) if doc.metadata else float('inf')
+                
+                # Convert distance to similarity score (ChromaDB returns distances, lower is better)
+                import math
+                scale_factor = 100.0
+                similarity_score = math.exp(-distance / scale_factor)
+                
+                # Update metadata with both distance and similarity score
+                if doc.metadata:
+                    doc.metadata['_similarity_score'] = similarity_score
+                    doc.metadata['_distance'] = distance
+            
+            # Apply similarity threshold
+            if similarity_score >= self.similarity_threshold:
+                scores.append(similarity_score)
+                
+                # Clean up metadata if requested
+                if not self.include_metadata and doc.metadata:
+                    # Remove internal scoring metadata but keep original metadata
+                    cleaned_metadata = {k: v for k, v in doc.metadata.items() 
+                                      if not k.startswith('_')}
+                    doc.metadata = cleaned_metadata
+                
+                filtered_docs.append(doc)
+        
+        return RetrievalResult(
+            documents=filtered_docs,
+            scores=scores,
+            strategy_metadata={
+                "strategy": "BasicSimilarityStrategy",
+                "version": "1.0.0",
+                "query_embedding_dim": len(query_embedding),
+                "similarity_threshold": self.similarity_threshold,
+                "requested_k": top_k,
+                "returned_count": len(filtered_docs)
+            }
+        )
+    
     def supports_vector_store(self, vector_store_type: str) -> bool:
         """Check if this strategy supports the given vector store type."""
         # Basic similarity works with any vector store that supports search
@@ -0,0 +1,190 @@
+"""BM25 retrieval strategy over the vector store's lexical index."""
+
+import logging
+from typing import List, Dict, Any, Optional
+
+from components.retrievers.base import RetrievalStrategy, RetrievalResult
+from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
+from utils.bm25_index import get_lexical_index
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Strategy(RetrievalStrategy):
+    """
+    Lexical retrieval strategy ranking chunks by Okapi BM25.
+
+    Scores the query text against the store's BM25 index (see
+    utils.bm25_index.get_lexical_index) instead of the query embedding, so exact
+    terms such as part numbers and error codes match even when their
+    embeddings do not. Combine it with a dense strategy through
+    HybridUniversalStrategy's rank fusion for sparse + dense search.
+    """
+
+    def __init__(self, name: str = "BM25Strategy", config: Optional[Dict[str, Any]] = None):
+        super().__init__(name, config)
+        config = config or {}
+
+        self.max_results = config.get("max_results", 100)
+        self.fetch_multiplier = max(config.get("fetch_multiplier", 2), 1)
+        self.default_filters = config.get("default_filters", {})
+        self._filters = MetadataFilteredStrategy()
+
+    def retrieve(
+        self,
+        query_embedding: List[float],
+        vector_store,
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> RetrievalResult:
+        """
+        Retrieve documents matching the query text's terms.
+
+        Args:
+            query_embedding: The embedded query vector (unused; kept for the common interface)
+            vector_store: The vector store whose lexical index is searched
+            top_k: Maximum number of documents to return
+            query_text: The query as typed
+            metadata_filter: Additional filters to apply
+            **kwargs: Additional parameters
+
+        Returns:
+            RetrievalResult with documents scored by normalized BM25
+        """
+        if query_text is None and len(kwargs.get("query_texts") or ()) == 1:
+            query_text = kwargs["query_texts"][0]
+        if query_text is None:
+            raise ValueError("BM25Strategy needs the query text (query_text=...)")
+        index = get_lexical_index(vector_store)
+        if index is None:
+            raise ValueError(
+                f"{getattr(vector_store, 'name', vector_store)} has no lexical index; "
+                "set lexical_index.enabled in its config"
+            )
+
+        filters = {**self.default_filters, **(metadata_filter or {})}
+        effective_top_k = min(top_k, self.max_results)
+        hits = index.search(query_text, effective_top_k * self.fetch_multiplier)
+
+        documents = []
+        scores = []
+        for doc_id, score in hits:
+            doc = vector_store.get_document(doc_id)
+            # The index can outlive deletions made directly on the store
+            if doc is None or (doc.metadata or {}).get("is_active") is False:
+                continue
+            if filters and not self._filters._matches_filters(doc, filters):
+                continue
+            documents.append(doc)
+            scores.append(score)
+            if len(documents) >= effective_top_k:
+                break
+
+        # BM25 is unbounded: scale by the best hit so scores fall in (0, 1]
+        best = scores[0] if scores else 1.0
+        normalized = [score / best for score in scores]
+        for doc, score, similarity in zip(documents, scores, normalized):
+            doc.metadata = {**(doc.metadata or {}), "bm25_score": score, "similarity_score": similarity}
+
+        logger.debug(f"Retrieved {len(documents)} documents using BM25")
+        return RetrievalResult(
+            documents=documents,
+            scores=normalized,
+            strategy_metadata={
+                "strategy": "BM25Strategy",
+                "version": "1.0.0",
+                "index_hits": len(hits),
+                "filters_applied": filters,
+                "requested_k": top_k,
+                "returned_count": len(documents)
+            }
+        )
+
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        **kwargs
+    ) -> List[RetrievalResult]:
+        """
+        Retrieve documents for several queries; ``query_texts`` pairs with ``query_embeddings``.
+        """
+        if query_texts is None and len(query_embeddings) == 1 and kwargs.get("query_text") is not None:
+            query_texts = [kwargs["query_text"]]
+        if query_texts is None or len(query_texts) != len(query_embeddings):
+            raise ValueError("BM25Strategy needs one query text per query (query_texts=...)")
+        kwargs.pop("query_text", None)
+        kwargs.pop("query_texts", None)
+        return [
+            self.retrieve(query_embedding, vector_store, top_k, query_text=query_text, **kwargs)
+            for query_embedding, query_text in zip(query_embeddings, query_texts)
+        ]
+
+    def supports_vector_store(self, vector_store_type: str) -> bool:
+        """Any store can keep a lexical index next to its vectors."""
+        return True
+
+    def get_strategy_info(self) -> Dict[str, Any]:
+        """Get information about this strategy."""
+        return {
+            "name": self.name,
+            "type": "bm25",
+            "description": "Lexical BM25 search over the store's inverted index",
+            "supported_stores": [
+                "ChromaStore", "FAISSStore", "NumpyStore", "QdrantStore", "ShardedStore"
+            ],
+            "parameters": {
+                "max_results": {
+                    "type": "int",
+                    "default": 100,
+                    "description": "Maximum number of results to return"
+                },
+                "fetch_multiplier": {
+                    "type": "int",
+                    "default": 2,
+                    "description": "Index hits fetched per requested result"
+                },
+                "default_filters": {
+                    "type": "dict",
+                    "default": {},
+                    "description": "Metadata filters always applied"
+                }
+            }
+        }
+
+    def get_config_schema(self) -> Dict[str, Any]:
+        """Get JSON schema for configuration validation."""
+        return {
+            "type": "object",
+            "properties": {
+                "max_results": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Maximum number of results to return"
+                },
+                "fetch_multiplier": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Index hits fetched per requested result"
+                },
+                "default_filters": {
+                    "type": "object",
+                    "description": "Metadata filters always applied"
+                }
+            },
+            "additionalProperties": False
+        }
+
+    def get_performance_info(self) -> Dict[str, Any]:
+        """Get performance characteristics of this strategy."""
+        return {
+            "speed": "fast",
+            "complexity": "low",
+            "memory_usage": "medium",
+            "accuracy": "high for exact terms",
+            "use_cases": ["keyword_search", "identifiers", "hybrid_search"]
+        }
@@ -0,0 +1,12 @@
+"""CrossEncoderRerank Component
+
+Component for reranking a base strategy's results with a local cross-encoder.
+"""
+
+from .cross_encoder_rerank import CrossEncoderRerankStrategy
+
+__all__ = ['CrossEncoderRerankStrategy']
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "retriever"
+COMPONENT_NAME = "cross_encoder_rerank"
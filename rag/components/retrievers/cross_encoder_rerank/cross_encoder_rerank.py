@@ -0,0 +1,373 @@
+"""Cross-encoder rerank strategy - rescore a base strategy's top-N with a local model.
+
+A cross-encoder reads the query and a chunk together, which ranks far more
+precisely than comparing two independently computed embeddings, at the cost
+of one model pass per (query, chunk) pair. This strategy keeps that cost
+bounded: only the base strategy's top ``candidates`` are scored, pairs are
+run through the model in length-sorted CPU batches (all queries of a batch
+together), scores are cached by (query hash, chunk hash), and a confident
+dense top-1 can skip the model entirely.
+
+torch and transformers are imported on first use, but must be installed for
+this module to import.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from components.retrievers.base import RetrievalStrategy, RetrievalResult
+from core.base import Document
+from utils.hash_utils import hash_content
+from utils.local_inference import length_sorted_batches, load_model_once, resolve_device
+from utils.query_cache import normalize_query
+
+if importlib.util.find_spec("torch") is None or importlib.util.find_spec("transformers") is None:
+    raise ImportError("CrossEncoderRerankStrategy requires torch and transformers")
+
+logger = logging.getLogger(__name__)
+
+ACTIVATIONS = ("sigmoid", "none")
+
+
+class PairScoreCache:
+    """Thread-safe LRU of cross-encoder scores keyed by (query hash, chunk hash)."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max(int(max_size), 1)
+        self._entries: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[Tuple[str, str]]) -> List[Optional[float]]:
+        with self._lock:
+            scores = []
+            for key in keys:
+                score = self._entries.get(key)
+                if score is not None:
+                    self._entries.move_to_end(key)
+                scores.append(score)
+            found = sum(score is not None for score in scores)
+            self.hits += found
+            self.misses += len(keys) - found
+            return scores
+
+    def put_many(self, items: List[Tuple[Tuple[str, str], float]]) -> None:
+        with self._lock:
+            for key, score in items:
+                self._entries[key] = score
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CrossEncoderRerankStrategy(RetrievalStrategy):
+    """Rerank another strategy's top candidates with a local cross-encoder.
+
+    The base strategy (``base_strategy``, basic similarity by default) returns
+    its top ``candidates``; each is scored against the query text by a
+    sequence-classification model (``model_name``) and the ``top_k`` best
+    are returned with the cross-encoder score as ``similarity_score``.
+
+    Use Cases:
+    - Precision-critical answers where the dense top-k is close but not right
+    - Sending fewer, better chunks to the LLM
+
+    Performance: Slower (one model pass per uncached pair)
+    Complexity: Medium
+    """
+
+    def __init__(self, name: str = "CrossEncoderRerankStrategy", config: Dict[str, Any] = None):
+        super().__init__(name, config)
+        config = config or {}
+        self.model_name = config.get("model_name", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+        self.device = resolve_device(config.get("device", "cpu"))
+        self.batch_size = max(config.get("batch_size", 32), 1)
+        self.max_length = config.get("max_length", 512)
+        self.cache_folder = config.get("cache_folder")
+        self.activation = config.get("activation", "sigmoid")
+        self.candidates = max(config.get("candidates", 20), 1)
+        # Skip the model when the dense top-1 is this sure (score, or lead over the runner-up)
+        self.early_exit_score = config.get("early_exit_score")
+        self.early_exit_margin = config.get("early_exit_margin")
+        self.score_cache = PairScoreCache(config.get("cache_size", 10000)) if config.get("cache_scores", True) else None
+
+        if self.activation not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation {self.activation!r}; expected one of {ACTIVATIONS}")
+
+        base_config = config.get("base_strategy", {"type": "BasicSimilarityStrategy"})
+        # Imported here: the factory module imports this one
+        from core.factories import create_retrieval_strategy_from_config
+        self.base_strategy = create_retrieval_strategy_from_config(base_config)
+
+    def load_model(self) -> Tuple[Any, Any]:
+        """The shared (tokenizer, model) pair, loaded on first call."""
+        key = ("cross-encoder", self.model_name, self.device, self.cache_folder)
+        return load_model_once(key, self._load_model)
+
+    def _load_model(self) -> Tuple[Any, Any]:
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        logger.info(f"Loading cross-encoder {self.model_name} on {self.device}")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name, cache_dir=self.cache_folder)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            self.model_name, cache_dir=self.cache_folder
+        ).to(self.device)
+        model.eval()
+        return tokenizer, model
+
+    def score_pairs(self, queries: List[str], passages: List[str]) -> np.ndarray:
+        """Cross-encoder relevance of each (query, passage) pair, as float32.
+
+        Pairs run in length-sorted batches of ``batch_size`` so each batch
+        pads to a similar length; scores come back in input order.
+        """
+        import torch
+
+        scores = np.empty(len(queries), dtype=np.float32)
+        if not len(queries):
+            return scores
+        tokenizer, model = self.load_model()
+        lengths = [query + passage for query, passage in zip(queries, passages)]
+
+        with torch.inference_mode():
+            for indices in length_sorted_batches(lengths, self.batch_size):
+                features = tokenizer(
+                    [queries[i] for i in indices], [passages[i] for i in indices],
+                    padding=True, truncation=True, max_length=self.max_length, return_tensors="pt"
+                ).to(self.device)
+                logits = model(**features).logits.to(dtype=torch.float32)
+                if logits.shape[-1] == 1:
+                    batch_scores = logits[:, 0]
+                    if self.activation == "sigmoid":
+                        batch_scores = torch.sigmoid(batch_scores)
+                else:
+                    # Classification heads: probability of the last ("relevant") label
+                    batch_scores = torch.softmax(logits, dim=-1)[:, -1]
+                scores[indices] = batch_scores.cpu().numpy()
+        return scores
+
+    def retrieve(
+        self,
+        query_embedding: List[float],
+        vector_store,
+        top_k: int = 5,
+        query_text: Optional[str] = None,
+        **kwargs
+    ) -> RetrievalResult:
+        """Retrieve with the base strategy, then rerank its top candidates.
+
+        Args:
+            query_embedding: The embedded query vector
+            vector_store: The vector store to search
+            top_k: Number of final results to return
+            query_text: The query as typed (the cross-encoder reads text, not vectors)
+            **kwargs: Additional arguments passed to the base strategy
+
+        Returns:
+            RetrievalResult with documents ordered by cross-encoder score
+        """
+        if query_text is None and len(kwargs.get("query_texts") or ()) == 1:
+            query_text = kwargs["query_texts"][0]
+        kwargs.pop("query_texts", None)
+        return self.retrieve_batch([query_embedding], vector_store, top_k, query_texts=[query_text], **kwargs)[0]
+
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int = 5,
+        query_texts: Optional[List[str]] = None,
+        **kwargs
+    ) -> List[RetrievalResult]:
+        """Rerank several queries, scoring every uncached pair of the batch together."""
+        if query_texts is None and len(query_embeddings) == 1 and kwargs.get("query_text") is not None:
+            query_texts = [kwargs["query_text"]]
+        kwargs.pop("query_text", None)
+        if query_texts is None or len(query_texts) != len(query_embeddings) or any(q is None for q in query_texts):
+            raise ValueError("CrossEncoderRerankStrategy needs the query text (query_text=... or query_texts=...)")
+
+        n_candidates = max(self.candidates, top_k)
+        if len(query_embeddings) == 1:
+            bases = [self.base_strategy.retrieve(
+                query_embeddings[0], vector_store, n_candidates, query_text=query_texts[0], **kwargs
+            )]
+        else:
+            bases = self.base_strategy.retrieve_batch(
+                query_embeddings, vector_store, n_candidates, query_texts=query_texts, **kwargs
+            )
+
+        # Collect the pairs that need the model, across all queries
+        rerank = [not self._early_exit(base.scores) for base in bases]
+        keys = [
+            [(self._query_hash(query), self._chunk_hash(doc)) for doc in base.documents[:n_candidates]]
+            if needed else []
+            for query, base, needed in zip(query_texts, bases, rerank)
+        ]
+        flat_keys = [key for query_keys in keys for key in query_keys]
+        cached = self.score_cache.get_many(flat_keys) if self.score_cache is not None else [None] * len(flat_keys)
+
+        pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        position = 0
+        for query, base, query_keys in zip(query_texts, bases, keys):
+            for doc, key in zip(base.documents, query_keys):
+                if cached[position] is None and key not in pending:
+                    pending[key] = (query, doc.content or "")
+                position += 1
+        fresh: Dict[Tuple[str, str], float] = {}
+        if pending:
+            pairs = list(pending.values())
+            scores = self.score_pairs([query for query, _ in pairs], [passage for _, passage in pairs])
+            fresh = dict(zip(pending, scores.tolist()))
+            if self.score_cache is not None:
+                self.score_cache.put_many(list(fresh.items()))
+
+        results = []
+        position = 0
+        for base, query_keys, needed in zip(bases, keys, rerank):
+            scores = []
+            for key in query_keys:
+                score = cached[position]
+                scores.append(fresh[key] if score is None else score)
+                position += 1
+            results.append(self._build_result(base, scores, top_k, needed, n_candidates))
+        return results
+
+    def _early_exit(self, base_scores: List[float]) -> bool:
+        """Whether the dense ranking is confident enough to keep as is."""
+        if not base_scores:
+            return True
+        top = base_scores[0]
+        if self.early_exit_score is not None and top >= self.early_exit_score:
+            return True
+        if self.early_exit_margin is not None:
+            runner_up = base_scores[1] if len(base_scores) > 1 else float("-inf")
+            return top - runner_up >= self.early_exit_margin
+        return False
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunk_hash(doc: Document) -> str:
+        return (doc.metadata or {}).get("chunk_hash") or hash_content(doc.content or "")
+
+    def _build_result(
+        self,
+        base: RetrievalResult,
+        scores: List[float],
+        top_k: int,
+        reranked: bool,
+        n_candidates: int
+    ) -> RetrievalResult:
+        """Order the base candidates by cross-encoder score (or keep them on early exit)."""
+        if reranked:
+            documents = base.documents[:n_candidates]
+            order = np.argsort(-np.asarray(scores, dtype=np.float64), kind="stable")[:top_k].tolist()
+            for doc, score, base_score in zip(documents, scores, base.scores):
+                doc.metadata = {
+                    **(doc.metadata or {}),
+                    "base_similarity_score": base_score,
+                    "cross_encoder_score": score,
+                    "similarity_score": score,
+                }
+            documents = [documents[i] for i in order]
+            scores = [scores[i] for i in order]
+        else:
+            documents = base.documents[:top_k]
+            scores = list(base.scores[:top_k])
+
+        return RetrievalResult(
+            documents=documents,
+            scores=scores,
+            strategy_metadata={
+                "strategy": self.name,
+                "version": "1.0.0",
+                "base_strategy": self.base_strategy.name,
+                "model_name": self.model_name,
+                "candidates_considered": min(len(base.documents), n_candidates),
+                "reranked": reranked,
+                "early_exit": not reranked,
+                "cache_size": len(self.score_cache) if self.score_cache is not None else 0,
+            }
+        )
+
+    def candidate_pool_size(self, top_k: int, vector_store, **kwargs) -> Optional[int]:
+        """Whatever the base strategy needs for its ``candidates``."""
+        return self.base_strategy.candidate_pool_size(max(self.candidates, top_k), vector_store, **kwargs)
+
+    def supports_vector_store(self, vector_store_type: str) -> bool:
+        """Supported wherever the base strategy is."""
+        return self.base_strategy.supports_vector_store(vector_store_type)
+
+    def validate_config(self) -> bool:
+        """Validate strategy configuration."""
+        if self.candidates < 1 or self.batch_size < 1:
+            return False
+        return self.base_strategy.validate_config()
+
+    def get_config_schema(self) -> Dict[str, Any]:
+        """Get configuration schema for this strategy."""
+        return {
+            "type": "object",
+            "properties": {
+                "model_name": {
+                    "type": "string",
+                    "default": "cross-encoder/ms-marco-MiniLM-L-6-v2",
+                    "description": "HuggingFace sequence-classification model or local path"
+                },
+                "base_strategy": {
+                    "type": "object",
+                    "description": "Strategy producing the candidates ({type, config})"
+                },
+                "candidates": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "default": 20,
+                    "description": "Top-N base results to rerank"
+                },
+                "batch_size": {"type": "integer", "minimum": 1, "default": 32},
+                "max_length": {"type": "integer", "minimum": 8, "default": 512},
+                "device": {"type": "string", "default": "cpu"},
+                "cache_folder": {"type": ["string", "null"], "default": None},
+                "activation": {"type": "string", "enum": list(ACTIVATIONS), "default": "sigmoid"},
+                "cache_scores": {"type": "boolean", "default": True},
+                "cache_size": {"type": "integer", "minimum": 1, "default": 10000},
+                "early_exit_score": {
+                    "type": ["number", "null"],
+                    "default": None,
+                    "description": "Skip reranking when the base top-1 score reaches this"
+                },
+                "early_exit_margin": {
+                    "type": ["number", "null"],
+                    "default": None,
+                    "description": "Skip reranking when the base top-1 leads the runner-up by this much"
+                }
+            },
+            "additionalProperties": False
+        }
+
+    def get_performance_info(self) -> Dict[str, Any]:
+        """Get performance characteristics of this strategy."""
+        return {
+            "speed": "slow",
+            "memory_usage": "high",
+            "complexity": "medium",
+            "accuracy": "very_high",
+            "best_for": ["precision_critical", "short_llm_context"],
+            "notes": f"Scores up to {self.candidates} (query, chunk) pairs per query with {self.model_name}"
+        }
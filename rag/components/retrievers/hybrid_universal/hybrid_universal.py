@@ -1,8 +1,14 @@
 """Hybrid universal strategy - combines multiple strategies with configurable weights."""
 
-from typing import List, Dict, Any
-from components.retrievers.base import RetrievalStrategy, RetrievalResult, HybridRetrievalStrategy
-from core.base import Document
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from components.retrievers.base import RetrievalStrategy, RetrievalResult, HybridRetrievalStrategy, CandidatePool
+from utils.mmr import maximal_marginal_relevance
 
 
 class HybridUniversalStrategy(HybridRetrievalStrategy):
@@ -19,6 +25,15 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
     - Scenarios where different strategies excel at different query types
     - When you want to hedge against the weaknesses of any single strategy
     
+    Sub-strategies that only read the query's nearest neighbours (see
+    RetrievalStrategy.candidate_pool_size) share one store search at the
+    largest k any of them needs; the rest run concurrently in a thread pool
+    and are dropped if they miss the ``sub_strategy_timeout`` deadline.
+    
+    With ``mmr_lambda`` set (or ``diversity_boost`` > 0), the final top-k is
+    chosen from all fused candidates by Maximal Marginal Relevance, using the
+    embeddings the store returns with the shared candidate search.
+    
     Performance: Variable (depends on sub-strategies used)
     Complexity: High
     """
@@ -36,6 +51,16 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         self.combination_method = config.get("combination_method", "weighted_average")  # weighted_average, rank_fusion
         self.normalize_scores = config.get("normalize_scores", True)
         self.diversity_boost = config.get("diversity_boost", 0.0)  # Boost for result diversity
+        # MMR trade-off: 1.0 is pure relevance, lower values favour diversity (None: off)
+        self.mmr_lambda = config.get("mmr_lambda")
+        if self.mmr_lambda is None and self.diversity_boost > 0:
+            self.mmr_lambda = 1.0 - self.diversity_boost
+        # Serve pool-compatible sub-strategies from one shared store search
+        self.shared_candidate_pool = config.get("shared_candidate_pool", True)
+        # Seconds a query waits for sub-strategies with their own store calls (None: no limit)
+        self.sub_strategy_timeout = config.get("sub_strategy_timeout", 10.0)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
         
         # Create strategy instances
         self._initialize_strategies(strategies_config)
@@ -48,6 +73,7 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         """
         # Import strategies dynamically to avoid circular imports
         from components.retrievers.basic_similarity.basic_similarity import BasicSimilarityStrategy
+        from components.retrievers.bm25.bm25 import BM25Strategy
         from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
         from components.retrievers.multi_query.multi_query import MultiQueryStrategy
         from components.retrievers.reranked.reranked import RerankedStrategy
@@ -55,15 +81,23 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         # Map strategy types to classes
         strategy_classes = {
             "BasicSimilarityStrategy": BasicSimilarityStrategy,
+            "BM25Strategy": BM25Strategy,
             "MetadataFilteredStrategy": MetadataFilteredStrategy,
             "MultiQueryStrategy": MultiQueryStrategy,
             "RerankedStrategy": RerankedStrategy,
             # Aliases for convenience
             "basic": BasicSimilarityStrategy,
+            "bm25": BM25Strategy,
             "filtered": MetadataFilteredStrategy,
             "multi_query": MultiQueryStrategy,
             "reranked": RerankedStrategy,
         }
+        try:
+            from components.retrievers.cross_encoder_rerank.cross_encoder_rerank import CrossEncoderRerankStrategy
+            strategy_classes["CrossEncoderRerankStrategy"] = CrossEncoderRerankStrategy
+            strategy_classes["cross_encoder"] = CrossEncoderRerankStrategy
+        except ImportError:
+            pass  # needs torch and transformers
         
         for strategy_config in strategies_config:
             strategy_type = strategy_config["type"]
@@ -95,37 +129,182 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         Returns:
             RetrievalResult with combined and weighted documents
         """
+        return self.retrieve_batch([query_embedding], vector_store, top_k, **kwargs)[0]
+    
+    def retrieve_batch(
+        self,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int = 5,
+        **kwargs
+    ) -> List[RetrievalResult]:
+        """Combine results from multiple strategies for several queries.
+        
+        Each sub-strategy sees all queries at once, so strategies backed by
+        VectorStore.search_batch cost one index call for the whole batch.
+        
+        Args:
+            query_embeddings: The embedded query vectors
+            vector_store: The vector store to search
+            top_k: Number of final results to return per query
+            **kwargs: Additional arguments passed to sub-strategies
+            
+        Returns:
+            One combined RetrievalResult per query, in order
+        """
         if not self.strategies:
             # Fallback to basic strategy if no strategies configured
             from components.retrievers.basic_similarity.basic_similarity import BasicSimilarityStrategy
             basic_strategy = BasicSimilarityStrategy()
-            return basic_strategy.retrieve(query_embedding, vector_store, top_k, **kwargs)
+            if len(query_embeddings) == 1:
+                return [basic_strategy.retrieve(query_embeddings[0], vector_store, top_k, **kwargs)]
+            return basic_strategy.retrieve_batch(query_embeddings, vector_store, top_k, **kwargs)
+        
+        # Sub-strategies get more results each for better combination
+        sub_k = top_k * 2
+        deadline = time.monotonic() + self.sub_strategy_timeout if self.sub_strategy_timeout else None
+        pool_sizes = [
+            strategy.candidate_pool_size(sub_k, vector_store, **kwargs) if self.shared_candidate_pool else None
+            for strategy in self.strategies
+        ]
+        pooled = [i for i, size in enumerate(pool_sizes) if size is not None]
+        own = [i for i, size in enumerate(pool_sizes) if size is None]
+        pool_k = max((pool_sizes[i] for i in pooled), default=None)
+        
+        # batches[i][q] is strategy i's result for query q
+        batches: Dict[int, List[RetrievalResult]] = {}
+        failures = {}
+        
+        def record_failure(strategy, error):
+            # Log error and continue with other strategies
+            print(f"Strategy {strategy.name} failed: {error}")
+            failures[strategy.name] = {
+                "success": False,
+                "error": str(error)
+            }
+        
+        # Strategies with their own store calls run concurrently with the shared search
+        futures = {}
+        if own and (pooled or len(own) > 1):
+            executor = self._get_executor()
+            for i in own:
+                futures[i] = executor.submit(
+                    self._run_strategy, self.strategies[i], query_embeddings, vector_store, sub_k, kwargs
+                )
+        else:
+            for i in own:
+                try:
+                    batches[i] = self._run_strategy(self.strategies[i], query_embeddings, vector_store, sub_k, kwargs)
+                except Exception as e:
+                    record_failure(self.strategies[i], e)
+        
+        # Vectors from the shared search, by document ID, for the MMR stage
+        pool_vectors = [{} for _ in query_embeddings]
+        if pooled:
+            try:
+                pools = self._search_batch(
+                    vector_store, query_embeddings, pool_k, include_embeddings=self.mmr_lambda is not None
+                )
+            except Exception as e:
+                pools = None
+                for i in pooled:
+                    record_failure(self.strategies[i], e)
+            if pools is not None:
+                if self.mmr_lambda is not None:
+                    pool_vectors = [
+                        {doc.id: doc.embeddings for doc in documents if doc.embeddings is not None}
+                        for documents in pools
+                    ]
+                # Pooled strategies see one query at a time, so each gets its own query text
+                query_kwargs = [kwargs] * len(query_embeddings)
+                if kwargs.get("query_texts") is not None:
+                    shared = {key: value for key, value in kwargs.items() if key != "query_texts"}
+                    query_kwargs = [{**shared, "query_text": text} for text in kwargs["query_texts"]]
+                for i in pooled:
+                    strategy = self.strategies[i]
+                    try:
+                        batches[i] = [
+                            strategy.retrieve(query_embedding, CandidatePool(documents), sub_k, **extra)
+                            for query_embedding, documents, extra in zip(query_embeddings, pools, query_kwargs)
+                        ]
+                    except Exception as e:
+                        record_failure(strategy, e)
+        
+        for i, future in futures.items():
+            try:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                batches[i] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                record_failure(self.strategies[i], f"timed out after {self.sub_strategy_timeout}s")
+            except Exception as e:
+                record_failure(self.strategies[i], e)
+        
+        # Keep configuration order: weights are matched to results by position
+        per_strategy = [(self.strategies[i], batches[i]) for i in sorted(batches)]
+        results = [
+            self._combine([(strategy, batch[q]) for strategy, batch in per_strategy], failures, top_k, pool_vectors[q])
+            for q in range(len(query_embeddings))
+        ]
+        for result in results:
+            result.strategy_metadata["candidate_pool_size"] = pool_k
+        return results
+    
+    def _run_strategy(
+        self,
+        strategy: RetrievalStrategy,
+        query_embeddings: List[List[float]],
+        vector_store,
+        top_k: int,
+        kwargs: Dict[str, Any]
+    ) -> List[RetrievalResult]:
+        """Run one sub-strategy against the store for every query."""
+        # A lone query goes through retrieve() so overrides of it still apply
+        if len(query_embeddings) == 1:
+            return [strategy.retrieve(query_embeddings[0], vector_store, top_k, **kwargs)]
+        return strategy.retrieve_batch(query_embeddings, vector_store, top_k, **kwargs)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for sub-strategies that make their own store calls."""
+        with self._executor_lock:
+            if self._executor is None:
+                # Room for a few concurrent queries' worth of sub-strategies
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4 * max(len(self.strategies), 1), thread_name_prefix=f"{self.name}-sub"
+                )
+            return self._executor
+    
+    def _combine(
+        self,
+        strategy_results: List[tuple],
+        failures: Dict[str, Dict[str, Any]],
+        top_k: int,
+        pool_vectors: Optional[Dict[str, Any]] = None
+    ) -> RetrievalResult:
+        """Combine one query's sub-strategy results into a single result.
         
-        # Get results from all strategies
+        Args:
+            strategy_results: (strategy, RetrievalResult) pairs for the strategies that succeeded
+            failures: Performance entries for the strategies that failed
+            top_k: Number of final results to return
+            pool_vectors: Candidate embeddings by document ID, for MMR
+            
+        Returns:
+            Combined RetrievalResult with hybrid metadata
+        """
         results = []
         strategy_performances = {}
         
-        for strategy in self.strategies:
-            try:
-                # Get more results from each strategy for better combination
-                result = strategy.retrieve(query_embedding, vector_store, top_k * 2, **kwargs)
-                results.append(result)
-                
-                # Track strategy performance
-                strategy_performances[strategy.name] = {
-                    "documents_found": len(result.documents),
-                    "average_score": sum(result.scores) / len(result.scores) if result.scores else 0.0,
-                    "success": True
-                }
-                
-            except Exception as e:
-                # Log error and continue with other strategies
-                print(f"Strategy {strategy.name} failed: {e}")
-                strategy_performances[strategy.name] = {
-                    "success": False,
-                    "error": str(e)
-                }
-                continue
+        for strategy, result in strategy_results:
+            results.append(result)
+            
+            # Track strategy performance
+            strategy_performances[strategy.name] = {
+                "documents_found": len(result.documents),
+                "average_score": sum(result.scores) / len(result.scores) if result.scores else 0.0,
+                "success": True
+            }
+        strategy_performances.update(failures)
         
         if not results:
             # No strategies succeeded
@@ -140,12 +319,18 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
                 }
             )
         
+        # MMR picks the final top_k from every fused candidate
+        fused_k = sum(len(result.documents) for result in results) if self.mmr_lambda is not None else top_k
+        
         # Combine results using the specified method
         if self.combination_method == "rank_fusion":
-            combined_result = self._rank_fusion_combine(results, top_k)
+            combined_result = self._rank_fusion_combine(results, fused_k)
         else:
             # Default to weighted average
-            combined_result = self.combine_results(results, top_k)
+            combined_result = self.combine_results(results, fused_k)
+        
+        if self.mmr_lambda is not None:
+            combined_result = self._apply_mmr(combined_result, top_k, pool_vectors or {})
         
         # Add hybrid-specific metadata
         combined_result.strategy_metadata.update({
@@ -154,7 +339,8 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
             "num_strategies": len(self.strategies),
             "strategy_performances": strategy_performances,
             "normalize_scores": self.normalize_scores,
-            "diversity_boost": self.diversity_boost
+            "diversity_boost": self.diversity_boost,
+            "mmr_lambda": self.mmr_lambda
         })
         
         return combined_result
@@ -217,43 +403,44 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
             }
         )
     
-    def _apply_diversity_boost(self, documents: List[Document], scores: List[float]) -> tuple[List[Document], List[float]]:
-        """Apply diversity boost to reduce redundancy in results.
+    def _apply_mmr(self, result: RetrievalResult, top_k: int, pool_vectors: Dict[str, Any]) -> RetrievalResult:
+        """Re-select the top_k fused candidates by Maximal Marginal Relevance.
+        
+        Relevance is the fused score scaled to [0, 1]; redundancy is the cosine
+        between candidate embeddings. Candidates without a known vector (e.g.
+        found only by BM25) are never counted as redundant.
         
         Args:
-            documents: List of documents
-            scores: Corresponding scores
+            result: Fused result holding every candidate, best first
+            top_k: Number of final results to return
+            pool_vectors: Candidate embeddings by document ID from the shared search
             
         Returns:
-            Tuple of (documents, scores) with diversity adjustments
+            The result narrowed to top_k documents in MMR order
         """
-        if self.diversity_boost <= 0 or len(documents) <= 1:
-            return documents, scores
-        
-        # Simple diversity heuristic: reduce scores for very similar content
-        adjusted_docs = []
-        adjusted_scores = []
-        seen_content_hashes = set()
-        
-        for doc, score in zip(documents, scores):
-            # Create a simple content hash for similarity detection
-            content_hash = hash(doc.content[:200])  # Use first 200 chars
-            
-            if content_hash in seen_content_hashes:
-                # Apply diversity penalty
-                adjusted_score = score * (1 - self.diversity_boost)
-            else:
-                adjusted_score = score
-                seen_content_hashes.add(content_hash)
-            
-            adjusted_docs.append(doc)
-            adjusted_scores.append(adjusted_score)
-        
-        # Re-sort by adjusted scores
-        combined = list(zip(adjusted_docs, adjusted_scores))
-        combined.sort(key=lambda x: x[1], reverse=True)
-        
-        return [doc for doc, _ in combined], [score for _, score in combined]
+        documents, scores = result.documents, result.scores
+        vectors = [
+            doc.embeddings if doc.embeddings is not None else pool_vectors.get(doc.id)
+            for doc in documents
+        ]
+        dimension = next((len(vector) for vector in vectors if vector is not None), None)
+        result.strategy_metadata["mmr_candidates"] = len(documents)
+        if dimension is None or len(documents) <= 1:
+            result.documents, result.scores = documents[:top_k], scores[:top_k]
+            return result
+        
+        matrix = np.zeros((len(documents), dimension), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            if vector is not None and len(vector) == dimension:
+                matrix[i] = vector
+        relevance = np.asarray(scores, dtype=np.float64)
+        spread = relevance.max() - relevance.min()
+        relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones(len(relevance))
+        
+        order = maximal_marginal_relevance(relevance, matrix, top_k, self.mmr_lambda)
+        result.documents = [documents[i] for i in order]
+        result.scores = [scores[i] for i in order]
+        return result
     
     def supports_vector_store(self, vector_store_type: str) -> bool:
         """Check if all sub-strategies support the vector store."""
@@ -280,9 +467,11 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
         if self.combination_method not in ["weighted_average", "rank_fusion"]:
             return False
         
-        # Check diversity boost range
+        # Check diversity boost and MMR trade-off ranges
         if not (0 <= self.diversity_boost <= 1):
             return False
+        if self.mmr_lambda is not None and not (0 <= self.mmr_lambda <= 1):
+            return False
         
         # Validate all sub-strategies
         return all(strategy.validate_config() for strategy in self.strategies)
@@ -308,7 +497,25 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
                     "minimum": 0,
                     "maximum": 1,
                     "default": 0.0,
-                    "description": "Boost factor for result diversity (reduces redundancy)"
+                    "description": "Result diversity; shorthand for mmr_lambda = 1 - diversity_boost"
+                },
+                "mmr_lambda": {
+                    "type": ["number", "null"],
+                    "minimum": 0,
+                    "maximum": 1,
+                    "default": None,
+                    "description": "Select the final results by MMR: 1.0 is pure relevance, lower favours diversity"
+                },
+                "shared_candidate_pool": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Serve sub-strategies that only read the nearest neighbours from one shared search"
+                },
+                "sub_strategy_timeout": {
+                    "type": ["number", "null"],
+                    "minimum": 0,
+                    "default": 10.0,
+                    "description": "Seconds to wait for sub-strategies with their own store calls (null: no limit)"
                 },
                 "strategies": {
                     "type": "array",
@@ -318,9 +525,9 @@ class HybridUniversalStrategy(HybridRetrievalStrategy):
                         "properties": {
                             "type": {
                                 "type": "string",
-                                "enum": ["BasicSimilarityStrategy", "MetadataFilteredStrategy", 
-                                        "MultiQueryStrategy", "RerankedStrategy", 
-                                        "basic", "filtered", "multi_query", "reranked"]
+                                "enum": ["BasicSimilarityStrategy", "BM25Strategy", "CrossEncoderRerankStrategy",
+                                        "MetadataFilteredStrategy", "MultiQueryStrategy", "RerankedStrategy", 
+                                        "basic", "bm25", "cross_encoder", "filtered", "multi_query", "reranked"]
                             },
                             "weight": {
                                 "type": "number",
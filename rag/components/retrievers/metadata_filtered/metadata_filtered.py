@@ -93,6 +93,21 @@ class MetadataFilteredStrategy(RetrievalStrategy):
             }
         )
     
+    def candidate_pool_size(
+        self,
+        top_k: int,
+        vector_store,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Optional[int]:
+        """Neighbours to post-filter; None when the store filters natively (its own call)."""
+        filters = {**self.default_filters, **(metadata_filter or {})}
+        if not filters:
+            return top_k
+        if hasattr(vector_store, 'search_with_filter'):
+            return None
+        return top_k * self.fallback_multiplier
+    
     def _filter_documents(self, documents: List[Document], filters: Dict[str, Any]) -> List[Document]:
         """Filter documents by metadata - universal implementation.
         
@@ -20,7 +20,7 @@ class MultiQueryStrategy(RetrievalStrategy):
     - Complex questions that benefit from multiple search approaches
     - Improving recall when initial queries miss relevant content
     
-    Performance: Medium (multiple searches required)
+    Performance: Medium (one batched search over all variations)
     Complexity: Medium
     """
     
@@ -64,11 +64,14 @@ class MultiQueryStrategy(RetrievalStrategy):
         doc_objects = {}
         total_searches = 0
         
-        for i, query_var in enumerate(query_variations):
-            documents = vector_store.search(
-                query_embedding=query_var,
-                top_k=top_k * self.search_multiplier  # Get more results for aggregation
-            )
+        # All variations go to the store in one batched search
+        batches = self._search_batch(
+            vector_store,
+            query_variations,
+            top_k * self.search_multiplier  # Get more results for aggregation
+        )
+        
+        for documents in batches:
             total_searches += 1
             
             for doc in documents:
@@ -196,5 +199,5 @@ class MultiQueryStrategy(RetrievalStrategy):
             "complexity": "medium",
             "accuracy": "high",
             "best_for": ["ambiguous_queries", "recall_optimization", "complex_questions"],
-            "notes": f"Performs {self.num_queries} searches, good for improving recall"
+            "notes": f"Searches {self.num_queries} query variations in one batch, good for improving recall"
         }
\ No newline at end of file
@@ -1,8 +1,32 @@
 """Reranked strategy - sophisticated multi-factor relevance scoring."""
 
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
 from components.retrievers.base import RetrievalStrategy, RetrievalResult
 from core.base import Document
+from utils.timestamps import EPOCH_FIELD, TIMESTAMP_FIELD, timestamp_to_epoch
+
+# Boost per (lowercased) metadata value; override per field with config["metadata_boosts"]
+DEFAULT_METADATA_BOOSTS = {
+    "priority": {"critical": 0.5, "high": 0.3, "medium": 0.1},
+    "type": {
+        "faq": 0.3, "troubleshooting": 0.3,
+        "documentation": 0.2, "tutorial": 0.2, "guide": 0.2,
+        "policy": 0.1, "procedure": 0.1,
+    },
+    "category": {"important": 0.15, "featured": 0.15, "recommended": 0.15},
+}
+# Boost for each of these metadata flags that is truthy
+FLAG_BOOSTS = {"verified": 0.1, "expert_reviewed": 0.1}
+# Recency boost by age: up to 1 day, 7 days, 30 days, 90 days, older
+RECENCY_AGE_DAYS = np.array([1, 7, 30, 90], dtype=np.float64)
+RECENCY_BOOSTS = np.array([1.0, 0.8, 0.5, 0.2, 0.0])
+SECONDS_PER_DAY = 86400.0
+# Distinct raw values remembered per boosted field (metadata values are usually a small set)
+MAX_MEMOIZED_VALUES = 4096
 
 
 class RerankedStrategy(RetrievalStrategy):
@@ -34,6 +58,13 @@ class RerankedStrategy(RetrievalStrategy):
         })
         self.distance_metric = config.get("distance_metric", "cosine")
         self.length_normalization = config.get("length_normalization", 1000)  # Characters to normalize by
+        
+        # Compile the boost tables once: field -> {lowercased value: boost}
+        self.metadata_boosts = {
+            field: {str(value).lower(): float(boost) for value, boost in table.items()}
+            for field, table in {**DEFAULT_METADATA_BOOSTS, **config.get("metadata_boosts", {})}.items()
+        }
+        self._boost_memo: Dict[str, Dict[str, float]] = {field: {} for field in self.metadata_boosts}
     
     def retrieve(
         self,
@@ -61,28 +92,20 @@ class RerankedStrategy(RetrievalStrategy):
             top_k=initial_k
         )
         
-        candidates = []
+        base_scores = np.array([doc.metadata.get("similarity_score", 0.0) for doc in documents], dtype=np.float64)
+        final_scores = self._rerank_scores(documents, base_scores)
         
-        for doc in documents:
-            # Base similarity score from vector search
-            base_score = doc.metadata.get("similarity_score", 0.0)
-            
-            # Apply re-ranking factors to get final score
-            final_score = self._rerank_score(base_score, doc.content, doc.metadata)
-            
-            # Store both scores in metadata for transparency
+        # Store both scores in metadata for transparency
+        for doc, base_score, final_score in zip(documents, base_scores.tolist(), final_scores.tolist()):
             doc.metadata["similarity_score"] = final_score
             doc.metadata["base_similarity_score"] = base_score
             doc.metadata["rerank_boost"] = final_score - base_score
-            
-            candidates.append((doc, final_score))
-        
-        # Sort by re-ranked score and take top_k
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        top_candidates = candidates[:top_k]
         
-        documents = [doc for doc, _ in top_candidates]
-        scores = [score for _, score in top_candidates]
+        # Sort by re-ranked score (ties keep search order) and take top_k
+        order = np.argsort(-final_scores, kind="stable")[:top_k]
+        candidates_considered = len(documents)
+        documents = [documents[i] for i in order.tolist()]
+        scores = final_scores[order].tolist()
         
         return RetrievalResult(
             documents=documents,
@@ -92,81 +115,99 @@ class RerankedStrategy(RetrievalStrategy):
                 "version": "1.0.0",
                 "initial_k": initial_k,
                 "rerank_factors": self.rerank_factors,
-                "candidates_considered": len(candidates),
+                "candidates_considered": candidates_considered,
                 "average_boost": sum(doc.metadata["rerank_boost"] for doc in documents) / len(documents) if documents else 0
             }
         )
     
-    def _rerank_score(self, base_score: float, content: str, metadata: Dict[str, Any]) -> float:
-        """Apply re-ranking factors to base similarity score.
+    def candidate_pool_size(self, top_k: int, vector_store, **kwargs) -> Optional[int]:
+        """The ``initial_k`` candidates that get re-ranked."""
+        return max(self.initial_k, top_k * 2)
+    
+    def _rerank_scores(self, documents: List[Document], base_scores: np.ndarray) -> np.ndarray:
+        """Apply re-ranking factors to every candidate's base similarity score at once.
         
         Args:
-            base_score: Original similarity score from vector search
-            content: Document content for length-based factors
-            metadata: Document metadata for various boosts
+            documents: Candidates from the vector search
+            base_scores: Their similarity scores from the vector search
             
         Returns:
-            Re-ranked final score
+            Re-ranked final scores, one per document
         """
-        final_score = base_score
+        final_scores = base_scores.astype(np.float64, copy=True)
+        if not documents:
+            return final_scores
         
         # Recency boost (if timestamp available)
-        if "timestamp" in metadata and self.rerank_factors.get("recency", 0) > 0:
-            recency_boost = self._calculate_recency_boost(metadata["timestamp"])
-            final_score += self.rerank_factors["recency"] * recency_boost
+        if self.rerank_factors.get("recency", 0) > 0:
+            epochs = np.array([self._epoch(doc.metadata) for doc in documents], dtype=np.float64)
+            final_scores += self.rerank_factors["recency"] * self._recency_boosts(epochs)
         
         # Length factor (configurable preference for content length)
         if self.rerank_factors.get("length", 0) > 0:
-            length_factor = min(len(content) / self.length_normalization, 1.0)
-            length_boost = self.rerank_factors["length"] * length_factor
-            final_score += length_boost
+            lengths = np.array([len(doc.content) for doc in documents], dtype=np.float64)
+            final_scores += self.rerank_factors["length"] * np.minimum(lengths / self.length_normalization, 1.0)
         
         # Metadata-based boosts
         if self.rerank_factors.get("metadata_boost", 0) > 0:
-            metadata_boost = self._calculate_metadata_boost(metadata)
-            final_score += self.rerank_factors["metadata_boost"] * metadata_boost
+            final_scores += self.rerank_factors["metadata_boost"] * self._metadata_boosts(
+                [doc.metadata for doc in documents]
+            )
+        
+        return final_scores
+    
+    @staticmethod
+    def _epoch(metadata: Dict[str, Any]) -> float:
+        """Ingest-time epoch of a chunk, parsing ``timestamp`` only for chunks stored before it existed."""
+        epoch = metadata.get(EPOCH_FIELD)
+        if epoch is None and TIMESTAMP_FIELD in metadata:
+            epoch = timestamp_to_epoch(metadata[TIMESTAMP_FIELD])
+        return np.nan if epoch is None else epoch
+    
+    @staticmethod
+    def _recency_boosts(epochs: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """Recency boost per epoch (0.0 to 1.0); NaN (no timestamp) gets none."""
+        age_days = np.floor(((time.time() if now is None else now) - epochs) / SECONDS_PER_DAY)
+        boosts = RECENCY_BOOSTS[np.searchsorted(RECENCY_AGE_DAYS, np.nan_to_num(age_days, nan=np.inf))]
+        return np.where(np.isnan(epochs), 0.0, boosts)
+    
+    def _metadata_boosts(self, metadatas: List[Dict[str, Any]]) -> np.ndarray:
+        """Metadata boost per document: table lookups, flags and view counts, capped at 1.0."""
+        boosts = np.zeros(len(metadatas), dtype=np.float64)
+        for field in self.metadata_boosts:
+            boosts += np.array([self._value_boost(field, metadata.get(field)) for metadata in metadatas])
+        for flag, flag_boost in FLAG_BOOSTS.items():
+            boosts += flag_boost * np.array([bool(metadata.get(flag, False)) for metadata in metadatas])
         
-        return final_score
+        # Normalize view count boost (log scale to prevent domination, max 0.2)
+        views = np.array([
+            view_count if isinstance(view_count, (int, float)) and view_count > 0 else 0
+            for view_count in (metadata.get("view_count", 0) for metadata in metadatas)
+        ], dtype=np.float64)
+        boosts += np.minimum(np.log10(views + 1) / 4, 0.2)
+        return np.minimum(boosts, 1.0)  # Cap total metadata boost at 1.0
     
-    def _calculate_recency_boost(self, timestamp: str) -> float:
+    def _value_boost(self, field: str, value: Any) -> float:
+        """Boost for one metadata value, memoized per raw value so repeats skip lowercasing."""
+        memo = self._boost_memo[field]
+        boost = memo.get(value) if isinstance(value, str) else 0.0
+        if boost is None:
+            boost = self.metadata_boosts[field].get(value.lower(), 0.0)
+            if len(memo) < MAX_MEMOIZED_VALUES:
+                memo[value] = boost
+        return boost
+    
+    def _calculate_recency_boost(self, timestamp: Any) -> float:
         """Calculate recency boost based on document timestamp.
         
         Args:
-            timestamp: Document timestamp (ISO format expected)
+            timestamp: Document timestamp (ISO string, datetime or epoch seconds)
             
         Returns:
             Recency boost factor (0.0 to 1.0)
         """
-        try:
-            from datetime import datetime, timezone
-            # Try to import dateutil, fall back gracefully if not available
-            try:
-                import dateutil.parser
-            except ImportError:
-                return 0.0  # No boost if dateutil not available
-            
-            # Parse the timestamp
-            doc_time = dateutil.parser.parse(timestamp)
-            current_time = datetime.now(timezone.utc)
-            
-            # Calculate age in days
-            age_days = (current_time - doc_time).days
-            
-            # Apply decay function (newer = higher boost)
-            if age_days <= 1:
-                return 1.0  # Maximum boost for very recent
-            elif age_days <= 7:
-                return 0.8  # High boost for past week
-            elif age_days <= 30:
-                return 0.5  # Medium boost for past month
-            elif age_days <= 90:
-                return 0.2  # Low boost for past quarter
-            else:
-                return 0.0  # No boost for older content
-                
-        except (ImportError, ValueError, TypeError):
-            # If timestamp parsing fails, no boost
-            return 0.0
+        epoch = timestamp_to_epoch(timestamp)
+        return float(self._recency_boosts(np.array([np.nan if epoch is None else epoch]))[0])
     
     def _calculate_metadata_boost(self, metadata: Dict[str, Any]) -> float:
         """Calculate boost based on metadata signals.
@@ -177,46 +218,7 @@ class RerankedStrategy(RetrievalStrategy):
         Returns:
             Metadata boost factor
         """
-        boost = 0.0
-        
-        # Priority-based boosts
-        priority = metadata.get("priority", "").lower()
-        if priority == "high":
-            boost += 0.3
-        elif priority == "medium":
-            boost += 0.1
-        elif priority == "critical":
-            boost += 0.5
-        
-        # Type-based boosts
-        doc_type = metadata.get("type", "").lower()
-        if doc_type in ["documentation", "tutorial", "guide"]:
-            boost += 0.2
-        elif doc_type in ["faq", "troubleshooting"]:
-            boost += 0.3
-        elif doc_type in ["policy", "procedure"]:
-            boost += 0.1
-        
-        # Category-based boosts
-        category = metadata.get("category", "").lower()
-        if category in ["important", "featured", "recommended"]:
-            boost += 0.15
-        
-        # Quality indicators
-        if metadata.get("verified", False):
-            boost += 0.1
-        if metadata.get("expert_reviewed", False):
-            boost += 0.1
-        
-        # Usage statistics
-        view_count = metadata.get("view_count", 0)
-        if isinstance(view_count, (int, float)) and view_count > 0:
-            # Normalize view count boost (log scale to prevent domination)
-            import math
-            view_boost = min(math.log10(view_count + 1) / 4, 0.2)  # Max 0.2 boost
-            boost += view_boost
-        
-        return min(boost, 1.0)  # Cap total metadata boost at 1.0
+        return float(self._metadata_boosts([metadata])[0])
     
     def supports_vector_store(self, vector_store_type: str) -> bool:
         """This is universal - supports all vector stores."""
@@ -258,6 +260,14 @@ class RerankedStrategy(RetrievalStrategy):
                     "default": 1000,
                     "description": "Character count to normalize length factor by"
                 },
+                "metadata_boosts": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "additionalProperties": {"type": "number"}
+                    },
+                    "description": "Boost tables {field: {value: boost}} replacing the defaults per field"
+                },
                 "rerank_factors": {
                     "type": "object",
                     "properties": {
@@ -86,7 +86,9 @@ class DatabaseCapabilities:
             "native_filtering": True,
             "filter_operators": ["$eq", "$ne", "$in", "$nin", "$gt", "$lt", "$gte", "$lte", "$range"],
             "payload_indexing": True,
-            "notes": "High performance, advanced filtering, clustering support"
+            "embedded_mode": True,
+            "quantization": ["scalar"],
+            "notes": "Embedded (local path) or server; native filtering, payload indexes and quantization on server"
         },
         
         "MilvusStore": {
@@ -107,15 +109,47 @@ class DatabaseCapabilities:
         "FAISSStore": {
             "supported": [
                 "basic_similarity",
+                "metadata_filtering",
                 "batch_operations",
                 "distance_metrics"
             ],
             "distance_metrics": ["L2", "IP", "COSINE"],
+            "index_types": ["Flat", "IVF", "HNSW", "LSH"],
             "max_batch_size": 10000,
-            "native_filtering": False,  # Requires post-processing
+            "native_filtering": True,  # SQLite sidecar resolves filters to an ID selector
+            "filter_operators": ["$eq", "$ne", "$in", "$nin", "$gt", "$lt", "$gte", "$lte"],
             "approximate_search": True,
             "gpu_support": True,
-            "notes": "Fastest pure vector search, minimal metadata support"
+            "notes": "Fastest in-process vector search, no server required"
+        },
+
+        "NumpyStore": {
+            "supported": [
+                "basic_similarity",
+                "metadata_filtering",
+                "batch_operations",
+                "distance_metrics"
+            ],
+            "distance_metrics": ["cosine", "ip", "l2"],
+            "max_batch_size": 10000,
+            "native_filtering": True,  # Columnar sidecar evaluated as vectorised masks
+            "filter_operators": ["$eq", "$ne", "$in", "$nin", "$gt", "$lt", "$gte", "$lte"],
+            "approximate_search": False,
+            "notes": "Exact, deterministic search over a memory-mapped matrix; best under ~200k chunks"
+        },
+
+        "ShardedStore": {
+            "supported": [
+                "basic_similarity",
+                "metadata_filtering",
+                "batch_operations",
+                "distance_metrics"
+            ],
+            "max_batch_size": 10000,
+            "native_filtering": True,  # Each shard filters with its own store's filtering
+            "filter_operators": ["$eq", "$ne", "$in", "$nin", "$gt", "$lt", "$gte", "$lte"],
+            "distributed": True,
+            "notes": "Partitions by document hash across several stores; scatter-gather search"
         }
     }
     
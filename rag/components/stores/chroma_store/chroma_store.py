@@ -3,12 +3,16 @@
 import json
 import logging
 import math
+import sqlite3
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from core.base import VectorStore, Document
-from utils.hash_utils import DeduplicationTracker
+from utils.change_marker import ChangeMarker
+from utils.hash_utils import DeduplicationTracker, PersistentDeduplicationTracker
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +27,10 @@ class ChromaStore(VectorStore):
         self.persist_directory = config.get("persist_directory", "./chroma_db")
         self.host = config.get("host")
         self.port = config.get("port")
-        self.embedding_dimension = max(config.get("embedding_dimension", 768), 1)  # Ensure positive
+        # Only set when configured; otherwise the collection's vectors decide
+        self.embedding_dimension = config.get("embedding_dimension")
+        if self.embedding_dimension is not None:
+            self.embedding_dimension = max(self.embedding_dimension, 1)  # Ensure positive
         
         # Get distance metric from config, default to cosine for best compatibility
         self.distance_metric = config.get("distance_metric", "cosine")
@@ -47,7 +54,44 @@ class ChromaStore(VectorStore):
         
         # Initialize deduplication tracker
         self.deduplication_enabled = config.get("enable_deduplication", True)
-        self.dedup_tracker = DeduplicationTracker() if self.deduplication_enabled else None
+        self.dedup_tracker = self._create_dedup_tracker(config) if self.deduplication_enabled else None
+
+        # Upper bound for a single add/upsert/get call (also capped by the client)
+        self.batch_size = max(config.get("batch_size", 1000), 1)
+        self.last_add_stats: Dict[str, int] = {"inserted": 0, "skipped": 0, "batches": 0}
+        # Whether any chunk is soft-deleted (and how many); None until checked.
+        # Local clients re-check only when the soft-delete marker changes, which
+        # any process soft-deleting, restoring or purging chunks bumps.
+        self._has_soft_deleted: Optional[bool] = None
+        self._deleted_count: Optional[int] = None
+        self._soft_delete_marker = None if (self.host and self.port) else ChangeMarker(
+            Path(self.persist_directory) / f"{self.collection_name}.soft_deletes"
+        )
+        self._soft_delete_token = self._soft_delete_marker.read() if self._soft_delete_marker else None
+
+    def _create_dedup_tracker(self, config: Dict[str, Any]) -> DeduplicationTracker:
+        """Create the hash tracker, persisted next to the collection for local clients."""
+        if (self.host and self.port) or not config.get("persistent_deduplication", True):
+            return DeduplicationTracker()
+
+        tracker = PersistentDeduplicationTracker(
+            Path(self.persist_directory) / f"{self.collection_name}.dedup.sqlite3"
+        )
+        # A tracker that outlived its collection would skip everything; start over
+        if tracker.db_path.exists() and self.collection is not None and self.collection.count() == 0:
+            tracker.clear()
+        return tracker
+
+    def get_dimension(self) -> Optional[int]:
+        """Dimension of the vectors already in the collection, else the configured one."""
+        try:
+            if self.collection is not None and self.collection.count():
+                stored = self.collection.get(limit=1, include=["embeddings"])["embeddings"]
+                if stored is not None and len(stored):
+                    return len(stored[0])
+        except Exception as e:
+            logger.warning(f"Could not read the collection's embedding dimension: {e}")
+        return self.embedding_dimension
 
     def validate_config(self) -> bool:
         """Validate configuration."""
@@ -92,7 +136,7 @@ class ChromaStore(VectorStore):
             Parsed metadata with nested objects restored
         """
         parsed = {}
-        for key, value in metadata.items():
+        for key, value in (metadata or {}).items():
             if isinstance(value, str):
                 # Try to parse as JSON if it looks like JSON
                 if value.startswith('{') or value.startswith('['):
@@ -107,207 +151,441 @@ class ChromaStore(VectorStore):
                 parsed[key] = value
         return parsed
 
+    def _clean_metadata(self, doc: Document) -> Dict[str, Any]:
+        """Flatten document metadata into the scalar types ChromaDB accepts."""
+        # ChromaDB only accepts str, int, float, bool
+        cleaned_metadata = {}
+
+        # Always include the source if available
+        if doc.source:
+            cleaned_metadata['source'] = doc.source
+
+        if doc.metadata:
+            for key, value in doc.metadata.items():
+                if value is None:
+                    # Skip None values as ChromaDB doesn't accept them
+                    continue
+                elif isinstance(value, (str, int, float, bool)):
+                    cleaned_metadata[key] = value
+                elif isinstance(value, list):
+                    # Convert lists to comma-separated strings (no spaces after commas for test compatibility)
+                    # Filter out None values from lists
+                    filtered_list = [str(v) for v in value if v is not None]
+                    if filtered_list:  # Only add if list is not empty after filtering
+                        cleaned_metadata[key] = ",".join(filtered_list)
+                elif isinstance(value, dict):
+                    # Convert dicts to JSON string, filtering out None values
+                    filtered_dict = {k: v for k, v in value.items() if v is not None}
+                    if filtered_dict:  # Only add if dict is not empty after filtering
+                        cleaned_metadata[key] = json.dumps(filtered_dict)
+                else:
+                    # Convert other types to string
+                    str_value = str(value)
+                    if str_value != 'None':  # Don't add string representations of None
+                        cleaned_metadata[key] = str_value
+
+        return cleaned_metadata
+
+    def _max_batch_size(self) -> int:
+        """Largest batch to send in a single ChromaDB call."""
+        try:
+            client_limit = self.client.get_max_batch_size()
+        except Exception:
+            client_limit = self.batch_size
+        return max(1, min(self.batch_size, client_limit))
+
+    def _existing_ids(self, doc_ids: List[str]) -> set:
+        """Return the subset of ``doc_ids`` already stored, using chunked bulk lookups."""
+        existing = set()
+        chunk_size = self._max_batch_size()
+        for start in range(0, len(doc_ids), chunk_size):
+            chunk = doc_ids[start:start + chunk_size]
+            try:
+                results = self.collection.get(ids=chunk, include=[])
+                existing.update(results.get('ids') or [])
+            except Exception as e:
+                logger.warning(f"Bulk existence check failed, assuming new documents: {e}")
+        return existing
+
     def add_documents(self, documents: List[Document]) -> bool:
-        """Add documents to the vector store with deduplication support."""
+        """Add documents to the vector store with deduplication support.
+
+        Existing IDs are resolved with a few chunked ``get`` calls rather than one
+        lookup per document, and writes go out in bounded batches. Counts of
+        inserted, skipped and batched documents are kept in ``last_add_stats``.
+        """
+        self.last_add_stats = {"inserted": 0, "skipped": 0, "batches": 0}
         try:
             if not documents:
                 return True
 
-            # Prepare data for ChromaDB
-            ids = []
-            embeddings = []
-            metadatas = []
-            documents_content = []
+            candidates = []
             skipped_duplicates = 0
+            seen_ids = set()
+
+            # Resolve known chunk hashes in bulk rather than per document. Chunks are
+            # registered only after their batch is written, so a document whose
+            # earlier ingest stopped part-way still gets its missing chunks.
+            known_chunks = set()
+            if self.deduplication_enabled and self.dedup_tracker:
+                known_chunks = self.dedup_tracker.known_chunks(
+                    doc.metadata['chunk_hash'] for doc in documents
+                    if doc.metadata and doc.metadata.get('chunk_hash')
+                )
 
             for doc in documents:
-                if not doc.embeddings:
+                if doc.embeddings is None or len(doc.embeddings) == 0:
                     logger.warning(f"Document {doc.id} has no embeddings, skipping")
                     continue
 
-                # Check for duplicates if deduplication is enabled
-                if self.deduplication_enabled and self.dedup_tracker and doc.metadata:
-                    document_hash = doc.metadata.get('document_hash')
-                    chunk_hash = doc.metadata.get('chunk_hash')
-                    source_hash = doc.metadata.get('source_hash')
-                    
-                    # Check if this document or chunk already exists
-                    is_duplicate_doc = document_hash and self.dedup_tracker.is_duplicate_document(document_hash)
-                    is_duplicate_chunk = chunk_hash and self.dedup_tracker.is_duplicate_chunk(chunk_hash)
-                    is_duplicate_source = source_hash and self.dedup_tracker.is_duplicate_source(source_hash)
-                    
-                    if is_duplicate_doc or is_duplicate_chunk or is_duplicate_source:
-                        logger.debug(f"Skipping duplicate document {doc.id}")
-                        skipped_duplicates += 1
-                        continue
-                    
-                    # Check if document already exists in ChromaDB by ID
-                    if self._document_exists(doc.id):
-                        logger.debug(f"Document {doc.id} already exists in collection, skipping")
-                        skipped_duplicates += 1
-                        continue
-                    
-                    # Register in dedup tracker
-                    if document_hash:
-                        self.dedup_tracker.register_document(document_hash, doc.id, source_hash or "")
-                    if chunk_hash:
-                        self.dedup_tracker.register_chunk(chunk_hash, doc.id)
-
-                ids.append(doc.id or f"doc_{len(ids)}")
-                embeddings.append(doc.embeddings)
-                
-                # Clean metadata - ChromaDB only accepts str, int, float, bool, None
-                cleaned_metadata = {}
-                
-                # Always include the source if available
-                if doc.source:
-                    cleaned_metadata['source'] = doc.source
-                
-                if doc.metadata:
-                    for key, value in doc.metadata.items():
-                        if value is None:
-                            # Skip None values as ChromaDB doesn't accept them
-                            continue
-                        elif isinstance(value, (str, int, float, bool)):
-                            cleaned_metadata[key] = value
-                        elif isinstance(value, list):
-                            # Convert lists to comma-separated strings (no spaces after commas for test compatibility)
-                            # Filter out None values from lists
-                            filtered_list = [str(v) for v in value if v is not None]
-                            if filtered_list:  # Only add if list is not empty after filtering
-                                cleaned_metadata[key] = ",".join(filtered_list)
-                        elif isinstance(value, dict):
-                            # Convert dicts to JSON string, filtering out None values
-                            import json
-                            filtered_dict = {k: v for k, v in value.items() if v is not None}
-                            if filtered_dict:  # Only add if dict is not empty after filtering
-                                cleaned_metadata[key] = json.dumps(filtered_dict)
-                        else:
-                            # Convert other types to string
-                            str_value = str(value)
-                            if str_value != 'None':  # Don't add string representations of None
-                                cleaned_metadata[key] = str_value
-                
-                metadatas.append(cleaned_metadata)
-                documents_content.append(doc.content)
+                doc_id = doc.id or f"doc_{len(candidates)}"
+                # ChromaDB rejects repeated IDs within a single write
+                if doc_id in seen_ids:
+                    skipped_duplicates += 1
+                    continue
+                seen_ids.add(doc_id)
+
+                # Check for already stored chunks if deduplication is enabled
+                chunk_hash = doc.metadata.get('chunk_hash') if doc.metadata else None
+                if chunk_hash and chunk_hash in known_chunks:
+                    logger.debug(f"Skipping duplicate chunk {doc.id}")
+                    skipped_duplicates += 1
+                    continue
+
+                candidates.append((doc_id, doc))
 
-            if not ids:
+            # Resolve every candidate ID against the collection in bulk
+            if self.deduplication_enabled and candidates:
+                existing_ids = self._existing_ids([doc_id for doc_id, _ in candidates])
+                if existing_ids:
+                    logger.debug(f"{len(existing_ids)} documents already exist in collection, skipping")
+                    skipped_duplicates += len(existing_ids)
+                    candidates = [(doc_id, doc) for doc_id, doc in candidates if doc_id not in existing_ids]
+
+            if not candidates:
+                self.last_add_stats["skipped"] = skipped_duplicates
                 logger.warning("No valid documents with embeddings to add (all may be duplicates)")
                 return True
 
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                documents=documents_content
-            )
+            # With deduplication on, only new IDs remain, so a plain add is enough;
+            # otherwise upsert so re-ingested IDs overwrite their previous version
+            write = self.collection.add if self.deduplication_enabled else self.collection.upsert
+            batch_size = self._max_batch_size()
+            inserted = 0
+            batches = 0
+            stored_documents = {}
+
+            for start in range(0, len(candidates), batch_size):
+                batch = candidates[start:start + batch_size]
+                write(
+                    ids=[doc_id for doc_id, _ in batch],
+                    embeddings=[doc.embeddings for _, doc in batch],
+                    # ChromaDB rejects empty metadata dicts but accepts None
+                    metadatas=[self._clean_metadata(doc) or None for _, doc in batch],
+                    documents=[doc.content for _, doc in batch]
+                )
+                inserted += len(batch)
+                batches += 1
+
+                # Register chunks in the dedup tracker once the batch is stored
+                if self.deduplication_enabled and self.dedup_tracker:
+                    chunk_entries = []
+                    for doc_id, doc in batch:
+                        if not doc.metadata:
+                            continue
+                        document_hash = doc.metadata.get('document_hash')
+                        if doc.metadata.get('chunk_hash'):
+                            chunk_entries.append((doc.metadata['chunk_hash'], doc_id, document_hash))
+                        if document_hash and document_hash not in stored_documents:
+                            stored_documents[document_hash] = (doc_id, doc.metadata.get('source_hash') or "")
+                    if chunk_entries:
+                        self.dedup_tracker.register_chunks(chunk_entries)
+
+                self.last_add_stats.update(inserted=inserted, batches=batches)
+
+            # Documents are recorded for hash/source lookups only; ingest never
+            # skips a whole document because it was seen before
+            for document_hash, (doc_id, source_hash) in stored_documents.items():
+                self.dedup_tracker.register_document(document_hash, doc_id, source_hash)
+
+            self.last_add_stats["skipped"] = skipped_duplicates
 
             if skipped_duplicates > 0:
-                logger.info(f"Added {len(ids)} documents, skipped {skipped_duplicates} duplicates")
+                logger.info(f"Added {inserted} documents in {batches} batches, skipped {skipped_duplicates} duplicates")
             else:
-                logger.info(f"Added {len(ids)} documents to ChromaDB collection")
+                logger.info(f"Added {inserted} documents to ChromaDB collection in {batches} batches")
             return True
 
         except Exception as e:
             logger.error(f"Failed to add documents to ChromaDB: {e}")
             return False
 
-    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
-        """Search for similar documents."""
+    def _query_documents(self, results: Dict[str, Any], q: int) -> List[Document]:
+        """Build Documents for one query's row of a collection.query() result."""
+        documents = []
+        # Present only when the query asked for them (include_embeddings)
+        embeddings = results.get('embeddings') if results else None
+        embeddings = embeddings[q] if embeddings is not None else None
+        if results and results['ids'] and results['ids'][q]:
+            for i, doc_id in enumerate(results['ids'][q]):
+                content = results['documents'][q][i] if results['documents'] and results['documents'][q] else ""
+                metadata = results['metadatas'][q][i] if results['metadatas'] and results['metadatas'][q] else {}
+                
+                # Parse JSON strings in metadata (ChromaDB stores nested objects as JSON)
+                metadata = self._parse_metadata(metadata)
+                
+                # Add distance/score to metadata
+                # Convert distance to similarity score (ChromaDB returns distances, lower is better)
+                if results['distances'] and results['distances'][q]:
+                    distance = results['distances'][q][i]
+                    metadata['_score'] = distance  # Keep original distance for reference
+                    
+                    # Convert distance to similarity score based on metric type
+                    if self.distance_metric == "cosine":
+                        # Cosine distance: 0 = identical, 2 = opposite
+                        # Convert to similarity: 1 - (distance / 2)
+                        if distance == 0:
+                            similarity = 1.0
+                        elif distance >= 2:
+                            similarity = 0.0
+                        else:
+                            similarity = 1.0 - (distance / 2.0)
+                    
+                    elif self.distance_metric == "l2":
+                        # L2 (Euclidean) distance: 0 = identical, larger = more different
+                        # For unnormalized embeddings, distances can be very large
+                        # Use inverse transformation with scaling
+                        if distance == 0:
+                            similarity = 1.0
+                        else:
+                            # Adjust scale based on typical embedding norms
+                            # This maps distances to similarities in range (0, 1]
+                            similarity = 1.0 / (1.0 + distance / 100.0)
+                    
+                    elif self.distance_metric == "ip":
+                        # Inner product: higher = more similar (opposite of distance)
+                        # For normalized embeddings, ranges from -1 to 1
+                        # ChromaDB may return negative of IP as distance
+                        similarity = max(0.0, min(1.0, (1.0 + distance) / 2.0))
+                    
+                    else:
+                        # Fallback for unknown metrics
+                        similarity = 1.0 / (1.0 + distance)
+                    
+                    metadata['similarity_score'] = similarity
+
+                # Preserve source from metadata if available
+                # Try multiple fields that might contain the source
+                source = (metadata.get('file_path') or 
+                         metadata.get('source') or 
+                         metadata.get('file_name') or
+                         'unknown')
+                
+                doc = Document(
+                    id=doc_id,
+                    content=content,
+                    metadata=metadata,
+                    source=source
+                )
+                if embeddings is not None:
+                    doc.embeddings = np.asarray(embeddings[i], dtype=np.float32)
+                documents.append(doc)
+
+        return documents
+
+    def search_batch(self, query_embeddings: List[List[float]], top_k: int = 10,
+                     where: Optional[Dict[str, Any]] = None,
+                     include_embeddings: bool = False) -> List[List[Document]]:
+        """Search several queries with a single collection.query() call."""
         try:
-            if query_embedding is None:
-                # If no embedding provided, we can't search
-                # In a real implementation, you'd embed the query here
-                logger.warning("No query embedding provided for search")
+            if not len(query_embeddings):
                 return []
 
             query_params = {
-                "query_embeddings": [query_embedding],
+                "query_embeddings": list(query_embeddings),
                 "n_results": top_k
             }
-            
+            if include_embeddings:
+                query_params["include"] = ["documents", "metadatas", "distances", "embeddings"]
+
+            # Soft-deleted chunks are excluded inside ChromaDB; the clause is
+            # only added while there are any, so it costs nothing otherwise
+            if self._any_soft_deleted():
+                where = {"$and": [where, self._ACTIVE_CLAUSE]} if where else self._ACTIVE_CLAUSE
+
             # Add metadata filtering if provided
             if where:
                 query_params["where"] = where
 
             results = self.collection.query(**query_params)
-
-            documents = []
-            if results and results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    content = results['documents'][0][i] if results['documents'] and results['documents'][0] else ""
-                    metadata = results['metadatas'][0][i] if results['metadatas'] and results['metadatas'][0] else {}
-                    
-                    # Parse JSON strings in metadata (ChromaDB stores nested objects as JSON)
-                    metadata = self._parse_metadata(metadata)
-                    
-                    # Add distance/score to metadata
-                    # Convert distance to similarity score (ChromaDB returns distances, lower is better)
-                    if results['distances'] and results['distances'][0]:
-                        distance = results['distances'][0][i]
-                        metadata['_score'] = distance  # Keep original distance for reference
-                        
-                        # Convert distance to similarity score based on metric type
-                        if self.distance_metric == "cosine":
-                            # Cosine distance: 0 = identical, 2 = opposite
-                            # Convert to similarity: 1 - (distance / 2)
-                            if distance == 0:
-                                similarity = 1.0
-                            elif distance >= 2:
-                                similarity = 0.0
-                            else:
-                                similarity = 1.0 - (distance / 2.0)
-                        
-                        elif self.distance_metric == "l2":
-                            # L2 (Euclidean) distance: 0 = identical, larger = more different
-                            # For unnormalized embeddings, distances can be very large
-                            # Use inverse transformation with scaling
-                            if distance == 0:
-                                similarity = 1.0
-                            else:
-                                # Adjust scale based on typical embedding norms
-                                # This maps distances to similarities in range (0, 1]
-                                similarity = 1.0 / (1.0 + distance / 100.0)
-                        
-                        elif self.distance_metric == "ip":
-                            # Inner product: higher = more similar (opposite of distance)
-                            # For normalized embeddings, ranges from -1 to 1
-                            # ChromaDB may return negative of IP as distance
-                            similarity = max(0.0, min(1.0, (1.0 + distance) / 2.0))
-                        
-                        else:
-                            # Fallback for unknown metrics
-                            similarity = 1.0 / (1.0 + distance)
-                        
-                        metadata['similarity_score'] = similarity
-
-                    # Preserve source from metadata if available
-                    # Try multiple fields that might contain the source
-                    source = (metadata.get('file_path') or 
-                             metadata.get('source') or 
-                             metadata.get('file_name') or
-                             'unknown')
-                    
-                    doc = Document(
-                        id=doc_id,
-                        content=content,
-                        metadata=metadata,
-                        source=source
-                    )
-                    documents.append(doc)
-
-            return documents
+            return [self._query_documents(results, q) for q in range(len(query_embeddings))]
 
         except Exception as e:
             logger.error(f"Failed to search ChromaDB: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+
+    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        """Search for similar documents."""
+        if query_embedding is None:
+            # If no embedding provided, we can't search
+            # In a real implementation, you'd embed the query here
+            logger.warning("No query embedding provided for search")
+            return []
+        return self.search_batch([query_embedding], top_k=top_k, where=where,
+                                 include_embeddings=kwargs.get("include_embeddings", False))[0]
+
+    # Operators understood by both MetadataFilteredStrategy and ChromaDB's where clause
+    _WHERE_OPERATORS = ("$eq", "$ne", "$in", "$nin", "$gt", "$gte", "$lt", "$lte")
+
+    @classmethod
+    def _build_where(cls, metadata_filter: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Translate a strategy metadata filter into a ChromaDB ``where`` clause.
+
+        Plain values mean equality, lists mean ``$in`` and dicts carry operators.
+        ChromaDB allows one operator per clause, so multiple conditions are
+        combined with ``$and``.
+        """
+        if not metadata_filter:
+            return None
+
+        clauses = []
+        for key, value in metadata_filter.items():
+            if isinstance(value, list):
+                clauses.append({key: {"$in": value}})
+            elif isinstance(value, dict):
+                for op, operand in value.items():
+                    if op not in cls._WHERE_OPERATORS:
+                        raise ValueError(f"Unsupported filter operator: {op}")
+                    if op in ("$in", "$nin"):
+                        operand = list(operand)
+                    clauses.append({key: {op: operand}})
+            else:
+                clauses.append({key: {"$eq": value}})
+
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def search_with_filter(self, query_embedding: List[float], top_k: int = 10,
+                           metadata_filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Search with the filter applied inside ChromaDB rather than after the fact."""
+        try:
+            where = self._build_where(metadata_filter)
+        except ValueError as e:
+            logger.error(f"Failed to translate metadata filter: {e}")
             return []
+        return self.search(query_embedding=query_embedding, top_k=top_k, where=where)
+
+    # Chunks without is_active also match $ne, so only soft-deleted ones are dropped
+    _ACTIVE_CLAUSE = {"is_active": {"$ne": False}}
+    _DELETED_CLAUSE = {"is_active": False}
+
+    def _refresh_soft_delete_state(self) -> None:
+        """Forget cached soft-delete facts if another writer may have changed them."""
+        if self._soft_delete_marker is None:
+            # Other clients of the server can soft-delete at any time
+            self._has_soft_deleted = None
+            self._deleted_count = None
+            return
+        token = self._soft_delete_marker.read()
+        if token != self._soft_delete_token:
+            self._soft_delete_token = token
+            self._has_soft_deleted = None
+            self._deleted_count = None
+
+    def _soft_deletes_changed(self) -> None:
+        """Invalidate cached soft-delete facts here and in other processes."""
+        self._has_soft_deleted = None
+        self._deleted_count = None
+        if self._soft_delete_marker is not None:
+            try:
+                self._soft_delete_token = self._soft_delete_marker.bump()
+            except OSError as e:
+                logger.warning(f"Failed to update soft-delete marker: {e}")
+
+    def _count_soft_deleted(self) -> int:
+        """Count soft-deleted chunks a page of IDs at a time."""
+        self._refresh_soft_delete_state()
+        if self._deleted_count is None:
+            page_size = self._max_batch_size()
+            count = 0
+            while True:
+                page = self.collection.get(
+                    where=self._DELETED_CLAUSE, limit=page_size, offset=count, include=[]
+                ).get('ids') or []
+                count += len(page)
+                if len(page) < page_size:
+                    break
+            self._deleted_count = count
+            self._has_soft_deleted = count > 0
+        return self._deleted_count
+
+    def _any_soft_deleted(self) -> bool:
+        self._refresh_soft_delete_state()
+        if self._has_soft_deleted is None:
+            try:
+                found = self.collection.get(where=self._DELETED_CLAUSE, limit=1, include=[])
+                self._has_soft_deleted = bool(found.get('ids'))
+            except Exception as e:
+                logger.warning(f"Could not check for soft-deleted documents: {e}")
+                return False
+        return self._has_soft_deleted
+
+    def update_metadata(self, where: Dict[str, Any], updates: Dict[str, Any]) -> int:
+        """Merge ``updates`` into the metadata of matching chunks."""
+        results = self.collection.get(where=self._build_where(where), include=[])
+        doc_ids = results.get('ids') or []
+        metadata = self._clean_metadata(Document(content="", metadata=updates))
+        batch_size = self._max_batch_size()
+        for start in range(0, len(doc_ids), batch_size):
+            batch = doc_ids[start:start + batch_size]
+            self.collection.update(ids=batch, metadatas=[metadata] * len(batch))
+        self._soft_deletes_changed()
+        logger.info(f"Updated metadata of {len(doc_ids)} documents in ChromaDB")
+        return len(doc_ids)
+
+    def purge_deleted(self, limit: Optional[int] = None) -> int:
+        """Delete soft-deleted chunks and vacuum the local SQLite file."""
+        results = self.collection.get(where=self._DELETED_CLAUSE, limit=limit, include=["metadatas"])
+        doc_ids = results.get('ids') or []
+        if doc_ids:
+            self._forget_documents(doc_ids, results.get('metadatas') or [])
+            batch_size = self._max_batch_size()
+            for start in range(0, len(doc_ids), batch_size):
+                self.collection.delete(ids=doc_ids[start:start + batch_size])
+            self._vacuum()
+        self._soft_deletes_changed()
+        logger.info(f"Purged {len(doc_ids)} soft-deleted documents from ChromaDB")
+        return len(doc_ids)
+
+    def _vacuum(self):
+        """Give pages freed by deletes back to the filesystem (local clients only)."""
+        db_path = Path(self.persist_directory) / "chroma.sqlite3"
+        if (self.host and self.port) or not db_path.exists():
+            return
+        try:
+            conn = sqlite3.connect(str(db_path))
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to vacuum {db_path}: {e}")
+
+    def storage_bytes(self) -> int:
+        """Bytes used by the local persist directory (0 for HTTP clients)."""
+        if self.host and self.port:
+            return 0
+        return super().storage_bytes()
 
     def delete_collection(self) -> bool:
         """Delete the collection."""
         try:
             self.client.delete_collection(name=self.collection_name)
+            self._soft_deletes_changed()
             logger.info(f"Deleted collection: {self.collection_name}")
+            if self.dedup_tracker:
+                self.dedup_tracker.clear()
             # Recreate collection for continued use
             self._setup_collection()
             return True
@@ -339,6 +617,9 @@ class ChromaStore(VectorStore):
     def delete_documents(self, doc_ids: List[str]) -> bool:
         """Delete documents by IDs."""
         try:
+            if self.dedup_tracker:
+                results = self.collection.get(ids=doc_ids, include=["metadatas"])
+                self._forget_documents(results.get('ids') or [], results.get('metadatas') or [])
             self.collection.delete(ids=doc_ids)
             logger.info(f"Deleted {len(doc_ids)} documents from ChromaDB")
             return True
@@ -357,6 +638,7 @@ class ChromaStore(VectorStore):
             
             if results and results['ids']:
                 doc_ids = results['ids']
+                self._forget_documents(doc_ids, results.get('metadatas') or [])
                 self.collection.delete(ids=doc_ids)
                 logger.info(f"Deleted {len(doc_ids)} documents with hash {document_hash[:12]}...")
                 return True
@@ -387,6 +669,7 @@ class ChromaStore(VectorStore):
                     
                     if results and results['ids']:
                         doc_ids = results['ids']
+                        self._forget_documents(doc_ids, results.get('metadatas') or [])
                         self.collection.delete(ids=doc_ids)
                         total_deleted += len(doc_ids)
                         
@@ -405,22 +688,28 @@ class ChromaStore(VectorStore):
             logger.error(f"Failed to delete documents by source: {e}")
             return False
             
+    def _forget_documents(self, doc_ids: List[str], metadatas: List[Optional[Dict[str, Any]]]):
+        """Drop deleted chunks and their parent documents from the dedup tracker."""
+        if not self.dedup_tracker:
+            return
+        document_hashes = {m.get('document_hash') for m in metadatas if m and m.get('document_hash')}
+        self.dedup_tracker.unregister_documents(document_hashes)
+        self.dedup_tracker.unregister_chunks(doc_ids)
+
     def _document_exists(self, doc_id: str) -> bool:
         """Check if a document with the given ID already exists."""
-        try:
-            results = self.collection.get(ids=[doc_id], include=[])
-            return bool(results and results['ids'] and doc_id in results['ids'])
-        except Exception:
-            return False
+        return doc_id in self._existing_ids([doc_id])
 
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection."""
         try:
             count = self.collection.count()
+            deleted_count = self._count_soft_deleted()
             return {
                 "name": self.collection_name,
                 "count": count,  # Keep as "count" for test compatibility
                 "document_count": count,  # Also provide "document_count" for other uses
+                "deleted_count": deleted_count,
                 "persist_directory": self.persist_directory
             }
         except Exception as e:
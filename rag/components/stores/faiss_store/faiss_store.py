@@ -0,0 +1,911 @@
+"""FAISS vector store implementation.
+
+Runs entirely in-process: vectors live in a FAISS index that is written to
+``persist_directory`` and document content/metadata live in a SQLite sidecar
+next to it, keyed by the integer IDs FAISS uses internally.
+
+With ``quantization`` set, the index holds float16, int8 or PQ codes and the
+full-precision vectors are appended to ``<collection>.vectors.f32`` on disk,
+where they are memory-mapped to re-score the top candidates exactly.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from core.base import VectorStore, Document
+from utils.quantization import QUANTIZATION_MODES, largest_divisor
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement
+SQLITE_MAX_VARIABLES = 900
+
+
+class FaissStore(VectorStore):
+    """FAISS vector store with a SQLite metadata sidecar.
+
+    Supported index types:
+    - Flat: exact search
+    - IVF: inverted file index, trained once enough vectors have arrived
+      to fit every list; searched exactly until then
+    - HNSW: graph index; deletions are tombstoned and compacted on demand
+    - LSH: binary hashing, smallest memory footprint
+
+    Flat, IVF and HNSW can store quantized codes (float16, int8 or PQ).
+    """
+
+    INDEX_TYPES = ["Flat", "IVF", "HNSW", "LSH"]
+    METRICS = ["L2", "IP", "Cosine"]
+
+    def __init__(self, name: str = "FaissStore", config: Optional[Dict[str, Any]] = None):
+        super().__init__(name, config)
+        config = config or {}
+        self.collection_name = config.get("collection_name", "documents")
+        self.persist_directory = config.get("persist_directory", "./data/faiss_db")
+        self.dimension = config.get("dimension")
+        self.index_type = config.get("index_type", "Flat")
+        self.metric = config.get("metric", "L2")
+        self.nlist = max(config.get("nlist", 100), 1)
+        self.nprobe = max(config.get("nprobe", 10), 1)
+        self.hnsw_m = max(config.get("hnsw_m", 32), 2)
+        self.ef_construction = max(config.get("ef_construction", 200), 1)
+        self.ef_search = max(config.get("ef_search", 64), 1)
+        self.lsh_nbits = config.get("lsh_nbits")
+        self.use_gpu = config.get("use_gpu", False)
+        self.auto_persist = config.get("auto_persist", True)
+        # Rebuild an HNSW index once this fraction of its vectors are tombstones
+        self.compaction_threshold = config.get("compaction_threshold", 0.2)
+        self.deduplication_enabled = config.get("enable_deduplication", True)
+        self.quantization = config.get("quantization", "none")
+        self.pq_m = max(config.get("pq_m", 8), 1)
+        self.pq_nbits = min(max(config.get("pq_nbits", 8), 1), 16)
+        # Re-score the top rescore_factor * top_k quantized candidates exactly
+        self.rescore = config.get("rescore", True)
+        self.rescore_factor = max(config.get("rescore_factor", 4), 1)
+
+        if self.index_type not in self.INDEX_TYPES:
+            logger.warning(f"Invalid index type '{self.index_type}', using 'Flat'")
+            self.index_type = "Flat"
+        if self.metric not in self.METRICS:
+            logger.warning(f"Invalid metric '{self.metric}', using 'L2'")
+            self.metric = "L2"
+        if self.quantization not in QUANTIZATION_MODES:
+            logger.warning(f"Invalid quantization '{self.quantization}', using 'none'")
+            self.quantization = "none"
+        if self.quantization != "none" and self.index_type == "LSH":
+            logger.warning("LSH already stores binary codes, ignoring quantization")
+            self.quantization = "none"
+
+        persist_path = Path(self.persist_directory)
+        persist_path.mkdir(parents=True, exist_ok=True)
+        self.index_path = persist_path / f"{self.collection_name}.faiss"
+        self.metadata_path = persist_path / f"{self.collection_name}.sqlite3"
+        self.vectors_path = persist_path / f"{self.collection_name}.vectors.f32"
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.metadata_path), check_same_thread=False)
+        self._setup_metadata_store()
+
+        self.index = None
+        self._next_id = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._vectors_unavailable_logged = False
+        # Integer IDs of soft-deleted chunks, loaded lazily and reset on every write
+        self._inactive_ids: Optional[np.ndarray] = None
+        # Sidecar rows, soft-deleted ones included; kept in step with every write
+        self._chunk_count = 0
+        self._load_index()
+
+    def validate_config(self) -> bool:
+        """Validate configuration."""
+        if self.dimension is not None and self.dimension < 1:
+            logger.error(f"Invalid dimension: {self.dimension}")
+            return False
+        return True
+
+    def _setup_metadata_store(self):
+        """Create the metadata sidecar tables if they don't exist."""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    int_id INTEGER PRIMARY KEY,
+                    doc_id TEXT UNIQUE NOT NULL,
+                    content TEXT,
+                    metadata TEXT,
+                    source TEXT,
+                    document_hash TEXT,
+                    source_hash TEXT,
+                    file_path TEXT,
+                    is_active INTEGER NOT NULL DEFAULT 1
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(chunks)")}
+            if "is_active" not in columns:
+                # Sidecars written before soft deletion existed
+                self._conn.execute("ALTER TABLE chunks ADD COLUMN is_active INTEGER NOT NULL DEFAULT 1")
+                self._conn.execute(
+                    "UPDATE chunks SET is_active = 0 WHERE json_extract(metadata, '$.is_active') = 0"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            for column in ("document_hash", "source_hash", "file_path", "source", "is_active"):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_chunks_{column} ON chunks({column})"
+                )
+
+    def _load_index(self):
+        """Load a persisted index or defer creation until the first add."""
+        if self.index_path.exists():
+            index = faiss.read_index(str(self.index_path))
+            if self.dimension and index.d != self.dimension:
+                logger.warning(
+                    f"Persisted index dimension {index.d} overrides configured {self.dimension}"
+                )
+            self.dimension = index.d
+            self.index = self._to_device(index)
+            logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors from {self.index_path}")
+
+        row = self._conn.execute("SELECT value FROM store_info WHERE key = 'next_id'").fetchone()
+        if row is not None:
+            self._next_id = int(row[0])
+        else:
+            max_row = self._conn.execute("SELECT MAX(int_id) FROM chunks").fetchone()[0]
+            self._next_id = max_row + 1 if max_row is not None else 0
+        self._chunk_count = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def _to_device(self, index):
+        """Move an index to GPU when requested and available."""
+        if self.use_gpu and hasattr(faiss, "StandardGpuResources"):
+            self._gpu_resources = faiss.StandardGpuResources()
+            return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index)
+        if self.use_gpu:
+            logger.warning("GPU requested but this FAISS build has no GPU support, using CPU")
+        return index
+
+    def _to_cpu(self, index):
+        """Return a CPU copy of an index suitable for serialization."""
+        if hasattr(faiss, "index_gpu_to_cpu") and self.use_gpu and hasattr(faiss, "StandardGpuResources"):
+            return faiss.index_gpu_to_cpu(index)
+        return index
+
+    def _faiss_metric(self) -> int:
+        """Map the configured metric to a FAISS metric type."""
+        if self.metric in ("IP", "Cosine"):
+            return faiss.METRIC_INNER_PRODUCT
+        return faiss.METRIC_L2
+
+    def _pq_params(self, training_count: int) -> Tuple[int, int]:
+        """Sub-quantizer count dividing the dimension and bits the training set can support."""
+        m = largest_divisor(self.dimension, self.pq_m)
+        if m != self.pq_m:
+            logger.warning(f"pq_m={self.pq_m} does not divide dimension {self.dimension}, using {m}")
+        nbits = self.pq_nbits
+        if training_count < 2 ** nbits:
+            nbits = max(int(np.log2(max(training_count, 2))), 1)
+            logger.warning(
+                f"PQ needs at least {2 ** self.pq_nbits} training vectors, got {training_count}; "
+                f"reducing pq_nbits to {nbits}"
+            )
+        return m, nbits
+
+    def _scalar_type(self) -> int:
+        if self.quantization == "float16":
+            return faiss.ScalarQuantizer.QT_fp16
+        return faiss.ScalarQuantizer.QT_8bit
+
+    def _create_index(self, training_vectors: np.ndarray):
+        """Build an empty index of the configured type, training it if required."""
+        dim = self.dimension
+        metric = self._faiss_metric()
+        quantized = self.quantization != "none"
+        if self.index_type == "IVF" and len(training_vectors) < self._ivf_training_size():
+            # Too few vectors to fit the centroids; hold them in a flat index
+            # until _maybe_train_ivf has a large enough sample
+            return self._to_device(faiss.IndexIDMap2(faiss.IndexFlat(dim, metric)))
+        if self.quantization == "pq":
+            pq_m, pq_nbits = self._pq_params(len(training_vectors))
+
+        if self.index_type == "IVF":
+            nlist = self.nlist
+            quantizer = faiss.IndexFlat(dim, metric)
+            if self.quantization == "pq":
+                base = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, pq_nbits, metric)
+            elif quantized:
+                base = faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, self._scalar_type(), metric)
+            else:
+                base = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+            base.train(training_vectors)
+            base.nprobe = min(self.nprobe, nlist)
+            # IVF takes arbitrary IDs natively; an IDMap on top would break
+            # on removal because IVF doesn't renumber its internal labels
+            return self._to_device(base)
+        elif self.index_type == "HNSW":
+            ef_construction = self.ef_construction
+            if self.quantization == "pq":
+                base = faiss.IndexHNSWPQ(dim, pq_m, self.hnsw_m, pq_nbits, metric)
+                # Graphs built over PQ codes lose recall above FAISS's default of 40
+                ef_construction = min(ef_construction, 40)
+            elif quantized:
+                base = faiss.IndexHNSWSQ(dim, self._scalar_type(), self.hnsw_m, metric)
+            else:
+                base = faiss.IndexHNSWFlat(dim, self.hnsw_m, metric)
+            base.hnsw.efConstruction = ef_construction
+            base.hnsw.efSearch = self.ef_search
+        elif self.index_type == "LSH":
+            base = faiss.IndexLSH(dim, self.lsh_nbits or dim * 2)
+        elif self.quantization == "pq":
+            base = faiss.IndexPQ(dim, pq_m, pq_nbits, metric)
+        elif quantized:
+            base = faiss.IndexScalarQuantizer(dim, self._scalar_type(), metric)
+        else:
+            base = faiss.IndexFlat(dim, metric)
+
+        if not base.is_trained:
+            base.train(training_vectors)
+        return self._to_device(faiss.IndexIDMap2(base))
+
+    def _ivf_training_size(self) -> int:
+        """Vectors needed before an IVF index is trained.
+
+        FAISS k-means wants 39 points per centroid, and PQ codebooks need at
+        least one point per code.
+        """
+        size = self.nlist * 39
+        if self.quantization == "pq":
+            size = max(size, 2 ** self.pq_nbits)
+        return size
+
+    def _maybe_train_ivf(self):
+        """Replace a flat warm-up index (or one trained with fewer lists) with the real IVF.
+
+        Vectors come from the vectors file when rescoring keeps one, else from
+        the current index; every stored chunk is re-added under its integer ID.
+        """
+        if self.index_type != "IVF" or self.index is None:
+            return
+        cpu_index = self._to_cpu(self.index)
+        ivf = faiss.try_extract_index_ivf(cpu_index)
+        if ivf is not None and ivf.nlist >= self.nlist:
+            return
+        if cpu_index.ntotal < self._ivf_training_size():
+            return
+
+        ids = np.fromiter((row[0] for row in self._conn.execute("SELECT int_id FROM chunks")), dtype=np.int64)
+        vectors = self._exact_vectors(ids) if self._rescoring else None
+        if vectors is None:
+            if ivf is not None:
+                # IVF lists only map IDs back to vectors with a direct map
+                ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+            vectors = cpu_index.reconstruct_batch(ids)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        index = self._create_index(vectors)
+        index.add_with_ids(vectors, ids)
+        self.index = index
+        logger.info(f"Trained IVF index with nlist={self.nlist} on {len(ids)} vectors")
+
+    @property
+    def _rescoring(self) -> bool:
+        """Quantized search re-scores candidates against the vectors file."""
+        return self.quantization != "none" and self.rescore
+
+    @property
+    def _takes_search_params(self) -> bool:
+        """LSH and flat PQ indexes reject per-query search parameters."""
+        return self.index_type != "LSH" and not (self.index_type == "Flat" and self.quantization == "pq")
+
+    def _append_vectors(self, first_id: int, vectors: np.ndarray):
+        """Write full-precision rows at their integer-ID offset in the vectors file.
+
+        IDs are never reused, so the file only grows; rows of deleted chunks
+        stay on disk but are never read.
+        """
+        offset = first_id * self.dimension * 4
+        mode = "r+b" if self.vectors_path.exists() else "w+b"
+        with open(self.vectors_path, mode) as f:
+            f.seek(0, 2)
+            if f.tell() < offset:
+                f.truncate(offset)
+            f.seek(offset)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._vectors = None
+
+    def _exact_vectors(self, int_ids: np.ndarray) -> Optional[np.ndarray]:
+        """Full-precision vectors for integer IDs, or None if they were never written."""
+        if self._vectors is None:
+            if not self.vectors_path.exists() or self.vectors_path.stat().st_size == 0:
+                return None
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r").reshape(-1, self.dimension)
+        if not len(int_ids) or int(int_ids.max()) >= len(self._vectors):
+            return None
+        return np.asarray(self._vectors[int_ids])
+
+    def _stored_vectors(self, int_ids: List[int]) -> Dict[int, np.ndarray]:
+        """Vectors by integer ID, or {} when the index can't give them back."""
+        if not int_ids:
+            return {}
+        ids = np.asarray(int_ids, dtype=np.int64)
+        vectors = self._exact_vectors(ids) if self._rescoring else None
+        if vectors is None:
+            try:
+                vectors = np.stack([self.index.reconstruct(int(i)) for i in ids])
+            except Exception as e:
+                # IVF indexes keep no direct map from IDs to vectors
+                if not self._vectors_unavailable_logged:
+                    logger.warning(f"FAISS index can't return stored vectors: {e}")
+                    self._vectors_unavailable_logged = True
+                return {}
+        return dict(zip(int_ids, vectors))
+
+    def get_dimension(self) -> Optional[int]:
+        """Dimension of the index, once it has been built or configured."""
+        return self.dimension
+
+    def _prepare_vectors(self, vectors: List[List[float]]) -> np.ndarray:
+        """Convert embeddings to a contiguous float32 matrix, normalizing for cosine."""
+        matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32))
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if self.metric == "Cosine":
+            faiss.normalize_L2(matrix)
+        return matrix
+
+    def _clean_metadata(self, doc: Document) -> Dict[str, Any]:
+        """Drop None values; everything else is stored as JSON."""
+        metadata = {}
+        if doc.source:
+            metadata["source"] = doc.source
+        for key, value in (doc.metadata or {}).items():
+            if value is not None:
+                metadata[key] = value
+        return metadata
+
+    def _existing_ids(self, doc_ids: List[str]) -> Dict[str, int]:
+        """Resolve which document IDs are already stored, in bounded SQL batches."""
+        existing = {}
+        for i in range(0, len(doc_ids), SQLITE_MAX_VARIABLES):
+            batch = doc_ids[i:i + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT doc_id, int_id FROM chunks WHERE doc_id IN ({placeholders})", batch
+            ).fetchall()
+            existing.update(rows)
+        return existing
+
+    def add_documents(self, documents: List[Document]) -> bool:
+        """Add documents to the index, skipping IDs that are already stored."""
+        try:
+            if not documents:
+                return True
+
+            with self._lock:
+                candidates = []
+                seen_ids = set()
+                for i, doc in enumerate(documents):
+                    if doc.embeddings is None or len(doc.embeddings) == 0:
+                        logger.warning(f"Document {doc.id} has no embeddings, skipping")
+                        continue
+                    doc_id = doc.id or f"doc_{self._next_id + i}"
+                    if doc_id in seen_ids:
+                        continue
+                    seen_ids.add(doc_id)
+                    candidates.append((doc_id, doc))
+
+                existing = self._existing_ids([doc_id for doc_id, _ in candidates])
+                skipped_duplicates = 0
+                if existing:
+                    if self.deduplication_enabled:
+                        skipped_duplicates = len(existing)
+                        candidates = [(d, doc) for d, doc in candidates if d not in existing]
+                    else:
+                        # Replace semantics: drop the old rows before re-adding
+                        self._remove_int_ids(list(existing.values()))
+
+                if not candidates:
+                    logger.warning("No valid documents with embeddings to add (all may be duplicates)")
+                    return True
+
+                vectors = self._prepare_vectors([doc.embeddings for _, doc in candidates])
+                if self.dimension is None:
+                    self.dimension = vectors.shape[1]
+                if vectors.shape[1] != self.dimension:
+                    logger.error(
+                        f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dimension}"
+                    )
+                    return False
+
+                if self.index is None:
+                    self.index = self._create_index(vectors)
+
+                int_ids = np.arange(self._next_id, self._next_id + len(candidates), dtype=np.int64)
+                self._reserve_ids(len(candidates))
+                if self._rescoring:
+                    self._append_vectors(int(int_ids[0]), vectors)
+                self.index.add_with_ids(vectors, int_ids)
+
+                rows = []
+                for int_id, (doc_id, doc) in zip(int_ids.tolist(), candidates):
+                    metadata = self._clean_metadata(doc)
+                    rows.append((
+                        int_id,
+                        doc_id,
+                        doc.content,
+                        json.dumps(metadata, default=str),
+                        doc.source,
+                        metadata.get("document_hash"),
+                        metadata.get("source_hash"),
+                        metadata.get("file_path"),
+                        0 if metadata.get("is_active") is False else 1,
+                    ))
+
+                # Persist vectors before committing rows so a crash never leaves
+                # metadata pointing at vectors that were not written
+                if self.auto_persist:
+                    self._write_index()
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                    )
+                self._chunk_count += len(rows)
+                self._inactive_ids = None
+
+                trained = self.index
+                self._maybe_train_ivf()
+                if self.auto_persist and self.index is not trained:
+                    self._write_index()
+
+            if skipped_duplicates > 0:
+                logger.info(f"Added {len(rows)} documents, skipped {skipped_duplicates} duplicates")
+            else:
+                logger.info(f"Added {len(rows)} documents to FAISS index")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to add documents to FAISS: {e}")
+            return False
+
+    def _reserve_ids(self, count: int):
+        """Advance the ID counter and record it before any vector is written.
+
+        IDs are never reused, so tombstoned HNSW vectors can't be confused
+        with newer chunks even after a crash between index and sidecar writes.
+        """
+        self._next_id += count
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_info (key, value) VALUES ('next_id', ?)",
+                (str(self._next_id),),
+            )
+
+    def _search_params(self, fetch_k: int, selector=None):
+        """Build per-query search parameters for the configured index type."""
+        if self.index_type == "IVF":
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.nprobe)
+        if self.index_type == "HNSW":
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=max(self.ef_search, fetch_k))
+        if selector is not None:
+            return faiss.SearchParameters(sel=selector)
+        return None
+
+    def _similarity(self, raw: float) -> Tuple[float, float]:
+        """Convert a raw FAISS score into (distance, similarity) like ChromaStore does."""
+        if self.metric == "Cosine":
+            distance = 1.0 - raw
+            similarity = max(0.0, min(1.0, 1.0 - distance / 2.0))
+        elif self.metric == "IP":
+            distance = 1.0 - raw
+            similarity = max(0.0, min(1.0, (1.0 + raw) / 2.0))
+        else:
+            distance = raw
+            similarity = 1.0 / (1.0 + distance / 100.0)
+        return distance, similarity
+
+    def search_batch(self, query_embeddings: List[List[float]], top_k: int = 10,
+                     where: Optional[Dict[str, Any]] = None,
+                     include_embeddings: bool = False) -> List[List[Document]]:
+        """Search several queries with a single index.search() call.
+
+        With ``include_embeddings`` each Document gets its stored vector: the
+        full-precision row when rescoring keeps one, else the index's reconstruction.
+        """
+        empty = [[] for _ in range(len(query_embeddings))]
+        try:
+            if not len(query_embeddings):
+                return []
+
+            with self._lock:
+                if self.index is None or self.index.ntotal == 0:
+                    return empty
+
+                selector = None
+                inactive = self._soft_deleted_ids()
+                if where:
+                    allowed = self._ids_matching(where)
+                    if not allowed:
+                        return empty
+                    selector = faiss.IDSelectorBatch(np.asarray(allowed, dtype=np.int64))
+                elif len(inactive) and self._takes_search_params:
+                    # Keep soft-deleted chunks out of the index scan itself
+                    excluded = faiss.IDSelectorBatch(inactive)
+                    selector = faiss.IDSelectorNot(excluded)
+
+                # Over-fetch by the number of tombstoned vectors so deleted
+                # HNSW entries can't crowd out live results; soft-deleted ones
+                # only need it when no selector excludes them
+                tombstones = max(self.index.ntotal - self._count(), 0)
+                if selector is None:
+                    tombstones += len(inactive)
+                candidates_k = top_k * self.rescore_factor if self._rescoring else top_k
+                fetch_k = min(candidates_k + tombstones, self.index.ntotal)
+
+                vectors = self._prepare_vectors(query_embeddings)
+                params = self._search_params(fetch_k, selector)
+                if params is not None and self._takes_search_params:
+                    scores, ids = self.index.search(vectors, fetch_k, params=params)
+                    hits = [
+                        [(int(i), float(s)) for i, s in zip(row_ids, row_scores) if i >= 0]
+                        for row_ids, row_scores in zip(ids, scores)
+                    ]
+                else:
+                    if selector is not None:
+                        # LSH and flat PQ can't take a selector, filter after the fact
+                        fetch_k = self.index.ntotal
+                    scores, ids = self.index.search(vectors, fetch_k)
+                    allowed_ids = set(allowed) if selector is not None else None
+                    hits = [
+                        [(int(i), float(s)) for i, s in zip(row_ids, row_scores)
+                         if i >= 0 and (allowed_ids is None or int(i) in allowed_ids)]
+                        for row_ids, row_scores in zip(ids, scores)
+                    ]
+
+                if self._rescoring:
+                    hits = [self._rescore(query, row_hits) for query, row_hits in zip(vectors, hits)]
+
+                rows = self._fetch_rows(sorted({i for row in hits for i, _ in row}))
+                vectors = self._stored_vectors(list(rows)) if include_embeddings else {}
+
+            results = []
+            for row_hits in hits:
+                documents = []
+                for int_id, raw in row_hits:
+                    row = rows.get(int_id)
+                    if row is None:
+                        continue  # tombstoned
+                    doc = self._row_to_document(row)
+                    distance, similarity = self._similarity(raw)
+                    doc.metadata["_score"] = distance
+                    doc.metadata["similarity_score"] = similarity
+                    doc.embeddings = vectors.get(int_id)
+                    documents.append(doc)
+                    if len(documents) >= top_k:
+                        break
+                results.append(documents)
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to search FAISS: {e}")
+            return empty
+
+    def _rescore(self, query: np.ndarray, hits: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+        """Replace approximate scores with exact ones and re-sort the candidates."""
+        if not hits:
+            return hits
+        int_ids = np.asarray([i for i, _ in hits], dtype=np.int64)
+        exact = self._exact_vectors(int_ids)
+        if exact is None:
+            return hits
+        if self._faiss_metric() == faiss.METRIC_L2:
+            scores = ((exact - query) ** 2).sum(axis=1)
+            order = np.argsort(scores, kind="stable")
+        else:
+            scores = exact @ query
+            order = np.argsort(-scores, kind="stable")
+        return [(int(int_ids[i]), float(scores[i])) for i in order]
+
+    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        """Search for similar documents."""
+        if query_embedding is None:
+            logger.warning("No query embedding provided for search")
+            return []
+        return self.search_batch([query_embedding], top_k=top_k, where=where,
+                                 include_embeddings=kwargs.get("include_embeddings", False))[0]
+
+    def _fetch_rows(self, int_ids: List[int]) -> Dict[int, tuple]:
+        """Fetch sidecar rows for a list of integer IDs."""
+        rows = {}
+        for i in range(0, len(int_ids), SQLITE_MAX_VARIABLES):
+            batch = int_ids[i:i + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            for row in self._conn.execute(
+                f"SELECT int_id, doc_id, content, metadata, source FROM chunks "
+                f"WHERE is_active = 1 AND int_id IN ({placeholders})",
+                batch,
+            ):
+                rows[row[0]] = row
+        return rows
+
+    def _row_to_document(self, row: tuple) -> Document:
+        """Build a Document from a sidecar row."""
+        _, doc_id, content, metadata_json, source = row
+        metadata = json.loads(metadata_json) if metadata_json else {}
+        source = (metadata.get("file_path") or source or
+                  metadata.get("file_name") or "unknown")
+        return Document(id=doc_id, content=content or "", metadata=metadata, source=source)
+
+    def _ids_matching(self, where: Dict[str, Any], include_inactive: bool = False) -> List[int]:
+        """Resolve a metadata filter to integer IDs using the sidecar."""
+        clauses = [] if include_inactive else ["is_active = 1"]
+        params: List[Any] = []
+        operators = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+        for key, value in where.items():
+            column = "json_extract(metadata, ?)"
+            path = f'$."{key}"'
+            if isinstance(value, list):
+                value = {"$in": value}
+            if not isinstance(value, dict):
+                value = {"$eq": value}
+            for op, operand in value.items():
+                if op == "$ne":
+                    # Chunks without the key count as not equal, as in the other stores
+                    clauses.append(f"({column} IS NULL OR {column} != ?)")
+                    params.extend([path, path, operand])
+                elif op in operators:
+                    clauses.append(f"{column} {operators[op]} ?")
+                    params.extend([path, operand])
+                elif op in ("$in", "$nin"):
+                    if not operand:
+                        clauses.append("0" if op == "$in" else "1")
+                        continue
+                    negate = "NOT " if op == "$nin" else ""
+                    clauses.append(f"{column} {negate}IN ({','.join('?' * len(operand))})")
+                    params.append(path)
+                    params.extend(operand)
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+        sql = "SELECT int_id FROM chunks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return [row[0] for row in self._conn.execute(sql, params)]
+
+    def _count(self) -> int:
+        """Number of chunks in the sidecar, soft-deleted ones included."""
+        return self._chunk_count
+
+    def _soft_deleted_ids(self) -> np.ndarray:
+        """Integer IDs of chunks marked ``is_active: False``."""
+        if self._inactive_ids is None:
+            self._inactive_ids = np.fromiter(
+                (row[0] for row in self._conn.execute("SELECT int_id FROM chunks WHERE is_active = 0")),
+                dtype=np.int64,
+            )
+        return self._inactive_ids
+
+    def _remove_int_ids(self, int_ids: List[int]) -> int:
+        """Remove vectors and sidecar rows for the given integer IDs."""
+        if not int_ids:
+            return 0
+        with self._lock:
+            if self.index is not None and self.index_type != "HNSW":
+                self.index.remove_ids(np.asarray(int_ids, dtype=np.int64))
+            with self._conn:
+                for i in range(0, len(int_ids), SQLITE_MAX_VARIABLES):
+                    batch = int_ids[i:i + SQLITE_MAX_VARIABLES]
+                    placeholders = ",".join("?" * len(batch))
+                    cursor = self._conn.execute(f"DELETE FROM chunks WHERE int_id IN ({placeholders})", batch)
+                    self._chunk_count -= cursor.rowcount
+            self._inactive_ids = None
+            if self.index_type == "HNSW":
+                # HNSW graphs can't drop nodes; leave tombstones until compaction
+                self._maybe_compact()
+            if self.auto_persist and self.index is not None:
+                self._write_index()
+        return len(int_ids)
+
+    def _maybe_compact(self):
+        """Rebuild an HNSW index once tombstones exceed the compaction threshold."""
+        if self.index is None or self.index.ntotal == 0:
+            return
+        tombstones = self.index.ntotal - self._count()
+        if tombstones / self.index.ntotal > self.compaction_threshold:
+            self.compact()
+
+    def compact(self) -> int:
+        """Rebuild the index from live vectors only. Returns vectors dropped."""
+        with self._lock:
+            if self.index is None:
+                return 0
+            cpu_index = faiss.downcast_index(self._to_cpu(self.index))
+            all_ids = faiss.vector_to_array(cpu_index.id_map)
+            live_ids = {row[0] for row in self._conn.execute("SELECT int_id FROM chunks")}
+            keep = np.fromiter((i in live_ids for i in all_ids.tolist()), dtype=bool, count=len(all_ids))
+            dropped = int((~keep).sum())
+            if dropped == 0:
+                return 0
+
+            if not keep.any():
+                self.index = None
+                if self.index_path.exists():
+                    self.index_path.unlink()
+                return dropped
+
+            live = all_ids[keep]
+            vectors = self._exact_vectors(live) if self._rescoring else None
+            if vectors is None:
+                vectors = cpu_index.index.reconstruct_n(0, cpu_index.ntotal)[keep]
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            self.index = self._create_index(vectors)
+            self.index.add_with_ids(vectors, live)
+            if self.auto_persist:
+                self._write_index()
+            logger.info(f"Compacted FAISS index, dropped {dropped} deleted vectors")
+            return dropped
+
+    def update_metadata(self, where: Dict[str, Any], updates: Dict[str, Any]) -> int:
+        """Merge ``updates`` into the sidecar metadata of matching chunks."""
+        with self._lock:
+            int_ids = self._ids_matching(where, include_inactive=True)
+            for i in range(0, len(int_ids), SQLITE_MAX_VARIABLES):
+                batch = int_ids[i:i + SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT int_id, metadata FROM chunks WHERE int_id IN ({placeholders})", batch
+                ).fetchall()
+                updated = []
+                for int_id, metadata_json in rows:
+                    metadata = json.loads(metadata_json) if metadata_json else {}
+                    metadata.update(updates)
+                    is_active = 0 if metadata.get("is_active") is False else 1
+                    updated.append((json.dumps(metadata, default=str), is_active, int_id))
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE chunks SET metadata = ?, is_active = ? WHERE int_id = ?", updated
+                    )
+            self._inactive_ids = None
+        logger.info(f"Updated metadata of {len(int_ids)} documents in FAISS")
+        return len(int_ids)
+
+    def purge_deleted(self, limit: Optional[int] = None) -> int:
+        """Remove soft-deleted chunks, rebuild the index and vacuum the sidecar.
+
+        Rows of the full-precision vectors file are addressed by integer ID,
+        so that file keeps its size.
+        """
+        with self._lock:
+            int_ids = self._soft_deleted_ids().tolist()
+            if limit is not None:
+                int_ids = int_ids[:max(limit, 0)]
+            if not int_ids:
+                return 0
+            self._remove_int_ids(int_ids)
+            if self.index_type == "HNSW":
+                # Purging is explicit, so don't wait for the automatic threshold
+                self.compact()
+            self._conn.execute("VACUUM")
+        logger.info(f"Purged {len(int_ids)} soft-deleted documents from FAISS")
+        return len(int_ids)
+
+    def _write_index(self):
+        """Atomically write the index to disk."""
+        tmp_path = self.index_path.with_suffix(".faiss.tmp")
+        faiss.write_index(self._to_cpu(self.index), str(tmp_path))
+        tmp_path.replace(self.index_path)
+
+    def persist(self) -> bool:
+        """Flush the index to disk (only needed with auto_persist disabled)."""
+        try:
+            with self._lock:
+                if self.index is not None:
+                    self._write_index()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to persist FAISS index: {e}")
+            return False
+
+    def delete_collection(self) -> bool:
+        """Delete the collection."""
+        try:
+            with self._lock:
+                self.index = None
+                self._next_id = 0
+                self._chunk_count = 0
+                self._vectors = None
+                self._inactive_ids = None
+                for path in (self.index_path, self.vectors_path):
+                    if path.exists():
+                        path.unlink()
+                with self._conn:
+                    self._conn.execute("DELETE FROM chunks")
+                    self._conn.execute("DELETE FROM store_info")
+            logger.info(f"Deleted collection: {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            return False
+
+    def get_document(self, doc_id: str) -> Optional[Document]:
+        """Get a specific document by ID."""
+        try:
+            row = self._conn.execute(
+                "SELECT int_id, doc_id, content, metadata, source FROM chunks WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            return self._row_to_document(row) if row else None
+        except Exception as e:
+            logger.error(f"Failed to get document {doc_id}: {e}")
+            return None
+
+    def delete_documents(self, doc_ids: List[str]) -> bool:
+        """Delete documents by IDs."""
+        try:
+            int_ids = list(self._existing_ids(doc_ids).values())
+            self._remove_int_ids(int_ids)
+            logger.info(f"Deleted {len(int_ids)} documents from FAISS")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return False
+
+    def delete_by_document_hash(self, document_hash: str) -> bool:
+        """Delete all chunks belonging to a specific document by its hash."""
+        try:
+            int_ids = [row[0] for row in self._conn.execute(
+                "SELECT int_id FROM chunks WHERE document_hash = ?", (document_hash,)
+            )]
+            if int_ids:
+                self._remove_int_ids(int_ids)
+                logger.info(f"Deleted {len(int_ids)} documents with hash {document_hash[:12]}...")
+            else:
+                logger.info(f"No documents found with hash {document_hash[:12]}...")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents by hash: {e}")
+            return False
+
+    def delete_by_source(self, source_path: str) -> bool:
+        """Delete all documents from a specific source file."""
+        try:
+            int_ids = [row[0] for row in self._conn.execute(
+                "SELECT int_id FROM chunks WHERE source = ? OR file_path = ?", (source_path, source_path)
+            )]
+            if int_ids:
+                self._remove_int_ids(int_ids)
+                logger.info(f"Deleted {len(int_ids)} documents from source {source_path}")
+            else:
+                logger.info(f"No documents found from source {source_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents by source: {e}")
+            return False
+
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection."""
+        try:
+            count = self._count()
+            return {
+                "name": self.collection_name,
+                "count": count,
+                "document_count": count,
+                "deleted_count": len(self._soft_deleted_ids()),
+                "persist_directory": self.persist_directory,
+                "index_type": self.index_type,
+                "metric": self.metric,
+                "dimension": self.dimension,
+                "quantization": self.quantization,
+                "index_vectors": self.index.ntotal if self.index is not None else 0,
+            }
+        except Exception as e:
+            logger.error(f"Failed to get collection info: {e}")
+            return {"error": str(e)}
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get store description."""
+        return "FAISS vector store for fast in-process similarity search with on-disk persistence."
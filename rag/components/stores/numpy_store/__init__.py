@@ -0,0 +1,12 @@
+"""NumpyStore Component
+
+Component for numpy store.
+"""
+
+from .numpy_store import NumpyStore
+
+__all__ = ['NumpyStore']
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "store"
+COMPONENT_NAME = "numpy_store"
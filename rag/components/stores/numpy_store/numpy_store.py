@@ -0,0 +1,833 @@
+"""NumPy vector store implementation.
+
+Exact (brute-force) search over a contiguous embedding matrix. The matrix is
+kept in ``<collection>.npy`` and memory-mapped on load; document content and
+metadata live in a columnar JSON sidecar (one list per field) so metadata
+filters become vectorised masks. Suited to collections of up to a few hundred
+thousand chunks, and deterministic, which makes it a good reference store for
+evaluation runs.
+
+Appends are amortised: the ``.npy`` file is preallocated and doubles in
+capacity, new rows are written in place, and their sidecar entries go to an
+append-only ``<collection>.columns.log`` that is folded into the sidecar once
+it outgrows it. Deletes and replacements rewrite the files compactly.
+
+With ``quantization: int8`` or ``pq`` the matrix stays on disk as the
+full-precision copy while compact codes (``<collection>.quant.npz``) are held
+in memory and scanned instead; the best candidates are then re-scored exactly
+against the memory-mapped rows.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from core.base import VectorStore, Document
+from utils.quantization import QUANTIZATION_MODES, QUANTIZERS, ProductQuantizer, ScalarQuantizer
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyStore(VectorStore):
+    """In-process exact-search store backed by a memory-mapped NumPy matrix."""
+
+    METRICS = ["cosine", "ip", "l2"]
+    DTYPES = {"float32": np.float32, "float16": np.float16}
+
+    def __init__(self, name: str = "NumpyStore", config: Optional[Dict[str, Any]] = None):
+        super().__init__(name, config)
+        config = config or {}
+        self.collection_name = config.get("collection_name", "documents")
+        self.persist_directory = config.get("persist_directory", "./data/numpy_db")
+        self.distance_metric = config.get("distance_metric", "cosine")
+        self.dtype_name = config.get("dtype", "float32")
+        # Rows converted to float32 at a time when scoring a float16 matrix
+        self.block_size = max(config.get("block_size", 65536), 1)
+        self.quantization = config.get("quantization", "none")
+        # Re-score the top rescore_factor * top_k quantized candidates exactly
+        self.rescore = config.get("rescore", True)
+        self.rescore_factor = max(config.get("rescore_factor", 4), 1)
+        self.pq_m = max(config.get("pq_m", 8), 1)
+        self.deduplication_enabled = config.get("enable_deduplication", True)
+        self.last_add_stats: Dict[str, int] = {"inserted": 0, "skipped": 0, "batches": 0}
+        # Set by prepare_for_embedder when the embedder already returns unit vectors
+        self.inputs_normalized = False
+
+        if self.distance_metric not in self.METRICS:
+            logger.warning(f"Invalid distance metric '{self.distance_metric}', using 'cosine'")
+            self.distance_metric = "cosine"
+        if self.dtype_name not in self.DTYPES:
+            logger.warning(f"Invalid dtype '{self.dtype_name}', using 'float32'")
+            self.dtype_name = "float32"
+        if self.quantization not in QUANTIZATION_MODES:
+            logger.warning(f"Invalid quantization '{self.quantization}', using 'none'")
+            self.quantization = "none"
+        if self.quantization == "float16":
+            # float16 is a storage precision, not a code book
+            self.dtype_name = "float16"
+        self.dtype = self.DTYPES[self.dtype_name]
+
+        self._lock = threading.RLock()
+        # The .npy file, possibly with spare capacity; _matrix views its stored rows
+        self._storage: Optional[np.ndarray] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._sq_norms: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._contents: List[str] = []
+        self._sources: List[Optional[str]] = []
+        self._metadata: Dict[str, List[Any]] = {}
+        self._id_index: Dict[str, int] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        # Rows soft-deleted via is_active: False, or None when there are none
+        self._deleted: Optional[np.ndarray] = None
+        # Columns and _deleted are rebuilt on the next read after rows are appended
+        self._columns_stale = False
+        # Rows in the sidecar snapshot and entries appended to the log since
+        self._snapshot_rows = 0
+        self._log_rows = 0
+        self._quantizer = None
+        self._codes: Optional[np.ndarray] = None
+        self._code_sq_norms: Optional[np.ndarray] = None
+        # Row count the quantizer was fit on; it is refit once the collection doubles
+        self._trained_rows = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @property
+    def matrix_path(self) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name}.npy"
+
+    @property
+    def sidecar_path(self) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name}.columns.json"
+
+    @property
+    def log_path(self) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name}.columns.log"
+
+    @property
+    def quant_path(self) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name}.quant.npz"
+
+    @property
+    def is_quantized(self) -> bool:
+        """True when search scans int8/PQ codes instead of the matrix."""
+        return self.quantization in QUANTIZERS
+
+    def _load(self):
+        """Memory-map the matrix and read the sidecar if they exist."""
+        if not (self.matrix_path.exists() and self.sidecar_path.exists()):
+            return
+        with open(self.sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        self._ids = sidecar["ids"]
+        self._contents = sidecar["contents"]
+        self._sources = sidecar["sources"]
+        self._metadata = sidecar["metadata"]
+        self._snapshot_rows = len(self._ids)
+        self._storage = np.load(self.matrix_path, mmap_mode="r")
+        if self._storage.dtype != self.dtype:
+            logger.warning(
+                f"Stored matrix is {self._storage.dtype}, ignoring configured dtype {self.dtype_name}"
+            )
+            self.dtype = self._storage.dtype
+        if not self._replay_log():
+            self._write_sidecar()
+        self._matrix = self._storage[:len(self._ids)]
+        if self.is_quantized:
+            self._load_codes()
+        self._reindex()
+        logger.info(f"Loaded {len(self._ids)} vectors from {self.matrix_path}")
+
+    def _replay_log(self) -> bool:
+        """Append the rows logged since the sidecar snapshot.
+
+        Returns False if the log ends in an entry an interrupted write left
+        incomplete; the caller then folds the log so appends start clean.
+        """
+        if not self.log_path.exists():
+            return True
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    return False
+                row = entry["row"]
+                if row < len(self._ids):
+                    continue  # already folded into the snapshot
+                if row != len(self._ids) or row >= len(self._storage):
+                    return False
+                self._append_row(entry["id"], entry["content"], entry["source"], entry["metadata"])
+                self._log_rows += 1
+        return True
+
+    def _load_codes(self):
+        """Read persisted codes, rebuilding them if missing or out of date.
+
+        Codes are written when the quantizer is refit and when the sidecar
+        log is folded, so rows appended since then are encoded here.
+        """
+        if self.quant_path.exists():
+            with np.load(self.quant_path) as saved:
+                kind = str(saved["kind"])
+                if kind == self.quantization and len(saved["codes"]) <= len(self._ids):
+                    self._quantizer = QUANTIZERS[kind].from_state(saved)
+                    self._trained_rows = int(saved["trained_rows"])
+                    codes = saved["codes"]
+                    if len(codes) < len(self._ids):
+                        codes = np.concatenate([codes, self._encode(self._matrix[len(codes):])])
+                    self._codes = codes
+                    return
+        logger.info(f"Rebuilding {self.quantization} codes for {self.collection_name}")
+        self._codes = self._updated_codes(self._matrix, 0, [])
+        self._write_codes()
+
+    def _updated_codes(self, matrix: np.ndarray, start: int, replaced: List[int]) -> Optional[np.ndarray]:
+        """Codes for ``matrix`` given that rows from ``start`` and ``replaced`` changed.
+
+        The quantizer is (re)fit when there is none or the collection has
+        doubled since it was fit; otherwise only changed rows are encoded.
+        """
+        if not self.is_quantized:
+            return None
+        if self._quantizer is None or self._codes is None or len(matrix) >= 2 * self._trained_rows:
+            if self.quantization == "pq":
+                self._quantizer = ProductQuantizer(m=self.pq_m)
+            else:
+                self._quantizer = ScalarQuantizer()
+            self._quantizer.fit(np.asarray(matrix, dtype=np.float32))
+            self._trained_rows = len(matrix)
+            return self._encode(matrix)
+
+        codes = np.concatenate([self._codes, self._encode(matrix[start:])])
+        if replaced:
+            codes[replaced] = self._encode(matrix[replaced])
+        return codes
+
+    def _encode(self, rows: np.ndarray) -> np.ndarray:
+        """Encode rows in blocks so a float16 matrix is never upcast whole."""
+        parts = [
+            self._quantizer.encode(np.asarray(rows[start:start + self.block_size], dtype=np.float32))
+            for start in range(0, len(rows), self.block_size)
+        ]
+        return np.concatenate(parts) if parts else np.empty((0, 0), dtype=np.uint8)
+
+    def _write_codes(self):
+        """Atomically write codes and quantizer state."""
+        directory = Path(self.persist_directory)
+        tmp_quant = directory / f".{self.collection_name}.quant.npz.tmp"
+        with open(tmp_quant, "wb") as f:
+            np.savez(f, kind=self.quantization, codes=self._codes,
+                     trained_rows=self._trained_rows, **self._quantizer.state())
+        os.replace(tmp_quant, self.quant_path)
+
+    def _persist(self, matrix: np.ndarray, codes: Optional[np.ndarray] = None):
+        """Write matrix, sidecar and codes compactly, then re-map the matrix."""
+        directory = Path(self.persist_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        tmp_matrix = directory / f".{self.collection_name}.npy.tmp"
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, matrix)
+        self._storage = self._matrix = None
+        os.replace(tmp_matrix, self.matrix_path)
+        self._write_sidecar()
+        if codes is not None:
+            self._codes = codes
+            self._write_codes()
+
+        if len(matrix):
+            self._storage = np.load(self.matrix_path, mmap_mode="r")
+            self._matrix = self._storage
+        self._reindex()
+
+    def _write_rows(self, vectors: np.ndarray) -> int:
+        """Write vectors after the stored rows, growing the file geometrically.
+
+        Returns the first new row; the rows become visible via _matrix.
+        """
+        start = len(self._ids)
+        end = start + len(vectors)
+        storage = self._storage
+        if storage is None or len(storage) < end:
+            capacity = max(end, 2 * len(storage) if storage is not None else 0)
+            directory = Path(self.persist_directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp_matrix = directory / f".{self.collection_name}.npy.tmp"
+            grown = np.lib.format.open_memmap(tmp_matrix, mode="w+", dtype=self.dtype,
+                                              shape=(capacity, vectors.shape[1]))
+            for offset in range(0, start, self.block_size):
+                stop = min(offset + self.block_size, start)
+                grown[offset:stop] = storage[offset:stop]
+            grown.flush()
+            del grown
+            os.replace(tmp_matrix, self.matrix_path)
+            storage = None
+        if storage is None or storage.mode != "r+":
+            storage = np.load(self.matrix_path, mmap_mode="r+")
+        storage[start:end] = vectors
+        storage.flush()
+        self._storage = storage
+        self._matrix = storage[:end]
+        return start
+
+    def _append_log(self, start: int):
+        """Log sidecar entries for rows from ``start``, folding once the log outgrows the snapshot."""
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            for row in range(start, len(self._ids)):
+                f.write(json.dumps({
+                    "row": row,
+                    "id": self._ids[row],
+                    "content": self._contents[row],
+                    "source": self._sources[row],
+                    "metadata": self._row_metadata(row),
+                }, default=str) + "\n")
+        self._log_rows += len(self._ids) - start
+        if self._log_rows > self._snapshot_rows:
+            self._write_sidecar()
+            if self._codes is not None:
+                self._write_codes()
+
+    def _write_sidecar(self):
+        """Replace the sidecar with a snapshot of every row and drop the log."""
+        os.replace(self._dump_sidecar(), self.sidecar_path)
+        # Entries left behind by a crash here are skipped on replay by row number
+        if self.log_path.exists():
+            self.log_path.unlink()
+        self._snapshot_rows, self._log_rows = len(self._ids), 0
+
+    def _dump_sidecar(self) -> Path:
+        """Write the sidecar to a temporary file and return its path."""
+        tmp_sidecar = Path(self.persist_directory) / f".{self.collection_name}.columns.json.tmp"
+        with open(tmp_sidecar, "w", encoding="utf-8") as f:
+            json.dump({
+                "ids": self._ids,
+                "contents": self._contents,
+                "sources": self._sources,
+                "metadata": self._metadata,
+            }, f, default=str)
+        return tmp_sidecar
+
+    def _reindex(self):
+        """Rebuild the ID lookup, typed metadata columns and cached norms."""
+        self._id_index = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._columns_stale = True
+        self._update_norms()
+
+    def _update_norms(self, start: int = 0):
+        """Cache squared row norms for l2 scoring, computing rows from ``start`` on."""
+        if self._matrix is None or self.distance_metric != "l2":
+            self._sq_norms = self._code_sq_norms = None
+            return
+        if self.is_quantized:
+            # Norms of the reconstructed rows; exact norms are computed per candidate
+            tail = self._quantizer.sq_norms(self._codes[start:])
+            head = self._code_sq_norms
+            self._code_sq_norms = np.concatenate([head[:start], tail]) if start and head is not None else tail
+        else:
+            rows = self._matrix[start:]
+            tail = np.einsum("ij,ij->i", rows, rows, dtype=np.float32)
+            head = self._sq_norms
+            self._sq_norms = np.concatenate([head[:start], tail]) if start and head is not None else tail
+
+    def _ensure_columns(self):
+        """Rebuild the typed metadata columns if rows were appended since the last read."""
+        if self._columns_stale:
+            self._columns = {key: self._to_column(values) for key, values in self._metadata.items()}
+            self._update_deleted()
+            self._columns_stale = False
+
+    def _update_deleted(self):
+        column = self._columns.get("is_active")
+        deleted = None if column is None else np.fromiter(
+            (value is False for value in column), dtype=bool, count=len(column)
+        )
+        self._deleted = deleted if deleted is not None and deleted.any() else None
+
+    @staticmethod
+    def _to_column(values: List[Any]) -> np.ndarray:
+        """Numeric columns become float arrays (NaN for missing); others stay objects."""
+        present = [v for v in values if v is not None]
+        if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _prepare(self, embeddings: Any) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if self.distance_metric == "cosine" and not self.inputs_normalized:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+        return vectors
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    def get_dimension(self) -> Optional[int]:
+        """Width of the stored matrix; None until the first vectors are added."""
+        return self.dimension
+
+    def prepare_for_embedder(self, dimension: int, normalized: bool = False) -> None:
+        super().prepare_for_embedder(dimension, normalized)
+        self.inputs_normalized = normalized
+
+    def add_documents(self, documents: List[Document]) -> bool:
+        """Add documents, skipping (or replacing) IDs that are already stored."""
+        self.last_add_stats = {"inserted": 0, "skipped": 0, "batches": 0}
+        try:
+            documents = [doc for doc in documents if doc.embeddings is not None and len(doc.embeddings)]
+            if not documents:
+                return True
+
+            with self._lock:
+                new_docs: Dict[str, Document] = {}
+                replaced: Dict[int, Document] = {}
+                skipped = 0
+                for i, doc in enumerate(documents):
+                    doc_id = doc.id or f"doc_{len(self._ids) + i}"
+                    if doc_id in self._id_index:
+                        if self.deduplication_enabled:
+                            skipped += 1
+                        else:
+                            replaced[self._id_index[doc_id]] = doc
+                    elif doc_id in new_docs:
+                        skipped += 1
+                    else:
+                        new_docs[doc_id] = doc
+
+                if not new_docs and not replaced:
+                    self.last_add_stats["skipped"] = skipped
+                    return True
+
+                changed = list(new_docs.values()) + list(replaced.values())
+                vectors = self._prepare([doc.embeddings for doc in changed])
+                if self.dimension is not None and vectors.shape[1] != self.dimension:
+                    logger.error(
+                        f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dimension}"
+                    )
+                    return False
+
+                if replaced:
+                    self._rewrite_with(new_docs, replaced, vectors)
+                else:
+                    self._append(new_docs, vectors)
+
+            self.last_add_stats = {"inserted": len(new_docs) + len(replaced), "skipped": skipped, "batches": 1}
+            logger.info(f"Added {len(new_docs)} and replaced {len(replaced)} documents, skipped {skipped}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to add documents to NumpyStore: {e}")
+            return False
+
+    def _append(self, new_docs: Dict[str, Document], vectors: np.ndarray):
+        """Append new rows in place; only the new rows are written."""
+        trained_rows = self._trained_rows
+        start = self._write_rows(vectors)
+        for doc_id, doc in new_docs.items():
+            self._append_row(doc_id, doc.content, doc.source, doc.metadata)
+        if self.is_quantized:
+            self._codes = self._updated_codes(self._matrix, start, [])
+            if self._trained_rows != trained_rows:
+                start = 0  # refit: every code changed
+                self._write_codes()
+        self._append_log(len(self._ids) - len(new_docs))
+        self._update_norms(start)
+
+    def _rewrite_with(self, new_docs: Dict[str, Document], replaced: Dict[int, Document], vectors: np.ndarray):
+        """Replace rows in a compact copy of the collection and rewrite every file."""
+        old = self._matrix if self._matrix is not None else np.empty((0, vectors.shape[1]), self.dtype)
+        matrix = np.empty((len(old) + len(new_docs), vectors.shape[1]), dtype=self.dtype)
+        matrix[:len(old)] = old
+        matrix[len(old):] = vectors[:len(new_docs)]
+        for offset, row in enumerate(replaced):
+            matrix[row] = vectors[len(new_docs) + offset]
+        codes = self._updated_codes(matrix, len(old), list(replaced))
+
+        for doc_id, doc in new_docs.items():
+            self._append_row(doc_id, doc.content, doc.source, doc.metadata)
+        for row, doc in replaced.items():
+            self._contents[row] = doc.content
+            self._sources[row] = doc.source
+            self._set_metadata(row, doc.metadata)
+
+        self._persist(matrix, codes)
+
+    def _append_row(self, doc_id: str, content: str, source: Optional[str], metadata: Optional[Dict[str, Any]]):
+        """Add one row to the ID index and every column."""
+        row = len(self._ids)
+        for values in self._metadata.values():
+            values.append(None)
+        self._ids.append(doc_id)
+        self._contents.append(content)
+        self._sources.append(source)
+        self._id_index[doc_id] = row
+        self._set_metadata(row, metadata)
+        self._columns_stale = True
+
+    def _set_metadata(self, row: int, metadata: Optional[Dict[str, Any]]):
+        """Write one row of metadata into the columns, adding new columns as needed."""
+        metadata = metadata or {}
+        for key in self._metadata:
+            self._metadata[key][row] = None
+        for key, value in metadata.items():
+            if key not in self._metadata:
+                self._metadata[key] = [None] * len(self._ids)
+            self._metadata[key][row] = value
+
+    def _remove_rows(self, rows: List[int]) -> int:
+        """Drop rows from the matrix and every column."""
+        if not rows:
+            return 0
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[rows] = False
+        indices = np.flatnonzero(keep)
+        matrix = np.ascontiguousarray(self._matrix[indices]) if self._matrix is not None else None
+        codes = self._codes[indices] if self._codes is not None else None
+
+        self._ids = [self._ids[i] for i in indices]
+        self._contents = [self._contents[i] for i in indices]
+        self._sources = [self._sources[i] for i in indices]
+        self._metadata = {
+            key: [values[i] for i in indices] for key, values in self._metadata.items()
+        }
+        if matrix is None or not len(matrix):
+            self._clear_files()
+        else:
+            self._persist(matrix, codes)
+        return len(rows)
+
+    def _clear_files(self):
+        self._storage = self._matrix = None
+        self._ids, self._contents, self._sources, self._metadata = [], [], [], {}
+        self._quantizer, self._codes, self._trained_rows = None, None, 0
+        self._snapshot_rows = self._log_rows = 0
+        for path in (self.matrix_path, self.sidecar_path, self.log_path, self.quant_path):
+            if path.exists():
+                path.unlink()
+        self._reindex()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a metadata filter ($eq/$ne/$in/$nin/$gt/$gte/$lt/$lte) to a row mask."""
+        self._ensure_columns()
+        mask = np.ones(len(self._ids), dtype=bool)
+        for key, value in where.items():
+            column = self._columns.get(key)
+            if column is None:
+                column = np.array(self._sources if key == "source" else [None] * len(self._ids), dtype=object)
+            if isinstance(value, list):
+                value = {"$in": value}
+            elif not isinstance(value, dict):
+                value = {"$eq": value}
+            for op, operand in value.items():
+                if op == "$eq":
+                    mask &= column == operand
+                elif op == "$ne":
+                    mask &= column != operand
+                elif op == "$in":
+                    mask &= self._isin(column, operand)
+                elif op == "$nin":
+                    mask &= ~self._isin(column, operand)
+                elif op in ("$gt", "$gte", "$lt", "$lte"):
+                    if column.dtype != np.float64:
+                        # Range operators only apply to numeric columns
+                        mask &= False
+                        continue
+                    with np.errstate(invalid="ignore"):
+                        if op == "$gt":
+                            mask &= column > operand
+                        elif op == "$gte":
+                            mask &= column >= operand
+                        elif op == "$lt":
+                            mask &= column < operand
+                        else:
+                            mask &= column <= operand
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    @staticmethod
+    def _isin(column: np.ndarray, values: Any) -> np.ndarray:
+        """Membership test that doesn't coerce mixed-type operands to strings like np.isin."""
+        if column.dtype == np.float64:
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            return np.isin(column, np.asarray(numbers, dtype=np.float64))
+        lookup = {v for v in values if isinstance(v, (str, int, float, bool))}
+        return np.fromiter(
+            (isinstance(v, (str, int, float, bool)) and v in lookup for v in column),
+            dtype=bool, count=len(column),
+        )
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Score every stored vector against each query; higher is better. Shape (q, n).
+
+        Quantized stores score the in-memory codes, so scores are approximate.
+        """
+        if self.is_quantized:
+            raw = self._quantizer.inner_products(queries, self._codes, self.block_size)
+            if self.distance_metric == "l2":
+                return 2.0 * raw - self._code_sq_norms[None, :]
+            return raw
+        if self._matrix.dtype == np.float32:
+            raw = queries @ self._matrix.T
+        else:
+            # float16 matmul is slow on CPU; upcast in blocks
+            raw = np.empty((len(queries), len(self._matrix)), dtype=np.float32)
+            for start in range(0, len(self._matrix), self.block_size):
+                block = np.asarray(self._matrix[start:start + self.block_size], dtype=np.float32)
+                raw[:, start:start + len(block)] = queries @ block.T
+        if self.distance_metric == "l2":
+            # -||q - x||^2 up to the per-query constant ||q||^2, added back in _similarity
+            return 2.0 * raw - self._sq_norms[None, :]
+        return raw
+
+    def _exact_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Full-precision scores for a few rows, read from the memory-mapped matrix."""
+        order = np.argsort(rows)
+        vectors = np.empty((len(rows), self._matrix.shape[1]), dtype=np.float32)
+        # Sorted reads keep memory-mapped access sequential
+        vectors[order] = self._matrix[rows[order]]
+        raw = vectors @ query
+        if self.distance_metric == "l2":
+            return 2.0 * raw - np.einsum("ij,ij->i", vectors, vectors)
+        return raw
+
+    def _similarity(self, score: float, query_sq_norm: float) -> Dict[str, float]:
+        """Map a raw score to the distance/similarity pair other stores report."""
+        if self.distance_metric == "l2":
+            distance = max(query_sq_norm - score, 0.0)
+            return {"_score": distance, "similarity_score": 1.0 / (1.0 + distance / 100.0)}
+        if self.distance_metric == "cosine":
+            distance = 1.0 - score
+            return {"_score": distance, "similarity_score": max(0.0, min(1.0, 1.0 - distance / 2.0))}
+        return {"_score": -score, "similarity_score": max(0.0, min(1.0, (1.0 + score) / 2.0))}
+
+    def _top_k(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k scores, ties broken by row order for determinism."""
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        # Batched and single-query matmuls round differently in the last bits;
+        # rank on rounded scores so both paths order near-ties identically
+        scores = np.round(scores, 6)
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        # Include every row tied with the k-th score so tie-breaking doesn't depend on argpartition
+        threshold = scores[candidates].min()
+        candidates = np.flatnonzero(scores >= threshold)
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order][:k]
+
+    def _row_metadata(self, row: int) -> Dict[str, Any]:
+        return {key: values[row] for key, values in self._metadata.items() if values[row] is not None}
+
+    def _row_to_document(self, row: int) -> Document:
+        metadata = self._row_metadata(row)
+        source = (metadata.get("file_path") or self._sources[row] or
+                  metadata.get("file_name") or "unknown")
+        return Document(id=self._ids[row], content=self._contents[row] or "", metadata=metadata, source=source)
+
+    def search_batch(self, query_embeddings: Any, top_k: int = 10,
+                     where: Optional[Dict[str, Any]] = None,
+                     include_embeddings: bool = False) -> List[List[Document]]:
+        """Search several queries with one matrix multiply (or one scan of the codes).
+
+        With ``include_embeddings`` each Document gets its full-precision row.
+        """
+        try:
+            with self._lock:
+                if self._matrix is None or not len(self._ids):
+                    return [[] for _ in range(len(query_embeddings))]
+
+                self._ensure_columns()
+                queries = self._prepare(query_embeddings)
+                scores = self._scores(queries)
+                available = len(self._ids)
+                mask = self._mask(where) if where else None
+                if self._deleted is not None:
+                    # Soft-deleted rows never compete for the top-k
+                    mask = ~self._deleted if mask is None else mask & ~self._deleted
+                if mask is not None:
+                    scores[:, ~mask] = -np.inf
+                    available = int(mask.sum())
+                    top_k = min(top_k, available)
+                query_sq_norms = np.einsum("ij,ij->i", queries, queries)
+
+                rescoring = self.is_quantized and self.rescore
+                candidates_k = min(top_k * self.rescore_factor, available) if rescoring else top_k
+
+                results = []
+                for q, row_scores in enumerate(scores):
+                    rows = self._top_k(row_scores, candidates_k)
+                    if rescoring:
+                        exact = self._exact_scores(queries[q], rows)
+                        order = self._top_k(exact, top_k)
+                        rows, row_values = rows[order], exact[order]
+                    else:
+                        row_values = row_scores[rows]
+
+                    documents = []
+                    for row, value in zip(rows, row_values):
+                        doc = self._row_to_document(int(row))
+                        doc.metadata.update(self._similarity(float(value), float(query_sq_norms[q])))
+                        documents.append(doc)
+                    if include_embeddings and len(rows):
+                        vectors = np.asarray(self._matrix[rows])
+                        for doc, vector in zip(documents, vectors):
+                            doc.embeddings = vector
+                    results.append(documents)
+                return results
+
+        except Exception as e:
+            logger.error(f"Failed to search NumpyStore: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+
+    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        """Search for similar documents."""
+        if query_embedding is None:
+            logger.warning("No query embedding provided for search")
+            return []
+        return self.search_batch([query_embedding], top_k=top_k, where=where,
+                                 include_embeddings=kwargs.get("include_embeddings", False))[0]
+
+    def search_with_filter(self, query_embedding: List[float], top_k: int = 10,
+                           metadata_filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Native filtered search used by MetadataFilteredStrategy."""
+        return self.search(query_embedding=query_embedding, top_k=top_k, where=metadata_filter)
+
+    # ------------------------------------------------------------------
+    # Management
+    # ------------------------------------------------------------------
+
+    def delete_collection(self) -> bool:
+        """Delete the collection."""
+        try:
+            with self._lock:
+                self._clear_files()
+            logger.info(f"Deleted collection: {self.collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            return False
+
+    def get_document(self, doc_id: str) -> Optional[Document]:
+        """Get a specific document by ID."""
+        with self._lock:
+            row = self._id_index.get(doc_id)
+            return None if row is None else self._row_to_document(row)
+
+    def update_metadata(self, where: Dict[str, Any], updates: Dict[str, Any]) -> int:
+        """Merge ``updates`` into matching rows; only the sidecar is rewritten."""
+        with self._lock:
+            if not self._ids:
+                return 0
+            rows = np.flatnonzero(self._mask(where)).tolist()
+            if not rows:
+                return 0
+            for key, value in updates.items():
+                if key not in self._metadata:
+                    self._metadata[key] = [None] * len(self._ids)
+                column = self._metadata[key]
+                for row in rows:
+                    column[row] = value
+                self._columns[key] = self._to_column(column)
+            self._write_sidecar()
+            self._update_deleted()
+        logger.info(f"Updated metadata of {len(rows)} documents in NumpyStore")
+        return len(rows)
+
+    def purge_deleted(self, limit: Optional[int] = None) -> int:
+        """Drop soft-deleted rows, rewriting the matrix, codes and sidecar without them."""
+        with self._lock:
+            self._ensure_columns()
+            if self._deleted is None:
+                return 0
+            rows = np.flatnonzero(self._deleted)
+            if limit is not None:
+                rows = rows[:max(limit, 0)]
+            purged = self._remove_rows(rows.tolist())
+        logger.info(f"Purged {purged} soft-deleted documents from NumpyStore")
+        return purged
+
+    def delete_documents(self, doc_ids: List[str]) -> bool:
+        """Delete documents by IDs."""
+        try:
+            with self._lock:
+                rows = [self._id_index[i] for i in set(doc_ids) if i in self._id_index]
+                deleted = self._remove_rows(rows)
+            logger.info(f"Deleted {deleted} documents from NumpyStore")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return False
+
+    def delete_by_document_hash(self, document_hash: str) -> bool:
+        """Delete all chunks belonging to a specific document by its hash."""
+        try:
+            with self._lock:
+                if not self._ids:
+                    return True
+                rows = np.flatnonzero(self._mask({"document_hash": document_hash})).tolist()
+                deleted = self._remove_rows(rows)
+            logger.info(f"Deleted {deleted} documents with hash {document_hash[:12]}...")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents by hash: {e}")
+            return False
+
+    def delete_by_source(self, source_path: str) -> bool:
+        """Delete all documents from a specific source file."""
+        try:
+            with self._lock:
+                if not self._ids:
+                    return True
+                mask = self._mask({"source": source_path}) | self._mask({"file_path": source_path})
+                deleted = self._remove_rows(np.flatnonzero(mask).tolist())
+            logger.info(f"Deleted {deleted} documents from source {source_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents by source: {e}")
+            return False
+
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection."""
+        with self._lock:
+            self._ensure_columns()
+            count = len(self._ids)
+            return {
+                "name": self.collection_name,
+                "count": count,
+                "document_count": count,
+                "deleted_count": int(self._deleted.sum()) if self._deleted is not None else 0,
+                "persist_directory": self.persist_directory,
+                "distance_metric": self.distance_metric,
+                "dtype": str(np.dtype(self.dtype)),
+                "dimension": self.dimension,
+                "quantization": self.quantization,
+                "code_bytes": int(self._codes.nbytes) if self._codes is not None else 0,
+            }
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get store description."""
+        return "NumPy vector store for exact, deterministic in-process search over a memory-mapped matrix."
@@ -0,0 +1,12 @@
+"""ShardedStore Component
+
+Component for sharded store.
+"""
+
+from .sharded_store import ShardedStore
+
+__all__ = ['ShardedStore']
+
+# Component metadata (read from schema.json at runtime)
+COMPONENT_TYPE = "store"
+COMPONENT_NAME = "sharded_store"
@@ -0,0 +1,275 @@
+"""Sharded vector store implementation.
+
+Wraps N stores of one type (any store registered in ``VectorStoreFactory``)
+and routes each chunk to a shard by its ``document_hash``, so every chunk of a
+source document lives on the same shard. Searches fan out to all shards on a
+thread pool and the per-shard results are merged into a global top-k with a
+heap. Shards can be spread across disks with ``shard_directories``.
+
+The shard count is recorded in ``<persist_directory>/<collection>.shards.json``
+on first use; reopening with a different ``num_shards`` keeps the recorded
+value, since changing it would route existing documents to the wrong shard.
+"""
+
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from core.base import VectorStore, Document
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedStore(VectorStore):
+    """Scatter-gather wrapper that partitions a collection across several stores."""
+
+    def __init__(self, name: str = "ShardedStore", config: Optional[Dict[str, Any]] = None):
+        super().__init__(name, config)
+        config = config or {}
+        self.collection_name = config.get("collection_name", "documents")
+        self.persist_directory = config.get("persist_directory", "./data/sharded_db")
+        self.shard_type = config.get("shard_type", "ChromaStore")
+        self.shard_config = dict(config.get("shard_config") or {})
+        self.shard_directories = list(config.get("shard_directories") or [])
+        self.num_shards = self._recorded_shard_count(max(config.get("num_shards", 4), 1))
+        self.max_workers = max(config.get("max_workers") or self.num_shards, 1)
+        self.last_add_stats: Dict[str, int] = {"inserted": 0, "skipped": 0, "batches": 0}
+
+        self.shards: List[VectorStore] = [self._create_shard(i) for i in range(self.num_shards)]
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-shard")
+
+    # ------------------------------------------------------------------
+    # Shard layout
+    # ------------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return Path(self.persist_directory) / f"{self.collection_name}.shards.json"
+
+    def _recorded_shard_count(self, requested: int) -> int:
+        """Return the persisted shard count, recording ``requested`` on first use."""
+        path = self.manifest_path
+        if path.exists():
+            recorded = json.loads(path.read_text()).get("num_shards", requested)
+            if recorded != requested:
+                logger.warning(
+                    f"Collection {self.collection_name} was created with {recorded} shards; "
+                    f"ignoring num_shards={requested}"
+                )
+            return recorded
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"num_shards": requested, "shard_type": self.shard_type}))
+        return requested
+
+    def _shard_directory(self, index: int) -> str:
+        if self.shard_directories:
+            base = Path(self.shard_directories[index % len(self.shard_directories)])
+        else:
+            base = Path(self.persist_directory)
+        return str(base / f"{self.collection_name}_shard{index}")
+
+    def _create_shard(self, index: int) -> VectorStore:
+        # Imported here: the factory module imports this one
+        from core.factories import VectorStoreFactory
+
+        shard_config = dict(self.shard_config)
+        shard_config["persist_directory"] = self._shard_directory(index)
+        shard_config.setdefault("collection_name", f"{self.collection_name}_shard{index}")
+        return VectorStoreFactory.create(self.shard_type, shard_config)
+
+    def shard_for(self, document_hash: str) -> int:
+        """Index of the shard that owns ``document_hash`` (stable across processes)."""
+        digest = hashlib.blake2b(str(document_hash).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.num_shards
+
+    def _routing_key(self, document: Document) -> str:
+        # Chunks without a document hash fall back to their source, then their own ID
+        metadata = document.metadata or {}
+        return (
+            metadata.get("document_hash")
+            or document.source
+            or metadata.get("source")
+            or document.id
+            or document.content
+        )
+
+    def _scatter(self, call) -> List[Any]:
+        """Run ``call(shard)`` on every shard concurrently; results in shard order."""
+        futures = [self._executor.submit(call, shard) for shard in self.shards]
+        return [future.result() for future in futures]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_documents(self, documents: List[Document]) -> bool:
+        """Add documents, each to the shard owning its document hash."""
+        try:
+            groups: Dict[int, List[Document]] = {}
+            for document in documents:
+                groups.setdefault(self.shard_for(self._routing_key(document)), []).append(document)
+
+            indices = sorted(groups)
+            futures = [self._executor.submit(self.shards[i].add_documents, groups[i]) for i in indices]
+            results = [future.result() for future in futures]
+
+            stats = {"inserted": 0, "skipped": 0, "batches": 0}
+            for index in indices:
+                for key, value in (getattr(self.shards[index], "last_add_stats", None) or {}).items():
+                    if isinstance(value, (int, float)):
+                        stats[key] = stats.get(key, 0) + value
+            stats["shards"] = len(indices)
+            self.last_add_stats = stats
+
+            logger.info(f"Added {len(documents)} documents across {len(indices)} shards")
+            return all(results)
+        except Exception as e:
+            logger.error(f"Failed to add documents: {e}")
+            return False
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _score(document: Document) -> float:
+        metadata = document.metadata or {}
+        score = metadata.get("similarity_score", metadata.get("_score", 0.0))
+        return float(score) if score is not None else 0.0
+
+    def _merge(self, shard_results: List[List[Document]], top_k: int) -> List[Document]:
+        """Global top-k over per-shard result lists; ties keep shard order."""
+        return heapq.nlargest(top_k, itertools.chain.from_iterable(shard_results), key=self._score)
+
+    def search_batch(self, query_embeddings: List[List[float]], top_k: int = 10,
+                     where: Optional[Dict[str, Any]] = None,
+                     include_embeddings: bool = False) -> List[List[Document]]:
+        """Search every shard for all queries concurrently and merge per query."""
+        if not len(query_embeddings):
+            return []
+        extra = {"include_embeddings": True} if include_embeddings else {}
+        try:
+            per_shard = self._scatter(
+                lambda shard: shard.search_batch(query_embeddings, top_k=top_k, where=where, **extra)
+            )
+            return [
+                self._merge([results[q] for results in per_shard], top_k)
+                for q in range(len(query_embeddings))
+            ]
+        except Exception as e:
+            logger.error(f"Failed to search shards: {e}")
+            return [[] for _ in query_embeddings]
+
+    def search(self, query: str = None, top_k: int = 10, query_embedding: Optional[List[float]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> List[Document]:
+        """Search all shards and return the global top-k."""
+        if query_embedding is None:
+            logger.error("ShardedStore requires a query embedding")
+            return []
+        return self.search_batch([query_embedding], top_k=top_k, where=where,
+                                 include_embeddings=kwargs.get("include_embeddings", False))[0]
+
+    def search_with_filter(self, query_embedding: List[float], top_k: int = 10,
+                           metadata_filter: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Search with a metadata filter applied by each shard."""
+        return self.search(query_embedding=query_embedding, top_k=top_k, where=metadata_filter or None)
+
+    # ------------------------------------------------------------------
+    # Management
+    # ------------------------------------------------------------------
+
+    def delete_collection(self) -> bool:
+        """Delete every shard's collection."""
+        try:
+            results = self._scatter(lambda shard: shard.delete_collection())
+            logger.info(f"Deleted sharded collection: {self.collection_name}")
+            return all(results)
+        except Exception as e:
+            logger.error(f"Failed to delete collection: {e}")
+            return False
+
+    def get_dimension(self) -> Optional[int]:
+        """The first dimension any shard has fixed."""
+        for shard in self.shards:
+            dimension = shard.get_dimension()
+            if dimension is not None:
+                return dimension
+        return None
+
+    def prepare_for_embedder(self, dimension: int, normalized: bool = False) -> None:
+        for shard in self.shards:
+            shard.prepare_for_embedder(dimension, normalized)
+
+    def get_document(self, doc_id: str) -> Optional[Document]:
+        """Get a specific document by ID from whichever shard holds it."""
+        for document in self._scatter(lambda shard: shard.get_document(doc_id)):
+            if document is not None:
+                return document
+        return None
+
+    def delete_documents(self, doc_ids: List[str]) -> bool:
+        """Delete documents by IDs (the owning shard is unknown, so all are asked)."""
+        try:
+            return all(self._scatter(lambda shard: shard.delete_documents(doc_ids)))
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+            return False
+
+    def delete_by_document_hash(self, document_hash: str) -> bool:
+        """Delete all chunks of a document from the shard that owns it."""
+        try:
+            return self.shards[self.shard_for(document_hash)].delete_by_document_hash(document_hash)
+        except Exception as e:
+            logger.error(f"Failed to delete documents by hash: {e}")
+            return False
+
+    def delete_by_source(self, source_path: str) -> bool:
+        """Delete all documents from a specific source file."""
+        try:
+            return all(self._scatter(lambda shard: shard.delete_by_source(source_path)))
+        except Exception as e:
+            logger.error(f"Failed to delete documents by source: {e}")
+            return False
+
+    def update_metadata(self, where: Dict[str, Any], updates: Dict[str, Any]) -> int:
+        """Update matching chunks on every shard."""
+        return sum(self._scatter(lambda shard: shard.update_metadata(where, updates)))
+
+    def purge_deleted(self, limit: Optional[int] = None) -> int:
+        """Compact every shard; with a limit, shards are compacted in turn until it is used up."""
+        if limit is None:
+            return sum(self._scatter(lambda shard: shard.purge_deleted()))
+        purged = 0
+        for shard in self.shards:
+            if purged >= limit:
+                break
+            purged += shard.purge_deleted(limit - purged)
+        return purged
+
+    def storage_bytes(self) -> int:
+        """Bytes used by all shards, wherever their directories live."""
+        return sum(self._scatter(lambda shard: shard.storage_bytes()))
+
+    def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection and each shard."""
+        shard_info = self._scatter(lambda shard: shard.get_collection_info())
+        count = sum(info.get("count", 0) or 0 for info in shard_info)
+        return {
+            "name": self.collection_name,
+            "count": count,
+            "document_count": count,
+            "deleted_count": sum(info.get("deleted_count", 0) or 0 for info in shard_info),
+            "persist_directory": self.persist_directory,
+            "shard_type": self.shard_type,
+            "num_shards": self.num_shards,
+            "shards": shard_info,
+        }
+
+    @classmethod
+    def get_description(cls) -> str:
+        """Get store description."""
+        return "Sharded vector store that partitions documents by hash across several stores with scatter-gather search."
@@ -2,8 +2,13 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 import logging
+import os
+
+import numpy as np
+
+from utils.timestamps import add_timestamp_epochs
 
 
 @dataclass
@@ -14,16 +19,20 @@ class Document:
     metadata: Dict[str, Any] = field(default_factory=dict)
     id: Optional[str] = None
     source: Optional[str] = None
-    embeddings: Optional[List[float]] = None
+    # A float32 row view into the batch array from Embedder.embed_array, or a list
+    embeddings: Optional[Union[np.ndarray, List[float]]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
+        embeddings = self.embeddings
+        if isinstance(embeddings, np.ndarray):
+            embeddings = embeddings.tolist()
         return {
             "content": self.content,
             "metadata": self.metadata,
             "id": self.id,
             "source": self.source,
-            "embeddings": self.embeddings,
+            "embeddings": embeddings,
         }
 
 
@@ -75,10 +84,20 @@ class Embedder(Component):
         """Generate embeddings for texts."""
         pass
 
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into one float32 array of shape (len(texts), dimension).
+
+        Embedders that produce arrays natively override this; the default
+        converts the output of embed().
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.asarray(self.embed(texts), dtype=np.float32).reshape(len(texts), -1)
+
     def process(self, documents: List[Document]) -> ProcessingResult:
-        """Add embeddings to documents."""
+        """Add embeddings to documents, each a row view into one batch array."""
         texts = [doc.content for doc in documents]
-        embeddings = self.embed(texts)
+        embeddings = self.embed_array(texts)
 
         for doc, embedding in zip(documents, embeddings):
             doc.embeddings = embedding
@@ -101,18 +120,93 @@ class VectorStore(Component):
         """Search for similar documents."""
         pass
 
+    def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[Document]]:
+        """Search several query embeddings, returning one result list per query.
+
+        Stores that can answer many queries in one index call override this;
+        the default issues one search() per query. With ``include_embeddings``
+        each returned Document carries its stored vector where the store keeps one.
+        """
+        extra = {"include_embeddings": True} if include_embeddings else {}
+        if where:
+            extra["where"] = where
+        return [
+            self.search(query_embedding=query_embedding, top_k=top_k, **extra)
+            for query_embedding in query_embeddings
+        ]
+
     @abstractmethod
     def delete_collection(self) -> bool:
         """Delete the collection."""
         pass
 
+    def get_dimension(self) -> Optional[int]:
+        """Dimension new vectors must have, or None while nothing fixes it yet."""
+        return None
+
+    def prepare_for_embedder(self, dimension: int, normalized: bool = False) -> None:
+        """Check, before ingest or search, that vectors of ``dimension`` fit this store.
+
+        Raises ValueError on a mismatch. ``normalized`` says the embedder
+        returns unit-length vectors; stores may use it to skip normalizing.
+        """
+        expected = self.get_dimension()
+        if expected is not None and expected != dimension:
+            raise ValueError(
+                f"{self.name} holds {expected}-dimensional vectors but the embedder produces {dimension}"
+            )
+
+    def update_metadata(self, where: Dict[str, Any], updates: Dict[str, Any]) -> int:
+        """Merge ``updates`` into the metadata of every chunk matching ``where``.
+
+        Returns the number of chunks updated. Soft deletion sets
+        ``is_active: False``; stores leave such chunks out of every search.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support metadata updates")
+
+    def purge_deleted(self, limit: Optional[int] = None) -> int:
+        """Physically remove soft-deleted chunks and rebuild the index without them.
+
+        At most ``limit`` chunks are removed per call so large backlogs can be
+        compacted incrementally. Returns the number of chunks removed.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support compaction")
+
+    def storage_bytes(self) -> int:
+        """Bytes the collection occupies on disk (0 for remote stores)."""
+        directory = getattr(self, "persist_directory", None)
+        if not directory or not os.path.isdir(directory):
+            return 0
+        total = 0
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, filename))
+                except OSError:
+                    continue  # removed while walking
+        return total
+
+    def prepare_documents(self, documents: List[Document]) -> None:
+        """Derive query-time metadata once, before ``documents`` are written.
+
+        Adds ``timestamp_epoch`` next to ``timestamp`` (see ``utils.timestamps``).
+        """
+        add_timestamp_epochs(documents)
+
     def process(self, documents: List[Document]) -> ProcessingResult:
         """Add documents to vector store."""
+        self.prepare_documents(documents)
         success = self.add_documents(documents)
-        return ProcessingResult(
-            documents=documents,
-            metrics={"stored_count": len(documents) if success else 0},
-        )
+        metrics = {"stored_count": len(documents) if success else 0}
+        # Stores that batch their writes report inserted/skipped/batches counts
+        metrics.update(getattr(self, "last_add_stats", None) or {})
+        return ProcessingResult(documents=documents, metrics=metrics)
 
 
 class Pipeline:
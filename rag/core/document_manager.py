@@ -424,6 +424,9 @@ class DocumentLifecycleManager:
 class DocumentDeletionManager:
     """Manages document deletion with various strategies."""
     
+    # Matches chunks not yet soft-deleted, including ones stored without is_active
+    ACTIVE_FILTER = {"$ne": False}
+
     def __init__(self, vector_store, config: Dict[str, Any]):
         self.vector_store = vector_store
         self.config = config
@@ -445,7 +448,7 @@ class DocumentDeletionManager:
         }
         
         if self.enable_soft_delete and strategy == DeletionStrategy.SOFT_DELETE:
-            filter_criteria["is_active"] = True
+            filter_criteria["is_active"] = dict(self.ACTIVE_FILTER)
         
         return self._execute_deletion(filter_criteria, strategy)
     
@@ -460,7 +463,7 @@ class DocumentDeletionManager:
         }
         
         if self.enable_soft_delete and strategy == DeletionStrategy.SOFT_DELETE:
-            filter_criteria["is_active"] = True
+            filter_criteria["is_active"] = dict(self.ACTIVE_FILTER)
         
         return self._execute_deletion(filter_criteria, strategy)
     
@@ -475,7 +478,7 @@ class DocumentDeletionManager:
         }
         
         if self.enable_soft_delete and strategy == DeletionStrategy.SOFT_DELETE:
-            filter_criteria["is_active"] = True
+            filter_criteria["is_active"] = dict(self.ACTIVE_FILTER)
         
         return self._execute_deletion(filter_criteria, strategy)
     
@@ -490,7 +493,7 @@ class DocumentDeletionManager:
         }
         
         if self.enable_soft_delete and strategy == DeletionStrategy.SOFT_DELETE:
-            filter_criteria["is_active"] = True
+            filter_criteria["is_active"] = dict(self.ACTIVE_FILTER)
         
         return self._execute_deletion(filter_criteria, strategy)
         
@@ -580,7 +583,7 @@ class DocumentDeletionManager:
         }
         
         if self.enable_soft_delete and strategy == DeletionStrategy.SOFT_DELETE:
-            filter_criteria["is_active"] = True
+            filter_criteria["is_active"] = dict(self.ACTIVE_FILTER)
         
         return self._execute_deletion(filter_criteria, strategy)
     
@@ -602,9 +605,67 @@ class DocumentDeletionManager:
         
         logger.info(f"Version cleanup requested (keep {keep_versions} versions)")
         # TODO: Implement version cleanup logic
-        
+
         return results
-    
+
+    def compact(
+        self,
+        max_chunks: Optional[int] = None,
+        min_deleted_ratio: float = 0.0,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """Purge soft-deleted chunks from the store and rebuild its index.
+
+        ``max_chunks`` bounds the work done per run so a large backlog can be
+        compacted incrementally; ``min_deleted_ratio`` skips the run while
+        tombstones are still a small fraction of the collection.
+        """
+        results = {
+            "action": "compact",
+            "deleted_count": 0,
+            "remaining_deleted": 0,
+            "bytes_before": 0,
+            "bytes_after": 0,
+            "bytes_reclaimed": 0,
+            "skipped": False,
+            "errors": []
+        }
+
+        try:
+            info = self.vector_store.get_collection_info()
+            total = info.get("count", 0) or 0
+            pending = info.get("deleted_count", 0) or 0
+            results["remaining_deleted"] = pending
+            results["bytes_before"] = results["bytes_after"] = self.vector_store.storage_bytes()
+
+            ratio = pending / total if total else 0.0
+            if not pending or ratio < min_deleted_ratio:
+                results["skipped"] = True
+                logger.info(
+                    f"Skipping compaction: {pending} of {total} chunks soft-deleted "
+                    f"(ratio {ratio:.2%}, threshold {min_deleted_ratio:.2%})"
+                )
+                return results
+
+            if dry_run:
+                results["deleted_count"] = pending if max_chunks is None else min(pending, max_chunks)
+                results["remaining_deleted"] = pending - results["deleted_count"]
+                return results
+
+            purged = self.vector_store.purge_deleted(limit=max_chunks)
+            results["deleted_count"] = purged
+            results["remaining_deleted"] = max(pending - purged, 0)
+            results["bytes_after"] = self.vector_store.storage_bytes()
+            results["bytes_reclaimed"] = max(results["bytes_before"] - results["bytes_after"], 0)
+
+        except NotImplementedError as e:
+            results["errors"].append(str(e))
+        except Exception as e:
+            results["errors"].append(f"Compaction failed: {str(e)}")
+            logger.error(f"Compaction failed: {e}")
+
+        return results
+
     def _execute_deletion(
         self, 
         filter_criteria: Dict[str, Any], 
@@ -773,10 +834,11 @@ class DocumentManager:
             else:
                 # Fallback to basic collection info
                 info = self.vector_store.get_collection_info()
+                deleted = info.get("deleted_count", 0)
                 return {
                     "total_documents": info.get("count", 0),
-                    "active_documents": info.get("count", 0),
-                    "deleted_documents": 0,
+                    "active_documents": info.get("count", 0) - deleted,
+                    "deleted_documents": deleted,
                     "expired_documents": 0,
                     "total_versions": 0,
                     "storage_size_mb": 0,
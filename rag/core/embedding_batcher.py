@@ -0,0 +1,213 @@
+"""Dynamic batching in front of an embedder for concurrent callers.
+
+Callers submit texts and get a future. A dispatcher thread coalesces
+pending requests into micro-batches of up to ``max_batch_size`` texts,
+waiting at most ``max_wait_ms`` after the first request of a batch for more
+to arrive, and runs each batch through ``embed_array`` on one of
+``max_concurrent_batches`` workers. The dispatcher only starts a batch when a
+worker is free, so while the embedder is busy requests pile up and the next
+batch is larger: batch size adapts to load, and an idle service adds at most
+``max_wait_ms`` to a single query.
+
+``get_embedding_batcher`` returns one shared batcher per model (keyed by
+``embedder_cache_key``), so every SearchAPI and EnhancedPipeline in one
+process that enables ``embedding_batcher`` feeds the same batches: a query
+arriving during an ingest waits behind at most one ingest batch. Callers in
+separate processes, such as the server's per-search subprocesses, do not
+share a batcher.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.base import Embedder
+from utils.query_cache import embedder_cache_key
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into micro-batches.
+
+    Has the ``embed``/``embed_array``/``embed_text`` methods of an Embedder,
+    so it can stand in for the embedder it wraps.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 1,
+    ):
+        self.embedder = embedder
+        self.max_batch_size = max(int(max_batch_size or getattr(embedder, "batch_size", 32) or 32), 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.max_concurrent_batches = max(int(max_concurrent_batches), 1)
+        self.model_key = embedder_cache_key(embedder)
+        self.batch_size = self.max_batch_size
+
+        self._requests: "queue.Queue" = queue.Queue()
+        self._slots = threading.Semaphore(self.max_concurrent_batches)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_batches, thread_name_prefix="embedding-batch"
+        )
+        self._submit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "texts": 0, "batches": 0, "failed_batches": 0}
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, name="embedding-batcher", daemon=True)
+        self._dispatcher.start()
+
+    # ------------------------------------------------------------------
+    # Submitting
+    # ------------------------------------------------------------------
+
+    def submit(self, texts: List[str]) -> "Future[np.ndarray]":
+        """Queue ``texts``; the future resolves to their (len(texts), dimension) float32 rows."""
+        future: "Future[np.ndarray]" = Future()
+        texts = list(texts)
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+            if not texts:
+                future.set_result(np.empty((0, 0), dtype=np.float32))
+            else:
+                self._requests.put((texts, future))
+        return future
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed texts through the shared batches and wait for the result."""
+        return self.submit(texts).result()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Like ``embed_array``, as lists."""
+        return self.embed_array(texts).tolist()
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text string."""
+        return self.embed([text])[0]
+
+    # ------------------------------------------------------------------
+    # Dispatching
+    # ------------------------------------------------------------------
+
+    def _dispatch(self) -> None:
+        stopping = False
+        # close() queues _STOP last, so every earlier request is served before exiting
+        while not stopping:
+            # Wait for a free worker first: requests arriving meanwhile join the next batch
+            self._slots.acquire()
+            first = self._requests.get()
+            if first is _STOP:
+                self._slots.release()
+                break
+
+            batch: List[Tuple[List[str], Future]] = [first]
+            size = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self._requests.get_nowait() if remaining <= 0 else self._requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._executor.submit(self._run, batch)
+
+    def _run(self, batch: List[Tuple[List[str], Future]]) -> None:
+        """Embed one micro-batch and hand each caller its rows."""
+        try:
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = self.embedder.embed_array(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"embedder returned {len(vectors)} vectors for {len(texts)} texts")
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+                with self._stats_lock:
+                    self._stats["failed_batches"] += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            with self._stats_lock:
+                self._stats["requests"] += len(batch)
+                self._stats["texts"] += len(texts)
+                self._stats["batches"] += 1
+            start = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+        finally:
+            self._slots.release()
+
+    # ------------------------------------------------------------------
+    # Lifecycle and stats
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Finish queued requests and stop the dispatcher."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(_STOP)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "EmbeddingBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests, texts and batches served, and the mean batch size."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["mean_batch_size"] = stats["texts"] / stats["batches"] if stats["batches"] else 0.0
+        stats["pending_requests"] = self._requests.qsize()
+        return stats
+
+
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(embedder: Embedder, config: Optional[Dict[str, Any]] = None) -> EmbeddingBatcher:
+    """The process-wide batcher for ``embedder``'s model, created on first use from ``config``.
+
+    Embedders with the same ``embedder_cache_key`` share one batcher, which
+    runs the first of them. ``config`` takes ``max_batch_size``,
+    ``max_wait_ms`` and ``max_concurrent_batches``; it only applies when the
+    batcher is created.
+    """
+    config = config or {}
+    key = embedder_cache_key(embedder)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None or batcher._closed:
+            batcher = EmbeddingBatcher(
+                embedder,
+                max_batch_size=config.get("max_batch_size"),
+                max_wait_ms=config.get("max_wait_ms", 5.0),
+                max_concurrent_batches=config.get("max_concurrent_batches", 1),
+            )
+            _batchers[key] = batcher
+        return batcher
@@ -1,22 +1,62 @@
 """Enhanced pipeline with progress tracking."""
 
-import time
-from typing import List
+from typing import Any, Dict, List, Optional
 from core.base import Pipeline, Document, ProcessingResult
+from core.embedding_batcher import get_embedding_batcher
+from core.streaming import stream_embed_store
+from utils.bm25_index import index_lexical
+from utils.embedding_registry import EmbeddingProbeError, validate_embedder_for_store
 from utils.progress import LlamaProgressTracker, create_enhanced_progress_bar
 
 
 class EnhancedPipeline(Pipeline):
     """Pipeline with beautiful progress tracking and llama puns."""
 
-    def __init__(self, name: str = "Enhanced RAG Pipeline"):
+    def __init__(
+        self,
+        name: str = "Enhanced RAG Pipeline",
+        write_batch_size: int = 256,
+        max_pending_batches: int = 4,
+        release_embeddings: bool = False,
+        embedding_batcher: Optional[Dict[str, Any]] = None,
+    ):
         super().__init__(name)
         self.tracker = LlamaProgressTracker()
+        # An embedder followed by a store streams: embedded batches wait in a
+        # queue of at most max_pending_batches and are written write_batch_size
+        # documents at a time. With release_embeddings stored vectors are dropped
+        # from the returned documents to save memory; callers opt in.
+        self.write_batch_size = write_batch_size
+        self.max_pending_batches = max_pending_batches
+        self.release_embeddings = release_embeddings
+        # With ``{"enabled": true, ...}`` embedding goes through the process-wide
+        # EmbeddingBatcher, sharing the model with searches in this process
+        self.embedding_batcher = embedding_batcher or {}
+
+    def validate_embedding_dimensions(self) -> None:
+        """Check each store can hold the vectors of the embedder before it.
+
+        Runs before any parsing or embedding, so a dimension mismatch fails
+        the ingest up front instead of at the first insert. Each model is
+        probed once and remembered (see ``utils.embedding_registry``).
+        Raises ValueError on a mismatch; an embedder that can't be probed is
+        only logged.
+        """
+        embedder = None
+        for component in self.components:
+            if hasattr(component, "embed"):
+                embedder = component
+            elif embedder is not None and hasattr(component, "add_documents"):
+                try:
+                    validate_embedder_for_store(embedder, component)
+                except EmbeddingProbeError as e:
+                    self.logger.warning(f"Skipping dimension check for {component.name}: {e}")
 
     def run_with_progress(
         self, source: str = None, documents: List[Document] = None
     ) -> ProcessingResult:
         """Run the pipeline with enhanced progress tracking."""
+        self.validate_embedding_dimensions()
 
         # Show llama art and welcome message
         self.tracker.print_llama_art()
@@ -66,39 +106,60 @@ class EnhancedPipeline(Pipeline):
                 f"🔄 Processing {len(current_docs)} documents through {total_steps} steps..."
             )
 
-            for step_idx, component in enumerate(self.components[start_idx:], 1):
+            components = self.components[start_idx:]
+            step_idx = 0
+            while step_idx < total_steps:
+                component = components[step_idx]
                 component_name = component.__class__.__name__
-
-                # Show step header
-                print(f"\n📋 Step {step_idx}/{total_steps}: {component_name}")
-                print(f"💭 {self.tracker.get_random_pun()}")
-
-                # Special handling for embedders (slow)
-                if hasattr(component, "embed"):
-                    self._process_embeddings_with_progress(component, current_docs)
-
-                # Special handling for vector stores (also potentially slow)
-                elif hasattr(component, "add_documents"):
-                    self._process_storage_with_progress(component, current_docs)
-
-                # Other components
+                next_component = components[step_idx + 1] if step_idx + 1 < total_steps else None
+
+                # Embedder straight into a vector store: embed and write concurrently
+                if (
+                    hasattr(component, "embed")
+                    and next_component is not None
+                    and hasattr(next_component, "add_documents")
+                ):
+                    print(
+                        f"\n📋 Steps {step_idx + 1}-{step_idx + 2}/{total_steps}: "
+                        f"{component_name} → {next_component.__class__.__name__}"
+                    )
+                    print(f"💭 {self.tracker.get_random_pun()}")
+                    all_errors.extend(
+                        self._process_streaming_with_progress(component, next_component, current_docs)
+                    )
+                    step_idx += 2
                 else:
-                    try:
-                        print(f"⚡ Processing with {component_name}...")
-                        result = component.process(current_docs)
-                        current_docs = result.documents
-                        all_errors.extend(result.errors)
-                        self.tracker.print_success(f"{component_name} completed!")
-                    except Exception as e:
-                        self.logger.error(f"Component {component.name} failed: {e}")
-                        all_errors.append(
-                            {"component": component.name, "error": str(e)}
-                        )
+                    step_idx += 1
+
+                    # Show step header
+                    print(f"\n📋 Step {step_idx}/{total_steps}: {component_name}")
+                    print(f"💭 {self.tracker.get_random_pun()}")
+
+                    # Special handling for embedders (slow)
+                    if hasattr(component, "embed"):
+                        self._process_embeddings_with_progress(component, current_docs)
+
+                    # Special handling for vector stores (also potentially slow)
+                    elif hasattr(component, "add_documents"):
+                        all_errors.extend(self._process_storage_with_progress(component, current_docs))
+
+                    # Other components
+                    else:
+                        try:
+                            print(f"⚡ Processing with {component_name}...")
+                            result = component.process(current_docs)
+                            current_docs = result.documents
+                            all_errors.extend(result.errors)
+                            self.tracker.print_success(f"{component_name} completed!")
+                        except Exception as e:
+                            self.logger.error(f"Component {component.name} failed: {e}")
+                            all_errors.append(
+                                {"component": component.name, "error": str(e)}
+                            )
 
                 # Show motivational message between steps
                 if step_idx < total_steps:
                     print(f"✨ {self.tracker.get_random_motivation()}")
-                    time.sleep(0.5)  # Brief pause for dramatic effect
 
         # Final celebration
         print(f"\n{self.tracker.get_completion_message()}")
@@ -117,6 +178,12 @@ class EnhancedPipeline(Pipeline):
 
         return ProcessingResult(documents=current_docs, errors=all_errors)
 
+    def _encoder(self, embedder):
+        """The shared batcher for ``embedder`` if enabled, else the embedder itself."""
+        if self.embedding_batcher.get("enabled", False):
+            return get_embedding_batcher(embedder, self.embedding_batcher)
+        return embedder
+
     def _process_embeddings_with_progress(self, embedder, documents: List[Document]):
         """Process embeddings with detailed progress tracking."""
         batch_size = getattr(embedder, "batch_size", 32)
@@ -130,14 +197,17 @@ class EnhancedPipeline(Pipeline):
         )
 
         processed_count = 0
+        cache_stats = getattr(embedder, "cache_stats", None)
+        cache_before = dict(cache_stats) if isinstance(cache_stats, dict) else None
+        encoder = self._encoder(embedder)
 
         try:
             for i in range(0, len(documents), batch_size):
                 batch = documents[i : i + batch_size]
                 texts = [doc.content for doc in batch]
 
-                # Generate embeddings for batch
-                embeddings = embedder.embed(texts)
+                # Generate embeddings for batch as one (batch, dimension) array
+                embeddings = encoder.embed_array(texts)
 
                 # Update documents with embeddings
                 for doc, embedding in zip(batch, embeddings):
@@ -148,51 +218,105 @@ class EnhancedPipeline(Pipeline):
                     # Show motivational message at milestones
                     if processed_count % milestone_interval == 0:
                         pbar.set_postfix_str(self.tracker.get_random_pun())
-                        time.sleep(0.1)  # Brief pause to let users see the message
 
             pbar.close()
             self.tracker.print_success(
-                f"Embeddings generated! Average dimension: {len(embeddings[0]) if embeddings and embeddings[0] else 'Unknown'}"
+                f"Embeddings generated! Average dimension: {embeddings.shape[1] if len(embeddings) else 'Unknown'}"
             )
+            self._print_cache_stats(embedder, cache_before)
 
         except Exception as e:
             pbar.close()
             raise e
 
-    def _process_storage_with_progress(self, store, documents: List[Document]):
-        """Process vector storage with progress tracking."""
+    def _process_storage_with_progress(self, store, documents: List[Document]) -> List[dict]:
+        """Store documents in write_batch_size batches, advancing progress per write."""
         print(f"💾 Storing {len(documents)} documents in vector database...")
 
-        # Create progress bar
-        pbar, milestone_interval = create_enhanced_progress_bar(
-            len(documents), "🦙 Storing", self.tracker
-        )
+        pbar, _ = create_enhanced_progress_bar(len(documents), "🦙 Storing", self.tracker)
+        errors = []
+        stored = 0
 
         try:
-            # For now, we'll simulate progress since ChromaDB doesn't expose batch progress
-            # In a real implementation, you might batch the storage operations
+            for i in range(0, len(documents), self.write_batch_size):
+                batch = documents[i : i + self.write_batch_size]
+                if hasattr(store, "prepare_documents"):
+                    store.prepare_documents(batch)
+                if store.add_documents(batch):
+                    stored += len(batch)
+                    index_lexical(store, batch)
+                else:
+                    errors.append({
+                        "component": getattr(store, "name", store.__class__.__name__),
+                        "error": f"add_documents failed for {len(batch)} documents",
+                    })
+                pbar.update(len(batch))
+                pbar.set_postfix_str(self.tracker.get_random_motivation())
+        finally:
+            pbar.close()
 
-            # Show some progress updates
-            for i in range(len(documents)):
-                if i % (len(documents) // 10 + 1) == 0:  # Update every ~10%
-                    pbar.set_postfix_str(self.tracker.get_random_motivation())
-                    time.sleep(0.05)
-                pbar.update(1)
+        self._print_storage_result(stored, len(documents))
+        return errors
 
-            # Actually store the documents
-            success = store.add_documents(documents)
+    def _process_streaming_with_progress(self, embedder, store, documents: List[Document]) -> List[dict]:
+        """Embed and store together, with one real progress bar per side."""
+        batch_size = getattr(embedder, "batch_size", 32)
+        print(
+            f"🧠 Embedding {len(documents)} documents in batches of {batch_size}, "
+            f"💾 storing in batches of {self.write_batch_size} as they arrive..."
+        )
 
-            pbar.close()
+        embed_bar, milestone_interval = create_enhanced_progress_bar(
+            len(documents), "🦙 Embedding", self.tracker
+        )
+        store_bar = self.tracker.create_progress_bar(len(documents), "🦙 Storing")
+        cache_stats = getattr(embedder, "cache_stats", None)
+        cache_before = dict(cache_stats) if isinstance(cache_stats, dict) else None
 
-            if success:
-                self.tracker.print_success(
-                    f"Successfully stored all {len(documents)} documents!"
-                )
-            else:
-                self.tracker.print_warning(
-                    "Storage completed but some issues may have occurred"
-                )
+        embedded = [0]
 
-        except Exception as e:
-            pbar.close()
-            raise e
+        def on_embedded(count: int):
+            embed_bar.update(count)
+            embedded[0] += count
+            # Show motivational message at milestones
+            if embedded[0] // milestone_interval != (embedded[0] - count) // milestone_interval:
+                embed_bar.set_postfix_str(self.tracker.get_random_pun())
+
+        try:
+            stats = stream_embed_store(
+                self._encoder(embedder),
+                store,
+                documents,
+                write_batch_size=self.write_batch_size,
+                max_pending_batches=self.max_pending_batches,
+                release_embeddings=self.release_embeddings,
+                on_embedded=on_embedded,
+                on_stored=lambda count, ok: store_bar.update(count),
+            )
+        finally:
+            embed_bar.close()
+            store_bar.close()
+
+        self.tracker.print_success(
+            f"Embeddings generated! Average dimension: {stats.dimension or 'Unknown'}"
+        )
+        self._print_cache_stats(embedder, cache_before)
+        self.tracker.print_info(
+            f"⏱️ Embedding {stats.embed_seconds:.1f}s, storing {stats.store_seconds:.1f}s "
+            f"({stats.write_batches} writes), wall {stats.wall_seconds:.1f}s"
+        )
+        self._print_storage_result(stats.stored, len(documents))
+        return stats.errors
+
+    def _print_cache_stats(self, embedder, cache_before):
+        """Report CachedEmbedder hits/misses since the ``cache_before`` snapshot."""
+        if cache_before is not None:
+            hits = embedder.cache_stats["cache_hits"] - cache_before["cache_hits"]
+            misses = embedder.cache_stats["cache_misses"] - cache_before["cache_misses"]
+            self.tracker.print_info(f"♻️ Embedding cache: {hits} hits, {misses} misses")
+
+    def _print_storage_result(self, stored: int, total: int):
+        if stored == total:
+            self.tracker.print_success(f"Successfully stored all {total} documents!")
+        else:
+            self.tracker.print_warning(f"Stored {stored} of {total} documents; some writes failed")
@@ -21,6 +21,7 @@ except ImportError:
 
 # Import embedders
 from components.embedders.ollama_embedder.ollama_embedder import OllamaEmbedder
+from components.embedders.cached_embedder.cached_embedder import CachedEmbedder
 
 # Conditional imports for embedders with dependencies
 try:
@@ -41,6 +42,16 @@ try:
 except ImportError:
     SENTENCE_TRANSFORMER_AVAILABLE = False
 
+try:
+    from components.embedders.onnx_embedder.onnx_embedder import OnnxEmbedder
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Import vector stores
+from components.stores.numpy_store.numpy_store import NumpyStore
+from components.stores.sharded_store.sharded_store import ShardedStore
+
 # Conditional imports for vector stores
 try:
     from components.stores.chroma_store.chroma_store import ChromaStore
@@ -49,7 +60,7 @@ except ImportError:
     CHROMA_AVAILABLE = False
 
 try:
-    from components.stores.faiss_store.faiss_store import FAISSStore
+    from components.stores.faiss_store.faiss_store import FaissStore as FAISSStore
     FAISS_AVAILABLE = True
 except ImportError:
     FAISS_AVAILABLE = False
@@ -79,12 +90,19 @@ from components.extractors.heading_extractor.heading_extractor import HeadingExt
 
 # Import retrieval strategies
 from components.retrievers.basic_similarity.basic_similarity import BasicSimilarityStrategy
+from components.retrievers.bm25.bm25 import BM25Strategy
 
 from components.retrievers.hybrid_universal.hybrid_universal import HybridUniversalStrategy
 from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
 from components.retrievers.multi_query.multi_query import MultiQueryStrategy
 from components.retrievers.reranked.reranked import RerankedStrategy
 
+try:
+    from components.retrievers.cross_encoder_rerank.cross_encoder_rerank import CrossEncoderRerankStrategy
+    CROSS_ENCODER_AVAILABLE = True
+except ImportError:
+    CROSS_ENCODER_AVAILABLE = False
+
 
 class ComponentFactory:
     """Base factory for creating RAG components."""
@@ -135,6 +153,7 @@ class EmbedderFactory(ComponentFactory):
 
     _registry = {
         "OllamaEmbedder": OllamaEmbedder,
+        "CachedEmbedder": CachedEmbedder,
     }
     
     # Add embedders conditionally based on availability
@@ -144,12 +163,17 @@ class EmbedderFactory(ComponentFactory):
         _registry["HuggingFaceEmbedder"] = HuggingFaceEmbedder
     if SENTENCE_TRANSFORMER_AVAILABLE:
         _registry["SentenceTransformerEmbedder"] = SentenceTransformerEmbedder
+    if ONNX_AVAILABLE:
+        _registry["OnnxEmbedder"] = OnnxEmbedder
 
 
 class VectorStoreFactory(ComponentFactory):
     """Factory for creating vector store instances."""
 
-    _registry = {}
+    _registry = {
+        "NumpyStore": NumpyStore,
+        "ShardedStore": ShardedStore,
+    }
     
     # Add vector stores conditionally based on availability
     if CHROMA_AVAILABLE:
@@ -185,12 +209,16 @@ class RetrievalStrategyFactory(ComponentFactory):
 
     _registry = {
         "BasicSimilarityStrategy": BasicSimilarityStrategy,
+        "BM25Strategy": BM25Strategy,
         "HybridUniversalStrategy": HybridUniversalStrategy,
         "MetadataFilteredStrategy": MetadataFilteredStrategy,
         "MultiQueryStrategy": MultiQueryStrategy,
         "RerankedStrategy": RerankedStrategy,
     }
 
+    if CROSS_ENCODER_AVAILABLE:
+        _registry["CrossEncoderRerankStrategy"] = CrossEncoderRerankStrategy
+
 
 def create_component_from_config(
     component_config: Dict[str, Any], factory_class: Type[ComponentFactory]
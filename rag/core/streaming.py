@@ -0,0 +1,142 @@
+"""Streaming embed -> store stage.
+
+The embedder runs on the calling thread and hands each embedded batch to a
+writer thread through a bounded queue. The writer groups batches into
+``write_batch_size`` documents per ``add_documents`` call, so the store
+writes while the next batches are being embedded, and at most
+``max_pending_batches`` embedded batches wait in memory at any time. With
+``release_embeddings`` the vectors of stored documents are dropped, which
+keeps peak memory independent of corpus size. Each successful write is also
+added to the store's BM25 index when ``lexical_index`` is enabled.
+
+Write batches ignore document boundaries, so one document's chunks can
+arrive in several ``add_documents`` calls; stores must not treat a document
+as complete after a single call (see ChromaStore's document deduplication).
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from core.base import Document, Embedder, VectorStore
+from utils.bm25_index import index_lexical
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StreamStats:
+    """Counts and timings from one streamed embed/store run."""
+
+    embedded: int = 0
+    stored: int = 0
+    failed: int = 0
+    write_batches: int = 0
+    embed_seconds: float = 0.0
+    store_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    dimension: Optional[int] = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def stream_embed_store(
+    embedder: Embedder,
+    store: VectorStore,
+    documents: List[Document],
+    write_batch_size: int = 256,
+    max_pending_batches: int = 4,
+    release_embeddings: bool = False,
+    on_embedded: Optional[Callable[[int], None]] = None,
+    on_stored: Optional[Callable[[int, bool], None]] = None,
+) -> StreamStats:
+    """Embed ``documents`` in ``embedder.batch_size`` batches and store them as they arrive.
+
+    ``on_embedded(count)`` is called on this thread after each embedded
+    batch; ``on_stored(count, ok)`` on the writer thread after each write.
+    A write that returns False is counted in ``failed`` and reported in
+    ``errors``; an exception from either side stops the stage and is
+    re-raised here once batches already embedded have been written.
+    """
+    embed_batch_size = max(getattr(embedder, "batch_size", 32) or 32, 1)
+    write_batch_size = max(write_batch_size, 1)
+    pending: "queue.Queue" = queue.Queue(maxsize=max(max_pending_batches, 1))
+    stats = StreamStats()
+    writer_failure: List[BaseException] = []
+    start = time.perf_counter()
+
+    def write(buffer: List[Document]) -> None:
+        write_start = time.perf_counter()
+        prepare = getattr(store, "prepare_documents", None)
+        if prepare is not None:
+            prepare(buffer)
+        ok = bool(store.add_documents(buffer))
+        stats.store_seconds += time.perf_counter() - write_start
+        stats.write_batches += 1
+        if ok:
+            stats.stored += len(buffer)
+            index_lexical(store, buffer)
+            if release_embeddings:
+                for doc in buffer:
+                    doc.embeddings = None
+        else:
+            stats.failed += len(buffer)
+            stats.errors.append({
+                "component": getattr(store, "name", store.__class__.__name__),
+                "error": f"add_documents failed for {len(buffer)} documents",
+            })
+        if on_stored:
+            on_stored(len(buffer), ok)
+
+    def writer() -> None:
+        buffer: List[Document] = []
+        while True:
+            batch = pending.get()
+            if batch is _DONE:
+                break
+            if writer_failure:
+                continue  # keep draining so the embedder never blocks on a full queue
+            buffer.extend(batch)
+            try:
+                while len(buffer) >= write_batch_size:
+                    write(buffer[:write_batch_size])
+                    buffer = buffer[write_batch_size:]
+            except BaseException as e:
+                writer_failure.append(e)
+        try:
+            if buffer and not writer_failure:
+                write(buffer)
+        except BaseException as e:
+            writer_failure.append(e)
+
+    thread = threading.Thread(target=writer, name="embed-store-writer", daemon=True)
+    thread.start()
+    try:
+        for i in range(0, len(documents), embed_batch_size):
+            if writer_failure:
+                break
+            batch = documents[i:i + embed_batch_size]
+            embed_start = time.perf_counter()
+            embeddings = embedder.embed_array([doc.content for doc in batch])
+            stats.embed_seconds += time.perf_counter() - embed_start
+            # Each document holds a row view; the batch array is freed once all rows are released
+            for doc, embedding in zip(batch, embeddings):
+                doc.embeddings = embedding
+            if stats.dimension is None and len(embeddings):
+                stats.dimension = embeddings.shape[1]
+            stats.embedded += len(batch)
+            if on_embedded:
+                on_embedded(len(batch))
+            pending.put(batch)
+    finally:
+        pending.put(_DONE)
+        thread.join()
+        stats.wall_seconds = time.perf_counter() - start
+
+    if writer_failure:
+        raise writer_failure[0]
+    return stats
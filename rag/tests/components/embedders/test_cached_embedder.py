@@ -0,0 +1,167 @@
+"""Tests for the CachedEmbedder component."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from core.base import Document
+from core.factories import create_embedder_from_config
+from components.embedders.cached_embedder.cached_embedder import CachedEmbedder
+from components.embedders.ollama_embedder.ollama_embedder import OllamaEmbedder
+
+
+def fake_vectors(texts):
+    """Deterministic float32-exact vectors derived from text length."""
+    return [[float(len(text)), 0.5, -0.25] for text in texts]
+
+
+def fake_array(texts):
+    return np.asarray(fake_vectors(texts), dtype=np.float32)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "embeddings.sqlite")
+
+
+def make_embedder(cache_path, **config):
+    config.setdefault("embedder_config", {"model": "nomic-embed-text"})
+    return CachedEmbedder("test_cache", {"cache_path": cache_path, **config})
+
+
+class TestCachedEmbedder:
+    """Test CachedEmbedder functionality."""
+
+    def test_wraps_configured_embedder(self, cache_path):
+        embedder = make_embedder(cache_path, embedder_config={"model": "mxbai-embed-large", "batch_size": 8})
+
+        assert isinstance(embedder.embedder, OllamaEmbedder)
+        assert embedder.model_key == "OllamaEmbedder:mxbai-embed-large"
+        assert embedder.batch_size == 8
+
+    def test_hits_skip_wrapped_embedder(self, cache_path):
+        embedder = make_embedder(cache_path)
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=fake_array) as inner:
+            first = embedder.embed(["alpha", "beta"])
+            second = embedder.embed(["beta", "gamma", "alpha"])
+
+        assert first == fake_vectors(["alpha", "beta"])
+        assert second == fake_vectors(["beta", "gamma", "alpha"])
+        assert inner.call_args_list[0].args[0] == ["alpha", "beta"]
+        assert inner.call_args_list[1].args[0] == ["gamma"]
+        assert embedder.last_embed_stats == {"cache_hits": 2, "cache_misses": 1}
+        assert embedder.cache_stats == {"cache_hits": 2, "cache_misses": 3}
+
+    def test_cache_persists_across_instances(self, cache_path):
+        with patch.object(OllamaEmbedder, "embed_array", side_effect=fake_array) as inner:
+            make_embedder(cache_path).embed(["persisted text"])
+            vectors = make_embedder(cache_path).embed(["persisted text"])
+
+        assert vectors == fake_vectors(["persisted text"])
+        assert inner.call_count == 1
+
+    def test_keys_are_per_model(self, cache_path):
+        with patch.object(OllamaEmbedder, "embed_array", side_effect=fake_array) as inner:
+            make_embedder(cache_path).embed(["shared text"])
+            make_embedder(cache_path, embedder_config={"model": "mxbai-embed-large"}).embed(["shared text"])
+            make_embedder(cache_path, namespace="custom").embed(["shared text"])
+
+        assert inner.call_count == 3
+
+    def test_duplicate_texts_embedded_once(self, cache_path):
+        embedder = make_embedder(cache_path)
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=fake_array) as inner:
+            vectors = embedder.embed(["same", "other", "same"])
+
+        assert vectors == fake_vectors(["same", "other", "same"])
+        assert inner.call_args.args[0] == ["same", "other"]
+
+    def test_zero_vectors_are_not_cached(self, cache_path):
+        embedder = make_embedder(cache_path)
+
+        with patch.object(embedder.embedder, "embed_array", return_value=np.zeros((1, 3), dtype=np.float32)) as inner:
+            embedder.embed(["server was down"])
+            embedder.embed(["server was down"])
+
+        assert inner.call_count == 2
+        assert embedder.get_cache_info()["entries"] == 0
+
+    def test_process_reports_hits_and_misses(self, cache_path):
+        embedder = make_embedder(cache_path)
+        documents = [Document(content=text, id=text) for text in ("one", "two", "three")]
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=fake_array):
+            embedder.process(documents[:2])
+            result = embedder.process(documents)
+
+        assert result.metrics == {"embedded_count": 3, "cache_hits": 2, "cache_misses": 1}
+        vectors = np.stack([doc.embeddings for doc in result.documents])
+        np.testing.assert_array_equal(vectors, fake_array(["one", "two", "three"]))
+
+    def test_lru_eviction_by_entries(self, cache_path):
+        embedder = make_embedder(cache_path, max_entries=10)
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=fake_array) as inner:
+            for i in range(10):
+                embedder.embed([f"text {i}"])
+            embedder.embed(["text 0"])  # refresh: now most recently used
+            embedder.embed(["text 10"])  # over the limit, evict down to 9
+
+            info = embedder.get_cache_info()
+            assert info["entries"] == 9
+            inner.reset_mock()
+            embedder.embed(["text 0", "text 10"])
+            assert inner.call_count == 0
+
+            embedder.embed(["text 1"])
+            assert inner.call_args.args[0] == ["text 1"]
+
+    def test_overwritten_rows_are_not_counted_twice(self, cache_path):
+        texts = [f"text {i}" for i in range(5)]
+        embedder = make_embedder(cache_path, max_entries=5)
+        raced = []
+
+        def embed_racing(batch):
+            # Another caller misses on the same texts and stores them first
+            if not raced:
+                raced.append(True)
+                embedder.embed(batch)
+            return fake_array(batch)
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=embed_racing) as inner:
+            embedder.embed(texts)
+            assert embedder.get_cache_info()["entries"] == 5
+
+            inner.reset_mock()
+            embedder.embed(texts)  # nothing was evicted
+            assert inner.call_count == 0
+
+    def test_eviction_by_size(self, cache_path):
+        # Each vector is 3 float32 values = 12 bytes
+        embedder = make_embedder(cache_path, max_size_mb=120 / 2 ** 20)
+
+        with patch.object(embedder.embedder, "embed_array", side_effect=fake_array):
+            embedder.embed([f"text {i}" for i in range(20)])
+
+        assert embedder.get_cache_info()["size_bytes"] <= 108
+
+    def test_created_from_config(self, cache_path):
+        embedder = create_embedder_from_config({
+            "type": "CachedEmbedder",
+            "config": {"cache_path": cache_path, "embedder_type": "OllamaEmbedder"},
+        })
+
+        assert isinstance(embedder, CachedEmbedder)
+        assert embedder.get_embedding_dimension() == 768
+
+    def test_cannot_wrap_itself(self, cache_path):
+        with pytest.raises(ValueError):
+            make_embedder(cache_path, embedder_type="CachedEmbedder")
@@ -0,0 +1,83 @@
+"""Tests for the HuggingFaceEmbedder component."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from core.factories import create_embedder_from_config
+from components.embedders.huggingface_embedder.huggingface_embedder import HuggingFaceEmbedder
+
+TEXTS = [
+    "security",
+    "the login password is a test of the backup",
+    "",
+    "a text document",
+]
+
+
+def make_embedder(model_dir, **config):
+    return HuggingFaceEmbedder("hf_test", {"model_name": model_dir, "device": "cpu", "batch_size": 3, **config})
+
+
+class TestHuggingFaceEmbedder:
+    """Test HuggingFaceEmbedder functionality."""
+
+    def test_encode_returns_normalized_float32(self, tiny_transformer_dir):
+        vectors = make_embedder(tiny_transformer_dir).encode(TEXTS)
+
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (len(TEXTS), 32)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+    @pytest.mark.parametrize("pooling", ["mean", "max", "cls"])
+    def test_batched_matches_one_at_a_time(self, tiny_transformer_dir, pooling):
+        embedder = make_embedder(tiny_transformer_dir, pooling_strategy=pooling)
+
+        batched = embedder.encode(TEXTS)
+        single = np.vstack([embedder.encode([text]) for text in TEXTS])
+
+        np.testing.assert_allclose(batched, single, atol=1e-5)
+
+    def test_pooling_strategies_differ(self, tiny_transformer_dir):
+        vectors = [
+            make_embedder(tiny_transformer_dir, pooling_strategy=pooling).encode(TEXTS[1:2])
+            for pooling in ("mean", "max", "cls")
+        ]
+
+        assert not np.allclose(vectors[0], vectors[1])
+        assert not np.allclose(vectors[0], vectors[2])
+
+    def test_unnormalized(self, tiny_transformer_dir):
+        vectors = make_embedder(tiny_transformer_dir, normalize_embeddings=False).encode(TEXTS[:2])
+
+        assert not np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+    def test_matches_sentence_transformers_mean_pooling(self, tiny_transformer_dir):
+        st = pytest.importorskip("components.embedders.sentence_transformer_embedder.sentence_transformer_embedder")
+        expected = st.SentenceTransformerEmbedder("st", {"model_name": tiny_transformer_dir}).encode(TEXTS)
+
+        np.testing.assert_allclose(make_embedder(tiny_transformer_dir).encode(TEXTS), expected, atol=1e-5)
+
+    def test_model_loaded_once_per_process(self, tiny_transformer_dir):
+        first = make_embedder(tiny_transformer_dir)
+        second = make_embedder(tiny_transformer_dir, pooling_strategy="cls")
+
+        assert first.load_model()[1] is second.load_model()[1]
+
+    def test_created_from_config(self, tiny_transformer_dir):
+        embedder = create_embedder_from_config({
+            "type": "HuggingFaceEmbedder",
+            "config": {"model_name": tiny_transformer_dir, "device": "cpu"},
+        })
+
+        assert embedder.validate_config() is True
+        assert embedder.get_embedding_dimension() == 32
+        assert len(embedder.embed(["login"])[0]) == 32
@@ -5,6 +5,8 @@ from pathlib import Path
 import sys
 from unittest.mock import Mock, patch
 
+import numpy as np
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
@@ -53,12 +55,14 @@ class TestOllamaEmbedder:
         
         embedder = OllamaEmbedder("test_embedder", config)
         
-        # Mock the actual embedding call
-        with patch.object(embedder, '_call_ollama_api') as mock_api:
+        # Mock the actual embedding calls (single text and batch endpoint)
+        with patch.object(embedder, '_call_ollama_api') as mock_api, \
+                patch.object(embedder, '_call_embed_api') as mock_batch_api:
             # Return fake embeddings
             mock_api.return_value = {
                 "embedding": [0.1, 0.2, 0.3, 0.4, 0.5] * 100  # 500-dim fake embedding
             }
+            mock_batch_api.side_effect = lambda texts: [[0.1, 0.2, 0.3, 0.4, 0.5] * 100 for _ in texts]
             yield embedder, mock_api
     
     def test_embedder_initialization(self):
@@ -150,8 +154,9 @@ class TestOllamaEmbedder:
         embeddings = embedder.embed(texts)
         
         assert len(embeddings) == 5
-        # Should have made multiple API calls due to batching
-        assert mock_api.call_count >= 2
+        # Should have made one batch API call per batch
+        assert embedder._call_embed_api.call_count == 3
+        assert mock_api.call_count == 0
     
     def test_error_handling(self):
         """Test error handling for API failures."""
@@ -227,6 +232,96 @@ class TestOllamaEmbedder:
         # Should be different
         assert embedding1 != embedding2
     
+    def test_batch_endpoint_preserves_order(self):
+        """Concurrent batches are reassembled in input order."""
+        embedder = OllamaEmbedder("order_test", {"batch_size": 2, "max_concurrency": 3})
+
+        with patch.object(embedder, '_call_embed_api') as mock_batch_api:
+            mock_batch_api.side_effect = lambda texts: [[float(t)] for t in texts]
+            embeddings = embedder.embed([str(i) for i in range(7)])
+
+        assert embeddings == [[float(i)] for i in range(7)]
+        assert mock_batch_api.call_count == 4
+
+    def test_batch_request_payload(self, requests_mock):
+        """Each batch is a single /api/embed POST carrying every text."""
+        requests_mock.post(
+            "http://localhost:11434/api/embed",
+            json=lambda request, context: {"embeddings": [[1.0, 2.0] for _ in request.json()["input"]]},
+        )
+        embedder = OllamaEmbedder("payload_test", {"batch_size": 3})
+
+        embeddings = embedder.embed(["a", "b", "c", "d"])
+
+        assert embeddings == [[1.0, 2.0]] * 4
+        assert requests_mock.call_count == 2
+        payloads = sorted((r.json() for r in requests_mock.request_history), key=lambda p: p["input"])
+        assert payloads == [
+            {"model": "nomic-embed-text", "input": ["a", "b", "c"]},
+            {"model": "nomic-embed-text", "input": ["d"]},
+        ]
+
+    def test_retries_busy_responses(self, requests_mock):
+        """429/5xx responses are retried with backoff before giving up."""
+        requests_mock.post("http://localhost:11434/api/embed", [
+            {"status_code": 503, "text": "busy"},
+            {"status_code": 429, "text": "slow down"},
+            {"json": {"embeddings": [[0.5, 0.5]]}},
+        ])
+        embedder = OllamaEmbedder("retry_test", {"max_retries": 2, "retry_backoff": 0})
+
+        assert embedder.embed(["hello"]) == [[0.5, 0.5]]
+        assert requests_mock.call_count == 3
+
+    def test_retries_exhausted_returns_zero_vectors(self, requests_mock):
+        """A batch that keeps failing falls back to zero vectors."""
+        requests_mock.post("http://localhost:11434/api/embed", status_code=500, text="boom")
+        embedder = OllamaEmbedder("exhausted_test", {"max_retries": 1, "retry_backoff": 0})
+
+        embeddings = embedder.embed(["a", "b"])
+
+        assert embeddings == [[0.0] * 768, [0.0] * 768]
+        assert requests_mock.call_count == 2
+
+    def test_dimension_is_probed_once_and_sizes_fallbacks(self, requests_mock):
+        """get_embedding_dimension probes the server once; failures then use that size."""
+        requests_mock.post("http://localhost:11434/api/embed", [
+            {"json": {"embeddings": [[0.5] * 1024]}},
+            {"status_code": 400, "text": "bad input"},
+        ])
+        embedder = OllamaEmbedder("probe_test", {"model": "mxbai-embed-large", "max_retries": 0})
+
+        assert embedder.get_embedding_dimension() == 1024
+        assert embedder.get_embedding_dimension() == 1024
+        assert embedder.embed(["a"]) == [[0.0] * 1024]
+        assert requests_mock.call_count == 2
+
+    def test_embed_array_leaves_failed_batches_zero(self, requests_mock):
+        """embed_array fills one float32 array; rows of failed batches stay zero."""
+        requests_mock.post("http://localhost:11434/api/embed", [
+            {"json": {"embeddings": [[0.5, 0.25], [1.0, 2.0]]}},
+            {"status_code": 400, "text": "bad input"},
+        ])
+        embedder = OllamaEmbedder("array_test", {"batch_size": 2, "max_concurrency": 1})
+
+        vectors = embedder.embed_array(["a", "b", "c"])
+
+        assert vectors.dtype == np.float32
+        assert vectors.tolist() == [[0.5, 0.25], [1.0, 2.0], [0.0, 0.0]]
+
+    def test_falls_back_to_legacy_endpoint(self, requests_mock):
+        """Servers without /api/embed are served one text per request."""
+        requests_mock.post("http://localhost:11434/api/embed", status_code=404, text="404 page not found")
+        requests_mock.post("http://localhost:11434/api/embeddings", json={"embedding": [0.3, 0.7]})
+        embedder = OllamaEmbedder("legacy_test", {"batch_size": 4})
+
+        assert embedder.embed(["a", "b", "c"]) == [[0.3, 0.7]] * 3
+        assert embedder.embed(["d"]) == [[0.3, 0.7]]
+
+        paths = [request.path for request in requests_mock.request_history]
+        assert paths.count("/api/embed") == 1
+        assert paths.count("/api/embeddings") == 4
+
     def test_get_description(self):
         """Test embedder description method."""
         description = OllamaEmbedder.get_description()
@@ -0,0 +1,121 @@
+"""Tests for the OnnxEmbedder component."""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnxscript")
+pytest.importorskip("onnx")
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from core.factories import create_embedder_from_config
+from components.embedders.huggingface_embedder.huggingface_embedder import HuggingFaceEmbedder
+from components.embedders.onnx_embedder.onnx_embedder import OnnxEmbedder
+
+TEXTS = [
+    "security",
+    "the login password is a test of the backup",
+    "",
+    "a text document",
+]
+
+
+@pytest.fixture(scope="module")
+def export_dir(tiny_transformer_dir, tmp_path_factory):
+    """Export (and quantize) the tiny model once for the whole module."""
+    directory = str(tmp_path_factory.mktemp("onnx_models"))
+    embedder = OnnxEmbedder("export", {"model_name": tiny_transformer_dir, "export_dir": directory})
+    embedder.export_onnx()
+    embedder.quantize_onnx()
+    return directory
+
+
+def make_embedder(model_dir, export_dir, **config):
+    return OnnxEmbedder("onnx_test", {
+        "model_name": model_dir, "export_dir": export_dir, "batch_size": 3, **config,
+    })
+
+
+class TestOnnxEmbedder:
+    """Test OnnxEmbedder functionality."""
+
+    @pytest.mark.parametrize("pooling", ["mean", "max", "cls"])
+    def test_matches_pytorch(self, tiny_transformer_dir, export_dir, pooling):
+        reference = HuggingFaceEmbedder("hf", {
+            "model_name": tiny_transformer_dir, "device": "cpu", "pooling_strategy": pooling,
+        })
+        vectors = make_embedder(tiny_transformer_dir, export_dir, pooling_strategy=pooling).encode(TEXTS)
+
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (len(TEXTS), 32)
+        np.testing.assert_allclose(vectors, reference.encode(TEXTS), atol=1e-5)
+
+    def test_batched_matches_one_at_a_time(self, tiny_transformer_dir, export_dir):
+        embedder = make_embedder(tiny_transformer_dir, export_dir)
+
+        batched = embedder.encode(TEXTS)
+        single = np.vstack([embedder.encode([text]) for text in TEXTS])
+
+        np.testing.assert_allclose(batched, single, atol=1e-5)
+
+    def test_export_is_reused(self, tiny_transformer_dir, export_dir):
+        embedder = make_embedder(tiny_transformer_dir, export_dir, intra_op_num_threads=1)
+
+        with patch.object(OnnxEmbedder, "export_onnx") as export:
+            assert embedder.validate_config() is True
+
+        export.assert_not_called()
+        assert (embedder.fp32_path.parent / "tokenizer_config.json").exists()
+
+    def test_int8_close_to_fp32(self, tiny_transformer_dir, export_dir):
+        fp32 = make_embedder(tiny_transformer_dir, export_dir)
+        int8 = make_embedder(tiny_transformer_dir, export_dir, quantize=True)
+
+        assert int8.model_path.name == "model_int8.onnx"
+        assert int8.model_path.stat().st_size < fp32.model_path.stat().st_size
+        cosine = (fp32.encode(TEXTS) * int8.encode(TEXTS)).sum(axis=1)
+        assert cosine.min() > 0.99
+
+    def test_runs_given_onnx_path(self, tiny_transformer_dir, export_dir):
+        exported = make_embedder(tiny_transformer_dir, export_dir)
+        embedder = OnnxEmbedder("onnx_path", {
+            "model_name": tiny_transformer_dir, "onnx_path": str(exported.fp32_path),
+            "export_dir": "/nonexistent", "intra_op_num_threads": 2,
+        })
+
+        _, session = embedder.load_model()
+
+        assert session.get_session_options().intra_op_num_threads == 2
+        np.testing.assert_allclose(embedder.encode(TEXTS), exported.encode(TEXTS), atol=1e-6)
+
+    def test_measure_against_reference(self, tiny_transformer_dir, export_dir):
+        report = make_embedder(tiny_transformer_dir, export_dir, quantize=True).measure_against_reference(
+            TEXTS, repeats=1
+        )
+
+        assert report["texts"] == len(TEXTS)
+        assert report["speedup"] > 0
+        assert 0 <= report["cosine_drift"] < 0.01
+        assert report["min_cosine"] <= report["mean_cosine"]
+
+    def test_created_from_config(self, tiny_transformer_dir, export_dir):
+        embedder = create_embedder_from_config({
+            "type": "OnnxEmbedder",
+            "config": {"model_name": tiny_transformer_dir, "export_dir": export_dir},
+        })
+
+        assert isinstance(embedder, OnnxEmbedder)
+        assert embedder.get_embedding_dimension() == 32
+        assert len(embedder.embed(["login"])[0]) == 32
+
+    def test_rejects_unknown_pooling(self):
+        with pytest.raises(ValueError):
+            OnnxEmbedder("bad", {"pooling_strategy": "sum"})
@@ -0,0 +1,209 @@
+"""Tests for the OpenAIEmbedder component against a stub OpenAI-compatible server."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import requests_mock
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from core.factories import create_embedder_from_config
+from components.embedders.openai_embedder import openai_embedder as module
+from components.embedders.openai_embedder.openai_embedder import OpenAIEmbedder, OpenAIRequestError, RateLimiter
+
+BASE_URL = "http://localhost:8000/v1"
+EMBEDDINGS_URL = f"{BASE_URL}/embeddings"
+
+
+class WordEncoding:
+    """Stand-in tiktoken encoding: one token per whitespace-separated word."""
+
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def stub_vector(text):
+    return [float(len(text)), 1.0, 0.0, 0.0]
+
+
+def stub_response(request, context):
+    """Answer like an OpenAI-compatible server, listing data out of order."""
+    inputs = request.json()["input"]
+    data = [{"object": "embedding", "index": i, "embedding": stub_vector(text)} for i, text in enumerate(inputs)]
+    return {"data": data[::-1], "model": request.json()["model"], "usage": {"prompt_tokens": len(inputs)}}
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(module, "_encoding_for_model", lambda model: WordEncoding())
+
+
+@pytest.fixture
+def server():
+    with requests_mock.Mocker() as mock:
+        mock.post(EMBEDDINGS_URL, json=stub_response)
+        yield mock
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(module.time, "sleep", recorded.append)
+    return recorded
+
+
+def make_embedder(**config):
+    return OpenAIEmbedder("openai_test", {
+        "base_url": BASE_URL, "model": "local-model", "requests_per_minute": None,
+        "tokens_per_minute": None, **config,
+    })
+
+
+class TestOpenAIEmbedder:
+    """Test OpenAIEmbedder functionality."""
+
+    def test_packs_requests_by_token_budget(self, server):
+        embedder = make_embedder(max_tokens_per_request=6, max_concurrency=1)
+        texts = ["one two three", "four five", "six", "seven eight nine ten", "eleven"]
+
+        vectors = embedder.embed(texts)
+
+        assert vectors == [stub_vector(text) for text in texts]
+        assert [request.json()["input"] for request in server.request_history] == [
+            ["one two three", "four five", "six"],
+            ["seven eight nine ten", "eleven"],
+        ]
+
+    def test_batch_size_caps_items_per_request(self, server):
+        make_embedder(batch_size=2, max_concurrency=1).embed(["a", "b", "c", "d", "e"])
+
+        assert [len(request.json()["input"]) for request in server.request_history] == [2, 2, 1]
+
+    def test_concurrent_requests_keep_input_order(self, server):
+        texts = [f"text {'x ' * (i % 7)}{i}" for i in range(50)]
+
+        vectors = make_embedder(max_tokens_per_request=10, max_concurrency=4).embed(texts)
+
+        assert vectors == [stub_vector(text) for text in texts]
+        assert server.call_count > 4
+
+    def test_long_inputs_are_truncated(self, server):
+        make_embedder(max_input_tokens=3).embed(["a b c d e f", ""])
+
+        assert server.last_request.json()["input"] == ["a b c", " "]
+
+    def test_dimensions_parameter(self, server):
+        vectors = make_embedder(dimensions=2).embed(["abc"])
+
+        assert server.last_request.json()["dimensions"] == 2
+        # The stub ignores dimensions, so the client shortens and re-normalizes
+        np.testing.assert_allclose(vectors[0], np.array([3.0, 1.0]) / np.sqrt(10.0), rtol=1e-6)
+
+    def test_retries_429_with_jittered_backoff(self, sleeps):
+        embedder = make_embedder(retry_backoff=1.0)
+
+        with requests_mock.Mocker() as mock:
+            mock.post(EMBEDDINGS_URL, [
+                {"status_code": 429, "headers": {"Retry-After": "4"}, "text": "slow down"},
+                {"status_code": 503, "text": "busy"},
+                {"json": stub_response},
+            ])
+            vectors = embedder.embed(["retry me"])
+
+        assert vectors == [stub_vector("retry me")]
+        assert 2.0 <= sleeps[0] <= 6.0  # Retry-After 4s, +/-50% jitter
+        assert 1.0 <= sleeps[1] <= 3.0  # backoff 2s, +/-50% jitter
+        assert embedder.usage == {"requests": 1, "prompt_tokens": 1, "retries": 2}
+
+    def test_exhausted_retries_give_zero_vectors(self, sleeps):
+        embedder = make_embedder(model="text-embedding-3-small", max_retries=2)
+
+        with requests_mock.Mocker() as mock:
+            mock.post(EMBEDDINGS_URL, status_code=429, text="rate limited")
+            vectors = embedder.embed(["never"])
+
+        assert vectors == [[0.0] * 1536]
+        assert mock.call_count == 3
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404])
+    def test_client_errors_raise_without_retry(self, sleeps, status_code):
+        """A rejected request is an error, not a batch of zero vectors."""
+        embedder = make_embedder(model="text-embedding-3-small")
+
+        with requests_mock.Mocker() as mock:
+            mock.post(EMBEDDINGS_URL, status_code=status_code, text="rejected")
+            with pytest.raises(OpenAIRequestError) as excinfo:
+                embedder.embed(["bad"])
+
+        assert (excinfo.value.status_code, excinfo.value.retryable) == (status_code, False)
+        assert mock.call_count == 1
+        assert sleeps == []
+
+    def test_api_key_header(self, server):
+        make_embedder(api_key="sk-test").embed(["a"])
+        assert server.last_request.headers["Authorization"] == "Bearer sk-test"
+
+        make_embedder(api_key=None).embed(["a"])
+        assert "Authorization" not in server.last_request.headers
+
+    def test_dimension_from_known_model_or_server(self, server):
+        assert make_embedder(model="text-embedding-3-large").get_embedding_dimension() == 3072
+        assert make_embedder(model="text-embedding-3-large", dimensions=256).get_embedding_dimension() == 256
+        assert server.call_count == 0
+
+        assert make_embedder().get_embedding_dimension() == 4
+        assert server.call_count == 1
+
+    def test_token_estimate_without_tiktoken(self, monkeypatch):
+        monkeypatch.setattr(module, "_encoding_for_model", lambda model: None)
+        embedder = make_embedder()
+
+        assert embedder.count_tokens("abcdefgh") == 2
+        assert embedder.count_tokens("") == 1
+
+    def test_created_from_config(self, server):
+        embedder = create_embedder_from_config({
+            "type": "OpenAIEmbedder",
+            "config": {"base_url": BASE_URL, "model": "local-model"},
+        })
+
+        assert isinstance(embedder, OpenAIEmbedder)
+        assert embedder.validate_config() is True
+
+
+class TestRateLimiter:
+    """Test the requests/tokens per minute limiter with a fake clock."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(module.time, "sleep", lambda seconds: now.__setitem__(0, now[0] + seconds))
+        return now
+
+    def test_tokens_per_minute(self, clock):
+        limiter = RateLimiter(tokens_per_minute=600)  # 10 tokens/s
+
+        assert limiter.acquire(600) == 0
+        assert limiter.acquire(300) == pytest.approx(30.0)
+        assert limiter.acquire(10_000) == pytest.approx(60.0)  # larger than the bucket: wait for a full one
+
+    def test_requests_per_minute(self, clock):
+        limiter = RateLimiter(requests_per_minute=2)
+
+        waits = [limiter.acquire(1) for _ in range(4)]
+
+        assert waits == pytest.approx([0.0, 0.0, 30.0, 30.0])
+
+    def test_unlimited(self, clock):
+        limiter = RateLimiter()
+
+        assert all(limiter.acquire(10 ** 9) == 0 for _ in range(100))
+        assert clock[0] == 1000.0
@@ -0,0 +1,100 @@
+"""Tests for the SentenceTransformerEmbedder component."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+from core.base import Document
+from core.factories import create_embedder_from_config
+from components.embedders.sentence_transformer_embedder.sentence_transformer_embedder import (
+    SentenceTransformerEmbedder,
+)
+from utils.local_inference import length_sorted_batches
+
+TEXTS = [
+    "login",
+    "the password of the login is a test",
+    "backup and security",
+    "",
+    "a document of text and a test of the backup",
+]
+
+
+@pytest.fixture
+def embedder(tiny_transformer_dir):
+    return SentenceTransformerEmbedder("st_test", {"model_name": tiny_transformer_dir, "batch_size": 2})
+
+
+class TestSentenceTransformerEmbedder:
+    """Test SentenceTransformerEmbedder functionality."""
+
+    def test_encode_returns_normalized_float32(self, embedder):
+        vectors = embedder.encode(TEXTS)
+
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (len(TEXTS), 32)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+    def test_batched_matches_one_at_a_time(self, embedder):
+        """Length sorting and padding must not change any vector or its position."""
+        batched = embedder.encode(TEXTS)
+        single = np.vstack([embedder.encode([text]) for text in TEXTS])
+
+        np.testing.assert_allclose(batched, single, atol=1e-5)
+
+    def test_embed_returns_lists(self, embedder):
+        embeddings = embedder.embed(TEXTS[:2])
+
+        assert isinstance(embeddings, list) and len(embeddings) == 2
+        assert all(isinstance(x, float) for x in embeddings[0])
+        assert embedder.embed([]) == []
+        assert embedder.embed_text("login") == pytest.approx(embeddings[0], abs=1e-6)
+
+    def test_process_sets_document_embeddings(self, embedder):
+        documents = [Document(content=text, id=str(i)) for i, text in enumerate(TEXTS)]
+
+        result = embedder.process(documents)
+
+        assert result.metrics["embedded_count"] == len(TEXTS)
+        assert all(len(doc.embeddings) == 32 for doc in result.documents)
+
+    def test_model_loaded_once_per_process(self, tiny_transformer_dir):
+        first = SentenceTransformerEmbedder("a", {"model_name": tiny_transformer_dir})
+        second = SentenceTransformerEmbedder("b", {"model_name": tiny_transformer_dir, "batch_size": 8})
+
+        assert first.load_model() is second.load_model()
+
+    def test_pooling_strategy_override(self, tiny_transformer_dir):
+        mean = SentenceTransformerEmbedder("mean", {"model_name": tiny_transformer_dir})
+        cls = SentenceTransformerEmbedder("cls", {"model_name": tiny_transformer_dir, "pooling_strategy": "cls"})
+
+        assert mean.load_model() is not cls.load_model()
+        assert not np.allclose(mean.encode(TEXTS[1:2]), cls.encode(TEXTS[1:2]))
+
+    def test_invalid_pooling_strategy(self):
+        with pytest.raises(ValueError):
+            SentenceTransformerEmbedder("bad", {"pooling_strategy": "median"})
+
+    def test_created_from_config(self, tiny_transformer_dir):
+        embedder = create_embedder_from_config({
+            "type": "SentenceTransformerEmbedder",
+            "config": {"model_name": tiny_transformer_dir, "device": "cpu"},
+        })
+
+        assert embedder.validate_config() is True
+        assert embedder.get_embedding_dimension() == 32
+
+    def test_length_sorted_batches(self):
+        texts = ["aa", "a", "aaaa", "aaa", ""]
+
+        batches = [list(batch) for batch in length_sorted_batches(texts, 2)]
+
+        assert batches == [[2, 3], [0, 1], [4]]
@@ -128,7 +128,52 @@ class TestChromaStore:
         for result in results:
             if "type" in result.metadata:
                 assert result.metadata["type"] == "login"
-    
+
+    def test_search_batch(self, test_store, sample_documents):
+        """Batched search issues one query and matches per-query search."""
+        test_store.add_documents(sample_documents)
+        queries = [[0.1, 0.2, 0.3, 0.4, 0.5] * 100, [0.5, 0.4, 0.3, 0.2, 0.1] * 100]
+
+        single = [test_store.search(query_embedding=q, top_k=2) for q in queries]
+        with patch.object(test_store.collection, "query", wraps=test_store.collection.query) as query:
+            batched = test_store.search_batch(queries, top_k=2)
+        assert query.call_count == 1
+        assert [[d.id for d in r] for r in batched] == [[d.id for d in r] for r in single]
+        assert test_store.search_batch([], top_k=2) == []
+
+        by_id = {doc.id: doc.embeddings for doc in sample_documents}
+        with_vectors = test_store.search_batch(queries, top_k=2, include_embeddings=True)
+        assert batched[0][0].embeddings is None
+        assert all(list(doc.embeddings) == pytest.approx(by_id[doc.id]) for doc in with_vectors[0])
+
+    def test_build_where_translation(self):
+        """Strategy filters become ChromaDB where clauses."""
+        assert ChromaStore._build_where({}) is None
+        assert ChromaStore._build_where({"category": "test"}) == {"category": {"$eq": "test"}}
+        assert ChromaStore._build_where({"priority": ["high", "low"]}) == {"priority": {"$in": ["high", "low"]}}
+        assert ChromaStore._build_where({"year": {"$gte": 2020, "$lt": 2024}, "category": {"$ne": "x"}}) == {
+            "$and": [{"year": {"$gte": 2020}}, {"year": {"$lt": 2024}}, {"category": {"$ne": "x"}}]
+        }
+        with pytest.raises(ValueError):
+            ChromaStore._build_where({"category": {"$regex": "t.*"}})
+
+    def test_search_with_filter_is_native(self, test_store, sample_documents):
+        """Selective filters are applied inside ChromaDB and used by MetadataFilteredStrategy."""
+        from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
+
+        test_store.add_documents(sample_documents)
+        query_embedding = [0.1, 0.2, 0.3, 0.4, 0.5] * 100
+
+        results = test_store.search_with_filter(
+            query_embedding, top_k=5, metadata_filter={"priority": {"$in": ["medium", "low"]}, "category": {"$ne": "sample"}}
+        )
+        assert [doc.id for doc in results] == ["doc2"]
+
+        strategy = MetadataFilteredStrategy(config={"default_filters": {"category": "sample"}})
+        result = strategy.retrieve(query_embedding, test_store, top_k=1)
+        assert result.strategy_metadata["filtering_method"] == "native"
+        assert [doc.id for doc in result.documents] == ["doc3"]
+
     def test_get_document_by_id(self, test_store, sample_documents):
         """Test retrieving specific document by ID."""
         # Add documents first
@@ -244,7 +289,130 @@ class TestChromaStore:
         info = test_store.get_collection_info()
         if info:
             assert info.get("document_count", 0) == len(large_batch)
-    
+
+    def test_batched_writes_and_stats(self, temp_directory):
+        """Writes are split into bounded batches and reported in the stats."""
+        store = ChromaStore("batched", {
+            "collection_name": "batched",
+            "persist_directory": temp_directory,
+            "batch_size": 4,
+        })
+        docs = [
+            Document(content=f"Chunk {i}", id=f"chunk_{i}", source="batched.txt",
+                     embeddings=[0.1 + i * 0.01] * 10)
+            for i in range(10)
+        ]
+
+        assert store.add_documents(docs) is True
+        assert store.last_add_stats == {"inserted": 10, "skipped": 0, "batches": 3}
+        assert store.get_collection_info()["count"] == 10
+
+        # Re-ingesting resolves all IDs in bulk and writes nothing
+        assert store.add_documents(docs) is True
+        assert store.last_add_stats == {"inserted": 0, "skipped": 10, "batches": 0}
+
+        result = store.process(docs[:2])
+        assert result.metrics["skipped"] == 2
+        assert result.metrics["inserted"] == 0
+
+    def test_existence_check_is_bulk(self, test_store, sample_documents):
+        """Existing IDs are resolved without a lookup per document."""
+        test_store.add_documents(sample_documents[:1])
+
+        with patch.object(test_store.collection, "get", wraps=test_store.collection.get) as mock_get:
+            test_store.add_documents(sample_documents)
+
+        assert mock_get.call_count == 1
+        assert test_store.last_add_stats["skipped"] == 1
+        assert test_store.last_add_stats["inserted"] == 2
+
+    def test_dedup_index_persists_across_instances(self, temp_directory):
+        """A new store instance skips unchanged chunks without querying ChromaDB."""
+        config = {"collection_name": "persistent_dedup", "persist_directory": temp_directory}
+        docs = [
+            Document(content=f"Chunk {i}", id=f"chunk_{i}", source="a.txt",
+                     metadata={"document_hash": "dochash", "chunk_hash": f"chunk{i}",
+                               "source_hash": "srchash"},
+                     embeddings=[0.1 + i * 0.01] * 10)
+            for i in range(3)
+        ]
+        ChromaStore("first", config).add_documents(docs)
+        assert (Path(temp_directory) / "persistent_dedup.dedup.sqlite3").exists()
+
+        store = ChromaStore("second", config)
+        with patch.object(store.collection, "get", wraps=store.collection.get) as mock_get:
+            assert store.add_documents(docs) is True
+        assert mock_get.call_count == 0
+        assert store.last_add_stats["skipped"] == 3
+
+        # Deleting the document makes it ingestible again
+        assert store.delete_by_document_hash("dochash") is True
+        store = ChromaStore("third", config)
+        store.add_documents(docs)
+        assert store.last_add_stats["inserted"] == 3
+
+    def test_document_split_across_calls_is_fully_stored(self, temp_directory):
+        """Chunks of one document written over two add_documents calls are all kept."""
+        config = {"collection_name": "split_doc", "persist_directory": temp_directory}
+        docs = [
+            Document(content=f"Chunk {i}", id=f"split_{i}", source="a.txt",
+                     metadata={"document_hash": "dochash", "chunk_hash": f"chunk{i}"},
+                     embeddings=[0.1 + i * 0.01] * 10)
+            for i in range(6)
+        ]
+        store = ChromaStore("split", config)
+        assert store.add_documents(docs[:4]) is True
+        assert store.add_documents(docs[2:]) is True
+        assert store.last_add_stats == {"inserted": 2, "skipped": 2, "batches": 1}
+        assert store.get_collection_info()["count"] == 6
+
+        # A later ingest skips every stored chunk
+        store = ChromaStore("again", config)
+        store.add_documents(docs)
+        assert store.last_add_stats["skipped"] == 6
+
+    def test_interrupted_ingest_is_completed(self, temp_directory):
+        """A document registered by an ingest that stopped part-way gets its missing chunks."""
+        config = {"collection_name": "interrupted", "persist_directory": temp_directory}
+        docs = [
+            Document(content=f"Chunk {i}", id=f"part_{i}", source="a.txt",
+                     metadata={"document_hash": "dochash", "chunk_hash": f"chunk{i}", "source_hash": "srchash"},
+                     embeddings=[0.1 + i * 0.01] * 10)
+            for i in range(6)
+        ]
+        # The first run only got half of the document's chunks written
+        ChromaStore("crashed", config).add_documents(docs[:3])
+
+        store = ChromaStore("resumed", config)
+        assert store.add_documents(docs) is True
+        assert store.last_add_stats == {"inserted": 3, "skipped": 3, "batches": 1}
+        assert store.get_collection_info()["count"] == 6
+
+    def test_changed_document_at_same_source_is_ingested(self, temp_directory):
+        """A known source hash alone doesn't skip a document with new content."""
+        store = ChromaStore("changed", {"collection_name": "changed", "persist_directory": temp_directory})
+        original = Document(content="v1", id="v1", embeddings=[0.1] * 10,
+                            metadata={"document_hash": "hash_v1", "source_hash": "srchash"})
+        edited = Document(content="v2", id="v2", embeddings=[0.2] * 10,
+                          metadata={"document_hash": "hash_v2", "source_hash": "srchash"})
+        store.add_documents([original])
+        store.add_documents([edited])
+        assert store.last_add_stats["inserted"] == 1
+
+    def test_upsert_without_deduplication(self, temp_directory):
+        """With deduplication off, re-ingested IDs overwrite the stored version."""
+        store = ChromaStore("upsert", {
+            "collection_name": "upsert",
+            "persist_directory": temp_directory,
+            "enable_deduplication": False,
+        })
+        doc = Document(content="Original", id="same", embeddings=[0.1] * 10)
+        store.add_documents([doc])
+        store.add_documents([Document(content="Updated", id="same", embeddings=[0.2] * 10)])
+
+        assert store.get_collection_info()["count"] == 1
+        assert store.get_document("same").content == "Updated"
+
     def test_metadata_preservation(self, test_store, sample_documents):
         """Test that document metadata is preserved."""
         # Add documents
@@ -299,6 +467,37 @@ class TestChromaStore:
         if info:
             assert info.get("document_count", 0) > 0
     
+    def test_soft_delete_and_purge(self, test_store, sample_documents):
+        """Soft-deleted chunks are excluded by ChromaDB and purged on demand."""
+        test_store.add_documents(sample_documents)
+
+        assert test_store.update_metadata({"category": "test"}, {"is_active": False}) == 2
+        results = test_store.search(query_embedding=sample_documents[0].embeddings, top_k=3)
+        assert [doc.id for doc in results] == ["doc3"]
+        filtered = test_store.search_with_filter(sample_documents[0].embeddings, top_k=3,
+                                                 metadata_filter={"priority": "high"})
+        assert filtered == []
+        assert test_store.get_collection_info()["deleted_count"] == 2
+
+        assert test_store.purge_deleted(limit=1) == 1
+        assert test_store.purge_deleted() == 1
+        info = test_store.get_collection_info()
+        assert info["count"] == 1 and info["deleted_count"] == 0
+        assert test_store.storage_bytes() > 0
+
+    def test_soft_deletes_by_another_store_are_seen(self, temp_directory, sample_documents):
+        """A long-lived store stops returning chunks another store soft-deletes later."""
+        config = {"collection_name": "shared", "persist_directory": temp_directory}
+        reader = ChromaStore("reader", config)
+        reader.add_documents(sample_documents)
+        assert len(reader.search(query_embedding=sample_documents[0].embeddings, top_k=3)) == 3
+        assert reader.get_collection_info()["deleted_count"] == 0
+
+        ChromaStore("writer", config).update_metadata({"category": "test"}, {"is_active": False})
+        results = reader.search(query_embedding=sample_documents[0].embeddings, top_k=3)
+        assert [doc.id for doc in results] == ["doc3"]
+        assert reader.get_collection_info()["deleted_count"] == 2
+
     def test_get_description(self):
         """Test store description method."""
         description = ChromaStore.get_description()
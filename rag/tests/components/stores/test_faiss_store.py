@@ -0,0 +1,353 @@
+"""Tests for FAISS Store component."""
+
+import pytest
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+faiss = pytest.importorskip("faiss")
+
+from core.base import Document
+from components.stores.faiss_store.faiss_store import FaissStore
+
+
+def make_documents(count: int, dim: int = 8, offset: int = 0):
+    """Create deterministic documents whose embeddings are one-hot-ish."""
+    documents = []
+    for i in range(offset, offset + count):
+        embedding = [0.01] * dim
+        embedding[i % dim] = 1.0 + i * 0.001
+        documents.append(Document(
+            id=f"doc{i}",
+            content=f"Document number {i}",
+            source=f"file{i % 3}.txt",
+            metadata={
+                "document_hash": f"hash{i % 3}",
+                "file_path": f"/data/file{i % 3}.txt",
+                "category": "even" if i % 2 == 0 else "odd",
+                "tags": ["a", "b"],
+            },
+            embeddings=embedding,
+        ))
+    return documents
+
+
+class TestFaissStore:
+    """Test FaissStore functionality."""
+
+    @pytest.fixture
+    def temp_directory(self):
+        """Create temporary directory for the index."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture(params=["Flat", "IVF", "HNSW"])
+    def test_store(self, request, temp_directory):
+        """Create a FaissStore for each ANN index type."""
+        config = {
+            "persist_directory": temp_directory,
+            "dimension": 8,
+            "index_type": request.param,
+            "metric": "Cosine",
+            "nlist": 4,
+            "nprobe": 4,
+        }
+        return FaissStore("test_store", config)
+
+    def test_add_and_search(self, test_store):
+        """Nearest neighbour of a stored vector is itself."""
+        documents = make_documents(16)
+        assert test_store.add_documents(documents) is True
+        assert test_store.get_collection_info()["count"] == 16
+
+        results = test_store.search(query_embedding=documents[3].embeddings, top_k=3)
+        assert len(results) == 3
+        assert results[0].id == "doc3"
+        assert results[0].metadata["similarity_score"] >= results[1].metadata["similarity_score"]
+        assert results[0].metadata["tags"] == ["a", "b"]
+        assert results[0].source == "/data/file0.txt"
+
+    def test_duplicates_are_skipped(self, test_store):
+        """Re-adding the same IDs doesn't grow the index."""
+        documents = make_documents(8)
+        test_store.add_documents(documents)
+        test_store.add_documents(documents)
+        assert test_store.get_collection_info()["count"] == 8
+
+    def test_delete_documents(self, test_store):
+        """Deleted documents are no longer returned."""
+        documents = make_documents(8)
+        test_store.add_documents(documents)
+
+        assert test_store.delete_documents(["doc2"]) is True
+        assert test_store.get_document("doc2") is None
+        results = test_store.search(query_embedding=documents[2].embeddings, top_k=8)
+        assert "doc2" not in [doc.id for doc in results]
+        assert len(results) == 7
+
+    def test_delete_by_document_hash_and_source(self, test_store):
+        """Hash and source deletions remove every matching chunk."""
+        test_store.add_documents(make_documents(9))
+
+        assert test_store.delete_by_document_hash("hash0") is True
+        assert test_store.get_collection_info()["count"] == 6
+
+        assert test_store.delete_by_source("/data/file1.txt") is True
+        remaining = test_store.search(query_embedding=[0.1] * 8, top_k=10)
+        assert {doc.metadata["document_hash"] for doc in remaining} == {"hash2"}
+
+    def test_search_batch(self, test_store):
+        """Batched search equals per-query search, with and without filters."""
+        documents = make_documents(16)
+        test_store.add_documents(documents)
+        queries = [documents[1].embeddings, documents[6].embeddings, documents[11].embeddings]
+
+        for where in (None, {"category": "even"}):
+            batched = test_store.search_batch(queries, top_k=4, where=where)
+            single = [test_store.search(query_embedding=q, top_k=4, where=where) for q in queries]
+            assert [[d.id for d in r] for r in batched] == [[d.id for d in r] for r in single]
+            assert all(len(r) == 4 for r in batched)
+
+        # Stored (normalized) vectors come back on request; a trained IVF keeps no ID-to-vector map
+        by_id = {doc.id: np.asarray(doc.embeddings) / np.linalg.norm(doc.embeddings) for doc in documents}
+        with_vectors = test_store.search_batch(queries, top_k=4, include_embeddings=True)
+        plain = test_store.search_batch(queries, top_k=4)
+        assert [[d.id for d in r] for r in with_vectors] == [[d.id for d in r] for r in plain]
+        for doc in with_vectors[0]:
+            if faiss.try_extract_index_ivf(test_store.index) is not None:
+                assert doc.embeddings is None
+            else:
+                assert np.allclose(doc.embeddings, by_id[doc.id], atol=1e-6)
+
+    def test_search_with_where(self, test_store):
+        """Metadata filters restrict the candidate set inside the index."""
+        documents = make_documents(16)
+        test_store.add_documents(documents)
+
+        results = test_store.search(
+            query_embedding=documents[3].embeddings, top_k=4, where={"category": "even"}
+        )
+        assert results
+        assert all(doc.metadata["category"] == "even" for doc in results)
+
+    def test_persistence(self, temp_directory):
+        """Index and sidecar are reloaded by a new instance."""
+        config = {"persist_directory": temp_directory, "dimension": 8}
+        documents = make_documents(5)
+        FaissStore("first", config).add_documents(documents)
+
+        reopened = FaissStore("second", config)
+        assert reopened.get_collection_info()["count"] == 5
+        results = reopened.search(query_embedding=documents[4].embeddings, top_k=1)
+        assert results[0].id == "doc4"
+
+        # New IDs must not collide with the persisted ones
+        reopened.add_documents(make_documents(3, offset=5))
+        assert reopened.get_collection_info()["count"] == 8
+
+    def test_hnsw_compaction(self, temp_directory):
+        """Tombstoned HNSW vectors are dropped once the threshold is crossed."""
+        store = FaissStore("hnsw", {
+            "persist_directory": temp_directory,
+            "dimension": 8,
+            "index_type": "HNSW",
+            "compaction_threshold": 0.5,
+        })
+        store.add_documents(make_documents(10))
+        store.delete_documents(["doc0", "doc1"])
+        assert store.get_collection_info()["index_vectors"] == 10
+
+        assert store.compact() == 2
+        info = store.get_collection_info()
+        assert info["index_vectors"] == info["count"] == 8
+
+    @pytest.mark.parametrize("quantization", ["none", "pq"])
+    def test_ivf_trains_once_enough_vectors_arrive(self, temp_directory, quantization):
+        """Small batches are searched exactly until the IVF can be trained on all of them."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((300, 8)).astype(np.float32)
+        documents = [Document(id=f"doc{i}", content=f"Document {i}", embeddings=vector.tolist())
+                     for i, vector in enumerate(vectors)]
+        config = {
+            "persist_directory": temp_directory,
+            "index_type": "IVF",
+            "quantization": quantization,
+            "pq_m": 4,
+            "nlist": 4,
+            "nprobe": 4,
+        }
+        store = FaissStore("ivf", config)
+        threshold = 256 if quantization == "pq" else 4 * 39
+
+        for start in range(0, len(documents), 20):
+            store.add_documents(documents[start:start + 20])
+            trained = faiss.try_extract_index_ivf(store.index) is not None
+            assert trained == (start + 20 >= threshold)
+            assert store.search(query_embedding=documents[start].embeddings, top_k=1)[0].id == f"doc{start}"
+
+        assert faiss.try_extract_index_ivf(store.index).nlist == 4
+        assert store.index.ntotal == 300
+
+        reopened = FaissStore("ivf", config)
+        assert faiss.try_extract_index_ivf(reopened.index).nlist == 4
+        assert reopened.search(query_embedding=documents[7].embeddings, top_k=1)[0].id == "doc7"
+
+    def test_ivf_with_fewer_lists_is_retrained(self, temp_directory):
+        """An index trained with a smaller nlist is rebuilt once it can fill the configured one."""
+        rng = np.random.default_rng(1)
+        documents = [Document(id=f"doc{i}", content=f"Document {i}", embeddings=vector.tolist())
+                     for i, vector in enumerate(rng.standard_normal((200, 8)))]
+        config = {"persist_directory": temp_directory, "index_type": "IVF", "nlist": 2, "nprobe": 4}
+        FaissStore("ivf", config).add_documents(documents[:100])
+
+        store = FaissStore("ivf", {**config, "nlist": 4})
+        assert faiss.try_extract_index_ivf(store.index).nlist == 2
+        store.delete_documents(["doc0"])
+        store.add_documents(documents[100:])
+
+        assert faiss.try_extract_index_ivf(store.index).nlist == 4
+        assert store.index.ntotal == 199
+        assert store.search(query_embedding=documents[42].embeddings, top_k=1)[0].id == "doc42"
+
+    def test_dimension_mismatch(self, temp_directory):
+        """Embeddings of the wrong size are rejected."""
+        store = FaissStore("dim", {"persist_directory": temp_directory, "dimension": 4})
+        assert store.add_documents(make_documents(2, dim=8)) is False
+
+    def test_delete_collection(self, test_store):
+        """Deleting the collection empties it and allows reuse."""
+        test_store.add_documents(make_documents(8))
+        assert test_store.delete_collection() is True
+        assert test_store.get_collection_info()["count"] == 0
+        assert test_store.search(query_embedding=[0.1] * 8, top_k=3) == []
+        assert test_store.add_documents(make_documents(8)) is True
+
+    @pytest.mark.parametrize("index_type", ["Flat", "IVF", "HNSW"])
+    @pytest.mark.parametrize("quantization", ["float16", "int8", "pq"])
+    def test_quantized_indexes(self, temp_directory, index_type, quantization):
+        """Quantized indexes find the right neighbours and re-score them exactly."""
+        documents = make_documents(64, dim=16)
+        store = FaissStore("quantized", {
+            "persist_directory": temp_directory,
+            "index_type": index_type,
+            "metric": "Cosine",
+            "quantization": quantization,
+            "pq_m": 4,
+            "nlist": 4,
+            "nprobe": 4,
+        })
+        assert store.add_documents(documents) is True
+        assert store.get_collection_info()["quantization"] == quantization
+        assert store.vectors_path.stat().st_size == 64 * 16 * 4
+
+        results = store.search(query_embedding=documents[5].embeddings, top_k=3)
+        assert results[0].id == "doc5"
+        # Re-scored against full-precision vectors, so the self-match is exact
+        assert results[0].metadata["similarity_score"] == pytest.approx(1.0, abs=1e-5)
+
+        filtered = store.search(query_embedding=documents[5].embeddings, top_k=3, where={"category": "even"})
+        assert filtered and all(doc.metadata["category"] == "even" for doc in filtered)
+
+    def test_quantization_without_rescore(self, temp_directory):
+        """With rescore disabled no full-precision copy is written."""
+        store = FaissStore("int8", {
+            "persist_directory": temp_directory, "quantization": "int8", "rescore": False, "metric": "Cosine",
+        })
+        documents = make_documents(16)
+        store.add_documents(documents)
+        assert not store.vectors_path.exists()
+        assert store.search(query_embedding=documents[2].embeddings, top_k=1)[0].id in ("doc2", "doc10")
+
+    def test_quantized_hnsw_compaction_uses_exact_vectors(self, temp_directory):
+        """Compaction retrains a quantized HNSW index from the vectors file."""
+        store = FaissStore("hnsw_pq", {
+            "persist_directory": temp_directory,
+            "index_type": "HNSW",
+            "metric": "Cosine",
+            "quantization": "int8",
+            "compaction_threshold": 0.9,
+        })
+        documents = make_documents(20)
+        store.add_documents(documents)
+        store.delete_documents([f"doc{i}" for i in range(10)])
+        assert store.compact() == 10
+        assert store.index.ntotal == 10
+
+        store.add_documents(make_documents(2, offset=20))
+        assert store.vectors_path.stat().st_size == 22 * 8 * 4
+        results = store.search(query_embedding=documents[15].embeddings, top_k=1)
+        assert results[0].id == "doc15"
+
+    def test_lsh_ignores_quantization(self, temp_directory):
+        """LSH already stores binary codes."""
+        store = FaissStore("lsh", {"persist_directory": temp_directory, "index_type": "LSH", "quantization": "pq"})
+        assert store.quantization == "none"
+
+    def test_soft_delete_and_purge(self, test_store):
+        """Soft-deleted chunks are excluded from search and purged on demand."""
+        documents = make_documents(12)
+        test_store.add_documents(documents)
+
+        assert test_store.update_metadata({"document_hash": "hash0"}, {"is_active": False}) == 4
+        results = test_store.search(query_embedding=documents[0].embeddings, top_k=12)
+        assert len(results) == 8
+        assert "doc0" not in [doc.id for doc in results]
+        assert len(test_store.search(query_embedding=documents[0].embeddings, top_k=12,
+                                     where={"category": "even"})) == 4
+        assert test_store.get_document("doc0").metadata["is_active"] is False
+
+        # Already soft-deleted chunks no longer match the deletion filter
+        assert test_store.update_metadata({"is_active": {"$ne": False}, "document_hash": "hash0"},
+                                          {"is_active": False}) == 0
+
+        assert test_store.purge_deleted(limit=1) == 1
+        assert test_store.purge_deleted() == 3
+        info = test_store.get_collection_info()
+        assert info["count"] == info["index_vectors"] == 8
+        assert info["deleted_count"] == 0
+
+    def test_chunk_count_tracks_writes(self, test_store):
+        """The in-memory chunk count matches the sidecar after adds, replaces and deletes."""
+        def sidecar_count():
+            return test_store._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+        test_store.add_documents(make_documents(10))
+        test_store.deduplication_enabled = False
+        test_store.add_documents(make_documents(4, offset=8))
+        test_store.delete_documents(["doc0", "doc1", "missing"])
+        test_store.update_metadata({"document_hash": "hash2"}, {"is_active": False})
+        test_store.purge_deleted()
+        assert test_store._count() == sidecar_count() == 6
+
+        reopened = FaissStore("test_store", test_store.config)
+        assert reopened._count() == 6
+        test_store.delete_collection()
+        assert test_store._count() == 0
+
+    def test_soft_delete_column_migration(self, temp_directory):
+        """Sidecars created before soft deletion gain the is_active column."""
+        import sqlite3
+
+        db_path = Path(temp_directory) / "documents.sqlite3"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE chunks (int_id INTEGER PRIMARY KEY, doc_id TEXT UNIQUE NOT NULL, content TEXT, "
+            "metadata TEXT, source TEXT, document_hash TEXT, source_hash TEXT, file_path TEXT)"
+        )
+        conn.execute("INSERT INTO chunks VALUES (0, 'old', '', '{\"is_active\": false}', NULL, NULL, NULL, NULL)")
+        conn.commit()
+        conn.close()
+
+        store = FaissStore("migrated", {"persist_directory": temp_directory, "dimension": 8})
+        assert store.get_collection_info()["deleted_count"] == 1
+
+    def test_get_description(self):
+        """Test store description method."""
+        assert "faiss" in FaissStore.get_description().lower()
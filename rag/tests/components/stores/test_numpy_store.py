@@ -0,0 +1,307 @@
+"""Tests for NumPy Store component."""
+
+import pytest
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from core.base import Document
+from core.factories import VectorStoreFactory
+from components.stores.numpy_store.numpy_store import NumpyStore
+
+
+def make_documents(count: int, dim: int = 8, offset: int = 0):
+    """Create deterministic documents whose embeddings are one-hot-ish."""
+    documents = []
+    for i in range(offset, offset + count):
+        embedding = [0.01] * dim
+        embedding[i % dim] = 1.0
+        documents.append(Document(
+            id=f"doc{i}",
+            content=f"Document number {i}",
+            source=f"file{i % 3}.txt",
+            metadata={
+                "document_hash": f"hash{i % 3}",
+                "file_path": f"/data/file{i % 3}.txt",
+                "category": "even" if i % 2 == 0 else "odd",
+                "priority": i,
+            },
+            embeddings=embedding,
+        ))
+    return documents
+
+
+class TestNumpyStore:
+    """Test NumpyStore functionality."""
+
+    @pytest.fixture
+    def temp_directory(self):
+        """Create temporary directory for the matrix and sidecar."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture(params=["cosine", "ip", "l2"])
+    def test_store(self, request, temp_directory):
+        """Create a NumpyStore for each distance metric."""
+        return NumpyStore("test_store", {
+            "persist_directory": temp_directory,
+            "distance_metric": request.param,
+        })
+
+    def test_factory_registration(self, temp_directory):
+        """NumpyStore is available from VectorStoreFactory."""
+        store = VectorStoreFactory.create("NumpyStore", {"persist_directory": temp_directory})
+        assert isinstance(store, NumpyStore)
+
+    def test_add_and_search(self, test_store):
+        """Nearest neighbour of a stored vector is itself."""
+        documents = make_documents(16)
+        assert test_store.add_documents(documents) is True
+        assert test_store.get_collection_info()["count"] == 16
+
+        results = test_store.search(query_embedding=documents[3].embeddings, top_k=3)
+        assert [doc.id for doc in results][0] == "doc3"
+        assert len(results) == 3
+        assert results[0].metadata["similarity_score"] >= results[1].metadata["similarity_score"]
+        assert results[0].source == "/data/file0.txt"
+        assert results[0].metadata["priority"] == 3
+
+    def test_matches_brute_force(self, temp_directory):
+        """Results are the exact cosine top-k, in order."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((200, 16)).astype(np.float32)
+        store = NumpyStore("exact", {"persist_directory": temp_directory})
+        store.add_documents([
+            Document(id=f"v{i}", content=str(i), embeddings=vectors[i].tolist()) for i in range(200)
+        ])
+
+        query = rng.standard_normal(16).astype(np.float32)
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = [f"v{i}" for i in np.argsort(-(normalized @ query))[:10]]
+        assert [doc.id for doc in store.search(query_embedding=query.tolist(), top_k=10)] == expected
+
+    def test_search_batch(self, test_store):
+        """Batched search equals per-query search."""
+        documents = make_documents(16)
+        test_store.add_documents(documents)
+        queries = [documents[1].embeddings, documents[6].embeddings]
+
+        batched = test_store.search_batch(queries, top_k=4)
+        single = [test_store.search(query_embedding=q, top_k=4) for q in queries]
+        assert [[d.id for d in r] for r in batched] == [[d.id for d in r] for r in single]
+        assert batched[0][0].embeddings is None
+
+        # Stored vectors come back on request (normalized for cosine)
+        by_id = {doc.id: np.asarray(doc.embeddings) for doc in documents}
+        with_vectors = test_store.search_batch(queries, top_k=4, include_embeddings=True)
+        assert [[d.id for d in r] for r in with_vectors] == [[d.id for d in r] for r in batched]
+        for doc in with_vectors[1]:
+            expected = by_id[doc.id]
+            if test_store.distance_metric == "cosine":
+                expected = expected / np.linalg.norm(expected)
+            assert np.allclose(doc.embeddings, expected, atol=1e-6)
+
+    def test_ties_are_deterministic(self, temp_directory):
+        """Equal scores are ordered by insertion order."""
+        store = NumpyStore("ties", {"persist_directory": temp_directory})
+        store.add_documents([Document(id=f"t{i}", content="", embeddings=[1.0, 0.0]) for i in range(20)])
+        assert [doc.id for doc in store.search(query_embedding=[1.0, 0.0], top_k=5)] == [f"t{i}" for i in range(5)]
+
+    def test_where_filters(self, test_store):
+        """Metadata filters are applied before ranking."""
+        test_store.add_documents(make_documents(16))
+        query = [0.1] * 8
+
+        results = test_store.search(query_embedding=query, top_k=16, where={"category": "odd"})
+        assert len(results) == 8
+        assert all(doc.metadata["category"] == "odd" for doc in results)
+
+        results = test_store.search_with_filter(
+            query, top_k=16, metadata_filter={"priority": {"$gte": 4, "$lt": 8}, "document_hash": ["hash1", "hash2"]}
+        )
+        assert sorted(doc.id for doc in results) == ["doc4", "doc5", "doc7"]
+
+        assert test_store.search(query_embedding=query, where={"category": "none"}) == []
+
+    def test_duplicates_and_replacement(self, temp_directory):
+        """Duplicates are skipped with deduplication, replaced without it."""
+        store = NumpyStore("dupes", {"persist_directory": temp_directory})
+        store.add_documents(make_documents(4))
+        store.add_documents(make_documents(4))
+        assert store.last_add_stats["skipped"] == 4
+        assert store.get_collection_info()["count"] == 4
+
+        upsert = NumpyStore("upsert", {"persist_directory": temp_directory, "collection_name": "upsert",
+                                       "enable_deduplication": False})
+        upsert.add_documents(make_documents(2))
+        changed = make_documents(1)[0]
+        changed.content = "Changed"
+        changed.metadata = {"category": "new"}
+        upsert.add_documents([changed])
+        assert upsert.get_collection_info()["count"] == 2
+        assert upsert.get_document("doc0").content == "Changed"
+        assert upsert.get_document("doc0").metadata == {"category": "new"}
+
+    def test_delete_paths(self, test_store):
+        """Deletes by ID, document hash and source remove the matching rows."""
+        test_store.add_documents(make_documents(9))
+
+        assert test_store.delete_documents(["doc0"]) is True
+        assert test_store.get_document("doc0") is None
+        assert test_store.delete_by_document_hash("hash1") is True
+        assert test_store.get_collection_info()["count"] == 5
+        assert test_store.delete_by_source("/data/file2.txt") is True
+        assert test_store.get_collection_info()["count"] == 2
+
+        results = test_store.search(query_embedding=[0.1] * 8, top_k=10)
+        assert {doc.id for doc in results} == {"doc3", "doc6"}
+
+    def test_persistence_is_memory_mapped(self, temp_directory):
+        """A new instance memory-maps the saved matrix."""
+        config = {"persist_directory": temp_directory, "dtype": "float16"}
+        documents = make_documents(6)
+        NumpyStore("first", config).add_documents(documents)
+
+        reopened = NumpyStore("second", config)
+        assert isinstance(reopened._matrix, np.memmap)
+        assert reopened._matrix.dtype == np.float16
+        assert reopened.search(query_embedding=documents[5].embeddings, top_k=1)[0].id == "doc5"
+
+    def test_many_small_batches(self, test_store, temp_directory):
+        """Small batches append in place and reload to the same collection as one batch."""
+        documents = make_documents(100)
+        for start in range(0, 100, 8):
+            assert test_store.add_documents(documents[start:start + 8]) is True
+        # The file grows geometrically; recent rows are only in the sidecar log
+        assert 100 <= len(test_store._storage) < 200
+        assert 0 < test_store._log_rows <= test_store._snapshot_rows
+
+        single = NumpyStore("single", {"persist_directory": temp_directory, "collection_name": "single",
+                                       "distance_metric": test_store.distance_metric})
+        single.add_documents(documents)
+        query = documents[42].embeddings
+        expected = [doc.id for doc in single.search(query_embedding=query, top_k=5, where={"category": "even"})]
+        assert [doc.id for doc in test_store.search(query_embedding=query, top_k=5,
+                                                    where={"category": "even"})] == expected
+
+        # An interrupted log write leaves a partial last line, which is dropped on reload
+        with open(test_store.log_path, "a", encoding="utf-8") as f:
+            f.write('{"row": 100, "id": "torn"')
+        reopened = NumpyStore("reopened", {"persist_directory": temp_directory,
+                                           "distance_metric": test_store.distance_metric})
+        assert reopened.get_collection_info()["count"] == 100
+        assert reopened.get_document("doc99").metadata["priority"] == 99
+        assert [doc.id for doc in reopened.search(query_embedding=query, top_k=5,
+                                                  where={"category": "even"})] == expected
+        assert reopened.add_documents(make_documents(3, offset=100)) is True
+        assert NumpyStore("again", {"persist_directory": temp_directory}).get_collection_info()["count"] == 103
+
+    def test_dimension_mismatch(self, temp_directory):
+        """Embeddings of a different size are rejected."""
+        store = NumpyStore("dim", {"persist_directory": temp_directory})
+        store.add_documents(make_documents(2, dim=4))
+        assert store.add_documents(make_documents(2, dim=8, offset=2)) is False
+
+    def test_delete_collection(self, test_store):
+        """Deleting the collection empties it and allows reuse."""
+        test_store.add_documents(make_documents(4))
+        assert test_store.delete_collection() is True
+        assert test_store.get_collection_info()["count"] == 0
+        assert test_store.search(query_embedding=[0.1] * 8) == []
+        assert test_store.add_documents(make_documents(4)) is True
+
+    @pytest.mark.parametrize("quantization", ["int8", "pq"])
+    def test_quantized_search_rescores_exactly(self, temp_directory, quantization):
+        """Quantized codes find candidates; re-scoring restores exact order and scores."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((300, 16)).astype(np.float32)
+        documents = [Document(id=f"v{i}", content=str(i), embeddings=vectors[i].tolist()) for i in range(300)]
+        exact = NumpyStore("exact", {"persist_directory": temp_directory, "collection_name": "exact"})
+        exact.add_documents(documents)
+        store = NumpyStore("quantized", {
+            "persist_directory": temp_directory,
+            "collection_name": quantization,
+            "quantization": quantization,
+            "pq_m": 8,
+            "rescore_factor": 30,
+        })
+        store.add_documents(documents)
+
+        info = store.get_collection_info()
+        assert info["quantization"] == quantization
+        assert 0 < info["code_bytes"] < vectors.nbytes
+        assert store.quant_path.exists()
+
+        queries = rng.standard_normal((5, 16)).astype(np.float32)
+        expected = exact.search_batch(queries, top_k=5)
+        results = store.search_batch(queries, top_k=5)
+        assert [[d.id for d in r] for r in results] == [[d.id for d in r] for r in expected]
+        assert results[0][0].metadata["similarity_score"] == pytest.approx(
+            expected[0][0].metadata["similarity_score"], abs=1e-5)
+
+        # Codes are reloaded rather than rebuilt, and stay aligned after deletes
+        reopened = NumpyStore("reopened", {
+            "persist_directory": temp_directory, "collection_name": quantization, "quantization": quantization,
+        })
+        assert np.array_equal(reopened._codes, store._codes)
+        reopened.delete_documents([expected[0][0].id])
+        assert len(reopened._codes) == 299
+        assert reopened.search(query_embedding=queries[0].tolist(), top_k=1)[0].id == expected[0][1].id
+
+    def test_quantized_incremental_adds(self, test_store, temp_directory):
+        """Rows added after the quantizer is fit are encoded with the existing codebook."""
+        store = NumpyStore("int8", {
+            "persist_directory": temp_directory, "collection_name": "incremental",
+            "quantization": "int8", "distance_metric": test_store.distance_metric,
+        })
+        store.add_documents(make_documents(10))
+        quantizer = store._quantizer
+        store.add_documents(make_documents(4, offset=10))
+        assert store._quantizer is quantizer
+        assert len(store._codes) == 14
+
+        results = store.search(query_embedding=make_documents(1, offset=12)[0].embeddings, top_k=1)
+        assert results[0].id in ("doc4", "doc12")  # identical embeddings
+
+        store.add_documents(make_documents(16, offset=14))
+        assert store._quantizer is not quantizer  # refit once the collection doubled
+
+    def test_float16_quantization_sets_dtype(self, temp_directory):
+        """quantization: float16 is the float16 storage dtype."""
+        store = NumpyStore("half", {"persist_directory": temp_directory, "quantization": "float16"})
+        store.add_documents(make_documents(4))
+        assert store._matrix.dtype == np.float16
+        assert store._codes is None
+
+    def test_soft_delete_and_purge(self, test_store, temp_directory):
+        """Soft-deleted rows drop out of search and are removed by purge_deleted."""
+        documents = make_documents(12)
+        test_store.add_documents(documents)
+
+        assert test_store.update_metadata({"document_hash": "hash0"}, {"is_active": False}) == 4
+        results = test_store.search(query_embedding=documents[0].embeddings, top_k=12)
+        assert len(results) == 8
+        assert all(doc.metadata["document_hash"] != "hash0" for doc in results)
+        assert test_store.get_collection_info()["deleted_count"] == 4
+
+        # Tombstones survive a reload
+        reopened = NumpyStore("reopened", {"persist_directory": temp_directory,
+                                           "distance_metric": test_store.distance_metric})
+        assert reopened.get_collection_info()["deleted_count"] == 4
+
+        assert test_store.purge_deleted(limit=3) == 3
+        assert test_store.purge_deleted() == 1
+        info = test_store.get_collection_info()
+        assert info["count"] == 8 and info["deleted_count"] == 0
+        assert test_store.get_document("doc0") is None
+
+    def test_get_description(self):
+        """Test store description method."""
+        assert "numpy" in NumpyStore.get_description().lower()
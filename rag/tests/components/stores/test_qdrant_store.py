@@ -0,0 +1,195 @@
+"""Tests for Qdrant Store component."""
+
+import pytest
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+pytest.importorskip("qdrant_client")
+
+from core.base import Document
+from components.stores.qdrant_store.qdrant_store import QdrantStore
+from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
+
+
+def make_documents(count: int, dim: int = 8, offset: int = 0):
+    """Create deterministic documents whose embeddings are one-hot-ish."""
+    documents = []
+    for i in range(offset, offset + count):
+        embedding = [0.01] * dim
+        embedding[i % dim] = 1.0
+        documents.append(Document(
+            id=f"doc{i}",
+            content=f"Document number {i}",
+            source=f"file{i % 3}.txt",
+            metadata={
+                "document_hash": f"hash{i % 3}",
+                "file_path": f"/data/file{i % 3}.txt",
+                "category": "even" if i % 2 == 0 else "odd",
+                "priority": i,
+            },
+            embeddings=embedding,
+        ))
+    return documents
+
+
+class TestQdrantStore:
+    """Test QdrantStore functionality in embedded (local path) mode."""
+
+    @pytest.fixture
+    def temp_directory(self):
+        """Create temporary directory for the local storage."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def test_store(self, temp_directory):
+        """Create an embedded QdrantStore instance."""
+        return QdrantStore("test_store", {
+            "collection_name": "test_collection",
+            "path": temp_directory,
+            "batch_size": 4,
+        })
+
+    def test_add_and_search(self, test_store):
+        """Documents are stored in batches and found by nearest neighbour."""
+        documents = make_documents(10)
+        assert test_store.add_documents(documents) is True
+        assert test_store.last_add_stats == {"inserted": 10, "skipped": 0, "batches": 3}
+        assert test_store.vector_size == 8
+
+        results = test_store.search(query_embedding=documents[2].embeddings, top_k=3)
+        assert results[0].id == "doc2"
+        assert results[0].content == "Document number 2"
+        assert results[0].source == "/data/file2.txt"
+        assert 0.0 <= results[1].metadata["similarity_score"] <= results[0].metadata["similarity_score"] <= 1.0
+
+    def test_duplicates_are_skipped(self, test_store):
+        """Re-adding the same IDs writes nothing."""
+        documents = make_documents(6)
+        test_store.add_documents(documents)
+        test_store.add_documents(documents)
+        assert test_store.last_add_stats["skipped"] == 6
+        assert test_store.get_collection_info()["count"] == 6
+
+    def test_search_batch(self, test_store):
+        """Batched search equals per-query search, with and without filters."""
+        documents = make_documents(12)
+        test_store.add_documents(documents)
+        queries = [documents[1].embeddings, documents[6].embeddings]
+
+        for where in (None, {"category": "odd"}):
+            batched = test_store.search_batch(queries, top_k=3, where=where)
+            single = [test_store.search(query_embedding=q, top_k=3, where=where) for q in queries]
+            assert [[d.id for d in r] for r in batched] == [[d.id for d in r] for r in single]
+        assert batched[0][0].id in ("doc1", "doc9")  # identical embeddings
+
+        # Stored vectors come back on request (Qdrant normalizes them for cosine)
+        doc = test_store.search_batch(queries, top_k=1, include_embeddings=True)[0][0]
+        expected = np.asarray(documents[1].embeddings)
+        assert np.allclose(doc.embeddings, expected / np.linalg.norm(expected), atol=1e-5)
+
+    def test_search_with_filter_operators(self, test_store):
+        """Operator filters are translated to native Qdrant filters."""
+        test_store.add_documents(make_documents(12))
+        query = [0.1] * 8
+
+        results = test_store.search_with_filter(query, top_k=12, metadata_filter={"category": "even"})
+        assert len(results) == 6
+        assert all(doc.metadata["category"] == "even" for doc in results)
+
+        results = test_store.search_with_filter(
+            query, top_k=12, metadata_filter={"priority": {"$gte": 3, "$lt": 6}, "category": {"$ne": "odd"}}
+        )
+        assert sorted(doc.id for doc in results) == ["doc4"]
+
+        results = test_store.search_with_filter(
+            query, top_k=12, metadata_filter={"document_hash": {"$in": ["hash0", "hash1"]}}
+        )
+        assert len(results) == 8
+
+    def test_metadata_filtered_strategy_uses_native_filtering(self, test_store):
+        """MetadataFilteredStrategy picks the native filter path."""
+        documents = make_documents(8)
+        test_store.add_documents(documents)
+
+        strategy = MetadataFilteredStrategy(config={"default_filters": {"category": "odd"}})
+        result = strategy.retrieve(documents[1].embeddings, test_store, top_k=3)
+        assert result.strategy_metadata["filtering_method"] == "native"
+        assert result.documents[0].id == "doc1"
+        assert all(doc.metadata["category"] == "odd" for doc in result.documents)
+
+    def test_delete_paths(self, test_store):
+        """Deletes by ID, document hash and source remove the matching chunks."""
+        test_store.add_documents(make_documents(9))
+
+        assert test_store.delete_documents(["doc0"]) is True
+        assert test_store.get_document("doc0") is None
+        assert test_store.get_document("doc1").content == "Document number 1"
+
+        assert test_store.delete_by_document_hash("hash1") is True
+        assert test_store.get_collection_info()["count"] == 5
+
+        assert test_store.delete_by_source("/data/file2.txt") is True
+        assert test_store.get_collection_info()["count"] == 2
+
+    def test_persistence_and_shared_client(self, temp_directory):
+        """A second store on the same path reuses the embedded client and sees the data."""
+        config = {"collection_name": "persisted", "path": temp_directory, "vector_size": 8,
+                  "quantization": "scalar"}
+        QdrantStore("first", config).add_documents(make_documents(4))
+
+        reopened = QdrantStore("second", config)
+        assert reopened.get_collection_info()["count"] == 4
+
+    def test_delete_collection(self, test_store):
+        """Deleting the collection empties it and allows reuse."""
+        test_store.add_documents(make_documents(4))
+        assert test_store.delete_collection() is True
+        assert test_store.get_collection_info()["count"] == 0
+        assert test_store.add_documents(make_documents(4)) is True
+
+    def test_unsupported_operator_returns_empty(self, test_store):
+        """Unknown operators are reported instead of silently ignored."""
+        test_store.add_documents(make_documents(4))
+        assert test_store.search(query_embedding=[0.1] * 8, where={"priority": {"$regex": "x"}}) == []
+
+    def test_soft_delete_and_purge(self, test_store):
+        """Soft-deleted points are filtered inside Qdrant and purged on demand."""
+        documents = make_documents(12)
+        test_store.add_documents(documents)
+
+        assert test_store.update_metadata({"document_hash": "hash0"}, {"is_active": False}) == 4
+        results = test_store.search(query_embedding=documents[0].embeddings, top_k=12)
+        assert len(results) == 8
+        assert all(doc.metadata["document_hash"] != "hash0" for doc in results)
+        assert test_store.get_collection_info()["deleted_count"] == 4
+
+        assert test_store.purge_deleted(limit=3) == 3
+        assert test_store.purge_deleted() == 1
+        info = test_store.get_collection_info()
+        assert info["count"] == 8 and info["deleted_count"] == 0
+
+    def test_soft_deletes_by_another_store_are_seen(self, temp_directory):
+        """A long-lived store stops returning points another store soft-deletes later."""
+        config = {"collection_name": "shared", "path": temp_directory}
+        documents = make_documents(6)
+        reader = QdrantStore("reader", config)
+        reader.add_documents(documents)
+        assert len(reader.search(query_embedding=documents[0].embeddings, top_k=6)) == 6
+
+        QdrantStore("writer", config).update_metadata({"document_hash": "hash0"}, {"is_active": False})
+        results = reader.search(query_embedding=documents[0].embeddings, top_k=6)
+        assert len(results) == 4
+        assert all(doc.metadata["document_hash"] != "hash0" for doc in results)
+
+    def test_get_description(self):
+        """Test store description method."""
+        assert "qdrant" in QdrantStore.get_description().lower()
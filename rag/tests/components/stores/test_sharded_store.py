@@ -0,0 +1,177 @@
+"""Tests for Sharded Store component."""
+
+import pytest
+from pathlib import Path
+import sys
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from core.base import Document
+from core.factories import VectorStoreFactory
+from components.stores.numpy_store.numpy_store import NumpyStore
+from components.stores.sharded_store.sharded_store import ShardedStore
+
+
+def make_documents(count: int, dim: int = 16, hashes: int = 6, seed: int = 0):
+    """Create random documents spread over a few source documents."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    return [
+        Document(
+            id=f"doc{i}",
+            content=f"Chunk {i}",
+            source=f"file{i % hashes}.txt",
+            metadata={
+                "document_hash": f"hash{i % hashes}",
+                "file_path": f"/data/file{i % hashes}.txt",
+                "category": "even" if i % 2 == 0 else "odd",
+            },
+            embeddings=vectors[i].tolist(),
+        )
+        for i in range(count)
+    ]
+
+
+class TestShardedStore:
+    """Test ShardedStore functionality."""
+
+    @pytest.fixture
+    def temp_directory(self):
+        """Create temporary directory for the shards."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def test_store(self, temp_directory):
+        """Create a ShardedStore over four NumPy shards."""
+        return ShardedStore("test_store", {
+            "persist_directory": temp_directory,
+            "shard_type": "NumpyStore",
+            "num_shards": 4,
+        })
+
+    def test_factory_registration(self, temp_directory):
+        """ShardedStore is available from VectorStoreFactory."""
+        store = VectorStoreFactory.create("ShardedStore", {
+            "persist_directory": temp_directory, "shard_type": "NumpyStore", "num_shards": 2,
+        })
+        assert isinstance(store, ShardedStore)
+        assert all(isinstance(shard, NumpyStore) for shard in store.shards)
+
+    def test_routing_by_document_hash(self, test_store):
+        """All chunks of a document land on the shard that owns its hash."""
+        documents = make_documents(60)
+        assert test_store.add_documents(documents) is True
+        assert test_store.last_add_stats["inserted"] == 60
+
+        for shard_index, shard in enumerate(test_store.shards):
+            for doc_id in shard._ids:
+                document_hash = shard.get_document(doc_id).metadata["document_hash"]
+                assert test_store.shard_for(document_hash) == shard_index
+        assert test_store.get_collection_info()["count"] == 60
+
+    def test_search_matches_single_store(self, test_store, temp_directory):
+        """Merged shard results equal one unsharded store's top-k."""
+        documents = make_documents(80)
+        test_store.add_documents(documents)
+        single = NumpyStore("single", {"persist_directory": temp_directory, "collection_name": "single"})
+        single.add_documents(documents)
+
+        queries = np.random.default_rng(1).standard_normal((4, 16)).astype(np.float32).tolist()
+        expected = [[doc.id for doc in single.search(query_embedding=q, top_k=7)] for q in queries]
+        assert [[doc.id for doc in test_store.search(query_embedding=q, top_k=7)] for q in queries] == expected
+        assert [[doc.id for doc in r] for r in test_store.search_batch(queries, top_k=7)] == expected
+        with_vectors = test_store.search(query_embedding=queries[0], top_k=7, include_embeddings=True)
+        vectors = {doc.id: doc.embeddings for doc in single.search(query_embedding=queries[0], top_k=7,
+                                                                  include_embeddings=True)}
+        assert all(np.allclose(doc.embeddings, vectors[doc.id]) for doc in with_vectors)
+
+        filtered = test_store.search_with_filter(queries[0], top_k=10, metadata_filter={"category": "odd"})
+        assert len(filtered) == 10
+        assert all(doc.metadata["category"] == "odd" for doc in filtered)
+
+    def test_delete_by_document_hash_targets_owner(self, test_store):
+        """Deleting by hash only touches the owning shard."""
+        test_store.add_documents(make_documents(30))
+        owner = test_store.shard_for("hash2")
+
+        calls = []
+        for index, shard in enumerate(test_store.shards):
+            original = shard.delete_by_document_hash
+
+            def recorder(document_hash, index=index, original=original):
+                calls.append(index)
+                return original(document_hash)
+
+            shard.delete_by_document_hash = recorder
+
+        assert test_store.delete_by_document_hash("hash2") is True
+        assert calls == [owner]
+        assert test_store.get_collection_info()["count"] == 25
+
+        assert test_store.delete_documents(["doc0", "doc1"]) is True
+        assert test_store.get_document("doc0") is None
+        assert test_store.get_document("doc3").id == "doc3"
+        assert test_store.delete_by_source("/data/file3.txt") is True
+        assert test_store.get_collection_info()["count"] == 18
+
+    def test_shard_count_is_fixed(self, test_store, temp_directory):
+        """Reopening with a different num_shards keeps the recorded count."""
+        documents = make_documents(20)
+        test_store.add_documents(documents)
+
+        reopened = ShardedStore("reopened", {
+            "persist_directory": temp_directory, "shard_type": "NumpyStore", "num_shards": 8,
+        })
+        assert reopened.num_shards == 4
+        assert reopened.get_collection_info()["count"] == 20
+        assert reopened.search(query_embedding=documents[5].embeddings, top_k=1)[0].id == "doc5"
+
+    def test_shard_directories(self, temp_directory):
+        """Shards are spread round-robin over shard_directories."""
+        disks = [str(Path(temp_directory) / "disk1"), str(Path(temp_directory) / "disk2")]
+        store = ShardedStore("disks", {
+            "persist_directory": temp_directory,
+            "shard_type": "NumpyStore",
+            "num_shards": 3,
+            "shard_directories": disks,
+        })
+        assert [Path(shard.persist_directory).parent for shard in store.shards] == [
+            Path(disks[0]), Path(disks[1]), Path(disks[0])
+        ]
+
+    def test_failed_shard_search_returns_empty(self, test_store):
+        """An exception from a shard is logged and yields empty results."""
+        test_store.add_documents(make_documents(10))
+        with patch.object(test_store.shards[0], "search_batch", side_effect=RuntimeError("down")):
+            assert test_store.search_batch([[0.0] * 16], top_k=3) == [[]]
+
+    def test_delete_collection(self, test_store):
+        """Deleting the collection empties every shard."""
+        test_store.add_documents(make_documents(12))
+        assert test_store.delete_collection() is True
+        assert test_store.get_collection_info()["count"] == 0
+        assert test_store.search(query_embedding=[0.1] * 16) == []
+
+    def test_soft_delete_and_incremental_purge(self, test_store):
+        """Soft deletes reach every shard and a purge limit spans shards."""
+        test_store.add_documents(make_documents(48))
+
+        assert test_store.update_metadata({"category": "odd"}, {"is_active": False}) == 24
+        assert test_store.get_collection_info()["deleted_count"] == 24
+
+        assert test_store.purge_deleted(limit=10) == 10
+        assert test_store.get_collection_info()["deleted_count"] == 14
+        assert test_store.purge_deleted() == 14
+        assert test_store.get_collection_info()["count"] == 24
+
+    def test_get_description(self):
+        """Test store description method."""
+        assert "shard" in ShardedStore.get_description().lower()
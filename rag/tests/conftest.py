@@ -7,6 +7,17 @@ from typing import Generator
 import pytest
 
 from core.base import Document
+from utils import embedding_registry
+
+
+@pytest.fixture(autouse=True)
+def isolated_embedding_registry(tmp_path, monkeypatch):
+    """Give each test its own embedding registry, including ones configure_embedding_registry sets up."""
+    path = tmp_path / "embedding_registry.json"
+    registry = embedding_registry.EmbeddingRegistry(path)
+    monkeypatch.setattr(embedding_registry, "DEFAULT_REGISTRY_PATH", str(path))
+    monkeypatch.setattr(embedding_registry, "_default_registry", registry)
+    return registry
 
 
 @pytest.fixture
@@ -71,6 +82,45 @@ def sample_csv_file(temp_dir: str, sample_csv_data: str) -> str:
     return str(csv_path)
 
 
+TINY_VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcdefghijklmnopqrstuvwxyz0123456789.,") + [
+    "the", "a", "is", "of", "and", "login", "password", "backup", "security", "test", "text", "document",
+]
+
+
+@pytest.fixture(scope="session")
+def tiny_transformer_dir(tmp_path_factory) -> str:
+    """A tiny randomly-initialized BERT model and tokenizer saved to disk (no download)."""
+    transformers = pytest.importorskip("transformers")
+    pytest.importorskip("torch")
+
+    model_dir = tmp_path_factory.mktemp("tiny_bert")
+    vocab_file = model_dir / "vocab.txt"
+    vocab_file.write_text("\n".join(TINY_VOCAB) + "\n")
+
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab_file))
+    config = transformers.BertConfig(
+        vocab_size=len(TINY_VOCAB), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+        intermediate_size=64, max_position_embeddings=128,
+    )
+    transformers.set_seed(0)
+    transformers.BertModel(config).save_pretrained(str(model_dir))
+    tokenizer.save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
+@pytest.fixture(scope="session")
+def tiny_cross_encoder_dir(tiny_transformer_dir, tmp_path_factory) -> str:
+    """A tiny randomly-initialized BERT cross-encoder (one relevance logit) saved to disk."""
+    transformers = pytest.importorskip("transformers")
+
+    model_dir = tmp_path_factory.mktemp("tiny_cross_encoder")
+    config = transformers.BertConfig.from_pretrained(tiny_transformer_dir, num_labels=1)
+    transformers.set_seed(0)
+    transformers.BertForSequenceClassification(config).save_pretrained(str(model_dir))
+    transformers.AutoTokenizer.from_pretrained(tiny_transformer_dir).save_pretrained(str(model_dir))
+    return str(model_dir)
+
+
 @pytest.fixture
 def mock_ollama_available():
     """Mock Ollama availability for tests that don't require actual Ollama."""
@@ -85,6 +135,12 @@ def mock_ollama_available():
             "http://localhost:11434/api/embeddings",
             json={"embedding": [0.1, 0.2, 0.3, 0.4] * 192},  # 768 dimensions
         )
+        m.post(
+            "http://localhost:11434/api/embed",
+            json=lambda request, context: {
+                "embeddings": [[0.1, 0.2, 0.3, 0.4] * 192 for _ in request.json()["input"]]
+            },
+        )
         yield m
 
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from core.base import Document, ProcessingResult, Parser, Embedder, VectorStore, Pipeline, Component
@@ -44,6 +45,28 @@ def test_document_to_dict_round_trip():
     assert d["source"] == "src"
 
 
+def test_document_to_dict_converts_array_embeddings():
+    doc = Document(content="hello", embeddings=np.array([0.5, 1.5], dtype=np.float32))
+    assert doc.to_dict()["embeddings"] == [0.5, 1.5]
+
+
+def test_embed_array_default_converts_embed_output():
+    vectors = DummyEmbedder().embed_array(["a", "bbb"])
+    assert vectors.dtype == np.float32
+    assert vectors.tolist() == [[1.0], [3.0]]
+    assert DummyEmbedder().embed_array([]).shape == (0, 0)
+
+
+def test_embedder_process_assigns_row_views():
+    docs = [Document(content="a"), Document(content="bb")]
+    DummyEmbedder().process(docs)
+
+    assert [doc.embeddings.tolist() for doc in docs] == [[1.0], [2.0]]
+    # Both rows live in one batch array rather than per-document lists
+    assert docs[0].embeddings.base is not None
+    assert docs[0].embeddings.base is docs[1].embeddings.base
+
+
 def test_pipeline_run_with_source_and_components():
     pipe = Pipeline()
     vs = DummyVectorStore()
@@ -60,6 +83,23 @@ def test_pipeline_run_with_source_and_components():
     assert result.errors == []
 
 
+def test_pipeline_run_does_not_probe_the_embedder(isolated_embedding_registry):
+    calls = []
+
+    class RecordingEmbedder(DummyEmbedder):
+        def embed(self, texts):
+            calls.append(list(texts))
+            return super().embed(texts)
+
+    pipe = Pipeline()
+    pipe.add_component(RecordingEmbedder()).add_component(DummyVectorStore())
+    pipe.run(documents=[Document(content="abc")])
+
+    # Dimension checks belong to EnhancedPipeline and SearchAPI, not the generic pipeline
+    assert calls == [["abc"]]
+    assert not isolated_embedding_registry.path.exists()
+
+
 def test_pipeline_requires_parser_when_source_is_provided():
     pipe = Pipeline()
     pipe.add_component(DummyEmbedder())
@@ -92,3 +132,19 @@ def test_vector_store_process_reports_metrics():
     result = vs.process(docs)
     assert result.metrics.get("stored_count") == 2
 
+
+
+def test_vector_store_search_batch_falls_back_to_search():
+    class RecordingStore(DummyVectorStore):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        def search(self, query: str = None, top_k: int = 10, query_embedding=None, where=None):
+            self.calls.append((query_embedding, top_k, where))
+            return [Document(content=str(query_embedding))]
+
+    vs = RecordingStore()
+    results = vs.search_batch([[1.0], [2.0]], top_k=3, where={"k": "v"})
+    assert [r[0].content for r in results] == ["[1.0]", "[2.0]"]
+    assert vs.calls == [([1.0], 3, {"k": "v"}), ([2.0], 3, {"k": "v"})]
@@ -323,6 +323,40 @@ class TestDocumentDeletionManager:
         assert "Test error" in result["errors"][0]
 
 
+    def test_soft_delete_matches_chunks_without_is_active(self, manager, mock_vector_store):
+        """Soft deletes don't require is_active to have been set at ingest."""
+        manager.delete_by_filename(["a.txt"], DeletionStrategy.SOFT_DELETE)
+
+        filter_criteria = mock_vector_store.update_metadata.call_args[0][0]
+        assert filter_criteria["is_active"] == {"$ne": False}
+
+    def test_compact(self, manager, mock_vector_store):
+        """Compaction purges up to max_chunks and reports reclaimed bytes."""
+        mock_vector_store.get_collection_info = Mock(return_value={"count": 100, "deleted_count": 40})
+        mock_vector_store.storage_bytes = Mock(side_effect=[5000, 3000])
+        mock_vector_store.purge_deleted = Mock(return_value=25)
+
+        result = manager.compact(max_chunks=25)
+
+        mock_vector_store.purge_deleted.assert_called_once_with(limit=25)
+        assert result["deleted_count"] == 25
+        assert result["remaining_deleted"] == 15
+        assert result["bytes_reclaimed"] == 2000
+        assert result["errors"] == []
+
+    def test_compact_below_threshold_and_dry_run(self, manager, mock_vector_store):
+        """Nothing is purged below the ratio threshold or in dry-run mode."""
+        mock_vector_store.get_collection_info = Mock(return_value={"count": 100, "deleted_count": 5})
+        mock_vector_store.storage_bytes = Mock(return_value=5000)
+        mock_vector_store.purge_deleted = Mock()
+
+        assert manager.compact(min_deleted_ratio=0.1)["skipped"] is True
+        dry_run = manager.compact(max_chunks=2, dry_run=True)
+        assert dry_run["deleted_count"] == 2
+        assert dry_run["remaining_deleted"] == 3
+        mock_vector_store.purge_deleted.assert_not_called()
+
+
 class TestDocumentManager:
     """Test main document manager."""
     
@@ -0,0 +1,129 @@
+"""Tests for the dynamic-batching embedding service."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core.embedding_batcher import EmbeddingBatcher, get_embedding_batcher
+
+
+class GatedEmbedder:
+    """Embeds each text as ``[len(text)]``; blocks each call until ``gate`` is set."""
+
+    model = "gated"
+    batch_size = 8
+
+    def __init__(self, gate=None, error=None):
+        self.gate = gate
+        self.error = error
+        self.calls = []
+        self.started = threading.Event()
+
+    def embed_array(self, texts):
+        self.calls.append(list(texts))
+        self.started.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+
+def test_requests_queued_while_busy_share_one_batch():
+    gate = threading.Event()
+    embedder = GatedEmbedder(gate=gate)
+
+    with EmbeddingBatcher(embedder, max_wait_ms=0) as batcher:
+        first = batcher.submit(["a"])
+        assert embedder.started.wait(5)
+        # The embedder is busy with "a": these pile up for the next batch
+        futures = [batcher.submit(["b" * i, "c" * i]) for i in range(1, 4)]
+        gate.set()
+
+        assert first.result(5).tolist() == [[1.0]]
+        assert [future.result(5).tolist() for future in futures] == [
+            [[1.0], [1.0]], [[2.0], [2.0]], [[3.0], [3.0]],
+        ]
+        assert [len(call) for call in embedder.calls] == [1, 6]
+        assert batcher.get_stats()["batches"] == 2
+
+
+def test_flush_at_max_batch_size():
+    gate = threading.Event()
+    embedder = GatedEmbedder(gate=gate)
+
+    with EmbeddingBatcher(embedder, max_batch_size=4, max_wait_ms=0) as batcher:
+        batcher.submit(["warm"])
+        assert embedder.started.wait(5)
+        futures = [batcher.submit([str(i)]) for i in range(10)]
+        gate.set()
+        for future in futures:
+            future.result(5)
+
+    assert [len(call) for call in embedder.calls] == [1, 4, 4, 2]
+
+
+def test_waits_up_to_max_wait_for_concurrent_callers():
+    embedder = GatedEmbedder()
+
+    with EmbeddingBatcher(embedder, max_wait_ms=500) as batcher:
+        barrier = threading.Barrier(4)
+
+        def query(i):
+            barrier.wait()
+            return batcher.embed([f"query {i}"])
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(query, range(4)))
+
+    assert results == [[[7.0]]] * 4
+    assert len(embedder.calls) == 1
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    gate = threading.Event()
+    embedder = GatedEmbedder(gate=gate, error=RuntimeError("server down"))
+
+    with EmbeddingBatcher(embedder, max_wait_ms=0) as batcher:
+        first = batcher.submit(["a"])
+        assert embedder.started.wait(5)
+        second, third = batcher.submit(["b"]), batcher.submit(["c"])
+        gate.set()
+
+        for future in (first, second, third):
+            with pytest.raises(RuntimeError, match="server down"):
+                future.result(5)
+        assert batcher.get_stats()["failed_batches"] == 2
+
+
+def test_close_serves_queued_requests_then_rejects():
+    gate = threading.Event()
+    embedder = GatedEmbedder(gate=gate)
+    batcher = EmbeddingBatcher(embedder, max_wait_ms=0)
+    futures = [batcher.submit([str(i)]) for i in range(3)]
+    gate.set()
+
+    batcher.close()
+
+    assert all(future.done() for future in futures)
+    with pytest.raises(RuntimeError):
+        batcher.submit(["late"])
+
+
+def test_shared_batcher_per_model():
+    embedder = GatedEmbedder()
+
+    batcher = get_embedding_batcher(embedder, {"max_batch_size": 16})
+    assert get_embedding_batcher(embedder) is batcher
+    # Another instance of the same model shares the batcher; another model does not
+    assert get_embedding_batcher(GatedEmbedder()) is batcher
+    other_model = GatedEmbedder()
+    other_model.model = "other"
+    assert get_embedding_batcher(other_model) is not batcher
+    assert (batcher.max_batch_size, batcher.model_key) == (16, "GatedEmbedder:gated")
+    assert batcher.embed_array([]).shape == (0, 0)
+
+    batcher.close()
+    assert get_embedding_batcher(embedder) is not batcher
@@ -5,6 +5,8 @@ from unittest.mock import Mock, patch, MagicMock
 from io import StringIO
 import sys
 
+import numpy as np
+
 from core.enhanced_pipeline import EnhancedPipeline
 from core.base import Document, ProcessingResult, Parser, Embedder, VectorStore
 
@@ -32,10 +34,10 @@ class TestEnhancedPipeline:
         embedder = Mock(spec=Embedder)
         embedder.name = "MockEmbedder"
         embedder.batch_size = 2
-        embedder.embed = Mock(return_value=[
+        embedder.embed_array = Mock(return_value=np.array([
             [0.1, 0.2, 0.3],
             [0.4, 0.5, 0.6]
-        ])
+        ], dtype=np.float32))
         embedder.process = Mock(return_value=ProcessingResult(
             documents=[
                 Document(content="Test doc 1", metadata={}, embeddings=[0.1, 0.2, 0.3]),
@@ -84,8 +86,8 @@ class TestEnhancedPipeline:
         # Verify parsing was called
         mock_parser.parse.assert_called_once_with("test.txt")
         
-        # Enhanced pipeline calls embed() directly for embedders, not process()
-        assert mock_embedder.embed.called
+        # Enhanced pipeline calls embed_array() directly for embedders, not process()
+        assert mock_embedder.embed_array.called
         
         # Verify result
         assert len(result.documents) == 2
@@ -105,8 +107,8 @@ class TestEnhancedPipeline:
         # Run pipeline
         result = pipeline.run_with_progress(documents=docs)
         
-        # Enhanced pipeline calls embed() directly for embedders, not process()
-        assert mock_embedder.embed.called
+        # Enhanced pipeline calls embed_array() directly for embedders, not process()
+        assert mock_embedder.embed_array.called
         
         # Verify result
         assert len(result.documents) == 2
@@ -157,7 +159,7 @@ class TestEnhancedPipeline:
         pipeline._process_embeddings_with_progress(mock_embedder, docs)
         
         # Verify embedder was called
-        mock_embedder.embed.assert_called()
+        mock_embedder.embed_array.assert_called()
         
         # Verify embeddings were added to documents
         for doc in docs:
@@ -179,7 +181,7 @@ class TestEnhancedPipeline:
         # Create failing embedder
         failing_embedder = Mock()
         failing_embedder.batch_size = 2
-        failing_embedder.embed = Mock(side_effect=Exception("Embedding failed"))
+        failing_embedder.embed_array = Mock(side_effect=Exception("Embedding failed"))
         
         # Test documents
         docs = [Document(content="Test", metadata={})]
@@ -188,8 +190,8 @@ class TestEnhancedPipeline:
         with pytest.raises(Exception, match="Embedding failed"):
             pipeline._process_embeddings_with_progress(failing_embedder, docs)
         
-        # Verify embed was called
-        assert failing_embedder.embed.called
+        # Verify embed_array was called
+        assert failing_embedder.embed_array.called
     
     def test_empty_document_handling(self, pipeline, mock_parser):
         """Test handling of empty document list."""
@@ -229,4 +231,89 @@ class TestEnhancedPipeline:
         
         completion = pipeline.tracker.get_completion_message()
         assert isinstance(completion, str)
-        assert len(completion) > 0
\ No newline at end of file
+        assert len(completion) > 0
+
+class TestEnhancedPipelineStreaming:
+    """Test the fused embed -> store stage of the enhanced pipeline."""
+
+    @pytest.mark.parametrize("release", [False, True])
+    def test_embedder_and_store_are_streamed(self, release):
+        embedder = Mock(spec=Embedder)
+        embedder.name = "MockEmbedder"
+        embedder.batch_size = 2
+        embedder.embed_array = Mock(side_effect=lambda texts: np.full((len(texts), 2), 0.1, dtype=np.float32))
+        store = Mock(spec=VectorStore)
+        store.name = "MockVectorStore"
+        written = []
+        store.add_documents = Mock(side_effect=lambda docs: written.append(len(docs)) or len(written) != 2)
+
+        pipeline = EnhancedPipeline("Streaming", write_batch_size=3, release_embeddings=release)
+        pipeline.add_component(embedder)
+        pipeline.add_component(store)
+        docs = [Document(content=f"Doc {i}", metadata={}) for i in range(7)]
+
+        with patch("time.sleep") as sleep:
+            result = pipeline.run_with_progress(documents=docs)
+
+        sleep.assert_not_called()
+        # One dimension probe up front, then 7 documents in batches of 2
+        assert embedder.embed_array.call_count == 5
+        store.prepare_for_embedder.assert_called_once_with(2, False)
+        assert written == [3, 3, 1]
+        assert result.errors == [{"component": "MockVectorStore", "error": "add_documents failed for 3 documents"}]
+        # Vectors are kept unless released; a failed batch always keeps its vectors
+        released = [release] * 3 + [False] * 3 + [release]
+        assert [doc.embeddings is None for doc in result.documents] == released
+
+    @pytest.mark.parametrize("streamed", [True, False])
+    def test_ingest_goes_through_shared_batcher(self, streamed):
+        """With embedding_batcher enabled, ingest embeds through the model's process-wide batcher."""
+        from core.embedding_batcher import get_embedding_batcher
+        embedder = Mock(spec=Embedder)
+        embedder.name = "MockEmbedder"
+        embedder.model_key = f"batched-ingest-{streamed}"
+        embedder.batch_size = 2
+        embedder.embed_array = Mock(side_effect=lambda texts: np.full((len(texts), 2), 0.1, dtype=np.float32))
+        store = Mock(spec=VectorStore)
+        store.name = "MockVectorStore"
+        store.add_documents = Mock(return_value=True)
+
+        pipeline = EnhancedPipeline("Batched", embedding_batcher={"enabled": True, "max_wait_ms": 0})
+        pipeline.add_component(embedder)
+        if streamed:
+            pipeline.add_component(store)
+        docs = [Document(content=f"Doc {i}", metadata={}) for i in range(5)]
+        pipeline.run_with_progress(documents=docs)
+
+        batcher = get_embedding_batcher(embedder)
+        assert batcher.get_stats()["texts"] == 5
+        batcher.close()
+
+    @pytest.mark.parametrize("streamed", [True, False])
+    def test_documents_straddling_writes_are_fully_stored(self, tmp_path, streamed):
+        """Chunks of one document split across write batches are all kept by a deduplicating store."""
+        from components.stores.chroma_store.chroma_store import ChromaStore
+        store = ChromaStore("straddle", {"collection_name": "straddle", "persist_directory": str(tmp_path)})
+        docs = [
+            Document(content=f"Doc {d} chunk {c}", id=f"d{d}_c{c}",
+                     metadata={"document_hash": f"doc{d}", "chunk_hash": f"doc{d}_c{c}"})
+            for d in range(3) for c in range(30)
+        ]
+        embedder = Mock(spec=Embedder)
+        embedder.name = "MockEmbedder"
+        embedder.batch_size = 8
+        embedder.embed_array = Mock(side_effect=lambda texts: np.random.default_rng(len(texts)).random(
+            (len(texts), 4), dtype=np.float32))
+
+        pipeline = EnhancedPipeline("Straddle", write_batch_size=16)
+        if streamed:
+            pipeline.add_component(embedder)
+            pipeline.add_component(store)
+            result = pipeline.run_with_progress(documents=docs)
+            assert result.errors == []
+        else:
+            for doc in docs:
+                doc.embeddings = np.random.default_rng(len(doc.content)).random(4, dtype=np.float32)
+            assert pipeline._process_storage_with_progress(store, docs) == []
+
+        assert store.get_collection_info()["count"] == 90
@@ -283,6 +283,40 @@ class TestManageCommand:
         
         assert success, "Cleanup command should handle gracefully"
 
+    def test_manage_compact_command(self, capsys):
+        """Compact purges soft-deleted chunks and reports the bytes reclaimed."""
+        from components.stores.numpy_store.numpy_store import NumpyStore
+
+        store = NumpyStore("compact", {"persist_directory": self.temp_dir})
+        store.add_documents([
+            Document(
+                id=f"doc{i}",
+                content=f"Chunk {i} " * 50,
+                metadata={"filename": "old.txt" if i < 3 else "new.txt"},
+                embeddings=[float(i), 1.0, 0.5],
+            )
+            for i in range(6)
+        ])
+        manager = DocumentManager(store, {})
+        deleted = manager.deletion_manager.delete_by_filename(["old.txt"], DeletionStrategy.SOFT_DELETE)
+        assert deleted["deleted_count"] == 3
+
+        args = self.create_mock_args(
+            manage_command='compact',
+            max_chunks=None,
+            min_deleted_ratio=0.0,
+            dry_run=False
+        )
+        # The cli package re-exports only the top-level commands
+        cli_module = rag_cli._cli_module
+        cli_module.handle_compact_command(args, manager, cli_module.LlamaProgressTracker())
+
+        output = capsys.readouterr().out
+        assert "Purged 3 soft-deleted chunks" in output
+        assert "Reclaimed" in output
+        info = store.get_collection_info()
+        assert info["count"] == 3 and info["deleted_count"] == 0
+
     def test_deletion_strategy_mapping(self):
         """Test that deletion strategy strings map correctly to enum values."""
         from core.document_manager import DeletionStrategy
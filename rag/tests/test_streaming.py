@@ -0,0 +1,147 @@
+"""Tests for the streaming embed -> store stage."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.base import Document
+from core.streaming import stream_embed_store
+
+
+class RecordingEmbedder:
+    """Embeds each text as ``[len(text)]`` and records every batch."""
+
+    def __init__(self, batch_size=3, fail_on_call=None):
+        self.batch_size = batch_size
+        self.fail_on_call = fail_on_call
+        self.calls = []
+
+    def embed_array(self, texts):
+        self.calls.append(list(texts))
+        if self.fail_on_call == len(self.calls):
+            raise RuntimeError("embedding failed")
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+
+class RecordingStore:
+    """Keeps copies of each ``add_documents`` batch; optionally blocks or fails."""
+
+    name = "recording_store"
+
+    def __init__(self, result=True, gate=None, error=None):
+        self.result = result
+        self.gate = gate
+        self.error = error
+        self.batches = []
+        self.first_write = threading.Event()
+
+    def add_documents(self, documents):
+        self.first_write.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        self.batches.append([(doc.content, doc.embeddings.tolist()) for doc in documents])
+        return self.result
+
+
+def make_docs(count):
+    return [Document(content="x" * (i + 1), metadata={}) for i in range(count)]
+
+
+def test_embeds_and_stores_in_write_batches():
+    docs = make_docs(10)
+    embedder, store = RecordingEmbedder(batch_size=3), RecordingStore()
+
+    stats = stream_embed_store(embedder, store, docs, write_batch_size=4)
+
+    assert [len(batch) for batch in embedder.calls] == [3, 3, 3, 1]
+    assert [len(batch) for batch in store.batches] == [4, 4, 2]
+    assert [item for batch in store.batches for item in batch] == [
+        ("x" * (i + 1), [float(i + 1)]) for i in range(10)
+    ]
+    assert (stats.embedded, stats.stored, stats.failed, stats.write_batches) == (10, 10, 0, 3)
+    assert stats.dimension == 1
+    assert all(doc.embeddings is not None for doc in docs)
+
+
+def test_store_writes_while_embedding_continues():
+    store = RecordingStore()
+
+    class WaitsForStore(RecordingEmbedder):
+        def embed_array(self, texts):
+            if self.calls:
+                # Only returns once the writer has stored the first batch
+                assert store.first_write.wait(5)
+            return super().embed_array(texts)
+
+    stats = stream_embed_store(WaitsForStore(batch_size=2), store, make_docs(6), write_batch_size=2)
+
+    assert stats.stored == 6
+
+
+def test_pending_batches_are_bounded():
+    gate = threading.Event()
+    embedder, store = RecordingEmbedder(batch_size=1), RecordingStore(gate=gate)
+    thread = threading.Thread(
+        target=stream_embed_store,
+        args=(embedder, store, make_docs(20)),
+        kwargs={"write_batch_size": 1, "max_pending_batches": 1},
+    )
+    thread.start()
+    assert store.first_write.wait(5)
+    time.sleep(0.2)
+
+    # One batch in the blocked write, one queued, one waiting to be queued
+    assert len(embedder.calls) == 3
+
+    gate.set()
+    thread.join(5)
+    assert len(store.batches) == 20
+
+
+def test_failed_writes_are_reported():
+    docs = make_docs(5)
+
+    stats = stream_embed_store(
+        RecordingEmbedder(batch_size=2), RecordingStore(result=False), docs,
+        write_batch_size=2, release_embeddings=True,
+    )
+
+    assert (stats.stored, stats.failed, stats.write_batches) == (0, 5, 3)
+    assert stats.errors[0] == {
+        "component": "recording_store", "error": "add_documents failed for 2 documents",
+    }
+    # Unstored vectors are kept
+    assert all(doc.embeddings is not None for doc in docs)
+
+
+def test_release_embeddings_after_store():
+    docs = make_docs(5)
+
+    stream_embed_store(RecordingEmbedder(), RecordingStore(), docs, write_batch_size=2, release_embeddings=True)
+
+    assert all(doc.embeddings is None for doc in docs)
+
+
+def test_store_error_stops_embedding():
+    embedder = RecordingEmbedder(batch_size=1)
+
+    with pytest.raises(ConnectionError, match="store down"):
+        stream_embed_store(
+            embedder, RecordingStore(error=ConnectionError("store down")), make_docs(50),
+            write_batch_size=1, max_pending_batches=1,
+        )
+
+    assert len(embedder.calls) < 50
+
+
+def test_embed_error_propagates_after_flushing_embedded_batches():
+    store = RecordingStore()
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        stream_embed_store(RecordingEmbedder(batch_size=2, fail_on_call=3), store, make_docs(10), write_batch_size=3)
+
+    assert [len(batch) for batch in store.batches] == [3, 1]
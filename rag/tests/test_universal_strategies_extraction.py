@@ -5,9 +5,10 @@ import numpy as np
 from typing import Dict, Any, List
 from unittest.mock import Mock, MagicMock
 
-from core.base import Document
+from core.base import Document, VectorStore
 from components.retrievers.base import RetrievalResult
 from components.retrievers.basic_similarity.basic_similarity import BasicSimilarityStrategy
+from components.retrievers.bm25.bm25 import BM25Strategy
 from components.retrievers.metadata_filtered.metadata_filtered import MetadataFilteredStrategy
 from components.retrievers.multi_query.multi_query import MultiQueryStrategy
 from components.retrievers.reranked.reranked import RerankedStrategy
@@ -337,6 +338,37 @@ class TestMultiQueryStrategy:
         assert result.scores[0] == 0.9
         assert result.strategy_metadata["aggregation_method"] == "max"
     
+    def test_variations_use_one_batched_search(self):
+        """All query variations are sent to the store in one search_batch call."""
+        class BatchStore(VectorStore):
+            def __init__(self):
+                super().__init__("BatchStore")
+                self.batch_calls = []
+
+            def add_documents(self, documents):
+                return True
+
+            def search(self, query=None, top_k=10, **kwargs):
+                raise AssertionError("search() should not be called")
+
+            def search_batch(self, query_embeddings, top_k=10, where=None):
+                self.batch_calls.append((len(query_embeddings), top_k))
+                return [
+                    [Document(content="doc1", id="doc1", metadata={"similarity_score": 0.5 + i / 10})]
+                    for i in range(len(query_embeddings))
+                ]
+
+            def delete_collection(self):
+                return True
+
+        store = BatchStore()
+        strategy = MultiQueryStrategy(config={"num_queries": 3, "search_multiplier": 2})
+        result = strategy.retrieve([0.1] * 8, store, top_k=2, query_variations=[[0.2] * 8, [0.3] * 8])
+
+        assert store.batch_calls == [(3, 4)]
+        assert result.scores == [0.7]
+        assert result.documents[0].metadata["query_frequency"] == 3
+    
     def test_mean_aggregation(self):
         """Test mean score aggregation."""
         strategy = MultiQueryStrategy(config={"aggregation_method": "mean"})
@@ -444,6 +476,33 @@ class TestRerankedStrategy:
         boost_invalid = strategy._calculate_recency_boost("invalid")
         assert boost_invalid == 0.0
     
+    def test_vectorized_scores_use_ingest_epochs(self):
+        """Scores come from stored epochs and compiled tables, matching the per-document helpers."""
+        import time
+        now = time.time()
+        strategy = RerankedStrategy(config={"initial_k": 5, "metadata_boosts": {"priority": {"Urgent": 0.4}}})
+        mock_store = Mock()
+        mock_store.search.return_value = [
+            Document(content="old", id="old", metadata={"similarity_score": 0.8, "timestamp_epoch": now - 400 * 86400}),
+            # Chunks stored before epochs existed still have their timestamp parsed
+            Document(content="legacy", id="legacy", metadata={
+                "similarity_score": 0.75, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - 3 * 86400))
+            }),
+            Document(content="new", id="new", metadata={
+                "similarity_score": 0.75, "timestamp_epoch": now, "priority": "URGENT", "view_count": 99
+            }),
+            Document(content="tie", id="tie", metadata={"similarity_score": 0.8, "timestamp_epoch": now - 400 * 86400}),
+        ]
+        
+        result = strategy.retrieve([0.1] * 4, mock_store, top_k=4)
+        
+        assert [d.id for d in result.documents] == ["new", "legacy", "old", "tie"]
+        new = result.documents[0].metadata
+        expected_boost = 0.1 * 1.0 + 0.05 * 3 / 1000 + 0.2 * (0.4 + 0.2)
+        assert new["rerank_boost"] == pytest.approx(expected_boost)
+        assert strategy._calculate_metadata_boost({"priority": "urgent", "view_count": 99}) == pytest.approx(0.6)
+        assert result.documents[1].metadata["rerank_boost"] == pytest.approx(0.1 * 0.8 + 0.05 * 6 / 1000)
+    
     def test_validation(self):
         """Test configuration validation."""
         # Valid config
@@ -455,6 +514,154 @@ class TestRerankedStrategy:
         assert strategy_bad.validate_config() == False
 
 
+class TestBM25Strategy:
+    """Test BM25Strategy individual file."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        from components.stores.numpy_store.numpy_store import NumpyStore
+        from utils.bm25_index import index_lexical
+        store = NumpyStore(config={"persist_directory": str(tmp_path), "lexical_index": {"enabled": True}})
+        texts = {
+            "pump": "Replace hydraulic pump part HX-4471 on the A320",
+            "panel": "Error code E42 shown on the hydraulic panel",
+            "cabin": "General cabin cleaning procedure",
+            "seat": "Seat track lubrication procedure",
+        }
+        docs = [
+            Document(content=text, id=doc_id, metadata={"kind": "cabin" if i > 1 else "hydraulics"},
+                     embeddings=[1.0, float(i), 0.0])
+            for i, (doc_id, text) in enumerate(texts.items())
+        ]
+        store.process(docs)
+        index_lexical(store, docs)
+        return store
+    
+    def test_retrieve_ranks_by_terms(self, store):
+        """Exact terms rank documents regardless of the query embedding."""
+        strategy = BM25Strategy()
+        result = strategy.retrieve([0.0, 0.0, 1.0], store, top_k=3, query_text="E42 hydraulic")
+        
+        assert [d.id for d in result.documents] == ["panel", "pump"]
+        assert result.scores[0] == 1.0 and 0 < result.scores[1] < 1
+        assert result.documents[0].metadata["bm25_score"] > result.documents[1].metadata["bm25_score"]
+        
+        filtered = strategy.retrieve([0.0] * 3, store, top_k=3, query_text="procedure",
+                                     metadata_filter={"kind": "cabin"})
+        assert sorted(d.id for d in filtered.documents) == ["cabin", "seat"]
+    
+    def test_soft_deleted_and_missing_requirements(self, store):
+        """Soft-deleted chunks are skipped; no index or no query text is an error."""
+        store.update_metadata({"kind": "hydraulics"}, {"is_active": False})
+        strategy = BM25Strategy()
+        assert strategy.retrieve([0.0] * 3, store, top_k=3, query_text="hydraulic").documents == []
+        
+        with pytest.raises(ValueError, match="query text"):
+            strategy.retrieve([0.0] * 3, store, top_k=3)
+        with pytest.raises(ValueError, match="lexical index"):
+            strategy.retrieve([0.0] * 3, Mock(spec=["search"]), top_k=3, query_text="pump")
+    
+    def test_hybrid_rank_fusion_with_dense(self, store):
+        """Sparse and dense results are fused, for single and batched queries."""
+        strategy = HybridUniversalStrategy(config={
+            "combination_method": "rank_fusion",
+            "strategies": [{"type": "basic", "weight": 1.0}, {"type": "bm25", "weight": 1.0}],
+        })
+        # Dense favours "seat", the query's terms only match "pump"
+        result = strategy.retrieve([0.0, 1.0, 0.0], store, top_k=2, query_text="HX-4471")
+        assert [d.id for d in result.documents][:1] == ["pump"]
+        assert result.strategy_metadata["strategy_performances"]["BM25Strategy"]["success"]
+        
+        batch = strategy.retrieve_batch([[0.0, 1.0, 0.0]] * 2, store, top_k=2, query_texts=["HX-4471", "E42"])
+        assert [r.documents[0].id for r in batch] == ["pump", "panel"]
+
+
+class TestCrossEncoderRerankStrategy:
+    """Test CrossEncoderRerankStrategy individual file."""
+    
+    @pytest.fixture
+    def strategy_factory(self, tiny_cross_encoder_dir):
+        module = pytest.importorskip("components.retrievers.cross_encoder_rerank.cross_encoder_rerank")
+        
+        def make(**config):
+            return module.CrossEncoderRerankStrategy(config={
+                "model_name": tiny_cross_encoder_dir, "candidates": 4, "batch_size": 2, **config
+            })
+        return make
+    
+    @staticmethod
+    def _store():
+        mock_store = Mock(spec=["search"])
+        mock_store.search.return_value = [
+            Document(content=text, id=f"d{i}", metadata={"similarity_score": score})
+            for i, (text, score) in enumerate([
+                ("the login password", 0.9), ("backup of the document", 0.8),
+                ("security test", 0.7), ("a text", 0.6), ("unused tail", 0.5),
+            ])
+        ]
+        return mock_store
+    
+    def test_reranks_top_candidates_by_model_score(self, strategy_factory):
+        """Top-N candidates are reordered by batched cross-encoder scores, matching one-pair calls."""
+        strategy = strategy_factory()
+        result = strategy.retrieve([0.1] * 4, self._store(), top_k=3, query_text="login password")
+        
+        documents = self._store().search.return_value[:4]
+        single = [strategy.score_pairs(["login password"], [doc.content])[0] for doc in documents]
+        expected = sorted(range(4), key=lambda i: -single[i])[:3]
+        assert [d.id for d in result.documents] == [f"d{i}" for i in expected]
+        assert result.scores == pytest.approx([single[i] for i in expected], abs=1e-5)
+        assert all(0 < score < 1 for score in result.scores)
+        assert result.documents[0].metadata["cross_encoder_score"] == result.scores[0]
+        assert result.strategy_metadata["reranked"] and result.strategy_metadata["candidates_considered"] == 4
+    
+    def test_scores_are_cached_and_batched_across_queries(self, strategy_factory):
+        """Repeated pairs come from the cache; a batch scores all new pairs in one pass."""
+        strategy = strategy_factory()
+        strategy.retrieve_batch([[0.1] * 4] * 2, self._store(), top_k=2, query_texts=["login", "Login "])
+        # Whitespace-normalized duplicates share cache entries; 5 docs, top 4 scored once
+        assert len(strategy.score_cache) == 8
+        
+        calls = []
+        original = strategy.score_pairs
+        strategy.score_pairs = lambda queries, passages: calls.append(len(queries)) or original(queries, passages)
+        strategy.retrieve_batch([[0.1] * 4] * 2, self._store(), top_k=2, query_texts=["login", "backup"])
+        assert calls == [4]
+        assert strategy.score_cache.hits >= 4
+    
+    def test_early_exit_keeps_dense_order(self, strategy_factory):
+        """A clear dense top-1 skips the model."""
+        strategy = strategy_factory(early_exit_score=0.85)
+        strategy.score_pairs = Mock(side_effect=AssertionError("model should not run"))
+        result = strategy.retrieve([0.1] * 4, self._store(), top_k=2, query_text="anything")
+        
+        assert [d.id for d in result.documents] == ["d0", "d1"]
+        assert result.strategy_metadata["early_exit"]
+        assert strategy_factory(early_exit_margin=0.2)._early_exit([0.9, 0.8]) is False
+        assert strategy_factory(early_exit_margin=0.05)._early_exit([0.9, 0.8]) is True
+        with pytest.raises(ValueError, match="query text"):
+            strategy.retrieve([0.1] * 4, self._store(), top_k=2)
+    
+    def test_factory_and_hybrid_composition(self, tiny_cross_encoder_dir):
+        """Registered in the factory and usable as a hybrid sub-strategy over the shared pool."""
+        pytest.importorskip("components.retrievers.cross_encoder_rerank.cross_encoder_rerank")
+        config = {"model_name": tiny_cross_encoder_dir, "candidates": 4}
+        strategy = create_retrieval_strategy_from_config({"type": "CrossEncoderRerankStrategy", "config": config})
+        assert strategy.name == "CrossEncoderRerankStrategy"
+        
+        hybrid = HybridUniversalStrategy(config={
+            "combination_method": "rank_fusion",
+            "strategies": [{"type": "basic", "weight": 0.5}, {"type": "cross_encoder", "weight": 0.5, "config": config}],
+        })
+        mock_store = self._store()
+        results = hybrid.retrieve_batch([[0.1] * 4] * 2, mock_store, top_k=2, query_texts=["login", "backup"])
+        
+        # One shared search per query serves both sub-strategies
+        assert mock_store.search.call_count == 2
+        for result in results:
+            assert result.strategy_metadata["strategy_performances"]["CrossEncoderRerankStrategy"]["success"]
+
+
 class TestHybridUniversalStrategy:
     """Test HybridUniversalStrategy individual file."""
     
@@ -527,6 +734,123 @@ class TestHybridUniversalStrategy:
         assert result.strategy_metadata["strategy"] == "HybridUniversalStrategy"
         assert result.strategy_metadata["num_strategies"] == 2
     
+    def test_retrieve_batch_matches_retrieve(self):
+        """Batched hybrid retrieval returns the same results as per-query retrieval."""
+        def search(query=None, query_embedding=None, top_k=10, **kwargs):
+            return [
+                Document(content=f"doc{i}", id=f"doc{i}",
+                         metadata={"similarity_score": 1.0 - abs(query_embedding[0] - i / 10)})
+                for i in range(top_k)
+            ]
+
+        mock_store = Mock()
+        mock_store.search.side_effect = search
+        strategy = HybridUniversalStrategy()
+        queries = [[0.1] * 4, [0.4] * 4]
+
+        batched = strategy.retrieve_batch(queries, mock_store, top_k=3)
+        single = [strategy.retrieve(q, mock_store, top_k=3) for q in queries]
+        assert [[d.id for d in r.documents] for r in batched] == [[d.id for d in r.documents] for r in single]
+        assert [r.scores for r in batched] == [r.scores for r in single]
+    
+    def test_shared_candidate_pool_searches_once(self):
+        """Pool-compatible sub-strategies share one search at the largest k they need."""
+        def search(query=None, query_embedding=None, top_k=10, **kwargs):
+            return [
+                Document(content=f"doc{i}", id=f"doc{i}",
+                         metadata={"similarity_score": 1.0 - i / 100, "type": "doc" if i % 2 else "faq"})
+                for i in range(top_k)
+            ]
+
+        config = {"strategies": [
+            {"type": "basic", "weight": 0.5},
+            {"type": "filtered", "weight": 0.3, "config": {"default_filters": {"type": "doc"}}},
+            {"type": "reranked", "weight": 0.2, "config": {"initial_k": 15}},
+        ]}
+        queries = [[0.1] * 4, [0.4] * 4]
+        pooled_store, serial_store = Mock(spec=["search"]), Mock(spec=["search"])
+        pooled_store.search.side_effect = search
+        serial_store.search.side_effect = search
+
+        pooled = HybridUniversalStrategy(config=config).retrieve_batch(queries, pooled_store, top_k=3)
+        serial = HybridUniversalStrategy(
+            config={**config, "shared_candidate_pool": False}
+        ).retrieve_batch(queries, serial_store, top_k=3)
+
+        # One search per query at max(6, 6 * 3, 15) instead of one per sub-strategy
+        assert [call.kwargs["top_k"] for call in pooled_store.search.call_args_list] == [18, 18]
+        assert serial_store.search.call_count == 6
+        assert pooled[0].strategy_metadata["candidate_pool_size"] == 18
+        assert [[d.id for d in r.documents] for r in pooled] == [[d.id for d in r.documents] for r in serial]
+        assert [r.scores for r in pooled] == [r.scores for r in serial]
+
+    def test_own_call_strategies_run_concurrently_with_deadline(self):
+        """Sub-strategies needing their own store calls run in threads and are dropped past the deadline."""
+        import threading
+        release = threading.Event()
+        mock_store = Mock(spec=["search", "search_with_filter"])
+        mock_store.search.return_value = [Document(content="a", id="a", metadata={"similarity_score": 0.9})]
+        strategy = HybridUniversalStrategy(config={
+            "sub_strategy_timeout": 0.05,
+            "strategies": [
+                {"type": "basic", "weight": 0.5},
+                # Native filtering needs its own store call
+                {"type": "filtered", "weight": 0.5, "config": {"default_filters": {"type": "doc"}}},
+            ],
+        })
+        mock_store.search_with_filter.side_effect = lambda **kwargs: release.wait(5) and []
+
+        try:
+            result = strategy.retrieve([0.1] * 4, mock_store, top_k=1)
+        finally:
+            release.set()
+
+        assert [d.id for d in result.documents] == ["a"]
+        performances = result.strategy_metadata["strategy_performances"]
+        assert performances["BasicSimilarityStrategy"]["success"]
+        assert "timed out" in performances["MetadataFilteredStrategy"]["error"]
+
+    def test_mmr_selects_diverse_results_from_stored_embeddings(self, tmp_path):
+        """MMR over the vectors the store returns drops near-duplicates that plain fusion keeps."""
+        from components.stores.numpy_store.numpy_store import NumpyStore
+        store = NumpyStore(config={"persist_directory": str(tmp_path)})
+        store.add_documents([
+            Document(content="pump removal", id="pump", embeddings=[1.0, 0.1, 0.0]),
+            Document(content="pump removal (copy)", id="pump_copy", embeddings=[1.0, 0.12, 0.0]),
+            Document(content="pump seals", id="seals", embeddings=[0.8, 0.0, 0.6]),
+            Document(content="cabin lights", id="cabin", embeddings=[0.0, 1.0, 0.0]),
+        ])
+        strategies = [{"type": "basic", "weight": 0.6}, {"type": "reranked", "weight": 0.4}]
+        query = [1.0, 0.05, 0.1]
+        
+        plain = HybridUniversalStrategy(config={"strategies": strategies}).retrieve(query, store, top_k=2)
+        assert [d.id for d in plain.documents] == ["pump", "pump_copy"]
+        
+        mmr = HybridUniversalStrategy(config={"strategies": strategies, "mmr_lambda": 0.5})
+        result = mmr.retrieve(query, store, top_k=2)
+        assert [d.id for d in result.documents] == ["pump", "seals"]
+        assert result.scores[0] == plain.scores[0]
+        assert result.strategy_metadata["mmr_lambda"] == 0.5
+        assert result.strategy_metadata["mmr_candidates"] == 4
+        
+        # diversity_boost is shorthand for the lambda; 1.0 keeps the fused order
+        assert HybridUniversalStrategy(config={"strategies": strategies, "diversity_boost": 0.3}).mmr_lambda == 0.7
+        same = HybridUniversalStrategy(config={"strategies": strategies, "mmr_lambda": 1.0})
+        assert [d.id for d in same.retrieve(query, store, top_k=2).documents] == ["pump", "pump_copy"]
+        assert not HybridUniversalStrategy(config={"strategies": strategies, "mmr_lambda": 1.5}).validate_config()
+    
+    def test_mmr_without_vectors_keeps_fused_order(self):
+        """Candidates with no known vector are never treated as redundant."""
+        mock_store = Mock(spec=["search"])
+        mock_store.search.return_value = [
+            Document(content=f"doc{i}", id=f"doc{i}", metadata={"similarity_score": 0.9 - i / 10}) for i in range(4)
+        ]
+        strategy = HybridUniversalStrategy(config={"strategies": [{"type": "basic", "weight": 1.0}], "mmr_lambda": 0.3})
+        result = strategy.retrieve([0.1] * 4, mock_store, top_k=2)
+        
+        assert mock_store.search.call_args.kwargs["include_embeddings"] is True
+        assert [d.id for d in result.documents] == ["doc0", "doc1"]
+    
     def test_rank_fusion_combination(self):
         """Test rank fusion combination method."""
         config = {
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from core.base import Document
+from components.stores.numpy_store.numpy_store import NumpyStore
+from core.enhanced_pipeline import EnhancedPipeline
+from utils.bm25_index import BM25Index, decode_varints, encode_varints, get_lexical_index
+
+
+DOCS = [
+    ("pump", "Replace hydraulic pump P/N 65-1234 on the A320"),
+    ("panel", "Error code E42 on the hydraulic panel"),
+    ("cabin", "General cabin cleaning procedure"),
+    ("leak", "hydraulic hydraulic hydraulic leak"),
+]
+
+
+def test_varints_round_trip():
+    values = [0, 1, 127, 128, 300, 2 ** 21, 2 ** 35 + 5, 2 ** 64 - 1]
+    encoded = encode_varints(values)
+    assert len(encode_varints([127])) == 1 and len(encode_varints([128])) == 2
+    assert decode_varints(encoded).tolist() == values
+    assert encode_varints([]) == b"" and decode_varints(b"").tolist() == []
+
+
+def test_search_matches_bm25_formula(tmp_path):
+    index = BM25Index(tmp_path / "docs.bm25")
+    assert index.add(DOCS) == 4
+
+    hits = index.search("hydraulic", 10)
+    assert [doc_id for doc_id, _ in hits] == ["leak", "panel", "pump"]
+
+    # Reference BM25 for the only document mentioning E42
+    lengths = [len(index._tokenize(text)) for _, text in DOCS]
+    avgdl = sum(lengths) / len(lengths)
+    idf = np.log(1 + (4 - 1 + 0.5) / (1 + 0.5))
+    expected = idf * 1 * 2.2 / (1 + 1.2 * (0.25 + 0.75 * lengths[1] / avgdl))
+    [(doc_id, score)] = index.search("e42 zzz", 10)
+    assert doc_id == "panel" and score == pytest.approx(expected, rel=1e-5)
+    assert index.search("65-1234", 1)[0][0] == "pump"
+    assert index.search("the of", 10) == []
+
+
+def test_persists_upserts_and_removals(tmp_path):
+    path = tmp_path / "docs.bm25"
+    index = BM25Index(path)
+    index.add(DOCS[:2])
+    index.add(DOCS[2:] + [("pump", "Replace fuel pump P/N 65-9999")])
+    index.remove(["leak", "missing"])
+
+    for reopened in (BM25Index(path), index):
+        assert len(reopened) == 3
+        assert reopened.search("hydraulic", 10) == index.search("hydraulic", 10)
+        assert [doc_id for doc_id, _ in reopened.search("hydraulic", 10)] == ["panel"]
+        assert reopened.search("9999", 10)[0][0] == "pump"
+        assert reopened.search("1234", 10) == []
+
+    # Compaction drops superseded and deleted documents from the statistics too
+    fresh = BM25Index(tmp_path / "fresh.bm25")
+    fresh.add([DOCS[1], DOCS[2], ("pump", "Replace fuel pump P/N 65-9999")])
+    size = path.stat().st_size
+    index.compact()
+    assert path.stat().st_size < size
+    assert index.get_stats()["segments"] == 1
+    assert BM25Index(path).search("pump fuel panel", 10) == fresh.search("pump fuel panel", 10)
+
+
+def test_torn_segment_is_dropped(tmp_path):
+    path = tmp_path / "docs.bm25"
+    BM25Index(path).add(DOCS[:2])
+    intact = path.stat().st_size
+    BM25Index(path).add(DOCS[2:])
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - 3)
+
+    index = BM25Index(path)
+    assert len(index) == 2
+    assert path.stat().st_size == intact
+    index.add(DOCS[2:])
+    assert len(BM25Index(path)) == 4
+
+
+def test_store_indexes_on_ingest(tmp_path):
+    store = NumpyStore(config={
+        "persist_directory": str(tmp_path),
+        "collection_name": "manuals",
+        "lexical_index": {"enabled": True},
+    })
+    docs = [
+        Document(content=text, id=doc_id, embeddings=[float(i), 1.0, 0.0])
+        for i, (doc_id, text) in enumerate(DOCS)
+    ]
+    assert EnhancedPipeline()._process_storage_with_progress(store, docs) == []
+
+    assert (tmp_path / "manuals.bm25").exists()
+    assert get_lexical_index(store).search("E42", 1)[0][0] == "panel"
+    assert get_lexical_index(NumpyStore(config={"persist_directory": str(tmp_path)})) is None
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from core.base import Document
+from core.enhanced_pipeline import EnhancedPipeline
+from components.stores.numpy_store.numpy_store import NumpyStore
+from utils import embedding_registry
+from utils.embedding_registry import (
+    EmbeddingProbeError,
+    EmbeddingRegistry,
+    configure_embedding_registry,
+    known_dimension,
+    probe_embedding_profile,
+    validate_embedder_for_store,
+)
+
+
+class FixedEmbedder:
+    def __init__(self, vector, model="model-a"):
+        self.model = model
+        self.vector = np.asarray(vector, dtype=np.float32)
+        self.calls = []
+
+    def embed_array(self, texts):
+        self.calls.append(list(texts))
+        return np.tile(self.vector, (len(texts), 1))
+
+    def embed(self, texts):
+        return self.embed_array(texts).tolist()
+
+
+def test_probe_once_and_persist(isolated_embedding_registry):
+    embedder = FixedEmbedder([0.6, 0.8, 0.0])
+
+    assert known_dimension(embedder) is None
+    profile = probe_embedding_profile(embedder)
+    assert (profile.dimension, profile.normalized) == (3, True)
+    assert profile.norm == pytest.approx(1.0)
+    assert probe_embedding_profile(embedder) == profile
+    assert len(embedder.calls) == 1
+    assert known_dimension(embedder) == 3
+
+    # Another process reading the same file sees the profile
+    reloaded = EmbeddingRegistry(isolated_embedding_registry.path)
+    assert reloaded.get("FixedEmbedder:model-a") == profile
+
+
+def test_failed_probe_is_not_recorded():
+    embedder = FixedEmbedder([0.0, 0.0])
+
+    with pytest.raises(EmbeddingProbeError):
+        probe_embedding_profile(embedder)
+    assert known_dimension(embedder) is None
+
+
+def test_mismatch_fails_before_embedding(tmp_path):
+    store = NumpyStore("store", {"persist_directory": str(tmp_path / "db")})
+    assert store.add_documents([Document(content="old", id="old", embeddings=[1.0, 0.0, 0.0])])
+    embedder = FixedEmbedder([1.0, 2.0, 3.0, 4.0])
+
+    with pytest.raises(ValueError, match="3-dimensional"):
+        validate_embedder_for_store(embedder, store)
+
+    pipeline = EnhancedPipeline()
+    pipeline.components = [embedder, store]
+    with pytest.raises(ValueError):
+        pipeline.run_with_progress(documents=[Document(content=f"doc {i}") for i in range(5)])
+    # Only probes reached the embedder (a mismatch re-probes once), no documents
+    assert embedder.calls and all(call == ["dimension probe"] for call in embedder.calls)
+
+
+def test_configured_path_is_relative_to_base_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_registry, "DEFAULT_REGISTRY_PATH", "./data/embedding_registry.json")
+
+    assert configure_embedding_registry(None, tmp_path).path == tmp_path / "data" / "embedding_registry.json"
+    registry = configure_embedding_registry({"path": "cache/profiles.json"}, tmp_path)
+    assert registry.path == tmp_path / "cache" / "profiles.json"
+    assert embedding_registry.get_embedding_registry() is registry
+    absolute = tmp_path / "elsewhere" / "profiles.json"
+    assert configure_embedding_registry({"path": str(absolute)}, tmp_path / "base").path == absolute
+
+
+def test_stale_profile_is_reprobed(tmp_path):
+    store = NumpyStore("store", {"persist_directory": str(tmp_path / "db")})
+    assert store.add_documents([Document(content="old", id="old", embeddings=[1.0, 0.0])])
+    probe_embedding_profile(FixedEmbedder([1.0, 1.0, 1.0]))
+
+    # Same model name, now serving 2-dimensional vectors
+    profile = validate_embedder_for_store(FixedEmbedder([3.0, 4.0]), store)
+
+    assert profile.dimension == 2
+    assert not store.inputs_normalized
+
+
+def test_normalized_models_skip_store_normalization(tmp_path):
+    store = NumpyStore("store", {"persist_directory": str(tmp_path / "db")})
+    validate_embedder_for_store(FixedEmbedder([0.6, 0.8]), store)
+
+    assert store.inputs_normalized
+    vectors = np.array([[0.6, 0.8]], dtype=np.float32)
+    assert np.array_equal(store._prepare(vectors), vectors)
+
+
+def test_output_settings_get_their_own_profile(tmp_path):
+    """Turning normalization off must not reuse the normalized profile of the same model."""
+    normalized = FixedEmbedder([0.6, 0.8])
+    normalized.normalize_embeddings = True
+    validate_embedder_for_store(normalized, NumpyStore("a", {"persist_directory": str(tmp_path / "a")}))
+
+    raw = FixedEmbedder([3.0, 4.0])
+    raw.normalize_embeddings = False
+    store = NumpyStore("b", {"persist_directory": str(tmp_path / "b")})
+    profile = validate_embedder_for_store(raw, store)
+
+    assert profile.model_key == "FixedEmbedder:model-a:normalize_embeddings=False"
+    assert not profile.normalized and not store.inputs_normalized
+    assert raw.calls == [["dimension probe"]]
@@ -0,0 +1,55 @@
+from utils.hash_utils import DeduplicationTracker, PersistentDeduplicationTracker
+
+
+def test_persistent_tracker_survives_reopen(tmp_path):
+    db_path = tmp_path / "dedup.sqlite3"
+    tracker = PersistentDeduplicationTracker(str(db_path))
+    tracker.register_document("dochash", "doc_1", "srchash")
+    tracker.register_chunks([("chunk_a", "doc_1_chunk_0", "dochash"),
+                             ("chunk_b", "doc_1_chunk_1", "dochash")])
+    tracker.close()
+
+    reopened = PersistentDeduplicationTracker(str(db_path))
+    assert reopened.is_duplicate_document("dochash")
+    assert reopened.is_duplicate_chunk("chunk_a")
+    assert reopened.is_duplicate_source("srchash")
+    assert reopened.get_original_chunk_id("chunk_b") == "doc_1_chunk_1"
+    assert reopened.get_document_by_source("srchash") == "dochash"
+    assert reopened.known_chunks(["chunk_a", "chunk_b", "chunk_c"]) == {"chunk_a", "chunk_b"}
+
+
+def test_persistent_tracker_is_lazy(tmp_path):
+    db_path = tmp_path / "nested" / "dedup.sqlite3"
+    tracker = PersistentDeduplicationTracker(str(db_path))
+    assert not db_path.exists()
+    assert not tracker.is_duplicate_document("missing")
+    assert db_path.exists()
+
+
+def test_unregister_documents_drops_chunks_and_sources(tmp_path):
+    tracker = PersistentDeduplicationTracker(str(tmp_path / "dedup.sqlite3"))
+    tracker.register_document("dochash", "doc_1", "srchash")
+    tracker.register_chunks([("chunk_a", "doc_1_chunk_0", "dochash")])
+
+    tracker.unregister_documents(["dochash"])
+    assert not tracker.is_duplicate_document("dochash")
+    assert not tracker.is_duplicate_source("srchash")
+    assert not tracker.is_duplicate_chunk("chunk_a")
+    assert tracker.is_empty()
+
+
+def test_bulk_lookup_beyond_sqlite_variable_limit(tmp_path):
+    tracker = PersistentDeduplicationTracker(str(tmp_path / "dedup.sqlite3"))
+    tracker.register_chunks([(f"h{i}", f"c{i}", None) for i in range(2500)])
+    assert len(tracker.known_chunks(f"h{i}" for i in range(0, 5000, 2))) == 1250
+
+
+def test_in_memory_tracker_shares_interface():
+    tracker = DeduplicationTracker()
+    tracker.register_document("dochash", "doc_1", "srchash")
+    tracker.register_chunks([("chunk_a", "doc_1_chunk_0", "dochash")])
+    assert tracker.known_documents(["dochash", "other"]) == {"dochash"}
+
+    tracker.unregister_documents(["dochash"])
+    tracker.unregister_chunks(["doc_1_chunk_0"])
+    assert tracker.is_empty()
@@ -0,0 +1,41 @@
+import numpy as np
+
+from utils.mmr import maximal_marginal_relevance
+
+
+# Two near-duplicates of one topic, then two other topics
+EMBEDDINGS = np.array([
+    [1.0, 0.0, 0.0],
+    [0.99, 0.05, 0.0],
+    [0.0, 1.0, 0.0],
+    [0.0, 0.0, 1.0],
+])
+RELEVANCE = [1.0, 0.95, 0.6, 0.5]
+
+
+def test_lambda_one_keeps_relevance_order():
+    assert maximal_marginal_relevance(RELEVANCE, EMBEDDINGS, 4, lambda_mult=1.0).tolist() == [0, 1, 2, 3]
+
+
+def test_near_duplicates_are_pushed_down():
+    selected = maximal_marginal_relevance(RELEVANCE, EMBEDDINGS, 3, lambda_mult=0.5)
+    assert selected.tolist() == [0, 2, 3]
+
+    # Reference MMR with an explicit loop
+    unit = EMBEDDINGS / np.linalg.norm(EMBEDDINGS, axis=1, keepdims=True)
+    chosen = [0]
+    while len(chosen) < 4:
+        rest = [i for i in range(4) if i not in chosen]
+        chosen.append(max(rest, key=lambda i: 0.7 * RELEVANCE[i] - 0.3 * max(unit[i] @ unit[j] for j in chosen)))
+    assert maximal_marginal_relevance(RELEVANCE, EMBEDDINGS, 4, lambda_mult=0.7).tolist() == chosen
+
+
+def test_unknown_vectors_and_edge_cases():
+    # The duplicate's vector is unknown (zeros), so it is never redundant
+    embeddings = EMBEDDINGS.copy()
+    embeddings[1] = 0.0
+    assert maximal_marginal_relevance(RELEVANCE, embeddings, 2, lambda_mult=0.5).tolist() == [0, 1]
+
+    assert maximal_marginal_relevance(RELEVANCE, EMBEDDINGS, 10).tolist() == [0, 2, 3, 1]
+    assert maximal_marginal_relevance([], np.empty((0, 3)), 5).tolist() == []
+    assert maximal_marginal_relevance(RELEVANCE, EMBEDDINGS, 0).tolist() == []
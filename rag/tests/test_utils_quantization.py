@@ -0,0 +1,57 @@
+import numpy as np
+
+from utils.quantization import ProductQuantizer, ScalarQuantizer, largest_divisor
+
+
+def _data(rows=500, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((rows, dim)).astype(np.float32), rng.standard_normal((4, dim)).astype(np.float32)
+
+
+def test_largest_divisor():
+    assert largest_divisor(384, 48) == 48
+    assert largest_divisor(100, 8) == 5
+    assert largest_divisor(7, 8) == 7
+    assert largest_divisor(7, 3) == 1
+
+
+def test_scalar_quantizer_round_trip_and_scores():
+    vectors, queries = _data()
+    quantizer = ScalarQuantizer().fit(vectors)
+    codes = quantizer.encode(vectors)
+    assert codes.dtype == np.int8
+
+    decoded = quantizer.decode(codes)
+    assert np.abs(decoded - vectors).max() <= quantizer.scale.max() / 2 + 1e-5
+    np.testing.assert_allclose(quantizer.inner_products(queries, codes, block_size=64),
+                               queries @ decoded.T, rtol=1e-4, atol=1e-3)
+    np.testing.assert_allclose(quantizer.sq_norms(codes), (decoded ** 2).sum(axis=1), rtol=1e-4)
+
+    restored = ScalarQuantizer.from_state(quantizer.state())
+    assert np.array_equal(restored.encode(vectors), codes)
+
+
+def test_product_quantizer_scores_match_decoded_rows():
+    vectors, queries = _data()
+    quantizer = ProductQuantizer(m=3, iterations=5).fit(vectors)
+    assert quantizer.m == 2  # largest divisor of 16 not above 3
+    codes = quantizer.encode(vectors, block_size=100)
+    assert codes.shape == (500, 2) and codes.dtype == np.uint8
+
+    decoded = quantizer.decode(codes)
+    np.testing.assert_allclose(quantizer.inner_products(queries, codes, block_size=128),
+                               queries @ decoded.T, rtol=1e-4, atol=1e-3)
+    np.testing.assert_allclose(quantizer.sq_norms(codes), (decoded ** 2).sum(axis=1), rtol=1e-4)
+    # Codebooks reduce reconstruction error well below the data variance
+    assert ((decoded - vectors) ** 2).mean() < 0.9 * (vectors ** 2).mean()
+
+    restored = ProductQuantizer.from_state(quantizer.state())
+    assert np.array_equal(restored.encode(vectors), codes)
+
+
+def test_product_quantizer_with_few_rows():
+    vectors, _ = _data(rows=20, dim=8)
+    quantizer = ProductQuantizer(m=4).fit(vectors)
+    assert quantizer.centroids.shape == (4, 20, 2)
+    # Every row is its own centroid when there are fewer rows than codes
+    np.testing.assert_allclose(quantizer.decode(quantizer.encode(vectors)), vectors, atol=1e-5)
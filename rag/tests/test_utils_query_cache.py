@@ -0,0 +1,150 @@
+from unittest.mock import Mock
+
+import pytest
+
+import utils.query_cache as query_cache
+from api import SearchAPI
+from utils.query_cache import QueryEmbeddingCache, embedder_cache_key, get_query_cache, normalize_query
+
+
+class CountingEmbedder:
+    def __init__(self, model="model-a"):
+        self.model = model
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_repeats_are_served_from_cache():
+    cache, embedder = QueryEmbeddingCache(), CountingEmbedder()
+
+    assert cache.embed(embedder, "reset password") == [14.0, 1.0]
+    assert cache.embed(embedder, "  reset\tpassword ") == [14.0, 1.0]
+    assert cache.embed_many(embedder, ["reset password", "billing", "billing"]) == [
+        [14.0, 1.0], [7.0, 1.0], [7.0, 1.0],
+    ]
+
+    # Only the distinct misses reach the embedder
+    assert embedder.calls == [["reset password"], ["billing"]]
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 2, 2)
+    assert stats["hit_rate"] == pytest.approx(0.6)
+
+
+def test_keys_include_the_model():
+    cache = QueryEmbeddingCache()
+    first, second = CountingEmbedder("model-a"), CountingEmbedder("model-b")
+
+    cache.embed(first, "query")
+    cache.embed(second, "query")
+
+    assert first.calls == second.calls == [["query"]]
+    assert embedder_cache_key(Mock(spec=[], model_key="CachedEmbedder:x")) == "CachedEmbedder:x"
+
+
+def test_least_recently_used_is_evicted():
+    cache, embedder = QueryEmbeddingCache(max_size=2), CountingEmbedder()
+
+    cache.embed_many(embedder, ["a", "b"])
+    cache.embed(embedder, "a")  # refresh: "b" is now least recently used
+    cache.embed(embedder, "c")
+    cache.embed_many(embedder, ["a", "c"])
+    cache.embed(embedder, "b")
+
+    assert embedder.calls == [["a", "b"], ["c"], ["b"]]
+    assert cache.get_stats()["evictions"] == 2
+
+
+def test_entries_expire(clock):
+    cache, embedder = QueryEmbeddingCache(ttl_seconds=60), CountingEmbedder()
+
+    cache.embed(embedder, "query")
+    clock[0] += 59
+    cache.embed(embedder, "query")
+    clock[0] += 1
+    cache.embed(embedder, "query")
+
+    assert len(embedder.calls) == 2
+    assert cache.get_stats()["expirations"] == 1
+
+
+def test_failed_embeddings_are_not_cached_and_results_are_copies():
+    cache = QueryEmbeddingCache()
+    failing = Mock(model="m", embed=Mock(return_value=[[0.0, 0.0]]))
+
+    cache.embed(failing, "down")
+    cache.embed(failing, "down")
+    assert failing.embed.call_count == 2
+
+    embedder = CountingEmbedder()
+    cache.embed(embedder, "query").append(99.0)
+    assert cache.embed(embedder, "query") == [5.0, 1.0]
+
+
+def test_persistent_tier_is_shared_between_caches(tmp_path, monkeypatch):
+    path = str(tmp_path / "queries.sqlite")
+    wall = [1000.0]
+    monkeypatch.setattr(query_cache.time, "time", lambda: wall[0])
+    first = QueryEmbeddingCache(ttl_seconds=60, path=path)
+    first.embed(CountingEmbedder(), "reset password")
+
+    # A new cache (as in another process) is served from the file, exactly
+    second, embedder = QueryEmbeddingCache(ttl_seconds=60, path=path), CountingEmbedder()
+    assert second.embed(embedder, "reset password") == [14.0, 1.0]
+    assert second.embed(embedder, "reset password") == [14.0, 1.0]
+    assert embedder.calls == []
+    stats = second.get_stats()
+    assert (stats["hits"], stats["persistent_hits"], stats["persistent_size"]) == (2, 1, 1)
+
+    # Expired rows are not served, and the file keeps at most max_size rows
+    wall[0] += 60
+    third = QueryEmbeddingCache(max_size=2, ttl_seconds=60, path=path)
+    third.embed_many(embedder, ["reset password", "a", "b", "c"])
+    assert embedder.calls == [["reset password", "a", "b", "c"]]
+    assert third.get_stats()["persistent_size"] == 2
+
+    third.clear()
+    assert QueryEmbeddingCache(path=path).get_stats()["persistent_size"] == 0
+
+
+def test_normalize_query():
+    assert normalize_query(" Reset  password\n") == "Reset password"
+
+
+def test_shared_cache_configuration(monkeypatch, tmp_path):
+    monkeypatch.setattr(query_cache, "_shared_cache", None)
+
+    cache = get_query_cache({"max_size": 8, "ttl_seconds": 30})
+    assert get_query_cache() is cache
+    assert get_query_cache({"max_size": 4}) is cache
+    assert (cache.max_size, cache.ttl_seconds) == (4, 30)
+    assert get_query_cache({"enabled": False}) is None
+    assert get_query_cache({"path": str(tmp_path / "q.sqlite")}).get_stats()["path"] == str(tmp_path / "q.sqlite")
+
+
+def test_search_api_uses_cache_and_reports_stats():
+    api = SearchAPI.__new__(SearchAPI)
+    api.embedder = api.query_embedder = CountingEmbedder()
+    api.query_cache = QueryEmbeddingCache()
+    api.vector_store = Mock(get_collection_info=Mock(return_value={"document_count": 3}))
+    api.retrieval_strategy = Mock(config={})
+    api.retrieval_strategy.name = "basic"
+    api.retrieval_strategy.retrieve.return_value = Mock(documents=[], scores=[])
+
+    api.search("faq question")
+    api.search("faq question")
+
+    assert api.embedder.calls == [["faq question"]]
+    info = api.get_collection_info()
+    assert info["document_count"] == 3
+    assert info["query_cache"]["hits"] == 1
+    assert info["query_cache"]["hit_rate"] == 0.5
@@ -0,0 +1,35 @@
+from datetime import date, datetime, timezone
+
+from core.base import Document
+from utils.timestamps import add_timestamp_epochs, timestamp_to_epoch
+
+
+def test_timestamp_to_epoch():
+    moment = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+    assert timestamp_to_epoch("2024-03-01T12:00:00Z") == moment.timestamp()
+    assert timestamp_to_epoch("2024-03-01T14:00:00+02:00") == moment.timestamp()
+    # Naive times are UTC
+    assert timestamp_to_epoch("2024-03-01 12:00:00") == moment.timestamp()
+    assert timestamp_to_epoch(moment.replace(tzinfo=None)) == moment.timestamp()
+    assert timestamp_to_epoch(date(2024, 3, 1)) == moment.timestamp() - 12 * 3600
+    assert timestamp_to_epoch(1709294400) == 1709294400.0
+    assert timestamp_to_epoch("not a date") is None
+    assert timestamp_to_epoch(None) is None and timestamp_to_epoch(True) is None
+
+
+def test_store_prepares_epochs_at_ingest(tmp_path):
+    from components.stores.numpy_store.numpy_store import NumpyStore
+
+    store = NumpyStore(config={"persist_directory": str(tmp_path)})
+    docs = [
+        Document(content="a", id="a", metadata={"timestamp": "2024-03-01T12:00:00Z"}, embeddings=[1.0, 0.0]),
+        Document(content="b", id="b", metadata={"timestamp": "garbage"}, embeddings=[0.0, 1.0]),
+        Document(content="c", id="c", metadata={}, embeddings=[1.0, 1.0]),
+    ]
+    store.process(docs)
+
+    assert store.get_document("a").metadata["timestamp_epoch"] == 1709294400.0
+    assert "timestamp_epoch" not in store.get_document("b").metadata
+    assert "timestamp_epoch" not in store.get_document("c").metadata
+
+    add_timestamp_epochs([Document(content="d")])  # no metadata is fine
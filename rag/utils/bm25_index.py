@@ -0,0 +1,538 @@
+"""Incremental BM25 inverted index over chunk text.
+
+Vector stores with ``"lexical_index": {"enabled": true}`` in their config
+keep one of these next to the collection (``<collection>.bm25``).
+``EnhancedPipeline`` and ``stream_embed_store`` pass every batch they store
+to ``index_lexical`` and ``BM25Strategy`` queries ``get_lexical_index``, so
+part numbers, error codes and names that embeddings blur still match
+exactly. Text is tokenized with ``keyword_extractor.tokenize``.
+
+On disk the index is an append-only file of segments, one per indexed
+batch. A segment holds its documents (id, token count), any deleted ids and
+per-term postings (delta-encoded document numbers and term frequencies),
+with every number LEB128 varint-encoded and a CRC32 to detect torn writes.
+A re-added id supersedes the earlier copy; ``compact`` rewrites the file
+without superseded and deleted documents.
+
+In memory, postings are a CSR layout (term offsets into flat document and
+frequency arrays) plus a small buffer of not yet merged postings, and a
+query scores its terms' postings with vectorized BM25.
+"""
+
+import logging
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from components.extractors.keyword_extractor.keyword_extractor import BASIC_STOP_WORDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BM25IDX1"
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """LEB128-encode non-negative integers: 7 bits per byte, high bit set on all but the last."""
+    values = np.asarray(values, dtype=np.uint64).ravel()
+    if not len(values):
+        return b""
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        lengths += values >= np.uint64(1 << shift)
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for i in range(int(lengths.max())):
+        rows = lengths > i
+        byte = (values[rows] >> np.uint64(7 * i)) & np.uint64(0x7F)
+        more = (lengths[rows] > i + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[rows] + i] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """Decode a concatenation of LEB128 varints into a uint64 array."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf < 0x80)
+    if not len(ends):
+        return np.empty(0, dtype=np.uint64)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts + 1
+    values = np.zeros(len(ends), dtype=np.uint64)
+    for i in range(int(lengths.max())):
+        rows = lengths > i
+        values[rows] |= (buf[starts[rows] + i] & 0x7F).astype(np.uint64) << np.uint64(7 * i)
+    return values
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """One varint from ``data`` at ``offset``; returns (value, next offset)."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class BM25Index:
+    """Okapi BM25 over (document id, text) pairs, persisted incrementally to ``path``."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        k1: float = 1.2,
+        b: float = 0.75,
+        min_token_length: int = 1,
+        stop_words: Optional[Iterable[str]] = None,
+    ):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self.min_token_length = max(int(min_token_length), 1)
+        self.stop_words = frozenset(BASIC_STOP_WORDS if stop_words is None else stop_words)
+        self._lock = threading.RLock()
+        self._reset()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._doc_ids: List[str] = []
+        self._docnums: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.int32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._live_count = 0
+        # Like Lucene, statistics count superseded and deleted documents until compact()
+        self._total_tokens = 0
+        self._norms: Optional[np.ndarray] = None
+        self._vocab: Dict[str, int] = {}
+        # Postings of terms [0, len(offsets) - 1), CSR
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._post_docs = np.empty(0, dtype=np.int32)
+        self._post_tfs = np.empty(0, dtype=np.int32)
+        # term number -> (docnums, tfs) not yet merged into the CSR arrays
+        self._pending: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._pending_count = 0
+        self._segments = 0
+
+    def _tokenize(self, text: str) -> List[str]:
+        return tokenize(text or "", self.stop_words, self.min_token_length)
+
+    def _append_doc(self, doc_id: str, length: int) -> int:
+        """Give ``doc_id`` a new document number, retiring its previous one."""
+        self._retire(doc_id)
+        docnum = len(self._doc_ids)
+        if docnum >= len(self._lengths):
+            grow = len(self._lengths)
+            self._lengths = np.concatenate((self._lengths, np.zeros(grow, dtype=np.int32)))
+            self._alive = np.concatenate((self._alive, np.zeros(grow, dtype=bool)))
+        self._doc_ids.append(doc_id)
+        self._docnums[doc_id] = docnum
+        self._lengths[docnum] = length
+        self._alive[docnum] = True
+        self._live_count += 1
+        self._total_tokens += length
+        self._norms = None
+        return docnum
+
+    def _retire(self, doc_id: str) -> None:
+        docnum = self._docnums.pop(doc_id, None)
+        if docnum is not None:
+            self._alive[docnum] = False
+            self._live_count -= 1
+
+    def _term_number(self, term: str) -> int:
+        termno = self._vocab.get(term)
+        if termno is None:
+            termno = self._vocab[term] = len(self._vocab)
+        return termno
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """Index (document id, text) pairs; re-added ids replace their earlier text.
+
+        Returns the number of documents indexed.
+        """
+        with self._lock:
+            ids: List[str] = []
+            lengths: List[int] = []
+            postings: Dict[str, Tuple[List[int], List[int]]] = {}
+            for doc_id, text in documents:
+                tokens = self._tokenize(text)
+                docnum = self._append_doc(doc_id, len(tokens))
+                local = len(ids)
+                ids.append(doc_id)
+                lengths.append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    docs, tfs = postings.setdefault(term, ([], []))
+                    docs.append(local)
+                    tfs.append(tf)
+                    pending_docs, pending_tfs = self._pending.setdefault(self._term_number(term), ([], []))
+                    pending_docs.append(docnum)
+                    pending_tfs.append(tf)
+                    self._pending_count += 1
+            if not ids:
+                return 0
+            self._append_segment(ids, lengths, [], postings)
+            if self._pending_count > max(1 << 16, len(self._post_docs) // 4):
+                self._merge_pending()
+            self._maybe_compact()
+            return len(ids)
+
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        """Drop documents from the index; returns how many were indexed."""
+        with self._lock:
+            removed = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id in self._docnums]
+            for doc_id in removed:
+                self._retire(doc_id)
+            if removed:
+                self._append_segment([], [], removed, {})
+                self._maybe_compact()
+            return len(removed)
+
+    def clear(self) -> None:
+        """Remove every document and the index file."""
+        with self._lock:
+            self._reset()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _encode_segment(
+        self,
+        ids: List[str],
+        lengths: List[int],
+        deleted: List[str],
+        postings: Dict[str, Tuple[List[int], List[int]]],
+    ) -> bytes:
+        id_bytes = [doc_id.encode("utf-8") for doc_id in ids]
+        deleted_bytes = [doc_id.encode("utf-8") for doc_id in deleted]
+        term_bytes = [term.encode("utf-8") for term in postings]
+        deltas: List[int] = []
+        tfs: List[int] = []
+        for docs, term_tfs in postings.values():
+            previous = 0
+            for docnum in docs:
+                deltas.append(docnum - previous)
+                previous = docnum
+            tfs.extend(term_tfs)
+        numbers = encode_varints(
+            [len(ids), len(deleted), len(postings)]
+            + [len(item) for item in id_bytes] + list(lengths)
+            + [len(item) for item in deleted_bytes]
+            + [len(item) for item in term_bytes] + [len(docs) for docs, _ in postings.values()]
+            + deltas + tfs
+        )
+        payload = encode_varints([len(numbers)]) + numbers + b"".join(id_bytes + deleted_bytes + term_bytes)
+        return encode_varints([len(payload)]) + payload + zlib.crc32(payload).to_bytes(4, "little")
+
+    def _append_segment(self, ids, lengths, deleted, postings) -> None:
+        frame = self._encode_segment(ids, lengths, deleted, postings)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            with open(self.path, "ab") as f:
+                if new_file:
+                    f.write(MAGIC)
+                f.write(frame)
+            self._segments += 1
+        except OSError as e:
+            logger.error(f"Could not write BM25 segment to {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Loading and compaction
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        """Rebuild the in-memory index from the segment file."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        if not data.startswith(MAGIC):
+            logger.warning(f"{self.path} is not a BM25 index; starting empty")
+            return
+
+        term_numbers: List[np.ndarray] = []
+        doc_parts: List[np.ndarray] = []
+        tf_parts: List[np.ndarray] = []
+        offset = len(MAGIC)
+        while offset < len(data):
+            try:
+                size, start = _read_varint(data, offset)
+            except IndexError:
+                size, start = len(data), offset
+            end = start + size
+            if end + 4 > len(data) or zlib.crc32(data[start:end]) != int.from_bytes(data[end:end + 4], "little"):
+                logger.warning(f"Ignoring a torn segment at byte {offset} of {self.path}")
+                self._truncate(offset)
+                break
+            self._load_segment(data[start:end], term_numbers, doc_parts, tf_parts)
+            self._segments += 1
+            offset = end + 4
+
+        if doc_parts:
+            self._build_csr(np.concatenate(term_numbers), np.concatenate(doc_parts), np.concatenate(tf_parts))
+
+    def _load_segment(self, payload: bytes, term_numbers, doc_parts, tf_parts) -> None:
+        numbers_size, start = _read_varint(payload, 0)
+        numbers = decode_varints(payload[start:start + numbers_size]).astype(np.int64)
+        strings = payload[start + numbers_size:]
+        n_docs, n_deleted, n_terms = (int(value) for value in numbers[:3])
+
+        position = 3
+        sections = {}
+        for name, count in (("id_lens", n_docs), ("lengths", n_docs), ("deleted_lens", n_deleted),
+                            ("term_lens", n_terms), ("dfs", n_terms)):
+            sections[name] = numbers[position:position + count]
+            position += count
+        total = int(sections["dfs"].sum())
+        deltas = numbers[position:position + total]
+        tfs = numbers[position + total:position + 2 * total]
+
+        def split(lengths: np.ndarray, cursor: int) -> Tuple[List[str], int]:
+            items = []
+            for length in lengths.tolist():
+                items.append(strings[cursor:cursor + length].decode("utf-8"))
+                cursor += length
+            return items, cursor
+
+        ids, cursor = split(sections["id_lens"], 0)
+        deleted, cursor = split(sections["deleted_lens"], cursor)
+        terms, _ = split(sections["term_lens"], cursor)
+
+        local_to_global = np.array(
+            [self._append_doc(doc_id, length) for doc_id, length in zip(ids, sections["lengths"].tolist())],
+            dtype=np.int64,
+        )
+        for doc_id in deleted:
+            self._retire(doc_id)
+        if not total:
+            return
+
+        # Deltas restart at every term: cumulative sum, minus the sum before each term's first entry
+        dfs = sections["dfs"]
+        cumulative = np.cumsum(deltas)
+        term_starts = np.cumsum(dfs) - dfs
+        before = np.where(term_starts > 0, cumulative[np.maximum(term_starts - 1, 0)], 0)
+        local_docs = cumulative - np.repeat(before, dfs)
+
+        term_numbers.append(np.repeat(np.array([self._term_number(term) for term in terms], dtype=np.int64), dfs))
+        doc_parts.append(local_to_global[local_docs])
+        tf_parts.append(tfs)
+
+    def _truncate(self, size: int) -> None:
+        try:
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+        except OSError as e:
+            logger.error(f"Could not truncate {self.path}: {e}")
+
+    def _build_csr(self, termnos: np.ndarray, docs: np.ndarray, tfs: np.ndarray) -> None:
+        """Replace the CSR arrays with these postings, grouped by term in document order."""
+        order = np.lexsort((docs, termnos))
+        counts = np.bincount(termnos, minlength=len(self._vocab)) if len(termnos) else np.zeros(len(self._vocab))
+        self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._post_docs = docs[order].astype(np.int32)
+        self._post_tfs = tfs[order].astype(np.int32)
+
+    def _merge_pending(self) -> None:
+        if not self._pending:
+            return
+        frozen_terms = np.repeat(np.arange(len(self._offsets) - 1, dtype=np.int64), np.diff(self._offsets))
+        pending_terms = np.repeat(
+            np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending)),
+            [len(docs) for docs, _ in self._pending.values()],
+        )
+        pending_docs = np.fromiter(
+            (docnum for docs, _ in self._pending.values() for docnum in docs), dtype=np.int64, count=len(pending_terms)
+        )
+        pending_tfs = np.fromiter(
+            (tf for _, tfs in self._pending.values() for tf in tfs), dtype=np.int64, count=len(pending_terms)
+        )
+        self._build_csr(
+            np.concatenate((frozen_terms, pending_terms)),
+            np.concatenate((self._post_docs.astype(np.int64), pending_docs)),
+            np.concatenate((self._post_tfs.astype(np.int64), pending_tfs)),
+        )
+        self._pending = {}
+        self._pending_count = 0
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._doc_ids) - self._live_count
+        if dead > 1024 and dead > self._live_count // 2:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file and memory without superseded or deleted documents."""
+        with self._lock:
+            self._merge_pending()
+            live = np.flatnonzero(self._alive[:len(self._doc_ids)])
+            renumber = np.full(len(self._doc_ids), -1, dtype=np.int64)
+            renumber[live] = np.arange(len(live))
+
+            postings: Dict[str, Tuple[List[int], List[int]]] = {}
+            terms = list(self._vocab)
+            for termno, term in enumerate(terms[:len(self._offsets) - 1]):
+                start, end = self._offsets[termno], self._offsets[termno + 1]
+                docs = renumber[self._post_docs[start:end]]
+                keep = docs >= 0
+                if keep.any():
+                    postings[term] = (docs[keep].tolist(), self._post_tfs[start:end][keep].tolist())
+
+            frame = self._encode_segment(
+                [self._doc_ids[docnum] for docnum in live.tolist()], self._lengths[live].tolist(), [], postings
+            )
+            partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                partial.write_bytes(MAGIC + frame)
+                os.replace(partial, self.path)
+            except OSError as e:
+                logger.error(f"Could not compact {self.path}: {e}")
+                return
+            self._reset()
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _postings(self, termno: int) -> Tuple[np.ndarray, np.ndarray]:
+        docs = tfs = None
+        if termno < len(self._offsets) - 1:
+            start, end = self._offsets[termno], self._offsets[termno + 1]
+            docs, tfs = self._post_docs[start:end], self._post_tfs[start:end]
+        pending = self._pending.get(termno)
+        if pending is not None:
+            pending_docs = np.asarray(pending[0], dtype=np.int32)
+            pending_tfs = np.asarray(pending[1], dtype=np.int32)
+            if docs is None:
+                return pending_docs, pending_tfs
+            return np.concatenate((docs, pending_docs)), np.concatenate((tfs, pending_tfs))
+        if docs is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        return docs, tfs
+
+    def _length_norms(self) -> np.ndarray:
+        """Per-document ``k1 * (1 - b + b * length / avgdl)``, cached until the next add."""
+        if self._norms is None:
+            count = len(self._doc_ids)
+            avgdl = max(self._total_tokens / max(count, 1), 1e-9)
+            lengths = self._lengths[:count].astype(np.float32)
+            self._norms = self.k1 * (1.0 - self.b + self.b * lengths / np.float32(avgdl))
+        return self._norms
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """The ``top_k`` (document id, BM25 score) pairs for ``query``, best first."""
+        terms = Counter(self._tokenize(query))
+        with self._lock:
+            if not terms or not self._live_count or top_k < 1:
+                return []
+            count = len(self._doc_ids)
+            norms = self._length_norms()
+            postings = []
+            for term, query_tf in terms.items():
+                termno = self._vocab.get(term)
+                if termno is not None:
+                    docs, tfs = self._postings(termno)
+                    if len(docs):
+                        postings.append((query_tf, docs, tfs))
+            if not postings:
+                return []
+
+            def weights(query_tf, docs, tfs):
+                idf = math.log(1.0 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                tfs = tfs.astype(np.float32)
+                return np.float32(query_tf * idf * (self.k1 + 1.0)) * tfs / (tfs + norms[docs])
+
+            if sum(len(docs) for _, docs, _ in postings) * 8 >= count:
+                # Common terms: accumulate into one slot per document (a term lists a document once)
+                scores = np.zeros(count, dtype=np.float32)
+                for query_tf, docs, tfs in postings:
+                    scores[docs] += weights(query_tf, docs, tfs)
+                scores[~self._alive[:count]] = 0.0
+                candidates = None
+            else:
+                # Rare terms: only the few documents they mention
+                candidates, inverse = np.unique(np.concatenate([docs for _, docs, _ in postings]), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate([weights(*item) for item in postings]))
+                scores[~self._alive[candidates]] = 0.0
+
+            if len(scores) > top_k:
+                best = np.argpartition(-scores, top_k - 1)[:top_k]
+            else:
+                best = np.arange(len(scores))
+            best = best[scores[best] > 0]
+            docnums = best if candidates is None else candidates[best]
+            order = np.lexsort((docnums, -scores[best]))
+            return [(self._doc_ids[docnums[i]], float(scores[best[i]])) for i in order.tolist()]
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Document, term, postings and segment counts and the file size."""
+        with self._lock:
+            return {
+                "documents": self._live_count,
+                "superseded_or_deleted": len(self._doc_ids) - self._live_count,
+                "terms": len(self._vocab),
+                "postings": len(self._post_docs) + self._pending_count,
+                "segments": self._segments,
+                "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            }
+
+
+_store_indexes: Dict[str, BM25Index] = {}
+_store_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(store: Any) -> Optional[BM25Index]:
+    """``store``'s BM25 index, or None unless its config sets ``lexical_index.enabled``.
+
+    Configured under ``lexical_index`` (``enabled``, ``path``, ``k1``,
+    ``b``); the file defaults to ``<persist_directory>/<collection>.bm25``.
+    Stores using the same file share one index per process.
+    """
+    config = getattr(store, "config", None) or {}
+    settings = config.get("lexical_index") or {}
+    if not settings.get("enabled"):
+        return None
+    collection = getattr(store, "collection_name", None) or config.get("collection_name", "documents")
+    directory = getattr(store, "persist_directory", None) or "./data"
+    path = os.path.abspath(settings.get("path") or os.path.join(directory, f"{collection}.bm25"))
+    with _store_indexes_lock:
+        index = _store_indexes.get(path)
+        if index is None:
+            index = _store_indexes[path] = BM25Index(path, k1=settings.get("k1", 1.2), b=settings.get("b", 0.75))
+        return index
+
+
+def index_lexical(store: Any, documents: List[Any]) -> None:
+    """Add documents ``store`` has just written to its BM25 index, if enabled.
+
+    Documents without an id are skipped. A failure is logged, not raised:
+    the vectors are already stored.
+    """
+    index = get_lexical_index(store)
+    if index is None:
+        return
+    try:
+        index.add((doc.id, doc.content) for doc in documents if doc.id)
+    except Exception as e:
+        logger.error(f"Failed to update lexical index {index.path}: {e}")
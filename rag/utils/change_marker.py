@@ -0,0 +1,35 @@
+"""A small token file rewritten on every change, so other processes notice it cheaply.
+
+Stores cache facts that are expensive to re-derive per query (such as
+"nothing is soft-deleted"). Writers bump the marker; readers compare its
+token with the one their cache was built under, which costs one small
+file read instead of a database query.
+"""
+
+import os
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+class ChangeMarker:
+    """Token file next to a collection; ``bump`` on change, ``read`` to compare."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def read(self) -> Optional[str]:
+        """Current token, or None if nothing was ever bumped."""
+        try:
+            return self.path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def bump(self) -> str:
+        """Write a new token atomically and return it."""
+        token = uuid.uuid4().hex
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(token, encoding="utf-8")
+        os.replace(tmp, self.path)
+        return token
@@ -0,0 +1,201 @@
+"""Probed embedding dimension and norm per (provider, model), kept on disk.
+
+The first time a model is used, ``probe_embedding_profile`` embeds one short
+string and records the vector's dimension and norm in a small JSON file
+(``./data/embedding_registry.json`` by default, or the ``path`` of the
+config's ``embedding_registry`` section), keyed like the query cache
+(``<EmbedderClass>:<model>`` plus any normalize/pooling/quantize settings,
+which change the vectors). Later runs read it back without calling the
+model, so:
+
+- ``EnhancedPipeline`` and ``SearchAPI`` check the store's dimension against the
+  embedder before any expensive embedding work (``validate_embedder_for_store``);
+- embedders size their zero-vector fallbacks correctly (``known_dimension``);
+- stores can skip re-normalizing vectors from models that already return
+  unit-length ones (``EmbeddingProfile.normalized``).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from utils.query_cache import embedder_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = "./data/embedding_registry.json"
+PROBE_TEXT = "dimension probe"
+# Probe norms within this of 1.0 count as already normalized
+NORM_TOLERANCE = 1e-3
+
+
+class EmbeddingProbeError(ValueError):
+    """The embedder could not be probed (unreachable, or it returned nothing usable)."""
+
+
+@dataclass
+class EmbeddingProfile:
+    """What one probe of a model measured."""
+
+    model_key: str
+    dimension: int
+    norm: float
+    normalized: bool
+    probed_at: float
+
+
+class EmbeddingRegistry:
+    """JSON file of EmbeddingProfiles, shared by every process using the same path."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_REGISTRY_PATH):
+        self.path = Path(path)
+        self._profiles: Optional[Dict[str, EmbeddingProfile]] = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, EmbeddingProfile]:
+        try:
+            raw = json.loads(self.path.read_text())
+            return {key: EmbeddingProfile(**value) for key, value in raw.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable embedding registry {self.path}: {e}")
+            return {}
+
+    def get(self, model_key: str) -> Optional[EmbeddingProfile]:
+        with self._lock:
+            if self._profiles is None:
+                self._profiles = self._read()
+            return self._profiles.get(model_key)
+
+    def record(self, profile: EmbeddingProfile) -> None:
+        """Store ``profile``, keeping entries other processes wrote meanwhile."""
+        with self._lock:
+            profiles = self._read()
+            profiles[profile.model_key] = profile
+            self._write(profiles)
+
+    def forget(self, model_key: str) -> None:
+        """Drop a profile so the next use probes the model again."""
+        with self._lock:
+            profiles = self._read()
+            if profiles.pop(model_key, None) is not None:
+                self._write(profiles)
+            self._profiles = profiles
+
+    def _write(self, profiles: Dict[str, EmbeddingProfile]) -> None:
+        """Replace the file atomically (lock held); a failed write only costs a re-probe later."""
+        self._profiles = profiles
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+            partial.write_text(json.dumps({key: asdict(value) for key, value in profiles.items()}, indent=2))
+            os.replace(partial, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write embedding registry {self.path}: {e}")
+
+
+_default_registry: Optional[EmbeddingRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_embedding_registry() -> EmbeddingRegistry:
+    """The process-wide registry (``DEFAULT_REGISTRY_PATH`` unless replaced)."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = EmbeddingRegistry()
+        return _default_registry
+
+
+def set_embedding_registry(path: Union[str, Path]) -> EmbeddingRegistry:
+    """Point the process-wide registry at ``path``."""
+    global _default_registry
+    with _default_lock:
+        _default_registry = EmbeddingRegistry(path)
+        return _default_registry
+
+
+def configure_embedding_registry(
+    config: Optional[Dict[str, Any]] = None, base_dir: Optional[Union[str, Path]] = None
+) -> EmbeddingRegistry:
+    """Point the process-wide registry at an ``embedding_registry`` config section.
+
+    A relative ``path`` (``DEFAULT_REGISTRY_PATH`` if unset) is resolved
+    against ``base_dir`` like the other paths in the config, not the working
+    directory.
+    """
+    path = Path((config or {}).get("path") or DEFAULT_REGISTRY_PATH)
+    if not path.is_absolute() and base_dir:
+        path = Path(base_dir) / path
+    return set_embedding_registry(path)
+
+
+def known_dimension(embedder: Any) -> Optional[int]:
+    """Dimension recorded for ``embedder``'s model, without probing it."""
+    profile = get_embedding_registry().get(embedder_cache_key(embedder))
+    return profile.dimension if profile else None
+
+
+def probe_embedding_profile(embedder: Any, refresh: bool = False) -> EmbeddingProfile:
+    """Recorded profile of ``embedder``'s model, probing it if unknown (or ``refresh``).
+
+    Raises EmbeddingProbeError if the embedder fails, or comes back empty or
+    all zeros, which is how the HTTP embedders report failures.
+    """
+    registry = get_embedding_registry()
+    model_key = embedder_cache_key(embedder)
+    profile = None if refresh else registry.get(model_key)
+    if profile is not None:
+        return profile
+
+    try:
+        vectors = np.asarray(embedder.embed_array([PROBE_TEXT]), dtype=np.float32)
+    except Exception as e:
+        raise EmbeddingProbeError(f"Embedding probe of {model_key} failed: {e}") from e
+    if vectors.ndim != 2 or not vectors.shape[0] or not vectors.shape[1] or not np.any(vectors[0]):
+        raise EmbeddingProbeError(f"Embedding probe of {model_key} returned no usable vector (shape {vectors.shape})")
+
+    norm = float(np.linalg.norm(vectors[0]))
+    profile = EmbeddingProfile(
+        model_key=model_key,
+        dimension=int(vectors.shape[1]),
+        norm=norm,
+        normalized=abs(norm - 1.0) <= NORM_TOLERANCE,
+        probed_at=time.time(),
+    )
+    registry.record(profile)
+    logger.info(f"Probed {model_key}: dimension {profile.dimension}, norm {norm:.4f}")
+    return profile
+
+
+def validate_embedder_for_store(embedder: Any, store: Any) -> EmbeddingProfile:
+    """Fail fast if ``store`` can't hold ``embedder``'s vectors.
+
+    A mismatch against a recorded profile re-probes once in case the model
+    behind the name changed. Raises ValueError on a real mismatch and
+    EmbeddingProbeError if the embedder can't be probed.
+    """
+    profile = probe_embedding_profile(embedder)
+    prepare = getattr(store, "prepare_for_embedder", None)
+    if prepare is None:
+        return profile
+    try:
+        prepare(profile.dimension, profile.normalized)
+    except ValueError as mismatch:
+        try:
+            fresh = probe_embedding_profile(embedder, refresh=True)
+        except EmbeddingProbeError:
+            raise mismatch
+        if fresh.dimension == profile.dimension:
+            raise mismatch
+        profile = fresh
+        prepare(profile.dimension, profile.normalized)
+    return profile
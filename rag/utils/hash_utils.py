@@ -6,8 +6,10 @@ Provides consistent hashing for content, documents, and source tracking.
 
 import hashlib
 import json
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 
 
@@ -235,6 +237,208 @@ class DeduplicationTracker:
         """Get document hash by source hash."""
         return self.source_hashes.get(source_hash)
 
+    def known_documents(self, document_hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of document hashes already registered."""
+        return {h for h in document_hashes if h in self.document_hashes}
+
+    def known_chunks(self, chunk_hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of chunk hashes already registered."""
+        return {h for h in chunk_hashes if h in self.chunk_hashes}
+
+    def register_chunks(self, chunks: Iterable[Tuple[str, str, Optional[str]]]):
+        """Register many ``(chunk_hash, chunk_id, document_hash)`` entries."""
+        for chunk_hash, chunk_id, _ in chunks:
+            self.register_chunk(chunk_hash, chunk_id)
+
+    def unregister_documents(self, document_hashes: Iterable[str]):
+        """Forget documents (and their sources) so they can be ingested again."""
+        for document_hash in set(document_hashes):
+            self.document_hashes.pop(document_hash, None)
+            for source_hash, doc_hash in list(self.source_hashes.items()):
+                if doc_hash == document_hash:
+                    del self.source_hashes[source_hash]
+
+    def unregister_chunks(self, chunk_ids: Iterable[str]):
+        """Forget chunks by chunk ID."""
+        chunk_ids = set(chunk_ids)
+        for chunk_hash, chunk_id in list(self.chunk_hashes.items()):
+            if chunk_id in chunk_ids:
+                del self.chunk_hashes[chunk_hash]
+
+    def clear(self):
+        """Forget everything."""
+        self.document_hashes.clear()
+        self.chunk_hashes.clear()
+        self.source_hashes.clear()
+
+    def is_empty(self) -> bool:
+        """Check if nothing has been registered."""
+        return not (self.document_hashes or self.chunk_hashes or self.source_hashes)
+
+
+class PersistentDeduplicationTracker(DeduplicationTracker):
+    """
+    DeduplicationTracker backed by a SQLite file so hashes survive across processes.
+
+    The database is opened lazily on first use. Membership checks are primary-key
+    lookups, so they stay fast for millions of hashes without touching the vector DB.
+    """
+
+    # SQLite's default limit on host parameters per statement
+    _MAX_VARIABLES = 900
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """SQLite connection, created (with tables) on first access."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.executescript("""
+                        CREATE TABLE IF NOT EXISTS documents (
+                            document_hash TEXT PRIMARY KEY,
+                            document_id TEXT,
+                            source_hash TEXT
+                        ) WITHOUT ROWID;
+                        CREATE TABLE IF NOT EXISTS chunks (
+                            chunk_hash TEXT PRIMARY KEY,
+                            chunk_id TEXT,
+                            document_hash TEXT
+                        ) WITHOUT ROWID;
+                        CREATE TABLE IF NOT EXISTS sources (
+                            source_hash TEXT PRIMARY KEY,
+                            document_hash TEXT
+                        ) WITHOUT ROWID;
+                        CREATE INDEX IF NOT EXISTS idx_chunks_id ON chunks(chunk_id);
+                        CREATE INDEX IF NOT EXISTS idx_chunks_doc ON chunks(document_hash);
+                        CREATE INDEX IF NOT EXISTS idx_sources_doc ON sources(document_hash);
+                    """)
+                    conn.commit()
+                    self._conn = conn
+        return self._conn
+
+    def _lookup(self, table: str, key: str, column: str, value: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {column} FROM {table} WHERE {key} = ?", (value,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _known(self, table: str, key: str, values: Iterable[str]) -> Set[str]:
+        values = [v for v in set(values) if v]
+        found = set()
+        with self._lock:
+            for start in range(0, len(values), self._MAX_VARIABLES):
+                chunk = values[start:start + self._MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT {key} FROM {table} WHERE {key} IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def is_duplicate_document(self, document_hash: str) -> bool:
+        """Check if document hash already exists."""
+        return self._lookup("documents", "document_hash", "1", document_hash) is not None
+
+    def is_duplicate_chunk(self, chunk_hash: str) -> bool:
+        """Check if chunk hash already exists."""
+        return self._lookup("chunks", "chunk_hash", "1", chunk_hash) is not None
+
+    def is_duplicate_source(self, source_hash: str) -> bool:
+        """Check if source has already been processed."""
+        return self._lookup("sources", "source_hash", "1", source_hash) is not None
+
+    def register_document(self, document_hash: str, document_id: str, source_hash: str):
+        """Register a new document in the tracker."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?)",
+                (document_hash, document_id, source_hash),
+            )
+            if source_hash:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?)", (source_hash, document_hash)
+                )
+            self.conn.commit()
+
+    def register_chunk(self, chunk_hash: str, chunk_id: str):
+        """Register a new chunk in the tracker."""
+        self.register_chunks([(chunk_hash, chunk_id, None)])
+
+    def register_chunks(self, chunks: Iterable[Tuple[str, str, Optional[str]]]):
+        """Register many ``(chunk_hash, chunk_id, document_hash)`` entries in one transaction."""
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?)", list(chunks))
+            self.conn.commit()
+
+    def get_original_document_id(self, document_hash: str) -> Optional[str]:
+        """Get the original document ID for a hash."""
+        return self._lookup("documents", "document_hash", "document_id", document_hash)
+
+    def get_original_chunk_id(self, chunk_hash: str) -> Optional[str]:
+        """Get the original chunk ID for a hash."""
+        return self._lookup("chunks", "chunk_hash", "chunk_id", chunk_hash)
+
+    def get_document_by_source(self, source_hash: str) -> Optional[str]:
+        """Get document hash by source hash."""
+        return self._lookup("sources", "source_hash", "document_hash", source_hash)
+
+    def known_documents(self, document_hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of document hashes already registered."""
+        return self._known("documents", "document_hash", document_hashes)
+
+    def known_chunks(self, chunk_hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of chunk hashes already registered."""
+        return self._known("chunks", "chunk_hash", chunk_hashes)
+
+    def unregister_documents(self, document_hashes: Iterable[str]):
+        """Forget documents, their sources and their chunks."""
+        params = [(h,) for h in set(document_hashes) if h]
+        with self._lock:
+            self.conn.executemany("DELETE FROM documents WHERE document_hash = ?", params)
+            self.conn.executemany("DELETE FROM sources WHERE document_hash = ?", params)
+            self.conn.executemany("DELETE FROM chunks WHERE document_hash = ?", params)
+            self.conn.commit()
+
+    def unregister_chunks(self, chunk_ids: Iterable[str]):
+        """Forget chunks by chunk ID."""
+        with self._lock:
+            self.conn.executemany(
+                "DELETE FROM chunks WHERE chunk_id = ?", [(i,) for i in set(chunk_ids)]
+            )
+            self.conn.commit()
+
+    def clear(self):
+        """Forget everything."""
+        with self._lock:
+            self.conn.executescript("DELETE FROM documents; DELETE FROM chunks; DELETE FROM sources;")
+            self.conn.commit()
+
+    def is_empty(self) -> bool:
+        """Check if nothing has been registered."""
+        with self._lock:
+            for table in ("documents", "chunks", "sources"):
+                if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                    return False
+        return True
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
 
 def extract_document_hash_from_chunk_id(chunk_id: str) -> Optional[str]:
     """
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Retry helpers shared by the components that call HTTP embedding APIs.
+"""
+
+from urllib3.exceptions import NewConnectionError
+
+# Responses worth retrying: the server is busy, rate limiting or restarting
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def connection_refused(error: Exception) -> bool:
+    """True if the request never reached a server (no point retrying)."""
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for embedders that run a transformer model in-process.
+Models are loaded once per process and shared between embedder instances;
+inputs are encoded in length-sorted batches so each batch pads to a similar
+length, then scattered back into input order as one float32 matrix.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List
+
+import numpy as np
+
+_MODELS: Dict[Hashable, Any] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def load_model_once(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the model cached under ``key``, calling ``loader`` on first use."""
+    model = _MODELS.get(key)
+    if model is None:
+        with _MODELS_LOCK:
+            model = _MODELS.get(key)
+            if model is None:
+                model = loader()
+                _MODELS[key] = model
+    return model
+
+
+def resolve_device(device: str) -> str:
+    """Map ``auto`` to the best available torch device."""
+    if device and device != "auto":
+        return device
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def length_sorted_batches(texts: List[str], batch_size: int) -> Iterator[np.ndarray]:
+    """Yield index arrays of ``batch_size`` texts, longest first."""
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    order = np.argsort(-lengths, kind="stable")
+    for start in range(0, len(order), batch_size):
+        yield order[start:start + batch_size]
+
+
+def scatter_batches(
+    texts: List[str],
+    batch_size: int,
+    dimension: int,
+    encode_batch: Callable[[List[str]], np.ndarray],
+    show_progress: bool = False,
+) -> np.ndarray:
+    """Run ``encode_batch`` over length-sorted batches of ``texts``.
+
+    ``encode_batch`` maps a list of texts to a (len, dimension) array.
+    Returns a float32 array of shape (len(texts), dimension) in input order.
+    """
+    output = np.empty((len(texts), dimension), dtype=np.float32)
+    batches = length_sorted_batches(texts, batch_size)
+    if show_progress:
+        from tqdm import tqdm
+
+        batches = tqdm(batches, total=-(-len(texts) // batch_size), desc="Embedding")
+
+    for indices in batches:
+        output[indices] = encode_batch([texts[i] for i in indices])
+    return output
+
+
+def encode_batched(
+    texts: List[str],
+    batch_size: int,
+    dimension: int,
+    encode_batch: Callable[[List[str]], Any],
+    show_progress: bool = False,
+) -> np.ndarray:
+    """``scatter_batches`` for torch models, run under ``torch.inference_mode``.
+
+    ``encode_batch`` maps a list of texts to a (len, dimension) torch tensor.
+    """
+    import torch
+
+    def to_numpy(batch: List[str]) -> np.ndarray:
+        return encode_batch(batch).to(dtype=torch.float32, device="cpu").numpy()
+
+    with torch.inference_mode():
+        return scatter_batches(texts, batch_size, dimension, to_numpy, show_progress=show_progress)
@@ -0,0 +1,51 @@
+"""Maximal Marginal Relevance: pick results that are relevant but not redundant.
+
+Each step selects the candidate maximizing
+
+    lambda_mult * relevance - (1 - lambda_mult) * max cosine to those already selected
+
+so ``lambda_mult=1`` keeps the relevance order and lower values trade
+relevance for diversity. Pairwise cosines come from one matrix product over
+the candidates' embeddings.
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+
+
+def maximal_marginal_relevance(
+    relevance: Sequence[float],
+    embeddings: Any,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> np.ndarray:
+    """Indices of ``k`` candidates in MMR selection order.
+
+    ``embeddings`` has one row per candidate. All-zero rows (unknown vectors)
+    count as similar to nothing, so those candidates rank on relevance alone.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    k = min(int(k), len(relevance))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    vectors = np.asarray(embeddings, dtype=np.float32).reshape(len(relevance), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.where(norms == 0, 1.0, norms)
+    similarity = unit @ unit.T
+
+    weighted = lambda_mult * relevance
+    first = int(np.argmax(weighted))
+    selected = [first]
+    # Highest cosine of each candidate to anything selected so far
+    redundancy = similarity[first].astype(np.float64)
+    available = np.ones(len(relevance), dtype=bool)
+    available[first] = False
+    for _ in range(k - 1):
+        scores = np.where(available, weighted - (1.0 - lambda_mult) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return np.asarray(selected, dtype=np.int64)
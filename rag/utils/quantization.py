@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Embedding quantization for in-process vector storage.
+Scalar (int8) and product quantization implemented with NumPy, so compact
+codes can be scanned for candidates and then re-scored against full-precision
+vectors.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Modes understood by stores that take a ``quantization`` option
+QUANTIZATION_MODES = ("none", "float16", "int8", "pq")
+
+# Rows decoded to float32 at a time while scanning codes
+DEFAULT_BLOCK_SIZE = 65536
+
+
+def largest_divisor(dimension: int, limit: int) -> int:
+    """Largest divisor of ``dimension`` that is at most ``limit`` (at least 1)."""
+    for m in range(min(limit, dimension), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+class ScalarQuantizer:
+    """
+    Per-dimension int8 scalar quantization.
+    Each dimension is mapped linearly from its observed [min, max] range onto
+    256 levels, cutting vector memory by 4x relative to float32.
+    """
+
+    kind = "int8"
+
+    def __init__(self, lo: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None):
+        self.lo = lo
+        self.scale = scale
+
+    def fit(self, vectors: np.ndarray) -> "ScalarQuantizer":
+        """Learn per-dimension ranges from a float32 matrix."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.lo = vectors.min(axis=0)
+        scale = (vectors.max(axis=0) - self.lo) / 255.0
+        self.scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Quantize rows to int8 codes; values outside the fitted range are clipped."""
+        levels = np.rint((np.asarray(vectors, dtype=np.float32) - self.lo) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate float32 rows from codes."""
+        return self.lo + (codes.astype(np.float32) + 128.0) * self.scale
+
+    def inner_products(self, queries: np.ndarray, codes: np.ndarray,
+                       block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """Approximate ``queries @ decoded.T`` without materializing decoded rows. Shape (q, n)."""
+        # q . (lo + (c + 128) * scale) = q . (lo + 128 * scale) + c . (q * scale)
+        weighted = queries * self.scale
+        offset = queries @ (self.lo + 128.0 * self.scale)
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), block_size):
+            block = codes[start:start + block_size].astype(np.float32)
+            out[:, start:start + len(block)] = weighted @ block.T
+        out += offset[:, None]
+        return out
+
+    def sq_norms(self, codes: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """Squared norms of the decoded rows."""
+        norms = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), block_size):
+            block = self.decode(codes[start:start + block_size])
+            norms[start:start + len(block)] = np.einsum("ij,ij->i", block, block)
+        return norms
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"lo": self.lo, "scale": self.scale}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "ScalarQuantizer":
+        return cls(lo=np.asarray(state["lo"]), scale=np.asarray(state["scale"]))
+
+
+class ProductQuantizer:
+    """
+    Product quantization with 8-bit codes.
+    Vectors are split into ``m`` sub-vectors and each is replaced by the index
+    of its nearest centroid (k-means per sub-space), so a vector costs ``m``
+    bytes. Queries are scored with per-query lookup tables (asymmetric
+    distance computation).
+    """
+
+    kind = "pq"
+
+    def __init__(self, m: int = 8, iterations: int = 20, max_training: int = 65536, seed: int = 0):
+        self.m = m
+        self.iterations = iterations
+        self.max_training = max_training
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None  # (m, ksub, dsub)
+
+    def fit(self, vectors: np.ndarray) -> "ProductQuantizer":
+        """Train one k-means codebook per sub-space on (a sample of) the rows."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n, dimension = vectors.shape
+        self.m = largest_divisor(dimension, self.m)
+        rng = np.random.default_rng(self.seed)
+        if n > self.max_training:
+            vectors = vectors[np.sort(rng.choice(n, self.max_training, replace=False))]
+        ksub = min(256, len(vectors))
+        dsub = dimension // self.m
+
+        self.centroids = np.stack([
+            self._kmeans(np.ascontiguousarray(vectors[:, j * dsub:(j + 1) * dsub]), ksub, rng)
+            for j in range(self.m)
+        ])
+        return self
+
+    def _kmeans(self, data: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+        centroids = data[rng.choice(len(data), k, replace=False)].copy()
+        for _ in range(self.iterations):
+            assignment = self._nearest(data, centroids)
+            counts = np.bincount(assignment, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            # Re-seed empty clusters from random points
+            empty = np.flatnonzero(~filled)
+            if len(empty):
+                centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+        return centroids
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||^2 == argmin ||c||^2 - 2 x . c
+        distances = np.einsum("ij,ij->i", centroids, centroids)[None, :] - 2.0 * (data @ centroids.T)
+        return distances.argmin(axis=1)
+
+    @property
+    def dsub(self) -> int:
+        return self.centroids.shape[2]
+
+    def encode(self, vectors: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """Assign each sub-vector to its nearest centroid. Returns uint8 codes (n, m)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for start in range(0, len(vectors), block_size):
+            block = vectors[start:start + block_size]
+            for j in range(self.m):
+                sub = block[:, j * self.dsub:(j + 1) * self.dsub]
+                codes[start:start + len(block), j] = self._nearest(sub, self.centroids[j])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate float32 rows from codes."""
+        return np.concatenate([self.centroids[j][codes[:, j]] for j in range(self.m)], axis=1)
+
+    def inner_products(self, queries: np.ndarray, codes: np.ndarray,
+                       block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """Approximate ``queries @ decoded.T`` from per-query lookup tables. Shape (q, n)."""
+        # tables[j] is (q, ksub): each query sub-vector against sub-space j's centroids
+        tables = [
+            queries[:, j * self.dsub:(j + 1) * self.dsub] @ self.centroids[j].T for j in range(self.m)
+        ]
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), block_size):
+            block = codes[start:start + block_size]
+            scores = tables[0][:, block[:, 0]]
+            for j in range(1, self.m):
+                scores += tables[j][:, block[:, j]]
+            out[:, start:start + len(block)] = scores
+        return out
+
+    def sq_norms(self, codes: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """Squared norms of the decoded rows."""
+        centroid_norms = np.einsum("mkd,mkd->mk", self.centroids, self.centroids)
+        norms = np.zeros(len(codes), dtype=np.float32)
+        for j in range(self.m):
+            norms += centroid_norms[j][codes[:, j]]
+        return norms
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"centroids": self.centroids}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray]) -> "ProductQuantizer":
+        centroids = np.asarray(state["centroids"])
+        quantizer = cls(m=centroids.shape[0])
+        quantizer.centroids = centroids
+        return quantizer
+
+
+QUANTIZERS = {ScalarQuantizer.kind: ScalarQuantizer, ProductQuantizer.kind: ProductQuantizer}
@@ -0,0 +1,291 @@
+"""LRU + TTL cache for query embeddings, optionally backed by SQLite.
+
+Chat traffic repeats the same questions all day; caching their embeddings
+skips the embedder round trip on every repeat. Entries are keyed by
+``(embedder model, normalized query)``, so one process-wide cache can serve
+several embedders. Normalization folds Unicode forms and whitespace only;
+case is kept because most embedding models are case-sensitive.
+
+``SearchAPI`` and the CLI ``search`` command both go through
+``get_query_cache``, configured by an optional ``query_cache`` config
+section::
+
+    "query_cache": {"enabled": true, "max_size": 1024, "ttl_seconds": 3600}
+
+The in-memory LRU only helps a long-lived process. With a ``path`` the
+cache also keeps entries in a SQLite file (like CachedEmbedder's), so
+short-lived processes such as the server's per-search subprocesses share
+hits: a memory miss is looked up there before calling the embedder. The
+file holds at most ``max_size`` entries, evicted least recently used first.
+"""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL_SECONDS = 3600.0
+
+
+def normalize_query(query: str) -> str:
+    """NFKC-normalize ``query`` and collapse runs of whitespace."""
+    return " ".join(unicodedata.normalize("NFKC", query or "").split())
+
+
+# Embedder settings that change the vectors a model returns
+VECTOR_SETTINGS = ("normalize_embeddings", "pooling_strategy", "quantize")
+
+
+def vector_settings_key(embedder: Any) -> str:
+    """``:name=value`` for each of ``VECTOR_SETTINGS`` that ``embedder`` sets."""
+    key = ""
+    for name in VECTOR_SETTINGS:
+        value = getattr(embedder, name, None)
+        if isinstance(value, (bool, str)):
+            key += f":{name}={value}"
+    return key
+
+
+def embedder_cache_key(embedder: Any) -> str:
+    """Identify the model and output settings behind ``embedder`` (CachedEmbedder's key when wrapped)."""
+    model_key = getattr(embedder, "model_key", None)
+    if isinstance(model_key, str):
+        return model_key
+    model = getattr(embedder, "model", None) or getattr(embedder, "model_name", None)
+    key = f"{type(embedder).__name__}:{model or 'default'}"
+    dimensions = getattr(embedder, "dimensions", None)
+    if isinstance(dimensions, int):
+        key = f"{key}:{dimensions}"
+    return key + vector_settings_key(embedder)
+
+
+class _SQLiteQueryStore:
+    """Query vectors in a SQLite file shared by every process that opens it.
+
+    Expiry times are wall-clock seconds so they mean the same in every
+    process; vectors are float64 blobs so hits equal the original lists.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_embeddings (
+                model TEXT NOT NULL,
+                query TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                expires REAL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, query)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_query_embeddings_last_used ON query_embeddings(last_used)")
+        self._conn.commit()
+
+    def get(self, key: Tuple[str, str], now: float) -> Optional[Tuple[List[float], Optional[float]]]:
+        """``(vector, expires)`` for an unexpired ``key``, marking it recently used."""
+        row = self._conn.execute(
+            "SELECT vector, expires FROM query_embeddings WHERE model = ? AND query = ? "
+            "AND (expires IS NULL OR expires > ?)",
+            (*key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE query_embeddings SET last_used = ? WHERE model = ? AND query = ?", (now, *key))
+        self._conn.commit()
+        return np.frombuffer(row[0], dtype=np.float64).tolist(), row[1]
+
+    def put(self, entries: Dict[Tuple[str, str], List[float]], expires: Optional[float],
+            now: float, max_size: int) -> None:
+        """Insert ``entries``, then drop expired rows and the least recently used beyond ``max_size``."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO query_embeddings (model, query, vector, expires, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(*key, np.asarray(vector, dtype=np.float64).tobytes(), expires, now) for key, vector in entries.items()],
+        )
+        self._conn.execute("DELETE FROM query_embeddings WHERE expires <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM query_embeddings WHERE (model, query) IN ("
+            "SELECT model, query FROM query_embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max_size,),
+        )
+        self._conn.commit()
+
+    def size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM query_embeddings")
+        self._conn.commit()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query vectors whose entries expire after ``ttl_seconds``.
+
+    With ``path``, misses fall through to a SQLite file shared across processes.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 path: Optional[str] = None):
+        self.max_size = max(int(max_size), 1)
+        self.ttl_seconds = ttl_seconds or None
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[List[float], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "persistent_hits": 0, "evictions": 0, "expirations": 0}
+        self._persistent = _SQLiteQueryStore(path) if path else None
+
+    def configure(self, max_size: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                  path: Optional[str] = None) -> None:
+        """Change the limits, evicting the least recently used entries if now over size.
+
+        A ``path`` different from the current one switches the SQLite file.
+        """
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max(int(max_size), 1)
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds or None
+            if path and (self._persistent is None or self._persistent.path != Path(path)):
+                self._persistent = _SQLiteQueryStore(path)
+            self._evict()
+
+    def embed(self, embedder: Any, query: str) -> List[float]:
+        """Embedding of ``query``, from the cache or from ``embedder``."""
+        return self.embed_many(embedder, [query])[0]
+
+    def embed_many(self, embedder: Any, queries: Sequence[str]) -> List[List[float]]:
+        """Embeddings of ``queries``; the misses are embedded in one ``embedder.embed`` call."""
+        model = embedder_cache_key(embedder)
+        keys = [(model, normalize_query(query)) for query in queries]
+        now = time.monotonic()
+        found: Dict[Tuple[str, str], List[float]] = {}
+        missing: Dict[Tuple[str, str], str] = {}
+
+        with self._lock:
+            for key, query in zip(keys, queries):
+                if key in found or key in missing:
+                    continue
+                vector = self._get(key, now)
+                if vector is None:
+                    vector = self._get_persistent(key, now)
+                if vector is None:
+                    missing[key] = query
+                else:
+                    found[key] = vector
+            self._evict()
+            self._counters["hits"] += len(keys) - len(missing)
+            self._counters["misses"] += len(missing)
+
+        if missing:
+            vectors = embedder.embed(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            found.update(fresh)
+            with self._lock:
+                expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+                stored = {}
+                for key, vector in fresh.items():
+                    # Failed embeddings come back as zeros; don't pin them
+                    if vector is not None and any(vector):
+                        stored[key] = list(vector)
+                        self._entries[key] = (stored[key], expires)
+                        self._entries.move_to_end(key)
+                self._evict()
+                if stored and self._persistent is not None:
+                    wall = time.time()
+                    self._persistent.put(
+                        stored, wall + self.ttl_seconds if self.ttl_seconds else None, wall, self.max_size
+                    )
+
+        # Copies, so callers can't modify cached vectors
+        return [list(found[key]) for key in keys]
+
+    def _get(self, key: Tuple[str, str], now: float) -> Optional[List[float]]:
+        """Look up ``key`` (lock held), dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        vector, expires = entry
+        if now >= expires:
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _get_persistent(self, key: Tuple[str, str], now: float) -> Optional[List[float]]:
+        """Look up ``key`` in the SQLite file (lock held), keeping a hit in memory."""
+        if self._persistent is None:
+            return None
+        wall = time.time()
+        entry = self._persistent.get(key, wall)
+        if entry is None:
+            return None
+        vector, expires = entry
+        # Keep the remaining lifetime, measured on this process's clock
+        self._entries[key] = (vector, now + (expires - wall) if expires is not None else float("inf"))
+        self._counters["persistent_hits"] += 1
+        return vector
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop every entry (including the SQLite file's) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self._persistent is not None:
+                self._persistent.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size, limits, hit/miss counters and hit rate."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "path": str(self._persistent.path) if self._persistent else None,
+                "persistent_size": self._persistent.size() if self._persistent else 0,
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            }
+
+
+_shared_cache: Optional[QueryEmbeddingCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_query_cache(config: Optional[Dict[str, Any]] = None) -> Optional[QueryEmbeddingCache]:
+    """The process-wide query cache, configured from a ``query_cache`` section.
+
+    Returns None when the section sets ``enabled: false``. ``path`` adds the
+    SQLite tier shared across processes.
+    """
+    global _shared_cache
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = QueryEmbeddingCache(
+                config.get("max_size", DEFAULT_MAX_SIZE),
+                config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+                config.get("path"),
+            )
+        else:
+            _shared_cache.configure(config.get("max_size"), config.get("ttl_seconds"), config.get("path"))
+    return _shared_cache
@@ -0,0 +1,60 @@
+"""Timestamps as epoch seconds, computed once at ingest instead of per query.
+
+Stores call ``add_timestamp_epochs`` (via ``VectorStore.prepare_documents``)
+before writing, so every chunk whose metadata has a ``timestamp`` also gets
+``timestamp_epoch``, which ``RerankedStrategy`` reads directly.
+"""
+
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+TIMESTAMP_FIELD = "timestamp"
+EPOCH_FIELD = "timestamp_epoch"
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Optional[float]:
+    try:
+        parsed = datetime.fromisoformat(text.strip())
+    except ValueError:
+        try:
+            import dateutil.parser
+        except ImportError:
+            return None
+        try:
+            parsed = dateutil.parser.parse(text)
+        except (ValueError, OverflowError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def timestamp_to_epoch(value: Any) -> Optional[float]:
+    """Seconds since the epoch for an ISO string, datetime, date or number; None if unparseable.
+
+    Naive times are taken as UTC.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp()
+    if isinstance(value, str):
+        return _parse(value)
+    return None
+
+
+def add_timestamp_epochs(documents: Iterable[Any]) -> None:
+    """Set ``timestamp_epoch`` on documents with a parseable ``timestamp``."""
+    for doc in documents:
+        metadata = doc.metadata
+        if not metadata or TIMESTAMP_FIELD not in metadata:
+            continue
+        epoch = timestamp_to_epoch(metadata[TIMESTAMP_FIELD])
+        if epoch is not None:
+            metadata[EPOCH_FIELD] = epoch
@@ -132,6 +132,8 @@ def search_with_rag(strategy, query: str, top_k: int = 5) -> list[dict[str, Any]
         "embedder": v1["rag"]["embedders"]["default"],
         "vector_store": v1["rag"]["vector_stores"]["default"],
         "retrieval_strategy": v1["rag"]["retrieval_strategies"]["default"],
+        # Each search is a new process: keep query embeddings in a shared file (cwd is rag_repo)
+        "query_cache": {"path": "./data/query_cache.sqlite"},
     }
 
     with tempfile.TemporaryDirectory() as tmpdir: